@@ -0,0 +1,157 @@
+"""
+WebSocket Identity Cache
+========================
+
+Resolved WebSocket identities, cached so reconnect storms do not turn into
+database storms. A session key (or a JWT's user id) maps to a snapshot of
+the user's fields for WEBSOCKET_AUTH_CACHE_TTL seconds; unknown or expired
+sessions are cached as anonymous for WEBSOCKET_AUTH_NEGATIVE_TTL seconds.
+
+- Cache hit: user rebuilt from the snapshot (no database access); field
+  values are parsed back with each field's ``to_python`` so snapshots
+  survive JSON cache serializers
+- Logout drops the session entry; saving or deleting a user drops its
+  user-id entry and, through a per-user index, every session entry that
+  resolved to it; anything else expires with the TTL
+"""
+
+import hashlib
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ws_auth"
+ANONYMOUS = "anonymous"
+# Never cached with the snapshot
+EXCLUDED_FIELDS = {"password"}
+
+
+class UserSnapshotCache:
+    """
+    Cache of resolved users keyed by credential kind ("session" or "user")
+    """
+
+    @property
+    def store(self):
+        return caches[getattr(settings, "WEBSOCKET_AUTH_CACHE_ALIAS", "default")]
+
+    @staticmethod
+    def key(kind: str, credential) -> str:
+        digest = hashlib.sha256(str(credential).encode()).hexdigest()[:32]
+        return f"{KEY_PREFIX}:{kind}:{digest}"
+
+    def index_key(self, user_id) -> str:
+        """Key listing the session entries cached for one user"""
+        return self.key("sessions", user_id)
+
+    def get(self, kind: str, credential):
+        """Cached user or AnonymousUser, or None on a miss"""
+        try:
+            snapshot = self.store.get(self.key(kind, credential))
+        except Exception as e:
+            logger.warning(f"WebSocket auth cache read failed: {e}")
+            return None
+
+        if snapshot is None:
+            return None
+        if snapshot == ANONYMOUS:
+            return AnonymousUser()
+        return self.restore(snapshot)
+
+    def set(self, kind: str, credential, user) -> None:
+        if user.is_authenticated:
+            value = self.snapshot(user)
+            timeout = getattr(settings, "WEBSOCKET_AUTH_CACHE_TTL", 60)
+        else:
+            value = ANONYMOUS
+            timeout = getattr(settings, "WEBSOCKET_AUTH_NEGATIVE_TTL", 10)
+
+        key = self.key(kind, credential)
+        try:
+            self.store.set(key, value, timeout)
+            if kind == "session" and user.is_authenticated:
+                self._index_session(user.pk, key, timeout)
+        except Exception as e:
+            logger.warning(f"WebSocket auth cache write failed: {e}")
+
+    def _index_session(self, user_id, key: str, timeout: int) -> None:
+        index_key = self.index_key(user_id)
+        keys = self.store.get(index_key) or []
+        if key not in keys:
+            keys.append(key)
+        self.store.set(index_key, keys, timeout)
+
+    def delete(self, kind: str, credential) -> None:
+        try:
+            self.store.delete(self.key(kind, credential))
+        except Exception as e:
+            logger.warning(f"WebSocket auth cache delete failed: {e}")
+
+    def invalidate_user(self, user_id) -> None:
+        """Drop the user-id entry and every session entry of one user"""
+        index_key = self.index_key(user_id)
+        try:
+            keys = self.store.get(index_key) or []
+            self.store.delete_many([self.key("user", user_id), index_key, *keys])
+        except Exception as e:
+            logger.warning(f"WebSocket auth cache delete failed: {e}")
+
+    @staticmethod
+    def snapshot(user) -> dict:
+        return {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.name not in EXCLUDED_FIELDS
+        }
+
+    @staticmethod
+    def restore(snapshot: dict):
+        """User instance from a snapshot; the password loads lazily if accessed"""
+        User = get_user_model()
+        fields = [
+            field for field in User._meta.concrete_fields if field.attname in snapshot
+        ]
+        return User.from_db(
+            User.objects.db,
+            [field.attname for field in fields],
+            # JSON serializers hand datetimes (and UUIDs, decimals) back as str
+            [field.to_python(snapshot[field.attname]) for field in fields],
+        )
+
+
+def user_logged_out_handler(sender, request, user, **kwargs):
+    session_key = getattr(getattr(request, "session", None), "session_key", None)
+    if session_key:
+        user_snapshots.delete("session", session_key)
+
+
+def user_changed_handler(sender, instance, **kwargs):
+    user_snapshots.invalidate_user(instance.pk)
+
+
+def connect_signals() -> None:
+    """
+    Drop cached identities on logout and on user changes
+    """
+    from django.contrib.auth.signals import user_logged_out
+    from django.db.models.signals import post_delete, post_save
+
+    User = get_user_model()
+    user_logged_out.connect(
+        user_logged_out_handler, dispatch_uid="ws_auth_cache_logout"
+    )
+    post_save.connect(
+        user_changed_handler, sender=User, dispatch_uid="ws_auth_cache_user_save"
+    )
+    post_delete.connect(
+        user_changed_handler, sender=User, dispatch_uid="ws_auth_cache_user_delete"
+    )
+
+
+# Global cache shared by the WebSocket auth middleware
+user_snapshots = UserSnapshotCache()
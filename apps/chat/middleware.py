@@ -4,24 +4,31 @@ Custom middleware for handling WebSocket authentication and session management
 """
 
 import logging
+from importlib import import_module
+from types import SimpleNamespace
 from urllib.parse import parse_qs
 
-from django.contrib.auth.models import AnonymousUser, User
-from django.contrib.sessions.models import Session
+from django.conf import settings
+from django.contrib.auth import get_user as get_session_user
+from django.contrib.auth.models import AnonymousUser
+from django.http import parse_cookie
 from django.utils import timezone
 
 from channels.auth import AuthMiddlewareStack
 from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 
+from apps.chat.auth_cache import user_snapshots
+
 logger = logging.getLogger(__name__)
 
 
 class WebSocketAuthMiddleware(BaseMiddleware):
     """
     Custom WebSocket authentication middleware that supports:
-    - Session-based authentication
-    - Token-based authentication
+    - Session-based authentication (configured session engine)
+    - Token-based authentication (JWT)
+    - Cached identities, so reconnects skip the database
     - Anonymous user handling
     - Connection logging and monitoring
     """
@@ -90,47 +97,40 @@ class WebSocketAuthMiddleware(BaseMiddleware):
             logger.error(f"Authentication error in WebSocket: {e}")
             return AnonymousUser()
 
-    def get_user_from_session(self, scope):  # noqa: C901
+    def get_user_from_session(self, scope):
         """
         Extract user from Django session
         """
         try:
-            # Get session key from cookies
-            cookies = {}
+            session_key = None
             for header_name, header_value in scope.get("headers", []):
                 if header_name == b"cookie":
-                    cookie_str = header_value.decode("utf-8")
-                    for cookie in cookie_str.split(";"):
-                        if "=" in cookie:
-                            key, value = cookie.strip().split("=", 1)
-                            cookies[key] = value
+                    cookies = parse_cookie(header_value.decode("latin-1"))
+                    session_key = cookies.get(settings.SESSION_COOKIE_NAME)
                     break
 
-            session_key = cookies.get("sessionid")
             if not session_key:
                 return AnonymousUser()
 
-            # Get session data
-            try:
-                session = Session.objects.get(session_key=session_key)
-                if session.expire_date < timezone.now():
-                    return AnonymousUser()
-
-                session_data = session.get_decoded()
-                user_id = session_data.get("_auth_user_id")
-
-                if user_id:
-                    return User.objects.get(id=user_id)
-
-            except (Session.DoesNotExist, User.DoesNotExist):
-                pass
-
-            return AnonymousUser()
+            user = user_snapshots.get("session", session_key)
+            if user is None:
+                user = self.resolve_session_user(session_key)
+                user_snapshots.set("session", session_key, user)
+            return user
 
         except Exception as e:
             logger.error(f"Session authentication error: {e}")
             return AnonymousUser()
 
+    def resolve_session_user(self, session_key):
+        """
+        Load the session through SESSION_ENGINE and resolve its user the way
+        django.contrib.auth does (backend lookup, session hash check)
+        """
+        engine = import_module(settings.SESSION_ENGINE)
+        session = engine.SessionStore(session_key)
+        return get_session_user(SimpleNamespace(session=session))
+
     def get_user_from_token(self, scope):
         """
         Extract user from authentication token (query params or headers)
@@ -151,9 +151,6 @@ class WebSocketAuthMiddleware(BaseMiddleware):
                         break
 
             if token:
-                # Validate token (implement your token validation logic here)
-                # For now, this is a placeholder - you should implement proper token validation
-                # For example, JWT validation or API key lookup
                 return self.validate_token(token)
 
             return AnonymousUser()
@@ -164,13 +161,44 @@ class WebSocketAuthMiddleware(BaseMiddleware):
 
     def validate_token(self, token):
         """
-        Validate authentication token
-        Implement your token validation logic here
+        Validate a JWT access token with the API's JWT backend
+
+        Signature, expiry and revocation are checked on every connect; only
+        the user lookup is served from the identity cache.
         """
-        # Placeholder implementation
-        # You should implement proper token validation based on your requirements
-        # This could be JWT validation, API key lookup, etc.
-        return AnonymousUser()
+        try:
+            from rest_framework.exceptions import AuthenticationFailed
+            from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+            from rest_framework_simplejwt.settings import api_settings
+
+            from apps.core.auth.jwt_backend import CustomJWTAuthentication
+        except ImportError as e:
+            logger.warning(f"JWT authentication unavailable for WebSocket: {e}")
+            return AnonymousUser()
+
+        backend = CustomJWTAuthentication()
+        try:
+            validated_token = backend.get_validated_token(token)
+        except (InvalidToken, TokenError) as e:
+            logger.info(f"Rejected WebSocket token: {e}")
+            return AnonymousUser()
+
+        if backend._is_token_blacklisted(validated_token):
+            logger.info("Rejected revoked WebSocket token")
+            return AnonymousUser()
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_snapshots.get("user", user_id)
+        if user is None:
+            try:
+                user = backend.get_user(validated_token)
+            except (AuthenticationFailed, InvalidToken):
+                user = AnonymousUser()
+            user_snapshots.set("user", user_id, user)
+
+        if not user.is_active:
+            return AnonymousUser()
+        return user
 
     def get_active_connections(self):
         """
@@ -4,13 +4,13 @@ import logging
 from django.conf import settings
 from django.contrib import messages
 from django.core.cache import cache
-from django.core.mail import send_mail
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
 from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_http_methods
 
 from apps.main.analytics import analytics
+from apps.main.mail_outbox import queue_mail
 
 from .forms import ContactForm
 
@@ -72,16 +72,15 @@ def contact_form(request: HttpRequest) -> HttpResponse:
                     f"Contact message submitted successfully from IP: {client_ip}"
                 )
 
-                # Send email notification (optional)
+                # Queue email notification (sent by the mail outbox)
                 try:
-                    send_mail(
+                    queue_mail(
                         subject=f"New Contact Message: {contact_message.subject}",
                         message=f"From: {contact_message.name} <{contact_message.email}>\n\nMessage:\n{contact_message.message}",
                         from_email=settings.DEFAULT_FROM_EMAIL,
                         recipient_list=[
                             getattr(settings, "CONTACT_EMAIL", "admin@example.com")
                         ],
-                        fail_silently=True,
                     )
                 except Exception as e:
                     logger.warning(f"Failed to send contact email: {e}")
@@ -4,12 +4,10 @@ Custom Admin Views for Modern Admin Panel
 
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Q
 from django.shortcuts import render
-from django.utils import timezone
-from datetime import timedelta
 
 from apps.blog.models import Post
+from apps.core.dashboard_stats import dashboard_stats
 from apps.tools.models import Tool
 from apps.main.models import (
     BlogPost,
@@ -24,27 +22,8 @@ def modern_admin_dashboard(request):
     """
     Modern Admin Dashboard - Ana Sayfa
     """
-    # Son 30 gün içindeki istatistikler
-    last_30_days = timezone.now() - timedelta(days=30)
-
-    # Blog istatistikleri
-    total_blog_posts = Post.objects.count() + BlogPost.objects.count()
-    recent_posts = Post.objects.filter(created_at__gte=last_30_days).count()
-    published_posts = Post.objects.filter(status='published').count()
-    draft_posts = Post.objects.filter(status='draft').count()
-
-    # Tools istatistikleri
-    total_tools = Tool.objects.count()
-    visible_tools = Tool.objects.filter(is_visible=True).count()
-
-    # AI Tools istatistikleri
-    total_ai_tools = AITool.objects.count()
-    featured_ai_tools = AITool.objects.filter(is_featured=True).count()
-
-    # Cybersecurity istatistikleri
-    total_cyber_resources = CybersecurityResource.objects.count()
-    urgent_cyber = CybersecurityResource.objects.filter(is_urgent=True).count()
-    critical_cyber = CybersecurityResource.objects.filter(severity_level=4).count()
+    # Sayılar önbellekli tek bir özetten gelir (apps/core/dashboard_stats.py)
+    snapshot = dashboard_stats.get()
 
     # Son aktiviteler
     recent_blog_posts = Post.objects.order_by('-created_at')[:5]
@@ -53,25 +32,10 @@ def modern_admin_dashboard(request):
     context = {
         'page_title': 'Admin Dashboard',
         'stats': {
-            'blog': {
-                'total': total_blog_posts,
-                'recent': recent_posts,
-                'published': published_posts,
-                'draft': draft_posts,
-            },
-            'tools': {
-                'total': total_tools,
-                'visible': visible_tools,
-            },
-            'ai_tools': {
-                'total': total_ai_tools,
-                'featured': featured_ai_tools,
-            },
-            'cybersecurity': {
-                'total': total_cyber_resources,
-                'urgent': urgent_cyber,
-                'critical': critical_cyber,
-            },
+            'blog': snapshot['blog'],
+            'tools': snapshot['tools'],
+            'ai_tools': snapshot['ai_tools'],
+            'cybersecurity': snapshot['cybersecurity'],
         },
         'recent_activities': {
             'blog_posts': recent_blog_posts,
@@ -118,18 +82,17 @@ def cybersecurity_management(request):
     """
     resources = CybersecurityResource.objects.all().order_by('-severity_level', '-created_at')
 
-    # Kategorilere göre grupla
-    by_type = resources.values('type').annotate(count=Count('id'))
-    by_severity = resources.values('severity_level').annotate(count=Count('id'))
+    cyber_stats = dashboard_stats.get()['cybersecurity']
 
     context = {
         'page_title': 'Siber Güvenlik Yönetimi',
         'resources': resources,
         'stats': {
-            'by_type': by_type,
-            'by_severity': by_severity,
-            'urgent_count': resources.filter(is_urgent=True).count(),
-            'total': resources.count(),
+            'by_type': cyber_stats['by_type'],
+            'by_severity': cyber_stats['by_severity'],
+            'urgent_count': cyber_stats['urgent'],
+            'featured_count': cyber_stats['featured'],
+            'total': cyber_stats['total'],
         },
     }
 
@@ -150,6 +113,7 @@ def tools_management(request):
         'tools': tools,
         'ai_tools': ai_tools,
         'useful_resources': useful_resources,
+        'stats': dashboard_stats.get(),
     }
 
     return render(request, 'admin/modern/tools.html', context)
@@ -6,10 +6,20 @@ Simple stub for collecting frontend performance metrics.
 import json
 import logging
 
+from django.contrib.admin.views.decorators import staff_member_required
 from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
+from apps.core.invalidation import invalidation_dispatcher
+from apps.main.feed_cache import feed_store
+from apps.main.middleware.fast_path import middleware_latency
+from apps.main.query_profiler import query_profiler
+from apps.main.rate_limiter import rate_limiter
+from apps.playground.result_cache import result_cache
+from apps.playground.sandbox import execution_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,16 +48,33 @@ def collect_performance_metric(request):
         )
 
 
+@staff_member_required
+@never_cache
 @require_http_methods(["GET"])
 def performance_dashboard_data(request):
     """
-    Stub endpoint for performance dashboard.
-    Returns empty data structure.
+    Endpoint for performance dashboard (staff only).
+    Returns per-endpoint database query aggregates from the query profiler
+    per-route middleware latency, rate limiter decisions, playground
+    execution stats, feed rendering and per-commit invalidation stats for
+    this process.
     """
     return JsonResponse(
         {
             "status": "success",
-            "data": {"metrics": [], "summary": {"lcp": 0, "fid": 0, "cls": 0}},
+            "data": {
+                "metrics": [],
+                "summary": {"lcp": 0, "fid": 0, "cls": 0},
+                "queries": query_profiler.endpoint_report(),
+                "middleware": middleware_latency.report(),
+                "rate_limits": rate_limiter.stats(),
+                "playground": {
+                    **execution_service.report(),
+                    "result_cache": result_cache.stats(),
+                },
+                "feeds": feed_store.stats(),
+                "invalidation": invalidation_dispatcher.stats(),
+            },
         },
         status=200,
     )
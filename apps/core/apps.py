@@ -17,3 +17,11 @@ class CoreConfig(AppConfig):
             import apps.core.cache_signals  # noqa: F401
         except ImportError:
             pass
+
+        from apps.core.auth.revocation import connect_signals
+
+        connect_signals()
+
+        from apps.core.dashboard_stats import connect_signals as connect_dashboard
+
+        connect_dashboard()
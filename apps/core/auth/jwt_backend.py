@@ -22,6 +22,8 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from apps.core.auth.revocation import revocation_cache
+
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
@@ -56,7 +58,7 @@ class CustomJWTAuthentication(JWTAuthentication):
                 raise exceptions.AuthenticationFailed(_("Token has been revoked."))
 
             # Log successful authentication
-            logger.info(
+            logger.debug(
                 f"JWT authentication successful for user {user.username} "
                 f"from {request.META.get('REMOTE_ADDR', 'unknown')}"
             )
@@ -73,16 +75,18 @@ class CustomJWTAuthentication(JWTAuthentication):
     def _is_token_blacklisted(self, token) -> bool:
         """
         Check if token is in blacklist
+
+        Served from the Bloom filter revocation cache; only filter hits are
+        confirmed against the BlacklistedToken table.
         """
+        jti = token.get("jti")
         try:
-            from rest_framework_simplejwt.token_blacklist.models import (
-                BlacklistedToken,
-                OutstandingToken,
-            )
+            return revocation_cache.is_revoked(jti)
+        except Exception as e:
+            logger.warning(f"Revocation cache check failed, querying blacklist: {e}")
 
-            jti = token.get("jti")
-            if jti:
-                return BlacklistedToken.objects.filter(token__jti=jti).exists()
+        try:
+            return bool(jti) and revocation_cache.confirm(jti)
         except Exception:  # nosec B110 - Token blacklist optional, graceful degradation
             # Token blacklist not configured - skip check
             pass
@@ -169,7 +173,11 @@ class JWTTokenManager:
                 outstanding_token = OutstandingToken.objects.filter(jti=jti).first()
 
                 if outstanding_token:
-                    BlacklistedToken.objects.get_or_create(token=outstanding_token)
+                    _, created = BlacklistedToken.objects.get_or_create(
+                        token=outstanding_token
+                    )
+                    if created:
+                        revocation_cache.mark_revoked(jti)
                     logger.info(f"Token {jti} blacklisted successfully")
                     return True
 
@@ -240,7 +248,7 @@ class APIKeyAuthentication(authentication.BaseAuthentication):
                 ip_address=request.META.get("REMOTE_ADDR", "unknown"),
             )
 
-            logger.info(
+            logger.debug(
                 f"API key authentication successful for {api_key_obj.name} "
                 f"from {request.META.get('REMOTE_ADDR', 'unknown')}"
             )
@@ -249,6 +257,9 @@ class APIKeyAuthentication(authentication.BaseAuthentication):
 
         except APIKey.DoesNotExist:
             raise exceptions.AuthenticationFailed(_("Invalid API key"))
+        except exceptions.APIException:
+            # Keep DRF errors (401 vs 429 Throttled) intact
+            raise
         except Exception as e:
             logger.error(f"API key authentication error: {e}")
             raise exceptions.AuthenticationFailed(_("Authentication failed"))
@@ -0,0 +1,230 @@
+"""
+JWT Revocation Cache
+====================
+
+Answers "is this JTI blacklisted?" without a database query for the common
+case. A Bloom filter of blacklisted JTIs is built from the token blacklist,
+shared between workers as a bitmap snapshot in the cache (keyed by version,
+stored as base64 text so JSON cache serializers can hold it), and refreshed
+when a committed blacklist event bumps the shared version counter.
+
+- Bloom negative: token is definitely not revoked (no DB access)
+- Bloom positive: confirmed against BlacklistedToken (rare)
+- Cache unavailable: every check goes to BlacklistedToken
+"""
+
+import base64
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = "jwt_revocation:version"
+SNAPSHOT_CACHE_KEY = "jwt_revocation:snapshot:{version}"
+SNAPSHOT_TIMEOUT = 60 * 60 * 24  # 24 hours
+MIN_CAPACITY = 10000
+ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings using double hashing
+    """
+
+    def __init__(self, capacity: int = MIN_CAPACITY, error_rate: float = ERROR_RATE):
+        capacity = max(int(capacity), 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def to_snapshot(self) -> dict:
+        return {
+            "size": self.size,
+            "hash_count": self.hash_count,
+            "bits": base64.b64encode(self.bits).decode("ascii"),
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> "BloomFilter":
+        """Restore a filter, raising ValueError for malformed snapshots"""
+        try:
+            bloom = cls.__new__(cls)
+            bloom.size = int(snapshot["size"])
+            bloom.hash_count = int(snapshot["hash_count"])
+            bloom.bits = bytearray(base64.b64decode(snapshot["bits"]))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid Bloom filter snapshot: {e}")
+        if len(bloom.bits) != (bloom.size + 7) // 8:
+            raise ValueError("Bloom filter snapshot size mismatch")
+        return bloom
+
+
+def _load_blacklisted_jtis() -> Iterable[str]:
+    """Stream JTIs of blacklisted tokens that have not expired yet"""
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+    return (
+        BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        .values_list("token__jti", flat=True)
+        .iterator(chunk_size=2000)
+    )
+
+
+def _is_blacklisted_in_db(jti: str) -> bool:
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+class TokenRevocationCache:
+    """
+    Process-local Bloom filter kept in sync through the shared cache
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Iterable[str]] = _load_blacklisted_jtis,
+        confirm: Callable[[str], bool] = _is_blacklisted_in_db,
+        refresh_interval: Optional[float] = None,
+    ):
+        self.loader = loader
+        self.confirm = confirm
+        self.refresh_interval = (
+            refresh_interval
+            if refresh_interval is not None
+            else getattr(settings, "JWT_REVOCATION_REFRESH_INTERVAL", 1.0)
+        )
+        self._bloom: Optional[BloomFilter] = None
+        self._version = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """
+        Check whether a JTI is blacklisted; only Bloom hits touch the DB
+        """
+        if not jti:
+            return False
+
+        try:
+            bloom = self._current_filter()
+        except Exception as e:
+            logger.warning(f"JWT revocation filter unavailable, using the DB: {e}")
+            return self.confirm(jti)
+        if jti not in bloom:
+            return False
+
+        return self.confirm(jti)
+
+    def mark_revoked(self, jti: str) -> None:
+        """
+        Record a blacklist event locally and, once the blacklist row is
+        committed, tell other workers to reload
+
+        A rolled-back revocation at most leaves a local false positive,
+        which the DB confirmation rejects.
+        """
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+        transaction.on_commit(self._bump_version)
+
+    @staticmethod
+    def _bump_version() -> None:
+        cache.add(VERSION_CACHE_KEY, 0, None)
+        try:
+            cache.incr(VERSION_CACHE_KEY)
+        except ValueError:
+            cache.set(VERSION_CACHE_KEY, 1, None)
+
+    def _current_filter(self) -> BloomFilter:
+        now = time.monotonic()
+        if self._bloom is not None and now - self._last_check < self.refresh_interval:
+            return self._bloom
+
+        version = cache.get(VERSION_CACHE_KEY, 0)
+        with self._lock:
+            self._last_check = now
+            if self._bloom is None or version != self._version:
+                self._bloom = self._load_filter(version)
+                self._version = version
+            return self._bloom
+
+    def _load_filter(self, version) -> BloomFilter:
+        """
+        Filter for ``version``: the shared snapshot, or rebuilt from the DB
+
+        Snapshots are never deleted, only superseded, so a worker still
+        building an old version cannot overwrite a newer one.
+        """
+        snapshot_key = SNAPSHOT_CACHE_KEY.format(version=version)
+        snapshot = cache.get(snapshot_key)
+        if snapshot is not None:
+            try:
+                return BloomFilter.from_snapshot(snapshot)
+            except ValueError as e:
+                logger.warning(f"Rebuilding JWT revocation filter: {e}")
+
+        jtis = list(self.loader())
+        bloom = BloomFilter(capacity=max(MIN_CAPACITY, len(jtis) * 2))
+        for jti in jtis:
+            bloom.add(jti)
+
+        cache.set(snapshot_key, bloom.to_snapshot(), SNAPSHOT_TIMEOUT)
+        logger.debug(f"JWT revocation filter rebuilt with {len(jtis)} tokens")
+        return bloom
+
+
+revocation_cache = TokenRevocationCache()
+
+
+def blacklisted_token_saved(sender, instance, created=False, **kwargs):
+    """
+    Signal receiver for BlacklistedToken inserts (logout, rotation, admin)
+    """
+    if created:
+        revocation_cache.mark_revoked(instance.token.jti)
+
+
+def connect_signals() -> None:
+    """
+    Hook the revocation cache to the simplejwt blacklist, when installed
+    """
+    try:
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+    except (ImportError, RuntimeError):
+        return
+
+    from django.db.models.signals import post_save
+
+    post_save.connect(
+        blacklisted_token_saved,
+        sender=BlacklistedToken,
+        dispatch_uid="jwt_revocation_cache",
+    )
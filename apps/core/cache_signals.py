@@ -2,7 +2,8 @@
 Cache invalidation signals for automatic cache clearing.
 
 This module provides signal handlers that automatically invalidate
-relevant cache keys when models are saved or deleted.
+relevant cache keys when models are saved or deleted. Handlers only queue
+the keys; the invalidation dispatcher deletes them once per commit.
 """
 
 from django.core.cache import cache
@@ -10,11 +11,18 @@ from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from apps.blog.models import Post as BlogPost
+from apps.core.invalidation import invalidation_dispatcher
 from apps.main.models import BlogPost as MainBlogPost
 from apps.main.models import PersonalInfo, SocialLink
+from apps.main.search.result_cache import search_result_cache
+from apps.portfolio.models import AITool
 from apps.portfolio.models import BlogPost as PortfolioBlogPost
+from apps.portfolio.models import CybersecurityResource, UsefulResource
 from apps.tools.models import Tool
 
+# Models indexed by the site search engine
+SEARCHABLE_MODELS = (BlogPost, Tool, AITool, CybersecurityResource, UsefulResource)
+
 
 @receiver(post_save, sender=BlogPost)
 @receiver(post_delete, sender=BlogPost)
@@ -47,7 +55,7 @@ def invalidate_blog_post_cache(sender, instance, **kwargs):
         for tag in instance.tags:
             cache_keys.append(f"blog_tag_{tag}")
 
-    cache.delete_many(cache_keys)
+    invalidation_dispatcher.invalidate(sender, instance, keys=cache_keys)
 
 
 @receiver(post_save, sender=MainBlogPost)
@@ -60,7 +68,7 @@ def invalidate_main_blog_cache(sender, instance, **kwargs):
         "main_post_list",
         "main_recent_posts",
     ]
-    cache.delete_many(cache_keys)
+    invalidation_dispatcher.invalidate(sender, instance, keys=cache_keys)
 
 
 @receiver(post_save, sender=PortfolioBlogPost)
@@ -73,7 +81,7 @@ def invalidate_portfolio_blog_cache(sender, instance, **kwargs):
         "portfolio_post_list",
         "portfolio_recent_posts",
     ]
-    cache.delete_many(cache_keys)
+    invalidation_dispatcher.invalidate(sender, instance, keys=cache_keys)
 
 
 @receiver(post_save, sender=Tool)
@@ -103,7 +111,21 @@ def invalidate_tool_cache(sender, instance, **kwargs):
     # Invalidate similar tools cache
     cache_keys.append(f"similar_tools_{instance.pk}")
 
-    cache.delete_many(cache_keys)
+    invalidation_dispatcher.invalidate(sender, instance, keys=cache_keys)
+
+
+def invalidate_search_results(sender, instance, **kwargs):
+    """
+    Retire cached search hit lists when searchable content changes.
+    """
+    invalidation_dispatcher.invalidate(
+        sender, instance, hooks={"search_results": search_result_cache.invalidate}
+    )
+
+
+for _model in SEARCHABLE_MODELS:
+    post_save.connect(invalidate_search_results, sender=_model)
+    post_delete.connect(invalidate_search_results, sender=_model)
 
 
 # Additional cache utility functions
@@ -114,6 +136,8 @@ def invalidate_search_cache():
     Invalidate all search-related caches.
     Call this after reindexing or when search results may have changed.
     """
+    search_result_cache.invalidate()
+
     pattern_keys = [
         "search_*",
         "tag_cloud_*",
@@ -176,14 +200,21 @@ def invalidate_personal_info_cache(sender, instance, **kwargs):
         "personal_page_data",
         "about_page_data",
     ]
-    # Also invalidate user-specific caches
+    invalidation_dispatcher.invalidate(
+        sender,
+        instance,
+        keys=cache_keys,
+        hooks={"user_home_pages": invalidate_user_home_pages},
+    )
+
+
+def invalidate_user_home_pages():
+    """Invalidate user-specific home page caches"""
     from django.contrib.auth import get_user_model
 
     User = get_user_model()
-    for user in User.objects.all()[:100]:  # Limit to first 100 users
-        cache_keys.append(f"home_page_data_user{user.pk}")
-
-    cache.delete_many(cache_keys)
+    user_ids = User.objects.values_list("pk", flat=True)[:100]  # First 100 users
+    cache.delete_many([f"home_page_data_user{pk}" for pk in user_ids])
 
 
 @receiver(post_save, sender=SocialLink)
@@ -202,4 +233,4 @@ def invalidate_social_link_cache(sender, instance, **kwargs):
         "footer_social_links",
         "contact_page_data",
     ]
-    cache.delete_many(cache_keys)
+    invalidation_dispatcher.invalidate(sender, instance, keys=cache_keys)
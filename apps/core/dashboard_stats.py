@@ -0,0 +1,201 @@
+"""
+Admin Dashboard Statistics
+==========================
+
+Content counts shown by the modern admin panel, computed with conditional
+aggregation (one ``aggregate(Count(..., filter=Q(...)))`` query per model
+instead of one ``count()`` per figure) and cached as a single snapshot.
+
+- Saving or deleting counted content drops the snapshot once per commit,
+  through the invalidation dispatcher; the next dashboard load rebuilds it
+- The snapshot also expires after DASHBOARD_STATS_TTL seconds, so figures
+  relative to "now" (posts of the last 30 days) do not drift for long
+- ``manage.py refresh_dashboard_stats`` rebuilds it ahead of time, e.g.
+  from cron, so staff never pay for the aggregation
+"""
+
+import logging
+import time
+from datetime import timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from apps.core.invalidation import invalidation_dispatcher
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "admin:dashboard_stats"
+RECENT_DAYS = 30
+
+
+def _counted_models() -> List[type]:
+    from apps.blog.models import Post
+    from apps.main.models import AITool, BlogPost, CybersecurityResource, UsefulResource
+    from apps.tools.models import Tool
+
+    return [Post, BlogPost, Tool, AITool, CybersecurityResource, UsefulResource]
+
+
+def _blog_stats() -> Dict:
+    from apps.blog.models import Post
+    from apps.main.models import BlogPost
+
+    since = timezone.now() - timedelta(days=RECENT_DAYS)
+    posts = Post.objects.aggregate(
+        total=Count("id"),
+        recent=Count("id", filter=Q(created_at__gte=since)),
+        published=Count("id", filter=Q(status="published")),
+        draft=Count("id", filter=Q(status="draft")),
+    )
+    posts["total"] += BlogPost.objects.count()
+    return posts
+
+
+def _tool_stats() -> Dict:
+    from apps.tools.models import Tool
+
+    return Tool.objects.aggregate(
+        total=Count("id"),
+        visible=Count("id", filter=Q(is_visible=True)),
+        favorite=Count("id", filter=Q(is_favorite=True)),
+    )
+
+
+def _ai_tool_stats() -> Dict:
+    from apps.main.models import AITool
+
+    return AITool.objects.aggregate(
+        total=Count("id"),
+        featured=Count("id", filter=Q(is_featured=True)),
+    )
+
+
+def _useful_resource_stats() -> Dict:
+    from apps.main.models import UsefulResource
+
+    return UsefulResource.objects.aggregate(
+        total=Count("id"),
+        free=Count("id", filter=Q(is_free=True)),
+    )
+
+
+def _cybersecurity_stats() -> Dict:
+    """
+    Totals plus the per-type and per-severity breakdowns in one query, one
+    conditional count per choice
+    """
+    from apps.main.models import CybersecurityResource
+
+    types = [value for value, _ in CybersecurityResource.TYPE_CHOICES]
+    field = CybersecurityResource._meta.get_field("severity_level")
+    severities = [value for value, _ in field.choices]
+
+    row = CybersecurityResource.objects.aggregate(
+        total=Count("id"),
+        urgent=Count("id", filter=Q(is_urgent=True)),
+        critical=Count("id", filter=Q(severity_level=4)),
+        featured=Count("id", filter=Q(is_featured=True)),
+        **{f"type_{value}": Count("id", filter=Q(type=value)) for value in types},
+        **{
+            f"severity_{value}": Count("id", filter=Q(severity_level=value))
+            for value in severities
+        },
+    )
+    return {
+        "total": row["total"],
+        "urgent": row["urgent"],
+        "critical": row["critical"],
+        "featured": row["featured"],
+        # Same shape as values(...).annotate(count=...): only non-empty groups
+        "by_type": [
+            {"type": value, "count": row[f"type_{value}"]}
+            for value in types
+            if row[f"type_{value}"]
+        ],
+        "by_severity": [
+            {"severity_level": value, "count": row[f"severity_{value}"]}
+            for value in severities
+            if row[f"severity_{value}"]
+        ],
+    }
+
+
+class DashboardStats:
+    """
+    Cached snapshot of the admin dashboard counts
+    """
+
+    def __init__(self, ttl: int = None, cache_alias: str = None):
+        self.ttl = ttl or getattr(settings, "DASHBOARD_STATS_TTL", 300)
+        self.cache_alias = cache_alias or getattr(
+            settings, "DASHBOARD_STATS_CACHE_ALIAS", "default"
+        )
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def compute(self) -> Dict:
+        """Run the aggregation queries (one per model)"""
+        start = time.perf_counter()
+        snapshot = {
+            "blog": _blog_stats(),
+            "tools": _tool_stats(),
+            "ai_tools": _ai_tool_stats(),
+            "useful_resources": _useful_resource_stats(),
+            "cybersecurity": _cybersecurity_stats(),
+            "generated_at": timezone.now().isoformat(),
+        }
+        snapshot["compute_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return snapshot
+
+    def get(self) -> Dict:
+        """The cached snapshot, computed on a miss"""
+        try:
+            snapshot = self.cache.get(CACHE_KEY)
+        except Exception as e:
+            logger.error(f"Dashboard stats cache unavailable: {e}")
+            return self.compute()
+        if snapshot is None:
+            snapshot = self.refresh()
+        return snapshot
+
+    def refresh(self) -> Dict:
+        """Recompute and store the snapshot"""
+        snapshot = self.compute()
+        try:
+            self.cache.set(CACHE_KEY, snapshot, self.ttl)
+        except Exception as e:
+            logger.error(f"Failed to cache dashboard stats: {e}")
+        return snapshot
+
+    def invalidate(self) -> None:
+        self.cache.delete(CACHE_KEY)
+
+
+def content_changed(sender, instance, **kwargs):
+    """
+    Drop the snapshot once the saving transaction commits
+    """
+    invalidation_dispatcher.invalidate(
+        sender, instance, hooks={"dashboard_stats": dashboard_stats.invalidate}
+    )
+
+
+def connect_signals() -> None:
+    """
+    Invalidate the snapshot when any counted model is saved or deleted
+    """
+    for model in _counted_models():
+        uid = f"dashboard_stats_{model._meta.label_lower}"
+        post_save.connect(content_changed, sender=model, dispatch_uid=uid)
+        post_delete.connect(content_changed, sender=model, dispatch_uid=uid)
+
+
+# Global snapshot used by the admin views
+dashboard_stats = DashboardStats()
@@ -0,0 +1,359 @@
+"""
+GDPR Data Export Worker
+=======================
+
+Builds Article 20 data exports for DataExportRequest rows.
+
+Each data category is streamed from chunked ``.iterator()`` querysets
+straight into a deflated ZIP on disk (one JSON-lines or CSV member per
+dataset), so memory use stays constant regardless of how much history a
+user has. Progress is written to the request row as the export runs, and
+several exports can run side by side on a bounded thread pool.
+
+A request left "processing" by a worker that died (e.g. a restart
+mid-export) stops receiving progress writes; once its heartbeat is older
+than GDPR_EXPORT_STALE_AFTER seconds it is claimable again and rebuilt
+from scratch.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Q
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+
+from apps.core.models.gdpr import DataExportRequest
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 2000
+DOWNLOAD_LIFETIME = timedelta(days=7)
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    """One exported table: which rows belong to the user and which columns"""
+
+    category: str
+    name: str
+    model: str
+    fields: tuple
+    lookup: Callable[[object], Dict]
+
+    def queryset(self, user):
+        try:
+            model = django_apps.get_model(self.model)
+        except LookupError:
+            return None
+        return (
+            model._default_manager.filter(**self.lookup(user))
+            .order_by("pk")
+            .values_list(*self.fields)
+        )
+
+
+def _owned_by(user) -> Dict:
+    return {"user": user}
+
+
+EXPORT_DATASETS: List[ExportDataset] = [
+    ExportDataset(
+        "profile",
+        "account",
+        settings.AUTH_USER_MODEL,
+        (
+            "username",
+            "email",
+            "first_name",
+            "last_name",
+            "date_joined",
+            "last_login",
+            "is_active",
+        ),
+        lambda user: {"pk": user.pk},
+    ),
+    ExportDataset(
+        "profile",
+        "api_keys",
+        "core.APIKey",
+        ("name", "key_prefix", "permissions", "is_active", "created_at"),
+        _owned_by,
+    ),
+    ExportDataset(
+        "content",
+        "code_snippets",
+        "playground.CodeSnippet",
+        ("id", "title", "code", "output", "is_public", "created_at", "updated_at"),
+        _owned_by,
+    ),
+    ExportDataset(
+        "content",
+        "contact_messages",
+        "contact.ContactMessage",
+        ("name", "email", "subject", "message", "preferred_channel", "created_at"),
+        lambda user: {"email": user.email},
+    ),
+    ExportDataset(
+        "activity",
+        "data_collection_logs",
+        "core.DataCollectionLog",
+        (
+            "collection_type",
+            "endpoint",
+            "data_categories",
+            "purpose",
+            "has_consent",
+            "timestamp",
+            "ip_address",
+            "user_agent",
+        ),
+        _owned_by,
+    ),
+    ExportDataset(
+        "activity",
+        "code_likes",
+        "playground.CodeLike",
+        ("snippet_id", "created_at"),
+        _owned_by,
+    ),
+    ExportDataset(
+        "preferences",
+        "privacy_preferences",
+        "core.PrivacyPreferences",
+        (
+            "data_retention_period",
+            "allow_profiling",
+            "allow_third_party",
+            "allow_analytics",
+            "communication_preferences",
+            "updated_at",
+        ),
+        _owned_by,
+    ),
+    ExportDataset(
+        "preferences",
+        "consent_records",
+        "core.ConsentRecord",
+        ("consent_type", "consented", "consent_version", "consent_text", "timestamp"),
+        _owned_by,
+    ),
+]
+
+
+def export_root() -> Path:
+    return Path(
+        getattr(settings, "GDPR_EXPORT_ROOT", Path(settings.BASE_DIR) / "exports")
+    )
+
+
+def _download_url(request_id) -> str:
+    try:
+        return reverse("download_data_export", args=[request_id])
+    except NoReverseMatch:
+        return ""
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    return value
+
+
+class DataExportWorker:
+    """
+    Streams user data exports to disk on a bounded thread pool
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        datasets: Optional[List[ExportDataset]] = None,
+    ):
+        self.max_workers = max_workers or getattr(settings, "GDPR_EXPORT_WORKERS", 2)
+        self.chunk_size = chunk_size
+        self.stale_after = timedelta(
+            seconds=getattr(settings, "GDPR_EXPORT_STALE_AFTER", 900)
+        )
+        self.datasets = datasets if datasets is not None else EXPORT_DATASETS
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="gdpr-export"
+                )
+            return self._executor
+
+    def submit(self, request_id):
+        """Queue an export once the creating transaction commits"""
+        transaction.on_commit(lambda: self.executor.submit(self._run, request_id))
+
+    def claimable(self) -> Q:
+        """Pending requests, and processing ones whose worker went silent"""
+        stale = Q(heartbeat_at__lt=timezone.now() - self.stale_after) | Q(
+            heartbeat_at__isnull=True
+        )
+        return Q(status="pending") | (Q(status="processing") & stale)
+
+    def process_pending(self, limit: Optional[int] = None) -> int:
+        """Run pending and stale exports concurrently and wait for them"""
+        pending = DataExportRequest.objects.filter(self.claimable()).order_by(
+            "requested_at"
+        )
+        ids = list(pending.values_list("id", flat=True)[:limit])
+        wait([self.executor.submit(self._run, request_id) for request_id in ids])
+        return len(ids)
+
+    def _run(self, request_id):
+        try:
+            return self.process(request_id)
+        finally:
+            # Worker threads own their DB connection
+            connection.close()
+
+    def process(self, request_id) -> bool:
+        """
+        Build one export; returns False if another worker already claimed it
+        """
+        claimed = (
+            DataExportRequest.objects.filter(pk=request_id)
+            .filter(self.claimable())
+            .update(
+                status="processing",
+                progress=0,
+                rows_exported=0,
+                heartbeat_at=timezone.now(),
+            )
+        )
+        if not claimed:
+            return False
+
+        export_request = DataExportRequest.objects.select_related("user").get(
+            pk=request_id
+        )
+        root = export_root()
+        root.mkdir(parents=True, exist_ok=True)
+        final_path = root / f"{export_request.pk}.zip"
+        tmp_path = root / f"{export_request.pk}.zip.tmp"
+        # Left behind when a previous attempt was interrupted
+        tmp_path.unlink(missing_ok=True)
+
+        try:
+            rows = self._write_archive(export_request, tmp_path)
+            os.replace(tmp_path, final_path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            DataExportRequest.objects.filter(pk=request_id).update(
+                status="failed", error_message=str(e)[:1000]
+            )
+            logger.error(f"Data export {request_id} failed: {e}")
+            return True
+
+        now = timezone.now()
+        DataExportRequest.objects.filter(pk=request_id).update(
+            status="completed",
+            progress=100,
+            rows_exported=rows,
+            file_path=str(final_path),
+            file_size=final_path.stat().st_size,
+            download_url=_download_url(request_id),
+            download_expires_at=now + DOWNLOAD_LIFETIME,
+            processed_at=now,
+        )
+        logger.info(f"Data export {request_id} completed with {rows} records")
+        return True
+
+    def _write_archive(self, export_request, path: Path) -> int:
+        user = export_request.user
+        categories = export_request.include_categories or []
+        datasets = [d for d in self.datasets if d.category in categories]
+        use_csv = export_request.export_format == "csv"
+        total_rows = 0
+
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+            for index, dataset in enumerate(datasets, start=1):
+                queryset = dataset.queryset(user)
+                if queryset is not None:
+                    extension = "csv" if use_csv else "jsonl"
+                    member = f"{dataset.category}/{dataset.name}.{extension}"
+                    with zf.open(member, "w", force_zip64=True) as raw:
+                        with io.TextIOWrapper(raw, encoding="utf-8", newline="") as out:
+                            total_rows = self._write_rows(
+                                export_request.pk,
+                                dataset,
+                                queryset,
+                                out,
+                                use_csv,
+                                total_rows,
+                            )
+
+                DataExportRequest.objects.filter(pk=export_request.pk).update(
+                    progress=int(index * 99 / len(datasets)),
+                    rows_exported=total_rows,
+                    heartbeat_at=timezone.now(),
+                )
+
+            zf.writestr("README.txt", self._readme(export_request, datasets))
+
+        return total_rows
+
+    def _write_rows(self, request_id, dataset, queryset, out, use_csv, total_rows):
+        writer = csv.writer(out) if use_csv else None
+        if writer:
+            writer.writerow(dataset.fields)
+
+        count = 0
+        for count, row in enumerate(
+            queryset.iterator(chunk_size=self.chunk_size), start=1
+        ):
+            if writer:
+                writer.writerow([_csv_value(value) for value in row])
+            else:
+                record = dict(zip(dataset.fields, row))
+                out.write(json.dumps(record, cls=DjangoJSONEncoder))
+                out.write("\n")
+
+            if count % self.chunk_size == 0:
+                DataExportRequest.objects.filter(pk=request_id).update(
+                    rows_exported=total_rows + count, heartbeat_at=timezone.now()
+                )
+
+        return total_rows + count
+
+    @staticmethod
+    def _readme(export_request, datasets) -> str:
+        lines = [
+            "Personal Data Export",
+            "====================",
+            "",
+            f"Request: {export_request.pk}",
+            f"Generated: {timezone.now().isoformat()}",
+            f"Format: {'CSV' if export_request.export_format == 'csv' else 'JSON lines'}",
+            "",
+            "Datasets:",
+        ]
+        lines += [f"- {d.category}/{d.name}: {', '.join(d.fields)}" for d in datasets]
+        return "\n".join(lines) + "\n"
+
+
+# Global worker used by the GDPR views and the process_data_exports command
+data_export_worker = DataExportWorker()
@@ -0,0 +1,292 @@
+"""
+Coalesced Cache and Search Index Invalidation
+=============================================
+
+Model signal handlers enqueue their work here instead of doing it inside
+the saving request. Work is collected per transaction, deduplicated and
+performed once when the transaction commits:
+
+- Cache keys: one ``delete_many`` per commit
+- Key patterns: each pattern scanned once per commit
+- Hooks (named callables, e.g. "retire cached search results"): run once
+- Search index: one bulk upsert per model (rows re-read after commit) and
+  one bulk delete per model
+
+A bulk admin edit of 500 rows is one flush instead of 500 pattern scans
+and 500 index round-trips. Outside a transaction (autocommit) the work is
+flushed right away, as ``transaction.on_commit`` runs callbacks
+immediately there. Work queued by a transaction that rolls back is
+discarded rather than flushed with the next commit. Each flush reports
+its duration to the dispatcher stats and the log.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+RECENT_FLUSHES = 50
+
+
+class InvalidationBatch:
+    """Deduplicated work collected during one transaction"""
+
+    def __init__(self):
+        self.events = 0
+        self.instances: Set[Tuple[str, object]] = set()
+        self.keys: Set[str] = set()
+        self.patterns: Set[str] = set()
+        self.hooks: Dict[str, Callable] = {}
+        # model -> primary keys to upsert / model name -> ids to delete
+        self.index: Dict[type, Set] = defaultdict(set)
+        self.unindex: Dict[str, Set] = defaultdict(set)
+
+    def __bool__(self):
+        return self.events > 0
+
+
+def delete_pattern(pattern: str) -> int:
+    """
+    Delete the keys matching ``pattern``; backends without pattern support
+    (e.g. LocMemCache) are skipped
+    """
+    if hasattr(cache, "delete_pattern"):
+        return cache.delete_pattern(pattern) or 0
+    try:
+        keys = cache.keys(pattern)
+    except (AttributeError, TypeError):
+        return 0
+    cache.delete_many(keys)
+    return len(keys)
+
+
+class InvalidationDispatcher:
+    """
+    Per-thread invalidation batches flushed on transaction commit
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=RECENT_FLUSHES)
+        self._totals = {"flushes": 0, "events": 0, "instances": 0, "errors": 0}
+
+    @property
+    def batch(self) -> InvalidationBatch:
+        batch = getattr(self._local, "batch", None)
+        if batch is None or (batch and not self._flush_pending()):
+            # Queued work whose flush callbacks are all gone was rolled back
+            if batch:
+                logger.debug(f"Discarding {batch.events} rolled-back events")
+            batch = self._local.batch = InvalidationBatch()
+        return batch
+
+    def _flush_pending(self) -> bool:
+        """Whether a flush is still registered with the open transaction"""
+        connection = transaction.get_connection()
+        return any(entry[1] == self.flush for entry in connection.run_on_commit)
+
+    def _enqueued(self, sender, instance) -> InvalidationBatch:
+        batch = self.batch
+        batch.events += 1
+        batch.instances.add((sender._meta.label, instance.pk))
+        # Every registration flushes the whole batch; later ones find it
+        # empty. Callbacks of a rolled-back savepoint are dropped by Django,
+        # so the batch is still flushed by any surviving one, and a batch
+        # left without any (the transaction rolled back) is discarded by
+        # the next event instead of being flushed with an unrelated commit.
+        transaction.on_commit(self.flush)
+        return batch
+
+    def invalidate(
+        self,
+        sender,
+        instance,
+        keys: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        hooks: Optional[Dict[str, Callable]] = None,
+    ) -> None:
+        """
+        Queue cache invalidation for a saved or deleted instance
+
+        ``hooks`` maps a name to a callable; a name runs once per commit.
+        """
+        batch = self._enqueued(sender, instance)
+        batch.keys.update(keys)
+        batch.patterns.update(patterns)
+        if hooks:
+            batch.hooks.update(hooks)
+
+    def index(self, sender, instance) -> None:
+        """Queue a search index upsert of ``instance``"""
+        batch = self._enqueued(sender, instance)
+        batch.unindex[sender.__name__].discard(instance.pk)
+        batch.index[sender].add(instance.pk)
+
+    def unindex(self, sender, instance) -> None:
+        """Queue removal of ``instance`` from the search index"""
+        batch = self._enqueued(sender, instance)
+        batch.index[sender].discard(instance.pk)
+        batch.unindex[sender.__name__].add(instance.pk)
+
+    def flush(self) -> Optional[Dict]:
+        """
+        Perform the queued work; returns the flush report, or None when
+        nothing was queued
+        """
+        # Not self.batch: Django unregisters the callbacks before running them
+        batch = getattr(self._local, "batch", None)
+        if not batch:
+            return None
+        self._local.batch = InvalidationBatch()
+
+        start = time.perf_counter()
+        errors = 0
+
+        if batch.keys:
+            try:
+                cache.delete_many(list(batch.keys))
+            except Exception as e:
+                errors += 1
+                logger.error(f"Failed to delete {len(batch.keys)} cache keys: {e}")
+
+        for pattern in batch.patterns:
+            try:
+                delete_pattern(pattern)
+            except Exception as e:
+                errors += 1
+                logger.error(f"Failed to invalidate cache pattern {pattern}: {e}")
+
+        for name, hook in batch.hooks.items():
+            try:
+                hook()
+            except Exception as e:
+                errors += 1
+                logger.error(f"Invalidation hook {name} failed: {e}")
+
+        indexed = self._sync_index(batch)
+        if indexed is None:
+            errors += 1
+            indexed = 0
+
+        report = {
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            "events": batch.events,
+            "instances": len(batch.instances),
+            "keys": len(batch.keys),
+            "patterns": len(batch.patterns),
+            "hooks": len(batch.hooks),
+            "indexed": indexed,
+            "errors": errors,
+        }
+        with self._lock:
+            self._recent.append(report)
+            self._totals["flushes"] += 1
+            self._totals["events"] += batch.events
+            self._totals["instances"] += len(batch.instances)
+            self._totals["errors"] += errors
+
+        logger.info(
+            f"Invalidation flush: {report['events']} events for "
+            f"{report['instances']} instances in {report['duration_ms']}ms"
+        )
+        return report
+
+    def _sync_index(self, batch: InvalidationBatch) -> Optional[int]:
+        """
+        Bulk upsert/delete queued documents; returns the number of documents
+        sent, or None when the index is unavailable or a request failed
+        """
+        upserts = {model: pks for model, pks in batch.index.items() if pks}
+        deletes = {name: ids for name, ids in batch.unindex.items() if ids}
+        if not upserts and not deletes:
+            return 0
+
+        try:
+            from apps.main.monitoring import search_monitor
+            from apps.main.search_index import search_index_manager
+        except Exception as e:
+            logger.error(f"Search index unavailable, skipping sync: {e}")
+            return None
+
+        sent = 0
+        failed = False
+        for model, pks in upserts.items():
+            start = time.perf_counter()
+            try:
+                objects = list(model._default_manager.filter(pk__in=pks))
+                result = search_index_manager.bulk_index(objects)
+                success, error = not result["failed"], None
+            except Exception as e:
+                objects, success, error = [], False, str(e)
+            failed = failed or not success
+            sent += len(objects)
+            self._log_sync(
+                search_monitor,
+                model.__name__,
+                "bulk_index",
+                success,
+                start,
+                len(objects),
+                error,
+            )
+
+        for model_name, ids in deletes.items():
+            start = time.perf_counter()
+            try:
+                success = search_index_manager.delete_documents(model_name, ids)
+                error = None
+            except Exception as e:
+                success, error = False, str(e)
+            failed = failed or not success
+            sent += len(ids)
+            self._log_sync(
+                search_monitor, model_name, "delete", success, start, len(ids), error
+            )
+
+        return None if failed else sent
+
+    @staticmethod
+    def _log_sync(monitor, model_name, operation, success, start, count, error):
+        try:
+            monitor.log_index_sync(
+                model_name=model_name,
+                operation=operation,
+                success=success,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                document_count=count,
+                error=error,
+            )
+        except Exception:
+            # Monitoring may not be available
+            pass
+
+    def stats(self) -> Dict:
+        with self._lock:
+            recent = list(self._recent)
+        durations = [flush["duration_ms"] for flush in recent]
+        return {
+            **self._totals,
+            "last_flush": recent[-1] if recent else None,
+            "avg_flush_ms": (
+                round(sum(durations) / len(durations), 2) if durations else 0.0
+            ),
+            "max_flush_ms": max(durations, default=0.0),
+        }
+
+    def reset(self) -> None:
+        self._local.batch = InvalidationBatch()
+        with self._lock:
+            self._recent.clear()
+            for stat in self._totals:
+                self._totals[stat] = 0
+
+
+# Global dispatcher used by the model signal handlers
+invalidation_dispatcher = InvalidationDispatcher()
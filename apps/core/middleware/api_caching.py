@@ -20,7 +20,10 @@ from django.http import HttpResponse, JsonResponse
 from django.utils.cache import patch_cache_control
 from django.utils.http import http_date, parse_http_date
 
+from apps.main.middleware.fast_path import route_aware
 
+
+@route_aware("caching")
 class APICachingMiddleware:
     """
     Middleware for API response caching with ETag and conditional requests.
@@ -124,9 +127,13 @@ class APICachingMiddleware:
         """Get fresh response and cache if appropriate."""
         response = self.get_response(request)
 
-        # Only cache successful JSON responses
-        is_cacheable = response.status_code == 200 and isinstance(
-            response, JsonResponse
+        # Only cache successful JSON responses the view allows to be shared
+        cache_control = response.get("Cache-Control", "")
+        is_cacheable = (
+            response.status_code == 200
+            and isinstance(response, JsonResponse)
+            and "private" not in cache_control
+            and "no-store" not in cache_control
         )
         if is_cacheable:
             self._cache_response(request, response, cache_key)
@@ -256,6 +263,7 @@ class APICachingMiddleware:
                 pass  # Fail silently if cache clearing fails
 
 
+@route_aware("caching")
 class CacheInvalidationMiddleware:
     """
     Middleware to handle cache invalidation on data updates.
@@ -297,6 +305,7 @@ class CacheInvalidationMiddleware:
                 pass
 
 
+@route_aware("analytics")
 class ResponseTimeMiddleware:
     """
     Middleware to track API response times.
@@ -7,16 +7,18 @@ Provides API-specific rate limiting with:
 - Per-endpoint rate limits (read vs write operations)
 - Rate limit by API key + IP combination
 - Graceful degradation with retry-after headers
+- Shared rate limiter engine (apps.main.rate_limiter)
 """
 
 import logging
 import time
 from typing import Optional, Tuple
 
-from django.core.cache import cache
 from django.http import JsonResponse
 from django.utils import timezone
 
+from apps.main.rate_limiter import Rate, rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -116,30 +118,13 @@ class APIRateLimitMiddleware:
 
         Returns: (is_allowed, retry_after_seconds)
         """
-        # Get rate limit configuration
         limit, window = self._get_limit_for_request(request)
+        decision = rate_limiter.hit(
+            "api", self._get_rate_limit_key(request), [Rate(limit, window)]
+        )
+        request.api_rate_limit_decision = decision
 
-        # Get cache key
-        cache_key = self._get_cache_key(request)
-
-        # Get current request count
-        current_count = cache.get(cache_key, 0)
-
-        if current_count >= limit:
-            # Rate limit exceeded - calculate retry_after
-            ttl = cache.ttl(cache_key)
-            retry_after = max(ttl, window) if ttl else window
-            return (False, retry_after)
-
-        # Increment counter
-        if current_count == 0:
-            # First request in window - set with expiry
-            cache.set(cache_key, 1, timeout=window)
-        else:
-            # Increment existing counter
-            cache.incr(cache_key)
-
-        return (True, 0)
+        return (decision.allowed, decision.retry_after_seconds)
 
     def _get_limit_for_request(self, request) -> Tuple[int, int]:
         """
@@ -163,9 +148,9 @@ class APIRateLimitMiddleware:
 
         return (config["requests"], config["window"])
 
-    def _get_cache_key(self, request) -> str:
+    def _get_rate_limit_key(self, request) -> str:
         """
-        Generate cache key for rate limiting
+        Generate the rate limiter identity for the request
         """
         # Use API key if available
         if hasattr(request, "auth") and hasattr(request.auth, "key_hash"):
@@ -181,7 +166,7 @@ class APIRateLimitMiddleware:
         # Include endpoint in key for endpoint-specific limits
         endpoint_key = request.path.split("?")[0]  # Remove query params
 
-        return f"api_rate_limit:{identifier}:{endpoint_key}"
+        return f"{identifier}:{endpoint_key}"
 
     def _get_client_ip(self, request) -> str:
         """
@@ -198,14 +183,11 @@ class APIRateLimitMiddleware:
         """
         Add rate limit headers to response
         """
-        limit, window = self._get_limit_for_request(request)
-        cache_key = self._get_cache_key(request)
-        current_count = cache.get(cache_key, 0)
-        remaining = max(0, limit - current_count)
+        decision = request.api_rate_limit_decision
 
-        response["X-RateLimit-Limit"] = limit
-        response["X-RateLimit-Remaining"] = remaining
-        response["X-RateLimit-Reset"] = int(time.time() + window)
+        response["X-RateLimit-Limit"] = decision.limit
+        response["X-RateLimit-Remaining"] = decision.remaining
+        response["X-RateLimit-Reset"] = int(time.time() + decision.reset_seconds)
 
 
 class DDoSProtectionMiddleware:
@@ -228,8 +210,15 @@ class DDoSProtectionMiddleware:
 
         ip_address = self._get_client_ip(request)
 
-        # Check if IP is blocked
-        if self._is_blocked(ip_address):
+        # Exceeding the threshold blocks the IP for BLOCK_DURATION
+        decision = rate_limiter.hit(
+            "ddos",
+            ip_address,
+            [Rate(self.DDOS_THRESHOLD, self.DDOS_WINDOW)],
+            lockout=self.BLOCK_DURATION,
+        )
+
+        if decision.state == "blocked":
             logger.warning(f"Blocked DDoS attempt from {ip_address}")
             return JsonResponse(
                 {
@@ -239,9 +228,7 @@ class DDoSProtectionMiddleware:
                 status=403,
             )
 
-        # Check if IP exceeds DDoS threshold
-        if self._check_ddos_threshold(ip_address):
-            self._block_ip(ip_address)
+        if decision.state == "locked":
             logger.error(f"DDoS detected from {ip_address} - IP blocked")
             return JsonResponse(
                 {
@@ -263,35 +250,3 @@ class DDoSProtectionMiddleware:
         else:
             ip = request.META.get("REMOTE_ADDR", "unknown")
         return ip
-
-    def _is_blocked(self, ip_address: str) -> bool:
-        """
-        Check if IP is currently blocked
-        """
-        block_key = f"ddos_block:{ip_address}"
-        return cache.get(block_key, False)
-
-    def _check_ddos_threshold(self, ip_address: str) -> bool:
-        """
-        Check if IP exceeds DDoS threshold
-        """
-        ddos_key = f"ddos_check:{ip_address}"
-        request_count = cache.get(ddos_key, 0)
-
-        if request_count >= self.DDOS_THRESHOLD:
-            return True
-
-        # Increment counter
-        if request_count == 0:
-            cache.set(ddos_key, 1, timeout=self.DDOS_WINDOW)
-        else:
-            cache.incr(ddos_key)
-
-        return False
-
-    def _block_ip(self, ip_address: str) -> None:
-        """
-        Block IP address for BLOCK_DURATION
-        """
-        block_key = f"ddos_block:{ip_address}"
-        cache.set(block_key, True, timeout=self.BLOCK_DURATION)
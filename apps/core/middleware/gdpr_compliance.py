@@ -28,9 +28,12 @@ from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse
 from django.utils.deprecation import MiddlewareMixin
 
+from apps.main.middleware.fast_path import route_aware
+
 logger = logging.getLogger(__name__)
 
 
+@route_aware("gdpr")
 class CookieConsentMiddleware(MiddlewareMixin):
     """
     Track and enforce cookie consent per GDPR Article 7.
@@ -192,6 +195,7 @@ class CookieConsentMiddleware(MiddlewareMixin):
                 logger.debug(f"Filtered cookie: {cookie_name}")
 
 
+@route_aware("gdpr")
 class DataCollectionLoggingMiddleware(MiddlewareMixin):
     """
     Log data collection activities for GDPR compliance (Article 30).
@@ -293,6 +297,7 @@ class DataCollectionLoggingMiddleware(MiddlewareMixin):
         return ip
 
 
+@route_aware("gdpr")
 class PrivacyPreferencesMiddleware(MiddlewareMixin):
     """
     Manage user privacy preferences across the application.
@@ -9,7 +9,8 @@ Features:
 - Per-username rate limiting
 - Configurable thresholds and cooldown periods
 - Automatic lockout after threshold breach
-- Redis backend for distributed systems (optional)
+- Shared rate limiter engine (apps.main.rate_limiter), Redis-backed when
+  the cache is django-redis
 """
 
 import logging
@@ -18,11 +19,12 @@ from collections import defaultdict
 from typing import Callable, Optional
 
 from django.conf import settings
-from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
 
+from apps.main.rate_limiter import Rate, rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,13 +56,12 @@ class AuthenticationRateLimiter:
             "EXEMPT_IPS": ["127.0.0.1", "localhost"],
         }
 
-    def _get_cache_key(self, identifier: str, tracking_type: str) -> str:
-        """Generate cache key for tracking"""
-        return f"rate_limit:{tracking_type}:{identifier}"
+    def _scope(self, tracking_type: str) -> str:
+        """Rate limiter scope for 'ip' or 'username' tracking"""
+        return f"auth:{tracking_type}"
 
-    def _get_lockout_key(self, identifier: str, tracking_type: str) -> str:
-        """Generate cache key for lockout status"""
-        return f"rate_limit:lockout:{tracking_type}:{identifier}"
+    def _rate(self) -> Rate:
+        return Rate(self.config["MAX_LOGIN_ATTEMPTS"], self.config["ATTEMPT_WINDOW"])
 
     def _is_exempt_ip(self, ip_address: str) -> bool:
         """Check if IP is exempt from rate limiting"""
@@ -109,35 +110,21 @@ class AuthenticationRateLimiter:
         Returns:
             Tuple of (is_allowed, error_message)
         """
-        # Check if currently locked out
-        lockout_key = self._get_lockout_key(identifier, tracking_type)
-        lockout_end = cache.get(lockout_key)
-
-        if lockout_end:
-            remaining = int(lockout_end - time.time())
-            if remaining > 0:
-                return (
-                    False,
-                    f"Too many failed attempts. Try again in {remaining // 60} minutes.",
-                )
-            else:
-                # Lockout expired, clear it
-                cache.delete(lockout_key)
-
-        # Check attempt count
-        cache_key = self._get_cache_key(identifier, tracking_type)
-        attempts = cache.get(cache_key, [])
-
-        # Remove old attempts outside window
-        current_time = time.time()
-        window_start = current_time - self.config["ATTEMPT_WINDOW"]
-        attempts = [ts for ts in attempts if ts > window_start]
+        # A check that finds the attempt budget exhausted starts the lockout
+        decision = rate_limiter.peek(
+            self._scope(tracking_type),
+            identifier,
+            [self._rate()],
+            lockout=self.config["LOCKOUT_DURATION"],
+        )
 
-        if len(attempts) >= self.config["MAX_LOGIN_ATTEMPTS"]:
-            # Trigger lockout
-            lockout_until = current_time + self.config["LOCKOUT_DURATION"]
-            cache.set(lockout_key, lockout_until, self.config["LOCKOUT_DURATION"])
+        if decision.state == "blocked":
+            return (
+                False,
+                f"Too many failed attempts. Try again in {decision.reset_seconds // 60} minutes.",
+            )
 
+        if decision.state == "locked":
             logger.warning(
                 f"Rate limit exceeded for {tracking_type}: {identifier}. "
                 f"Locked out for {self.config['LOCKOUT_DURATION']} seconds."
@@ -177,18 +164,9 @@ class AuthenticationRateLimiter:
         self, identifier: str, tracking_type: str, timestamp: float
     ) -> None:
         """Record attempt for specific identifier"""
-        cache_key = self._get_cache_key(identifier, tracking_type)
-        attempts = cache.get(cache_key, [])
-
-        # Remove old attempts
-        window_start = timestamp - self.config["ATTEMPT_WINDOW"]
-        attempts = [ts for ts in attempts if ts > window_start]
-
-        # Add new attempt
-        attempts.append(timestamp)
-
-        # Save with TTL equal to attempt window
-        cache.set(cache_key, attempts, self.config["ATTEMPT_WINDOW"])
+        rate_limiter.hit(
+            self._scope(tracking_type), identifier, [self._rate()], now=timestamp
+        )
 
     def reset_attempts(self, ip_address: str, username: Optional[str] = None) -> None:
         """
@@ -199,16 +177,10 @@ class AuthenticationRateLimiter:
             username: Username that succeeded (optional)
         """
         if self.config["ENABLE_IP_TRACKING"]:
-            cache_key = self._get_cache_key(ip_address, "ip")
-            cache.delete(cache_key)
-            lockout_key = self._get_lockout_key(ip_address, "ip")
-            cache.delete(lockout_key)
+            rate_limiter.reset(self._scope("ip"), ip_address)
 
         if username and self.config["ENABLE_USERNAME_TRACKING"]:
-            cache_key = self._get_cache_key(username, "username")
-            cache.delete(cache_key)
-            lockout_key = self._get_lockout_key(username, "username")
-            cache.delete(lockout_key)
+            rate_limiter.reset(self._scope("username"), username)
 
 
 class RateLimitMiddleware:
@@ -8,21 +8,62 @@ Provides API key-based authentication with:
 - Rate limiting per key
 - Usage tracking and analytics
 - Key expiration
+- Cached key verification with negative caching
+- Write-behind usage accounting (batched DB writes)
 """
 
+import atexit
 import hashlib
+import logging
 import secrets
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
-from django.db import models
+from django.db import models, transaction
+from django.db.models import DateTimeField, F, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import gettext_lazy as _
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+# Verified keys are cached briefly; unknown keys are negatively cached so
+# brute-force or misconfigured clients do not hit the database either.
+AUTH_CACHE_TIMEOUT = 60  # seconds
+NEGATIVE_CACHE_TIMEOUT = 30  # seconds
+_MISSING = "__missing__"
+
+RATE_LIMIT_WINDOW = 3600  # 1 hour
+USAGE_FLUSH_INTERVAL = 10  # seconds
+USAGE_FLUSH_SIZE = 200  # buffered usage rows
+USAGE_MAX_PENDING = 10000  # rows kept for retry while the database is down
+
+# Fields cached per verified key (JSON-safe primitives, no model instance)
+_CACHED_FIELDS = (
+    "id",
+    "user_id",
+    "name",
+    "key_prefix",
+    "permissions",
+    "is_active",
+    "rate_limit_per_hour",
+)
+
+
+def _auth_cache_key(key_hash: str) -> str:
+    return f"api_key_auth:{key_hash}"
+
+
+def _rate_limit_cache_key(key_hash: str) -> str:
+    return f"api_key_rate_limit:{key_hash}"
 
 
 class APIKeyManager(models.Manager):
@@ -33,15 +74,50 @@ class APIKeyManager(models.Manager):
     def get_from_key(self, key: str) -> Optional["APIKey"]:
         """
         Get API key object from raw key string
+
+        Verified keys are cached as a JSON-safe dict of their fields and
+        rebuilt into an instance on a hit (the user loads lazily by pk);
+        misses are cached as well so repeated invalid keys cost no queries.
         """
         # Hash the key
         key_hash = self._hash_key(key)
+        cache_key = _auth_cache_key(key_hash)
+
+        cached = cache.get(cache_key)
+        if cached == _MISSING:
+            return None
+        if isinstance(cached, dict):
+            return self._from_cached(key_hash, cached)
 
         try:
-            return self.get(key_hash=key_hash, is_active=True)
+            api_key = self.select_related("user").get(key_hash=key_hash, is_active=True)
         except APIKey.DoesNotExist:
+            cache.set(cache_key, _MISSING, NEGATIVE_CACHE_TIMEOUT)
             return None
 
+        cache.set(cache_key, self._to_cached(api_key), AUTH_CACHE_TIMEOUT)
+        return api_key
+
+    @staticmethod
+    def _to_cached(api_key: "APIKey") -> Dict[str, Any]:
+        data = {field: getattr(api_key, field) for field in _CACHED_FIELDS}
+        data["expires_at"] = (
+            api_key.expires_at.isoformat() if api_key.expires_at else None
+        )
+        return data
+
+    def _from_cached(self, key_hash: str, data: Dict[str, Any]) -> "APIKey":
+        fields = {field: data[field] for field in _CACHED_FIELDS}
+        expires_at = data.get("expires_at")
+        api_key = self.model(
+            key_hash=key_hash,
+            expires_at=parse_datetime(expires_at) if expires_at else None,
+            **fields,
+        )
+        api_key._state.adding = False
+        api_key._state.db = self.db
+        return api_key
+
     @staticmethod
     def _hash_key(key: str) -> str:
         """
@@ -172,6 +248,21 @@ class APIKey(models.Model):
     def __str__(self):
         return f"{self.name} ({self.key_prefix}...)"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.invalidate_auth_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.invalidate_auth_cache()
+        return result
+
+    def invalidate_auth_cache(self) -> None:
+        """
+        Drop the cached verification result for this key
+        """
+        cache.delete(_auth_cache_key(self.key_hash))
+
     @property
     def is_expired(self) -> bool:
         """
@@ -186,7 +277,7 @@ class APIKey(models.Model):
         Check if API key is within rate limit
         """
         # Use Redis cache for rate limiting
-        cache_key = f"api_key_rate_limit:{self.key_hash}"
+        cache_key = _rate_limit_cache_key(self.key_hash)
         current_count = cache.get(cache_key, 0)
 
         if current_count >= self.rate_limit_per_hour:
@@ -194,33 +285,34 @@ class APIKey(models.Model):
 
         return True
 
-    def record_usage(self, endpoint: str, ip_address: str) -> None:
+    def record_usage(self, endpoint: str, ip_address: str) -> int:
         """
         Record API key usage
+
+        The rate counter is bumped with an atomic cache INCR; usage_count,
+        last_used_at and APIKeyUsage rows are buffered and written in
+        batches by usage_buffer. Returns the request count in the window.
         """
-        # Update rate limit counter
-        cache_key = f"api_key_rate_limit:{self.key_hash}"
-        current_count = cache.get(cache_key, 0)
-        cache.set(cache_key, current_count + 1, timeout=3600)  # 1 hour
+        # Update rate limit counter (add() only initialises a missing key)
+        cache_key = _rate_limit_cache_key(self.key_hash)
+        cache.add(cache_key, 0, timeout=RATE_LIMIT_WINDOW)
+        try:
+            current_count = cache.incr(cache_key)
+        except ValueError:
+            # Key expired between add() and incr()
+            cache.set(cache_key, 1, timeout=RATE_LIMIT_WINDOW)
+            current_count = 1
 
-        # Update last used timestamp and usage count
         self.last_used_at = timezone.now()
-        self.usage_count += 1
-        self.save(update_fields=["last_used_at", "usage_count"])
-
-        # Log usage (optional - can be stored in separate model)
-        APIKeyUsage.objects.create(
-            api_key=self,
-            endpoint=endpoint,
-            ip_address=ip_address,
-        )
+        usage_buffer.record(self.pk, endpoint, ip_address, self.last_used_at)
+        return current_count
 
     def revoke(self) -> None:
         """
         Revoke API key
         """
         self.is_active = False
-        self.save(update_fields=["is_active"])
+        self.save(update_fields=["is_active"])  # save() invalidates the cache
 
     def has_permission(self, required_permission: str) -> bool:
         """
@@ -266,3 +358,115 @@ class APIKeyUsage(models.Model):
 
     def __str__(self):
         return f"{self.api_key.name} - {self.endpoint} at {self.timestamp}"
+
+
+class APIKeyUsageBuffer:
+    """
+    Write-behind buffer for API key usage accounting
+
+    Collects per-key usage counts and APIKeyUsage rows in process memory and
+    flushes them with one UPDATE per key and one bulk INSERT, either when the
+    buffer is full, when the flush interval elapsed, or at process exit.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = USAGE_FLUSH_INTERVAL,
+        flush_size: int = USAGE_FLUSH_SIZE,
+    ):
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._counts: Dict[int, int] = defaultdict(int)
+        self._last_used: Dict[int, datetime] = {}
+        self._rows: List[APIKeyUsage] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(
+        self, api_key_id: int, endpoint: str, ip_address: str, used_at: datetime
+    ) -> None:
+        """
+        Buffer one API request
+        """
+        with self._lock:
+            self._counts[api_key_id] += 1
+            self._last_used[api_key_id] = used_at
+            self._rows.append(
+                APIKeyUsage(
+                    api_key_id=api_key_id,
+                    endpoint=endpoint[:500],
+                    ip_address=ip_address,
+                    timestamp=used_at,
+                )
+            )
+            due = (
+                len(self._rows) >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if due:
+            self.flush()
+
+    def pending(self) -> int:
+        """
+        Number of buffered usage rows
+        """
+        return len(self._rows)
+
+    def flush(self) -> int:
+        """
+        Write buffered usage to the database, returning the rows written
+        """
+        with self._lock:
+            counts, self._counts = self._counts, defaultdict(int)
+            last_used, self._last_used = self._last_used, {}
+            rows, self._rows = self._rows, []
+            self._last_flush = time.monotonic()
+
+        if not rows:
+            return 0
+
+        try:
+            with transaction.atomic():
+                for api_key_id, count in counts.items():
+                    used_at = Value(last_used[api_key_id], output_field=DateTimeField())
+                    APIKey.objects.filter(pk=api_key_id).update(
+                        usage_count=F("usage_count") + count,
+                        # Coalesce first: Greatest() is NULL-propagating on SQLite
+                        last_used_at=Greatest(
+                            Coalesce("last_used_at", used_at), used_at
+                        ),
+                    )
+                APIKeyUsage.objects.bulk_create(rows, batch_size=500)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(rows)} API key usage rows: {e}")
+            self._requeue(counts, last_used, rows)
+            return 0
+
+        return len(rows)
+
+    def _requeue(
+        self,
+        counts: Dict[int, int],
+        last_used: Dict[int, datetime],
+        rows: List[APIKeyUsage],
+    ) -> None:
+        """
+        Put a failed batch back in front of newer usage, keeping at most
+        USAGE_MAX_PENDING rows (the oldest are dropped first)
+        """
+        with self._lock:
+            for api_key_id, count in counts.items():
+                self._counts[api_key_id] += count
+                newer = self._last_used.get(api_key_id)
+                if newer is None or newer < last_used[api_key_id]:
+                    self._last_used[api_key_id] = last_used[api_key_id]
+            self._rows = rows + self._rows
+            dropped = len(self._rows) - USAGE_MAX_PENDING
+            if dropped > 0:
+                del self._rows[:dropped]
+                logger.warning(f"Dropped {dropped} buffered API key usage rows")
+
+
+usage_buffer = APIKeyUsageBuffer()
+atexit.register(usage_buffer.flush)
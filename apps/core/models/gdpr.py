@@ -232,6 +232,15 @@ class DataExportRequest(models.Model):
     requested_at = models.DateTimeField(default=timezone.now)
     processed_at = models.DateTimeField(null=True, blank=True)
     error_message = models.TextField(blank=True)
+    progress = models.PositiveSmallIntegerField(
+        default=0, help_text="Export progress in percent"
+    )
+    rows_exported = models.BigIntegerField(
+        default=0, help_text="Records written to the export so far"
+    )
+    heartbeat_at = models.DateTimeField(
+        null=True, blank=True, help_text="Last progress write of the running export"
+    )
 
     class Meta:
         ordering = ["-requested_at"]
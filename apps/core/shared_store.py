@@ -0,0 +1,91 @@
+"""
+Shared State Backends
+=====================
+
+Backend selection for state that all worker processes share through a
+cache (rate limiter, search counters, Web Vitals aggregates).
+
+Each caller provides two implementations of its own operations: one for
+Redis and one for any Django cache. SharedStore picks one lazily from the
+cache alias named by a setting:
+
+- A django-redis cache gets the Redis implementation; when the Redis
+  client cannot be set up, the cache implementation is used on the same
+  alias
+- Any other cache gets the cache implementation
+- An operation that raises is retried on a private LocMemCache with the
+  cache implementation, so an outage degrades to per-process state
+  instead of failing the caller
+"""
+
+import logging
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+logger = logging.getLogger(__name__)
+
+
+class SharedStore:
+    """
+    Lazily selected Redis or cache backend plus a local fallback
+    """
+
+    def __init__(
+        self,
+        name: str,
+        alias_setting: str,
+        cache_backend: type,
+        redis_backend: type,
+        cache_alias: Optional[str] = None,
+        backend=None,
+        local_entries: int = 1000,
+    ):
+        self.name = name
+        self.alias_setting = alias_setting
+        self.cache_backend = cache_backend
+        self.redis_backend = redis_backend
+        self._cache_alias = cache_alias
+        self._backend = backend
+        self.local = cache_backend(
+            LocMemCache(name, {"OPTIONS": {"MAX_ENTRIES": local_entries}})
+        )
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            alias = self._cache_alias or getattr(
+                settings, self.alias_setting, "default"
+            )
+            cache_backend = settings.CACHES.get(alias, {}).get("BACKEND", "")
+            self._backend = self.cache_backend(caches[alias])
+            if "django_redis" in cache_backend:
+                try:
+                    self._backend = self.redis_backend(alias)
+                except Exception as e:
+                    logger.warning(f"Redis {self.name} store unavailable: {e}")
+        return self._backend
+
+    def call(self, operation: str, *args) -> Any:
+        """Run ``operation`` on the shared backend, or locally if it fails"""
+        try:
+            return getattr(self.backend, operation)(*args)
+        except Exception as e:
+            logger.warning(f"{self.name} backend error, using local state: {e}")
+            return getattr(self.local, operation)(*args)
+
+    def flush(self) -> None:
+        """Write out values batched by cache implementations"""
+        for backend in (self.backend, self.local):
+            if isinstance(backend, self.cache_backend):
+                backend.flush()
+
+    def reset(self, *args) -> None:
+        """Run ``reset`` on both the shared backend and the local fallback"""
+        try:
+            self.backend.reset(*args)
+        except Exception as e:
+            logger.warning(f"{self.name} reset failed: {e}")
+        self.local.reset(*args)
@@ -12,18 +12,21 @@ Views for GDPR compliance features:
 
 import json
 import logging
+import os
+import re
 import secrets
 from datetime import datetime, timedelta
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.mail import send_mail
-from django.http import FileResponse, HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
+from django.utils.http import http_date, parse_http_date_safe
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods, require_POST
 
+from apps.core.gdpr_export import data_export_worker
 from apps.core.middleware.gdpr_compliance import (
     clear_consent_cookie,
     invalidate_privacy_preferences_cache,
@@ -35,9 +38,13 @@ from apps.core.models.gdpr import (
     DataExportRequest,
     PrivacyPreferences,
 )
+from apps.main.mail_outbox import queue_mail
 
 logger = logging.getLogger(__name__)
 
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 # ============================================================================
 # Cookie Consent Views
@@ -223,8 +230,8 @@ def request_data_export(request):
             include_categories=include_categories,
         )
 
-        # Queue export job (async processing)
-        # export_user_data_task.delay(export_request.id)
+        # Queue export job (streamed to disk by the export worker pool)
+        data_export_worker.submit(export_request.id)
 
         logger.info(
             f"Data export requested by user {request.user.username}: "
@@ -262,6 +269,8 @@ def data_export_status(request, request_id):
             "request_id": str(export_request.id),
             "status": export_request.status,
             "requested_at": export_request.requested_at.isoformat(),
+            "progress": export_request.progress,
+            "rows_exported": export_request.rows_exported,
         }
 
         if export_request.status == "completed":
@@ -312,19 +321,16 @@ def download_data_export(request, request_id):
             )
 
         # Serve file
-        import os
-
         if not os.path.exists(export_request.file_path):
             return JsonResponse(
                 {"success": False, "error": "Export file not found"}, status=404
             )
 
-        response = FileResponse(
-            open(export_request.file_path, "rb"),
-            content_type="application/octet-stream",
-        )
-        response["Content-Disposition"] = (
-            f'attachment; filename="data_export_{request_id}.{export_request.export_format}"'
+        response = _ranged_file_response(
+            request,
+            export_request.file_path,
+            content_type="application/zip",
+            filename=f"data_export_{request_id}.zip",
         )
 
         logger.info(f"Data export downloaded: {request_id}")
@@ -483,6 +489,63 @@ def cancel_data_deletion(request, request_id):
 # ============================================================================
 
 
+def _ranged_file_response(request, path, content_type, filename):
+    """
+    Stream a file with HTTP Range support so large downloads can resume.
+
+    Honors a single ``bytes=start-end`` range (and If-Range); anything else
+    falls back to the full file.
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = f'"{int(stat.st_mtime)}-{size}"'
+    last_modified = http_date(stat.st_mtime)
+    start, end = 0, size - 1
+    status = 200
+
+    range_header = request.META.get("HTTP_RANGE", "")
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range and if_range != etag:
+        if_range_date = parse_http_date_safe(if_range)
+        if if_range_date is None or if_range_date < int(stat.st_mtime):
+            range_header = ""
+
+    match = RANGE_RE.match(range_header.strip())
+    if match and any(match.groups()):
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            start = max(size - int(last), 0)
+        if start > end or start >= size:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        status = 206
+
+    def stream():
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    response = StreamingHttpResponse(stream(), content_type=content_type, status=status)
+    response["Content-Length"] = str(end - start + 1)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if status == 206:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
+
+
 def _log_consent(request, consent_type, categories, consented=True):
     """Log consent to database."""
     try:
@@ -526,12 +589,11 @@ If you did not request this deletion, please ignore this email.
 Request ID: {request_id}
 """
 
-        send_mail(
+        queue_mail(
             subject,
             message,
             settings.DEFAULT_FROM_EMAIL,
             [email],
-            fail_silently=False,
         )
     except Exception as e:
         logger.error(f"Failed to send deletion verification email: {e}")
@@ -6,4 +6,6 @@ class MainConfig(AppConfig):
     name = "apps.main"
 
     def ready(self):
-        pass
+        from apps.main.feed_cache import connect_signals
+
+        connect_signals()
@@ -0,0 +1,278 @@
+"""
+Pre-rendered Feeds
+==================
+
+RSS feeds rendered once per content change instead of on every poll.
+
+- The rendered feed is stored under one key per feed and origin
+  (``feeds:{name}:{scheme}:{host}``) as a JSON-safe dict: text content, a
+  content ETag and a Last-Modified taken from the newest item
+- If-None-Match / If-Modified-Since are answered with 304 from the stored
+  validators, without touching the database
+- Saving or deleting a model a feed depends on re-renders only the feeds
+  built from that model, once the transaction commits; a per-feed origin
+  index lets any process drop the renderings of every origin
+- A feed with items that become visible later (scheduled posts) expires
+  when the next one is due
+"""
+
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "feeds"
+
+Origin = Tuple[str, str]  # (scheme, host)
+
+
+@dataclass
+class RenderedFeed:
+    """Feed bytes and their validators"""
+
+    content: bytes
+    content_type: str
+    etag: str
+    last_modified: Optional[int]  # epoch seconds of the newest item
+
+    def to_dict(self) -> Dict:
+        """JSON-safe form stored in the cache (feeds are UTF-8 text)"""
+        return {
+            "content": self.content.decode("utf-8"),
+            "content_type": self.content_type,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RenderedFeed":
+        return cls(
+            content=data["content"].encode("utf-8"),
+            content_type=data["content_type"],
+            etag=data["etag"],
+            last_modified=data["last_modified"],
+        )
+
+
+class _OriginRequest(HttpRequest):
+    """Bare request for re-rendering a feed outside of a request cycle"""
+
+    def __init__(self, scheme: str, host: str):
+        super().__init__()
+        self._scheme = scheme
+        self.META["HTTP_HOST"] = host
+        self.path = self.path_info = "/"
+
+    def _get_scheme(self):
+        return self._scheme
+
+
+class PrerenderedFeed(Feed):
+    """
+    Feed served from the feed store
+
+    Subclasses set ``name`` (store key) and ``depends_on`` (models whose
+    changes re-render the feed).
+    """
+
+    name: str = ""
+    depends_on: Tuple = ()
+
+    def __call__(self, request, *args, **kwargs):
+        return feed_store.serve(self, request)
+
+    def next_change(self) -> Optional[datetime]:
+        """
+        When the items change without a model signal (e.g. a scheduled
+        post going live), or None
+        """
+        return None
+
+
+class FeedStore:
+    """
+    Rendered feeds in the FEED_CACHE_ALIAS cache, one entry per feed and
+    origin plus an index of the origins rendered for each feed
+    """
+
+    def __init__(self):
+        self._feeds: Dict[str, PrerenderedFeed] = {}
+        # Origins rendered by this process, re-rendered on content changes
+        self._origins: Dict[str, Set[Origin]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "not_modified": 0, "renders": 0}
+
+    @property
+    def store(self):
+        return caches[getattr(settings, "FEED_CACHE_ALIAS", "default")]
+
+    @staticmethod
+    def key(name: str, origin: Origin) -> str:
+        scheme, host = origin
+        return f"{KEY_PREFIX}:{name}:{scheme}:{host}"
+
+    @staticmethod
+    def index_key(name: str) -> str:
+        """Key listing the origins rendered for a feed, by any process"""
+        return f"{KEY_PREFIX}:{name}:origins"
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def register(self, feed: PrerenderedFeed) -> None:
+        self._feeds[feed.name] = feed
+
+    def models(self) -> Set:
+        return {model for feed in self._feeds.values() for model in feed.depends_on}
+
+    def feeds_for(self, model) -> List[str]:
+        """Names of the feeds built from ``model``"""
+        return [name for name, feed in self._feeds.items() if model in feed.depends_on]
+
+    def get(self, name: str, origin: Origin) -> Optional[RenderedFeed]:
+        try:
+            data = self.store.get(self.key(name, origin))
+            return RenderedFeed.from_dict(data) if data else None
+        except Exception as e:
+            logger.warning(f"Feed cache read failed for {name}: {e}")
+            return None
+
+    def render(self, feed: PrerenderedFeed, request) -> RenderedFeed:
+        """Render ``feed`` for the request's origin and store it"""
+        feedgen = feed.get_feed(feed.get_object(request), request)
+        content = feedgen.writeString("utf-8").encode("utf-8")
+        latest = feedgen.latest_post_date()
+        rendered = RenderedFeed(
+            content=content,
+            content_type=feedgen.content_type,
+            etag='"%s"' % hashlib.sha256(content).hexdigest()[:32],
+            last_modified=int(latest.timestamp()) if latest else None,
+        )
+
+        origin = (request.scheme, request.get_host())
+        timeout = getattr(settings, "FEED_CACHE_TIMEOUT", 3600)
+        next_change = feed.next_change()
+        if next_change is not None:
+            due = (next_change - timezone.now()).total_seconds()
+            timeout = max(1, min(timeout, int(due) + 1))
+
+        try:
+            self.store.set(self.key(feed.name, origin), rendered.to_dict(), timeout)
+            index_key = self.index_key(feed.name)
+            origins = self.store.get(index_key) or []
+            if list(origin) not in origins:
+                self.store.set(index_key, origins + [list(origin)], None)
+        except Exception as e:
+            logger.warning(f"Feed cache write failed for {feed.name}: {e}")
+
+        with self._lock:
+            self._origins[feed.name].add(origin)
+            self._stats["renders"] += 1
+        return rendered
+
+    def serve(self, feed: PrerenderedFeed, request) -> HttpResponse:
+        """
+        Stored rendering (rendered on a miss), or 304 when the client's
+        validators still match
+        """
+        rendered = self.get(feed.name, (request.scheme, request.get_host()))
+        if rendered is None:
+            rendered = self.render(feed, request)
+        else:
+            self._count("hits")
+
+        response = get_conditional_response(
+            request, etag=rendered.etag, last_modified=rendered.last_modified
+        )
+        if response is not None:
+            self._count("not_modified")
+        else:
+            response = HttpResponse(
+                rendered.content, content_type=rendered.content_type
+            )
+
+        response["ETag"] = rendered.etag
+        if rendered.last_modified is not None:
+            response["Last-Modified"] = http_date(rendered.last_modified)
+        return response
+
+    def regenerate(self, names: Iterable[str]) -> int:
+        """
+        Drop the stored renderings of ``names`` and re-render the origins
+        this process has served; returns the number of renderings
+        """
+        rendered = 0
+        for name in names:
+            self._delete(name)
+
+            feed = self._feeds.get(name)
+            with self._lock:
+                origins = list(self._origins[name])
+            for scheme, host in origins:
+                try:
+                    self.render(feed, _OriginRequest(scheme, host))
+                    rendered += 1
+                except Exception as e:
+                    logger.error(f"Failed to re-render feed {name} for {host}: {e}")
+        return rendered
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "feeds": sorted(self._feeds)}
+
+    def _delete(self, name: str) -> None:
+        """Drop the renderings of every origin of one feed"""
+        with self._lock:
+            origins = {tuple(origin) for origin in self._origins[name]}
+        try:
+            origins.update(tuple(o) for o in self.store.get(self.index_key(name)) or [])
+            self.store.delete_many([self.key(name, origin) for origin in origins])
+        except Exception as e:
+            logger.warning(f"Feed cache delete failed for {name}: {e}")
+
+    def clear(self) -> None:
+        for name in self._feeds:
+            self._delete(name)
+            self.store.delete(self.index_key(name))
+        with self._lock:
+            self._origins.clear()
+            for stat in self._stats:
+                self._stats[stat] = 0
+
+
+def _content_changed(sender, **kwargs):
+    names = feed_store.feeds_for(sender)
+    if names:
+        transaction.on_commit(lambda: feed_store.regenerate(names))
+
+
+def connect_signals():
+    """
+    Re-render feeds when the models they are built from change
+    """
+    from . import feeds  # noqa: F401  (registers the site feeds)
+
+    for model in feed_store.models():
+        uid = f"feed_store:{model._meta.label}"
+        post_save.connect(_content_changed, sender=model, dispatch_uid=uid)
+        post_delete.connect(_content_changed, sender=model, dispatch_uid=uid)
+
+
+# Global store used by the site feeds
+feed_store = FeedStore()
@@ -1,19 +1,51 @@
-from django.contrib.syndication.views import Feed
+from functools import lru_cache
+
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.feedgenerator import Rss201rev2Feed
 from django.utils.html import strip_tags
 
 from apps.blog.models import Post
+from apps.tools.models import Tool
+
+from .feed_cache import PrerenderedFeed, feed_store
 
-from .models import Project
 
+@lru_cache(maxsize=256)
+def _plain_summary(content: str) -> str:
+    # Strip HTML tags and get plain text for RSS
+    plain_text = strip_tags(content)
+    return plain_text[:200] + "..." if len(plain_text) > 200 else plain_text
 
-class LatestPostsFeed(Feed):
+
+def post_summary(post) -> str:
+    """
+    Excerpt if available, otherwise the first 200 chars of plain content
+    """
+    if post.excerpt:
+        return post.excerpt
+    elif post.content:
+        return _plain_summary(post.content)
+    return "Blog yazısı"
+
+
+def next_scheduled_post():
+    """Publish time of the next scheduled post, or None"""
+    return (
+        Post.objects.filter(status="published", published_at__gt=timezone.now())
+        .order_by("published_at")
+        .values_list("published_at", flat=True)
+        .first()
+    )
+
+
+class LatestPostsFeed(PrerenderedFeed):
     """
     RSS feed for latest blog posts
     """
 
+    name = "posts"
+    depends_on = (Post,)
     title = "Portfolio Blog"
     link = "/blog/"
     description = "En son blog yazıları ve güncellemeler"
@@ -24,18 +56,14 @@ class LatestPostsFeed(Feed):
             status="published", published_at__lte=timezone.now()
         ).order_by("-published_at")[:20]
 
+    def next_change(self):
+        return next_scheduled_post()
+
     def item_title(self, item):
         return item.title
 
     def item_description(self, item):
-        # Return excerpt if available, otherwise first 200 chars of content
-        if item.excerpt:
-            return item.excerpt
-        elif item.content:
-            # Strip HTML tags and get plain text for RSS
-            plain_text = strip_tags(item.content)
-            return plain_text[:200] + "..." if len(plain_text) > 200 else plain_text
-        return "Blog yazısı"
+        return post_summary(item)
 
     def item_pubdate(self, item):
         return item.published_at
@@ -52,30 +80,28 @@ class LatestPostsFeed(Feed):
         return []
 
 
-class LatestProjectsFeed(Feed):
+class LatestProjectsFeed(PrerenderedFeed):
     """
     RSS feed for latest projects
     """
 
+    name = "projects"
+    depends_on = (Tool,)
     title = "Portfolio Projects"
     link = "/projects/"
     description = "En son projeler ve güncellemeler"
     feed_type = Rss201rev2Feed
 
     def items(self):
-        return Project.objects.filter(is_visible=True).order_by("-updated_at")[:10]
+        return Tool.objects.filter(is_visible=True).order_by("-updated_at")[:10]
 
     def item_title(self, item):
-        return f"{item.title} - {item.get_status_display()}"
+        return f"{item.title} - {item.get_category_display()}"
 
     def item_description(self, item):
         description = item.description
-        if item.tech_stack:
-            tech_list = ", ".join(item.tech_stack)
-            description += f"\n\nKullanılan teknolojiler: {tech_list}"
-
-        if item.progress_percentage:
-            description += f"\n\nİlerleme: %{item.progress_percentage}"
+        if item.tags:
+            description += f"\n\nEtiketler: {', '.join(item.tags)}"
 
         return description
 
@@ -89,17 +115,19 @@ class LatestProjectsFeed(Feed):
         return f"project-{item.id}-{item.slug}"
 
     def item_categories(self, item):
-        categories = [item.get_status_display()]
-        if item.tech_stack:
-            categories.extend(item.tech_stack)
+        categories = [item.get_category_display()]
+        if item.tags:
+            categories.extend(item.tags)
         return categories
 
 
-class CombinedFeed(Feed):
+class CombinedFeed(PrerenderedFeed):
     """
     Combined RSS feed for both blog posts and projects
     """
 
+    name = "combined"
+    depends_on = (Post, Tool)
     title = "Portfolio - Blog & Projects"
     link = "/"
     description = "Blog yazıları ve projeler - tam güncelleme akışı"
@@ -111,9 +139,9 @@ class CombinedFeed(Feed):
             status="published", published_at__lte=timezone.now()
         ).order_by("-published_at")[:10]
 
-        recent_projects = Project.objects.filter(is_visible=True).order_by(
-            "-updated_at"
-        )[:5]
+        recent_projects = Tool.objects.filter(is_visible=True).order_by("-updated_at")[
+            :5
+        ]
 
         # Combine and sort by date
         items = []
@@ -125,9 +153,7 @@ class CombinedFeed(Feed):
                     "object": post,
                     "date": post.published_at,
                     "title": post.title,
-                    "description": (
-                        post.excerpt if post.excerpt else post.content[:200] + "..."
-                    ),
+                    "description": post_summary(post),
                     "link": reverse("blog:detail", args=[post.slug]),
                     "guid": f"post-{post.id}",
                     "categories": (
@@ -142,12 +168,12 @@ class CombinedFeed(Feed):
                     "type": "project",
                     "object": project,
                     "date": project.updated_at,
-                    "title": f"[Proje] {project.title} - {project.get_status_display()}",
+                    "title": f"[Proje] {project.title} - {project.get_category_display()}",
                     "description": project.description,
                     "link": reverse("main:project_detail", args=[project.slug]),
                     "guid": f"project-{project.id}",
-                    "categories": [project.get_status_display()]
-                    + (project.tech_stack if project.tech_stack else []),
+                    "categories": [project.get_category_display()]
+                    + (project.tags if project.tags else []),
                 }
             )
 
@@ -155,6 +181,9 @@ class CombinedFeed(Feed):
         items.sort(key=lambda x: x["date"], reverse=True)
         return items[:15]
 
+    def next_change(self):
+        return next_scheduled_post()
+
     def item_title(self, item):
         return item["title"]
 
@@ -172,3 +201,8 @@ class CombinedFeed(Feed):
 
     def item_categories(self, item):
         return item["categories"]
+
+
+feed_store.register(LatestPostsFeed())
+feed_store.register(LatestProjectsFeed())
+feed_store.register(CombinedFeed())
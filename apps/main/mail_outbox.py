@@ -0,0 +1,363 @@
+"""
+Mail Outbox
+===========
+
+Central queue for outbound email. Callers persist messages with
+``queue_mail`` (one OutboundEmail row per recipient) and return
+immediately; delivery happens off the request path:
+
+- A background sender thread, woken when the enqueueing transaction
+  commits, drains due rows in batches over one reused mail connection
+- Failed deliveries are retried with exponential backoff until
+  MAIL_OUTBOX_MAX_ATTEMPTS is reached
+- Identical messages to the same recipient within MAIL_OUTBOX_DEDUP_WINDOW
+  are queued once, which collapses alert storms
+- Rows are claimed with a conditional UPDATE, so several processes (or the
+  ``send_outbox`` management command) can drain the same table
+- Sent rows are deleted after MAIL_OUTBOX_RETENTION_DAYS
+
+Alerts use ``queue_mail_or_send``, which falls back to a direct
+``send_mail`` when the queue itself (i.e. the database) is unavailable.
+"""
+
+import hashlib
+import logging
+import smtplib
+import threading
+import time
+from datetime import timedelta
+from typing import List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
+from django.db import connection as db_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF = 30  # seconds, doubled per failed attempt
+DEDUP_WINDOW = 600  # seconds
+POLL_INTERVAL = 30  # seconds between sweeps for retries
+STALE_CLAIM = timedelta(minutes=10)
+RETENTION_DAYS = 7
+PRUNE_INTERVAL = 3600  # seconds between prunes by the sender thread
+
+# Errors after which the SMTP session cannot be reused (SMTPException is an
+# OSError subclass, so OSError would also match recipient refusals)
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError)
+
+
+def dedup_key(recipient: str, subject: str, body: str) -> str:
+    """Stable fingerprint of one message to one recipient"""
+    return hashlib.sha256(
+        "\x00".join((recipient.lower(), subject, body)).encode("utf-8")
+    ).hexdigest()
+
+
+class MailOutbox:
+    """
+    Persistent outbound mail queue with a batching sender
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        dedup_window: Optional[float] = None,
+        backend: Optional[str] = None,
+    ):
+        self.batch_size = batch_size or getattr(
+            settings, "MAIL_OUTBOX_BATCH_SIZE", BATCH_SIZE
+        )
+        self.max_attempts = max_attempts or getattr(
+            settings, "MAIL_OUTBOX_MAX_ATTEMPTS", MAX_ATTEMPTS
+        )
+        self.retry_backoff = retry_backoff or getattr(
+            settings, "MAIL_OUTBOX_RETRY_BACKOFF", RETRY_BACKOFF
+        )
+        self.dedup_window = (
+            dedup_window
+            if dedup_window is not None
+            else getattr(settings, "MAIL_OUTBOX_DEDUP_WINDOW", DEDUP_WINDOW)
+        )
+        self.backend = backend
+        self._last_prune = 0.0
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        subject: str,
+        message: str,
+        recipient_list: Sequence[str],
+        from_email: Optional[str] = None,
+        html_message: Optional[str] = None,
+    ) -> int:
+        """
+        Queue one message per recipient; returns the number of rows queued
+        """
+        from apps.main.models import OutboundEmail
+
+        from_email = from_email or settings.DEFAULT_FROM_EMAIL
+        subject = " ".join(subject.split())[:255]
+        keys = {}
+        for recipient in recipient_list:
+            if recipient and recipient.lower() not in keys:
+                keys[recipient.lower()] = (
+                    recipient,
+                    dedup_key(recipient, subject, message),
+                )
+
+        now = timezone.now()
+        recent = set()
+        if self.dedup_window:
+            recent = set(
+                OutboundEmail.objects.filter(
+                    dedup_key__in=[key for _, key in keys.values()],
+                    created_at__gte=now - timedelta(seconds=self.dedup_window),
+                )
+                .exclude(status="failed")
+                .values_list("dedup_key", flat=True)
+            )
+
+        rows = [
+            OutboundEmail(
+                subject=subject,
+                body=message,
+                html_body=html_message or "",
+                from_email=from_email,
+                recipient=recipient,
+                dedup_key=key,
+                created_at=now,
+                next_attempt_at=now,
+            )
+            for recipient, key in keys.values()
+            if key not in recent
+        ]
+        if rows:
+            OutboundEmail.objects.bulk_create(rows)
+            transaction.on_commit(self.wake)
+        return len(rows)
+
+    def wake(self) -> None:
+        """Start the sender thread if needed and let it drain the queue"""
+        if not getattr(settings, "MAIL_OUTBOX_AUTOSTART", True):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="mail-outbox", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Sender side
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        poll_interval = getattr(settings, "MAIL_OUTBOX_POLL_INTERVAL", POLL_INTERVAL)
+        while True:
+            self._wakeup.wait(poll_interval)
+            self._wakeup.clear()
+            try:
+                self.drain()
+                if time.monotonic() - self._last_prune >= PRUNE_INTERVAL:
+                    self.prune()
+            except Exception as e:
+                logger.error(f"Mail outbox sweep failed: {e}")
+            finally:
+                # The sender thread owns its DB connection
+                db_connection.close()
+
+    def drain(self) -> int:
+        """Send batches until nothing is due; returns messages processed"""
+        total = 0
+        while True:
+            processed = self.send_pending()
+            total += processed
+            if processed < self.batch_size:
+                return total
+
+    def send_pending(self, limit: Optional[int] = None) -> int:
+        """Claim and send one batch of due messages"""
+        rows = self._claim(limit or self.batch_size)
+        if not rows:
+            return 0
+
+        sent, failed = self._deliver(rows)
+        self._record(sent, failed)
+        return len(rows)
+
+    def prune(self, days: Optional[int] = None) -> int:
+        """Delete sent messages older than the retention period"""
+        from apps.main.models import OutboundEmail
+
+        days = days or getattr(settings, "MAIL_OUTBOX_RETENTION_DAYS", RETENTION_DAYS)
+        self._last_prune = time.monotonic()
+        deleted, _ = OutboundEmail.objects.filter(
+            status="sent", sent_at__lt=timezone.now() - timedelta(days=days)
+        ).delete()
+        return deleted
+
+    def _claim(self, limit: int) -> List:
+        from apps.main.models import OutboundEmail
+
+        now = timezone.now()
+        due = Q(status="pending", next_attempt_at__lte=now) | Q(
+            status="sending", claimed_at__lt=now - STALE_CLAIM
+        )
+        ids = list(
+            OutboundEmail.objects.filter(due)
+            .order_by("next_attempt_at", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+
+        OutboundEmail.objects.filter(due, id__in=ids).update(
+            status="sending", claimed_at=now
+        )
+        return list(
+            OutboundEmail.objects.filter(
+                id__in=ids, status="sending", claimed_at=now
+            ).order_by("id")
+        )
+
+    def _deliver(self, rows) -> Tuple[List[int], List[Tuple[object, str]]]:
+        sent: List[int] = []
+        failed: List[Tuple[object, str]] = []
+
+        connection = get_connection(self.backend, fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            logger.warning(f"Mail outbox could not connect: {e}")
+            return sent, [(row, str(e)) for row in rows]
+
+        try:
+            for row in rows:
+                message = EmailMultiAlternatives(
+                    row.subject,
+                    row.body,
+                    row.from_email,
+                    [row.recipient],
+                    connection=connection,
+                )
+                if row.html_body:
+                    message.attach_alternative(row.html_body, "text/html")
+
+                try:
+                    connection.send_messages([message])
+                except Exception as e:
+                    failed.append((row, str(e)))
+                    if isinstance(e, RECONNECT_ERRORS):
+                        connection.close()
+                        try:
+                            connection.open()
+                        except Exception:
+                            pass
+                else:
+                    sent.append(row.id)
+        finally:
+            connection.close()
+
+        return sent, failed
+
+    def _record(self, sent: List[int], failed: List[Tuple[object, str]]) -> None:
+        from apps.main.models import OutboundEmail
+
+        now = timezone.now()
+        if sent:
+            OutboundEmail.objects.filter(id__in=sent).update(
+                status="sent",
+                sent_at=now,
+                attempts=F("attempts") + 1,
+                last_error="",
+                claimed_at=None,
+            )
+
+        for row, error in failed:
+            attempts = row.attempts + 1
+            gave_up = attempts >= self.max_attempts
+            OutboundEmail.objects.filter(id=row.id).update(
+                status="failed" if gave_up else "pending",
+                attempts=attempts,
+                last_error=error[:1000],
+                next_attempt_at=now
+                + timedelta(seconds=self.retry_backoff * 2 ** (attempts - 1)),
+                claimed_at=None,
+            )
+            if gave_up:
+                logger.error(
+                    f"Giving up on email {row.id} to {row.recipient} "
+                    f"after {attempts} attempts: {error}"
+                )
+
+        if failed:
+            logger.warning(f"Mail outbox: {len(sent)} sent, {len(failed)} deferred")
+
+
+# Global outbox used by views, alerting and the send_outbox command
+mail_outbox = MailOutbox()
+
+
+def queue_mail(
+    subject: str,
+    message: str,
+    from_email: Optional[str],
+    recipient_list: Sequence[str],
+    html_message: Optional[str] = None,
+) -> int:
+    """
+    Drop-in replacement for ``send_mail`` that queues instead of sending
+    """
+    return mail_outbox.enqueue(
+        subject,
+        message,
+        recipient_list,
+        from_email=from_email,
+        html_message=html_message,
+    )
+
+
+def queue_mail_or_send(
+    subject: str,
+    message: str,
+    from_email: Optional[str],
+    recipient_list: Sequence[str],
+    html_message: Optional[str] = None,
+) -> int:
+    """
+    ``queue_mail`` for alerts: sends directly when the queue is unavailable
+
+    Alerts about a failing database must not depend on that database.
+    """
+    try:
+        return queue_mail(
+            subject,
+            message,
+            from_email,
+            recipient_list,
+            html_message=html_message,
+        )
+    except Exception as e:
+        logger.warning(f"Mail outbox unavailable, sending directly: {e}")
+
+    return send_mail(
+        subject,
+        message,
+        from_email,
+        recipient_list,
+        html_message=html_message,
+    )
@@ -0,0 +1,46 @@
+"""
+Management command to enforce search telemetry retention.
+
+Usage:
+    python manage.py prune_search_logs
+    python manage.py prune_search_logs --days 14 --stats-days 180
+
+Deletes raw SearchLog rows (which hold IP addresses and user agents) older
+than SEARCH_LOG_RETENTION_DAYS and SearchQueryStat rollups older than
+SEARCH_STATS_RETENTION_DAYS. Run it daily from cron.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.main.search.analytics import search_telemetry
+
+
+class Command(BaseCommand):
+    help = "Delete search logs and rollups past their retention period"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Keep raw search logs for this many days",
+        )
+        parser.add_argument(
+            "--stats-days",
+            type=int,
+            default=None,
+            help="Keep per-day query rollups for this many days",
+        )
+
+    def handle(self, *args, **options):
+        search_telemetry.flush()
+        deleted = search_telemetry.prune(
+            log_days=options["days"], stats_days=options["stats_days"]
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted['search_logs']} search logs and "
+                f"{deleted['query_stats']} query rollups"
+            )
+        )
@@ -0,0 +1,46 @@
+"""
+Management command to deliver queued outbound email.
+
+Usage:
+    python manage.py send_outbox --limit 500
+
+Drains OutboundEmail rows that are due (new messages and retries whose
+backoff has elapsed) over one reused mail connection per batch, then
+deletes sent rows older than MAIL_OUTBOX_RETENTION_DAYS. Useful from cron
+when the in-process sender thread is disabled with
+MAIL_OUTBOX_AUTOSTART = False.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.main.mail_outbox import mail_outbox
+
+
+class Command(BaseCommand):
+    help = "Send queued outbound email"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of messages to process",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options["limit"]:
+            processed = mail_outbox.send_pending(limit=options["limit"])
+        else:
+            processed = mail_outbox.drain()
+        elapsed = time.perf_counter() - start
+        pruned = mail_outbox.prune()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {processed} queued emails in {elapsed:.2f}s, "
+                f"pruned {pruned} sent emails"
+            )
+        )
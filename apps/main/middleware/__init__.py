@@ -11,6 +11,7 @@ from .cache_security import (
     PerformanceMiddleware,
     SecurityHeadersMiddleware,
 )
+from .fast_path import RouteClassMiddleware, route_aware
 from .static_optimization_middleware import StaticOptimizationMiddleware
 
 __all__ = [
@@ -21,4 +22,6 @@ __all__ = [
     "SecurityHeadersMiddleware",
     "CompressionMiddleware",
     "PerformanceMiddleware",
+    "RouteClassMiddleware",
+    "route_aware",
 ]
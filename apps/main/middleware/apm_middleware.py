@@ -2,18 +2,24 @@
 APM (Application Performance Monitoring) Middleware
 
 Provides transaction tracking and database query monitoring for performance analysis.
+Query monitoring is production-safe; see apps.main.query_profiler.
 """
 
 import logging
 import time
+from contextlib import ExitStack
 
 from django.conf import settings
-from django.db import connection
+from django.db import connections
 from django.utils.deprecation import MiddlewareMixin
 
+from apps.main.middleware.fast_path import route_aware
+from apps.main.query_profiler import query_profiler
+
 logger = logging.getLogger("apm")
 
 
+@route_aware("apm")
 class APMMiddleware(MiddlewareMixin):
     """
     APM transaction tracking middleware.
@@ -72,65 +78,68 @@ class APMMiddleware(MiddlewareMixin):
         return response
 
 
-class DatabaseQueryTrackingMiddleware(MiddlewareMixin):
+@route_aware("apm")
+class DatabaseQueryTrackingMiddleware:
     """
     Database query tracking middleware.
 
-    Monitors database queries per request and logs slow queries
-    based on PERFORMANCE_BUDGETS configuration.
+    Wraps every database connection with the query profiler for the
+    duration of the request (``connection.execute_wrapper``, so it also
+    works with DEBUG=False), adds query metrics headers, logs slow queries,
+    high query counts and repeated-query (N+1) patterns, and feeds the
+    per-endpoint aggregates shown on the performance dashboard.
     """
 
-    def process_request(self, request):
-        """Reset query tracking"""
-        # Store initial query count
-        request._db_query_start_count = len(connection.queries)
-        return None
+    def __init__(self, get_response):
+        self.get_response = get_response
 
-    def process_response(self, request, response):
-        """Track database queries and log if needed"""
-        if not hasattr(request, "_db_query_start_count"):
-            return response
+    def __call__(self, request):
+        recorder = query_profiler.recorder()
 
-        # Calculate queries executed in this request
-        queries = connection.queries[request._db_query_start_count :]
-        query_count = len(queries)
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(recorder))
+            response = self.get_response(request)
 
-        # Calculate total query time
-        total_query_time = sum(float(q.get("time", 0)) for q in queries)
-
-        # Get performance budgets from settings
-        perf_budgets = getattr(settings, "PERFORMANCE_BUDGETS", {})
-        db_threshold = perf_budgets.get("DATABASE_QUERY_THRESHOLD", 0.1)
+        endpoint = self._endpoint_name(request)
+        repeated = query_profiler.record(endpoint, recorder)
 
         # Add query metrics to response headers
-        response["X-DB-Query-Count"] = str(query_count)
-        response["X-DB-Query-Time"] = f"{total_query_time:.3f}s"
+        response["X-DB-Query-Count"] = str(recorder.count)
+        response["X-DB-Query-Time"] = f"{recorder.total_time:.3f}s"
 
         # Log excessive query count
-        if query_count > 50:
+        if recorder.count > 50:
             logger.warning(
                 f"High query count: {request.method} {request.path} "
-                f"executed {query_count} queries",
+                f"executed {recorder.count} queries",
                 extra={
                     "path": request.path,
                     "method": request.method,
-                    "query_count": query_count,
-                    "total_time": total_query_time,
+                    "query_count": recorder.count,
+                    "total_time": recorder.total_time,
                 },
             )
 
-        # Log slow queries
-        slow_queries = [q for q in queries if float(q.get("time", 0)) > db_threshold]
-        if slow_queries:
-            for query in slow_queries:
-                query_time = float(query.get("time", 0))
-                logger.warning(
-                    f'Slow database query ({query_time:.3f}s): {query.get("sql", "")[:100]}...',
-                    extra={
-                        "query_time": query_time,
-                        "threshold": db_threshold,
-                        "sql": query.get("sql", "")[:500],
-                    },
-                )
+        # Log repeated identical queries (likely N+1)
+        for finding in repeated:
+            logger.warning(
+                f"Possible N+1 in {endpoint}: query repeated {finding['count']} "
+                f"times: {finding['sql'][:100]}...",
+                extra={
+                    "endpoint": endpoint,
+                    "path": request.path,
+                    "fingerprint": finding["fingerprint"],
+                    "repeat_count": finding["count"],
+                    "sql": finding["sql"],
+                },
+            )
 
         return response
+
+    @staticmethod
+    def _endpoint_name(request) -> str:
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "<unresolved>"
+        return match.view_name or match._func_path
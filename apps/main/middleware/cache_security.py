@@ -9,9 +9,12 @@ import time
 from django.utils.cache import patch_response_headers
 from django.utils.deprecation import MiddlewareMixin
 
+from .fast_path import route_aware
+
 logger = logging.getLogger("performance")
 
 
+@route_aware()
 class CacheControlMiddleware(MiddlewareMixin):
     """Add appropriate cache control headers based on content type and URL patterns"""
 
@@ -60,6 +63,7 @@ class CacheControlMiddleware(MiddlewareMixin):
         return response
 
 
+@route_aware()
 class SecurityHeadersMiddleware(MiddlewareMixin):
     """Add security and performance headers"""
 
@@ -105,6 +109,7 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
         return response
 
 
+@route_aware()
 class CompressionMiddleware(MiddlewareMixin):
     """Additional compression settings"""
 
@@ -127,6 +132,7 @@ class CompressionMiddleware(MiddlewareMixin):
         return response
 
 
+@route_aware("analytics")
 class PerformanceMiddleware(MiddlewareMixin):
     """Performance monitoring and optimization middleware"""
 
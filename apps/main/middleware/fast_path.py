@@ -0,0 +1,232 @@
+"""
+Middleware fast path and per-middleware latency accounting.
+
+RouteClassMiddleware runs first and classifies every request by path prefix
+(MIDDLEWARE_ROUTE_CLASSES), e.g. static assets, health probes and beacons;
+an entry starting with "=" matches that exact path only.
+Middlewares decorated with ``@route_aware(group)`` are bypassed entirely for
+route classes whose MIDDLEWARE_FAST_PATH entry lists their group; both
+settings live in project/settings/base.py, so the skip rules are declared in
+one place.
+
+Decorated middlewares also report their own cost per request (time spent in
+the middleware excluding the inner chain), aggregated per route in this
+process and exposed on the performance dashboard.
+"""
+
+import functools
+import threading
+import time
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from django.conf import settings
+
+
+def classify(path: str) -> Optional[str]:
+    """Route class of a request path (first matching entry wins)"""
+    for route_class, patterns in getattr(
+        settings, "MIDDLEWARE_ROUTE_CLASSES", {}
+    ).items():
+        for pattern in patterns:
+            if pattern.startswith("="):
+                if path == pattern[1:]:
+                    return route_class
+            elif path.startswith(pattern):
+                return route_class
+    return None
+
+
+def bypassed_groups(route_class: Optional[str]) -> FrozenSet[str]:
+    """Middleware groups skipped for ``route_class``"""
+    if route_class is None:
+        return frozenset()
+    return frozenset(getattr(settings, "MIDDLEWARE_FAST_PATH", {}).get(route_class, ()))
+
+
+def route_aware(group: Optional[str] = None):
+    """
+    Class decorator for middlewares taking part in the fast path.
+
+    ``group`` names the skip group (analytics, gdpr, apm, caching); middlewares
+    without a group are never bypassed but still have their latency tracked.
+    Decorated middlewares run in sync mode only.
+    """
+
+    def decorate(cls):
+        original_init = cls.__init__
+        original_call = cls.__call__
+        name = cls.__name__
+
+        @functools.wraps(original_init)
+        def __init__(self, get_response, *args, **kwargs):
+            original_init(self, get_response, *args, **kwargs)
+            inner = self.get_response
+
+            def timed_get_response(request):
+                start = time.perf_counter()
+                try:
+                    return inner(request)
+                finally:
+                    frames = getattr(request, "_middleware_frames", None)
+                    if frames:
+                        frames[-1] += time.perf_counter() - start
+
+            self._fast_path_inner = inner
+            self.get_response = timed_get_response
+
+        @functools.wraps(original_call)
+        def __call__(self, request):
+            if group in getattr(request, "_fast_path_skip", ()):
+                return self._fast_path_inner(request)
+
+            timings = getattr(request, "_middleware_timings", None)
+            if timings is None:
+                return original_call(self, request)
+
+            frames = request._middleware_frames
+            frames.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original_call(self, request)
+            finally:
+                inner = frames.pop()
+                timings.append((name, time.perf_counter() - start - inner))
+
+        cls.__init__ = __init__
+        cls.__call__ = __call__
+        cls.async_capable = False
+        cls.fast_path_group = group
+        return cls
+
+    return decorate
+
+
+class MiddlewareLatency:
+    """
+    Per-route aggregates of the time each middleware adds
+    """
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        route: str,
+        route_class: Optional[str],
+        total: float,
+        timings: List[tuple],
+    ) -> None:
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {
+                    "route_class": route_class,
+                    "requests": 0,
+                    "total": 0.0,
+                    "middleware": {},
+                }
+            stats["requests"] += 1
+            stats["total"] += total
+
+            for name, seconds in timings:
+                entry = stats["middleware"].get(name)
+                if entry is None:
+                    entry = stats["middleware"][name] = {
+                        "calls": 0,
+                        "total": 0.0,
+                        "max": 0.0,
+                    }
+                entry["calls"] += 1
+                entry["total"] += seconds
+                entry["max"] = max(entry["max"], seconds)
+
+    def report(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Routes by total time, with each middleware's average own cost;
+        ``unattributed_ms`` covers the view and undecorated middlewares
+        """
+        with self._lock:
+            routes = {
+                route: {
+                    **stats,
+                    "middleware": {
+                        name: dict(entry) for name, entry in stats["middleware"].items()
+                    },
+                }
+                for route, stats in self._routes.items()
+            }
+
+        report = []
+        for route, stats in routes.items():
+            requests = stats["requests"]
+            middleware = sorted(
+                (
+                    {
+                        "name": name,
+                        "calls": entry["calls"],
+                        "avg_ms": round(entry["total"] / entry["calls"] * 1000, 3),
+                        "max_ms": round(entry["max"] * 1000, 3),
+                    }
+                    for name, entry in stats["middleware"].items()
+                ),
+                key=lambda x: x["avg_ms"],
+                reverse=True,
+            )
+            attributed = sum(e["total"] for e in stats["middleware"].values())
+            report.append(
+                {
+                    "route": route,
+                    "route_class": stats["route_class"],
+                    "requests": requests,
+                    "avg_total_ms": round(stats["total"] / requests * 1000, 3),
+                    "avg_middleware_ms": round(attributed / requests * 1000, 3),
+                    "avg_unattributed_ms": round(
+                        (stats["total"] - attributed) / requests * 1000, 3
+                    ),
+                    "middleware": middleware,
+                }
+            )
+
+        report.sort(key=lambda x: x["avg_total_ms"] * x["requests"], reverse=True)
+        return report[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+class RouteClassMiddleware:
+    """
+    Classify the request for the fast path and collect middleware timings.
+
+    Must be the first entry in MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        route_class = classify(request.path_info)
+        request.route_class = route_class
+        request._fast_path_skip = bypassed_groups(route_class)
+
+        if not getattr(settings, "MIDDLEWARE_LATENCY_TRACKING", True):
+            return self.get_response(request)
+
+        request._middleware_timings = []
+        request._middleware_frames = []
+        start = time.perf_counter()
+        response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        route = match.view_name if match else route_class or "unresolved"
+        middleware_latency.record(
+            route, route_class, total, request._middleware_timings
+        )
+        return response
+
+
+# Global aggregates, reported by the performance dashboard
+middleware_latency = MiddlewareLatency()
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "10000_remove_admin_idx_main_admin_email_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("query", models.CharField(max_length=200)),
+                ("normalized_query", models.CharField(db_index=True, max_length=200)),
+                ("category", models.CharField(blank=True, max_length=50)),
+                ("result_count", models.PositiveIntegerField(default=0)),
+                ("ip_address", models.GenericIPAddressField(blank=True, null=True)),
+                ("user_agent", models.CharField(blank=True, max_length=300)),
+                ("referer", models.CharField(blank=True, max_length=500)),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Log",
+                "verbose_name_plural": "Search Logs",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SearchQueryStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("query", models.CharField(max_length=200)),
+                ("searches", models.PositiveIntegerField(default=0)),
+                ("zero_results", models.PositiveIntegerField(default=0)),
+                ("total_results", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Search Query Stat",
+                "verbose_name_plural": "Search Query Stats",
+                "ordering": ["-date", "-searches"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "query"), name="unique_search_query_stat"
+                    )
+                ],
+            },
+        ),
+    ]
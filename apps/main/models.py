@@ -550,3 +550,85 @@ class UsefulResource(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
+
+
+class SearchLog(models.Model):
+    """Raw search event, written in batches by the search telemetry buffer"""
+
+    query = models.CharField(max_length=200)
+    normalized_query = models.CharField(max_length=200, db_index=True)
+    category = models.CharField(max_length=50, blank=True)
+    result_count = models.PositiveIntegerField(default=0)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.CharField(max_length=300, blank=True)
+    referer = models.CharField(max_length=500, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Search Log"
+        verbose_name_plural = "Search Logs"
+
+    def __str__(self):
+        return f"{self.query} ({self.result_count})"
+
+
+class SearchQueryStat(models.Model):
+    """Per-day rollup of one normalized query, incremented atomically"""
+
+    date = models.DateField()
+    query = models.CharField(max_length=200)
+    searches = models.PositiveIntegerField(default=0)
+    zero_results = models.PositiveIntegerField(default=0)
+    total_results = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-date", "-searches"]
+        verbose_name = "Search Query Stat"
+        verbose_name_plural = "Search Query Stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "query"], name="unique_search_query_stat"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.query}: {self.searches}"
+
+
+class OutboundEmail(models.Model):
+    """One queued message for one recipient, delivered by the mail outbox"""
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    recipient = models.CharField(max_length=254)
+    dedup_key = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="main_outbox_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient} ({self.status})"
@@ -2,7 +2,8 @@
 Search Performance Monitoring & Logging
 
 This module provides comprehensive monitoring for search functionality:
-- Query latency tracking
+- Query latency tracking (atomic counters and a latency histogram, see
+  search_counters)
 - Index sync monitoring
 - Error logging and alerting
 - Performance metrics collection
@@ -30,6 +31,8 @@ from typing import Any, Dict, List, Optional
 from django.core.cache import cache
 from django.utils import timezone
 
+from .search_counters import SearchCounters, metrics_from_counters
+
 try:
     import sentry_sdk
 
@@ -48,9 +51,6 @@ class SearchMonitor:
     """
 
     # Cache keys
-    CACHE_KEY_METRICS = "search:metrics"
-    CACHE_KEY_ERRORS = "search:errors:recent"
-    CACHE_KEY_QUERIES = "search:queries:recent"
     CACHE_KEY_HEALTH = "search:health:status"
 
     # Thresholds
@@ -58,11 +58,10 @@ class SearchMonitor:
     LATENCY_ERROR_MS = 500
     ERROR_RATE_WARNING = 0.05  # 5%
 
-    def __init__(self):
+    def __init__(self, counters: Optional[SearchCounters] = None):
         """Initialize search monitor"""
-        self.metrics_ttl = 3600  # 1 hour
-        self.error_log_ttl = 86400  # 24 hours
-        self.query_log_ttl = 3600  # 1 hour
+        # Counters, histogram and capped query/error logs
+        self.counters = counters or SearchCounters()
 
     @contextmanager
     def track_query(self, query: str, user_id: Optional[int] = None):
@@ -117,7 +116,7 @@ class SearchMonitor:
         error_message: Optional[str],
         user_id: Optional[int],
     ):
-        """Log search query with metadata"""
+        """Count the query and log it (and its error) to the capped logs"""
         log_entry = {
             "timestamp": timezone.now().isoformat(),
             "query": query,
@@ -127,61 +126,23 @@ class SearchMonitor:
             "user_id": user_id,
         }
 
-        # Update metrics
-        self._update_metrics(duration_ms, error)
-
-        # Store recent queries
-        recent_queries = cache.get(self.CACHE_KEY_QUERIES, [])
-        recent_queries.insert(0, log_entry)
-        recent_queries = recent_queries[:100]  # Keep last 100
-        cache.set(self.CACHE_KEY_QUERIES, recent_queries, self.query_log_ttl)
-
-        # Store errors separately
-        if error:
-            self._log_error(log_entry)
-
-    def _update_metrics(self, duration_ms: float, error: bool):
-        """Update aggregate metrics"""
-        metrics = cache.get(
-            self.CACHE_KEY_METRICS,
-            {
-                "total_queries": 0,
-                "total_errors": 0,
-                "total_duration_ms": 0,
-                "min_duration_ms": float("inf"),
-                "max_duration_ms": 0,
-                "last_updated": timezone.now().isoformat(),
-            },
+        total_queries, total_errors = self.counters.record(
+            duration_ms, error, log_entry
         )
 
-        metrics["total_queries"] += 1
-        if error:
-            metrics["total_errors"] += 1
-
-        metrics["total_duration_ms"] += duration_ms
-        metrics["min_duration_ms"] = min(metrics["min_duration_ms"], duration_ms)
-        metrics["max_duration_ms"] = max(metrics["max_duration_ms"], duration_ms)
-        metrics["avg_duration_ms"] = (
-            metrics["total_duration_ms"] / metrics["total_queries"]
-        )
-        metrics["error_rate"] = metrics["total_errors"] / metrics["total_queries"]
-        metrics["last_updated"] = timezone.now().isoformat()
-
-        cache.set(self.CACHE_KEY_METRICS, metrics, self.metrics_ttl)
-
         # Alert if error rate is high
-        if metrics["error_rate"] > self.ERROR_RATE_WARNING:
+        error_rate = total_errors / total_queries if total_queries else 0
+        if error and error_rate > self.ERROR_RATE_WARNING:
             logger.warning(
-                f"High search error rate: {metrics['error_rate']:.2%} "
-                f"({metrics['total_errors']}/{metrics['total_queries']})"
+                f"High search error rate: {error_rate:.2%} "
+                f"({total_errors}/{total_queries})"
             )
 
-    def _log_error(self, log_entry: Dict):
-        """Store error for later analysis"""
-        errors = cache.get(self.CACHE_KEY_ERRORS, [])
-        errors.insert(0, log_entry)
-        errors = errors[:50]  # Keep last 50 errors
-        cache.set(self.CACHE_KEY_ERRORS, errors, self.error_log_ttl)
+    def _snapshot(self, queries: int = 0, errors: int = 0) -> Dict[str, Any]:
+        """Metrics and recent logs, read together in one round-trip"""
+        snapshot = self.counters.snapshot(queries, errors)
+        snapshot["metrics"] = metrics_from_counters(snapshot.pop("counters"))
+        return snapshot
 
     def get_metrics(self) -> Dict[str, Any]:
         """
@@ -190,7 +151,7 @@ class SearchMonitor:
         Returns:
             dict: Performance metrics including latency, error rates, query counts
         """
-        metrics = cache.get(self.CACHE_KEY_METRICS, {})
+        metrics = self._snapshot()["metrics"]
 
         # Add health status
         health = self.check_index_health()
@@ -201,13 +162,11 @@ class SearchMonitor:
 
     def get_recent_queries(self, limit: int = 20) -> List[Dict]:
         """Get recent search queries"""
-        queries = cache.get(self.CACHE_KEY_QUERIES, [])
-        return queries[:limit]
+        return self._snapshot(queries=limit)["recent_queries"]
 
     def get_recent_errors(self, limit: int = 20) -> List[Dict]:
         """Get recent search errors"""
-        errors = cache.get(self.CACHE_KEY_ERRORS, [])
-        return errors[:limit]
+        return self._snapshot(errors=limit)["recent_errors"]
 
     def check_index_health(self) -> Dict[str, Any]:
         """
@@ -318,19 +277,23 @@ class SearchMonitor:
         Returns:
             dict: All monitoring data for admin dashboard
         """
+        snapshot = self._snapshot(queries=10, errors=10)
+        health = self.check_index_health()
+        metrics = snapshot["metrics"]
+        metrics["health_status"] = health["status"]
+        metrics["health_message"] = health["message"]
+
         return {
-            "metrics": self.get_metrics(),
-            "recent_queries": self.get_recent_queries(10),
-            "recent_errors": self.get_recent_errors(10),
-            "health": self.check_index_health(),
+            "metrics": metrics,
+            "recent_queries": snapshot["recent_queries"],
+            "recent_errors": snapshot["recent_errors"],
+            "health": health,
             "sync_events": cache.get("search:sync:events", [])[:10],
         }
 
     def reset_metrics(self):
         """Reset all metrics (use with caution)"""
-        cache.delete(self.CACHE_KEY_METRICS)
-        cache.delete(self.CACHE_KEY_ERRORS)
-        cache.delete(self.CACHE_KEY_QUERIES)
+        self.counters.reset()
         cache.delete(self.CACHE_KEY_HEALTH)
         cache.delete("search:sync:events")
         logger.info("Search monitoring metrics reset")
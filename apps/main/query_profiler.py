@@ -0,0 +1,286 @@
+"""
+Query profiler.
+
+Per-request database instrumentation built on ``connection.execute_wrapper``,
+so it works with ``DEBUG=False``:
+
+- Every request gets a query count and total query time (two
+  ``perf_counter`` calls per query)
+- A sampled fraction of requests (QUERY_PROFILER_SAMPLE_RATE) also records
+  normalized SQL fingerprints and flags fingerprints repeated at least
+  QUERY_PROFILER_N_PLUS_ONE_THRESHOLD times (N+1 patterns) with the view
+  that issued them
+- Per-endpoint aggregates are kept in process memory and published to the
+  cache periodically, where the performance dashboard merges all workers
+"""
+
+import hashlib
+import logging
+import os
+import random
+import re
+import socket
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger("apm")
+
+PUBLISH_INTERVAL = 30  # seconds
+PUBLISH_TTL = 300  # seconds a silent worker's stats remain visible
+MAX_FINGERPRINTS = 20  # per endpoint
+PROCESS_INDEX_KEY = "query_profiler:processes"
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Replace literals and parameter lists so structurally identical
+    statements share one fingerprint
+    """
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def _digest(normalized: str) -> str:
+    return hashlib.md5(normalized.encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+def fingerprint(sql: str) -> str:
+    """Short stable id of a statement's normalized form"""
+    return _digest(normalize_sql(sql))
+
+
+class QueryRecorder:
+    """
+    ``execute_wrapper`` callable collecting the queries of one request
+    """
+
+    def __init__(self, sampled: bool, slow_threshold: float):
+        self.sampled = sampled
+        self.slow_threshold = slow_threshold
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints: Counter = Counter()
+        self.samples: Dict[str, str] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.total_time += duration
+
+            if self.sampled:
+                normalized = normalize_sql(sql)
+                key = _digest(normalized)
+                self.fingerprints[key] += 1
+                if key not in self.samples:
+                    self.samples[key] = normalized[:500]
+
+            if duration > self.slow_threshold:
+                logger.warning(
+                    f"Slow database query ({duration:.3f}s): {sql[:100]}...",
+                    extra={
+                        "query_time": duration,
+                        "threshold": self.slow_threshold,
+                        "sql": sql[:500],
+                    },
+                )
+
+    def repeated(self, threshold: int) -> List[Dict[str, Any]]:
+        """Fingerprints executed at least ``threshold`` times"""
+        return [
+            {"fingerprint": key, "count": count, "sql": self.samples[key]}
+            for key, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryProfiler:
+    """
+    Sampling policy and per-endpoint aggregates for the current process
+    """
+
+    def __init__(
+        self,
+        sample_rate: Optional[float] = None,
+        n_plus_one_threshold: Optional[int] = None,
+        publish_interval: float = PUBLISH_INTERVAL,
+    ):
+        self._sample_rate = sample_rate
+        self._n_plus_one_threshold = n_plus_one_threshold
+        self.publish_interval = publish_interval
+        self.process_key = f"query_profiler:{socket.gethostname()}:{os.getpid()}"
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+        self._last_publish = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def sample_rate(self) -> float:
+        if self._sample_rate is not None:
+            return self._sample_rate
+        return getattr(settings, "QUERY_PROFILER_SAMPLE_RATE", 0.1)
+
+    @property
+    def n_plus_one_threshold(self) -> int:
+        if self._n_plus_one_threshold is not None:
+            return self._n_plus_one_threshold
+        return getattr(settings, "QUERY_PROFILER_N_PLUS_ONE_THRESHOLD", 5)
+
+    def recorder(self) -> QueryRecorder:
+        """A recorder for one request, sampled at ``sample_rate``"""
+        budgets = getattr(settings, "PERFORMANCE_BUDGETS", {})
+        return QueryRecorder(
+            sampled=random.random() < self.sample_rate,
+            slow_threshold=budgets.get("DATABASE_QUERY_THRESHOLD", 0.1),
+        )
+
+    def record(self, endpoint: str, recorder: QueryRecorder) -> List[Dict[str, Any]]:
+        """
+        Fold one request into the endpoint aggregates; returns N+1 findings
+        """
+        repeated = recorder.repeated(self.n_plus_one_threshold)
+
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    "requests": 0,
+                    "queries": 0,
+                    "query_time": 0.0,
+                    "max_queries": 0,
+                    "sampled": 0,
+                    "n_plus_one": 0,
+                    "fingerprints": {},
+                }
+            stats["requests"] += 1
+            stats["queries"] += recorder.count
+            stats["query_time"] += recorder.total_time
+            stats["max_queries"] = max(stats["max_queries"], recorder.count)
+
+            if recorder.sampled:
+                stats["sampled"] += 1
+                stats["n_plus_one"] += bool(repeated)
+                self._merge_fingerprints(stats["fingerprints"], recorder)
+
+            due = time.monotonic() - self._last_publish >= self.publish_interval
+
+        if due:
+            self.publish()
+        return repeated
+
+    @staticmethod
+    def _merge_fingerprints(target: Dict[str, Dict], recorder: QueryRecorder):
+        for key, count in recorder.fingerprints.items():
+            entry = target.get(key)
+            if entry is None:
+                entry = target[key] = {"count": 0, "sql": recorder.samples[key]}
+            entry["count"] += count
+
+        if len(target) > MAX_FINGERPRINTS:
+            keep = sorted(target.items(), key=lambda x: x[1]["count"], reverse=True)
+            target.clear()
+            target.update(keep[:MAX_FINGERPRINTS])
+
+    def local_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                endpoint: {**stats, "fingerprints": dict(stats["fingerprints"])}
+                for endpoint, stats in self._endpoints.items()
+            }
+
+    def publish(self) -> None:
+        """Write this process's aggregates to the shared cache"""
+        with self._lock:
+            self._last_publish = time.monotonic()
+        try:
+            cache.set(self.process_key, self.local_stats(), PUBLISH_TTL)
+            processes = cache.get(PROCESS_INDEX_KEY) or []
+            if self.process_key not in processes:
+                cache.set(PROCESS_INDEX_KEY, processes + [self.process_key], None)
+        except Exception as e:
+            logger.debug(f"Query profiler publish failed: {e}")
+
+    def endpoint_report(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Per-endpoint aggregates across all workers, hottest first
+        """
+        processes = cache.get(PROCESS_INDEX_KEY) or []
+        published = cache.get_many(processes) if processes else {}
+        if len(published) < len(processes):
+            cache.set(PROCESS_INDEX_KEY, list(published), None)
+        published[self.process_key] = self.local_stats()
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        for stats_by_endpoint in published.values():
+            for endpoint, stats in stats_by_endpoint.items():
+                total = merged.setdefault(
+                    endpoint,
+                    {
+                        "requests": 0,
+                        "queries": 0,
+                        "query_time": 0.0,
+                        "max_queries": 0,
+                        "sampled": 0,
+                        "n_plus_one": 0,
+                        "fingerprints": {},
+                    },
+                )
+                for field in ("requests", "queries", "query_time", "sampled"):
+                    total[field] += stats[field]
+                total["n_plus_one"] += stats["n_plus_one"]
+                total["max_queries"] = max(total["max_queries"], stats["max_queries"])
+                for key, entry in stats["fingerprints"].items():
+                    merged_entry = total["fingerprints"].setdefault(
+                        key, {"count": 0, "sql": entry["sql"]}
+                    )
+                    merged_entry["count"] += entry["count"]
+
+        report = []
+        for endpoint, stats in merged.items():
+            requests = stats["requests"] or 1
+            top = sorted(
+                stats["fingerprints"].items(), key=lambda x: x[1]["count"], reverse=True
+            )[:5]
+            report.append(
+                {
+                    "endpoint": endpoint,
+                    "requests": stats["requests"],
+                    "avg_queries": round(stats["queries"] / requests, 2),
+                    "max_queries": stats["max_queries"],
+                    "avg_query_time_ms": round(
+                        stats["query_time"] / requests * 1000, 2
+                    ),
+                    "total_query_time_ms": round(stats["query_time"] * 1000, 2),
+                    "sampled_requests": stats["sampled"],
+                    "n_plus_one_requests": stats["n_plus_one"],
+                    "top_fingerprints": [
+                        {"fingerprint": key, **entry} for key, entry in top
+                    ],
+                }
+            )
+
+        report.sort(key=lambda x: x["total_query_time_ms"], reverse=True)
+        return report[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+        cache.delete(self.process_key)
+
+
+# Global profiler used by DatabaseQueryTrackingMiddleware
+query_profiler = QueryProfiler()
@@ -0,0 +1,304 @@
+"""
+Rate limiter engine.
+
+Shared by every rate-limit middleware and decorator. Limits use GCRA
+(generic cell rate algorithm): each rate keeps one "theoretical arrival
+time" per identity, which behaves like a sliding window without storing
+individual timestamps.
+
+- All rates and the lockout state of one identity live in a single hash,
+  checked and updated atomically
+- With a django-redis cache (RATE_LIMIT_CACHE_ALIAS) a check is one Lua
+  script call, i.e. one round-trip
+- Other caches hold the same state, updated under a process-wide lock
+- A check the shared store cannot answer is made against per-process
+  state (apps.core.shared_store), so limits keep applying per worker
+- Decisions are counted per scope for the performance dashboard
+"""
+
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from apps.core.shared_store import SharedStore
+
+KEY_PREFIX = "rl"
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+EPSILON = 1e-6
+
+# KEYS[1]: identity hash
+# ARGV: now, consume (0/1), lockout seconds, then (interval, window) per rate
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local consume = tonumber(ARGV[2])
+local lockout = tonumber(ARGV[3])
+
+local blocked = tonumber(redis.call('HGET', KEYS[1], 'b') or '0')
+if blocked > now then
+  return {'blocked', 0, tostring(blocked - now), tostring(blocked - now)}
+end
+
+local allowed = true
+local remaining = nil
+local retry_after = 0
+local reset_after = 0
+local updates = {}
+for i = 4, #ARGV, 2 do
+  local interval = tonumber(ARGV[i])
+  local window = tonumber(ARGV[i + 1])
+  local field = 'w' .. ARGV[i + 1]
+  local tat = math.max(tonumber(redis.call('HGET', KEYS[1], field) or '0'), now)
+  local new_tat = tat + interval
+  if new_tat - now > window + 1e-6 then
+    allowed = false
+    retry_after = math.max(retry_after, new_tat - window - now)
+  end
+  local left = math.floor((window - (new_tat - now)) / interval + 1e-6)
+  if remaining == nil or left < remaining then
+    remaining = left
+  end
+  reset_after = math.max(reset_after, new_tat - now)
+  updates[#updates + 1] = field
+  updates[#updates + 1] = tostring(new_tat)
+end
+
+if not allowed then
+  if lockout > 0 then
+    redis.call('HSET', KEYS[1], 'b', tostring(now + lockout))
+    redis.call('PEXPIRE', KEYS[1], math.ceil(math.max(lockout, reset_after) * 1000))
+    return {'locked', 0, tostring(lockout), tostring(lockout)}
+  end
+  return {'throttled', 0, tostring(retry_after), tostring(reset_after)}
+end
+
+if consume == 1 then
+  redis.call('HSET', KEYS[1], unpack(updates))
+  redis.call('PEXPIRE', KEYS[1], math.ceil(reset_after * 1000))
+end
+return {'allowed', math.max(remaining, 0), '0', tostring(reset_after)}
+"""
+
+
+@dataclass(frozen=True)
+class Rate:
+    """``limit`` requests per ``window`` seconds"""
+
+    limit: int
+    window: float
+
+    @classmethod
+    def parse(cls, rate: str) -> "Rate":
+        """Parse ``"10/m"``-style rates (s, m, h, d)"""
+        match = re.fullmatch(r"(\d+)/(\d*)([smhd])", rate.strip())
+        if not match:
+            raise ValueError(f"Invalid rate: {rate!r}")
+        multiplier = int(match.group(2) or 1)
+        return cls(int(match.group(1)), multiplier * PERIODS[match.group(3)])
+
+    @property
+    def interval(self) -> float:
+        return self.window / self.limit
+
+    @property
+    def field(self) -> str:
+        return f"{self.window:g}"
+
+
+@dataclass(frozen=True)
+class Decision:
+    """
+    Outcome of one check.
+
+    ``state`` is allowed, throttled, locked (the lockout started with this
+    check) or blocked (an earlier lockout is still active).
+    """
+
+    state: str
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+    @property
+    def allowed(self) -> bool:
+        return self.state == "allowed"
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.retry_after)) if not self.allowed else 0
+
+    @property
+    def reset_seconds(self) -> int:
+        return math.ceil(self.reset_after)
+
+
+def evaluate(
+    state: Dict[str, float],
+    now: float,
+    rates: Sequence[Rate],
+    consume: bool,
+    lockout: float,
+) -> Tuple[str, int, float, float, Dict[str, float]]:
+    """
+    GCRA step over one identity's ``state``; mirrors GCRA_SCRIPT.
+
+    Returns (state, remaining, retry_after, reset_after, updated fields).
+    """
+    blocked = state.get("b", 0.0)
+    if blocked > now:
+        return "blocked", 0, blocked - now, blocked - now, {}
+
+    allowed = True
+    remaining = None
+    retry_after = 0.0
+    reset_after = 0.0
+    updates = {}
+    for rate in rates:
+        tat = max(state.get(f"w{rate.field}", 0.0), now)
+        new_tat = tat + rate.interval
+        if new_tat - now > rate.window + EPSILON:
+            allowed = False
+            retry_after = max(retry_after, new_tat - rate.window - now)
+        left = math.floor((rate.window - (new_tat - now)) / rate.interval + EPSILON)
+        if remaining is None or left < remaining:
+            remaining = left
+        reset_after = max(reset_after, new_tat - now)
+        updates[f"w{rate.field}"] = new_tat
+
+    if not allowed:
+        if lockout > 0:
+            return "locked", 0, lockout, lockout, {"b": now + lockout}
+        return "throttled", 0, retry_after, reset_after, {}
+
+    return "allowed", max(remaining, 0), 0.0, reset_after, updates if consume else {}
+
+
+class CacheBackend:
+    """
+    GCRA state in a Django cache, read and written under a process-wide
+    lock (atomic within this process)
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+
+    def check(self, key, now, rates, consume, lockout):
+        with self._lock:
+            state = self.store.get(key) or {}
+            result, remaining, retry_after, reset_after, updates = evaluate(
+                state, now, rates, consume, lockout
+            )
+            if updates:
+                ttl = max(lockout, reset_after) if result == "locked" else reset_after
+                self.store.set(key, {**state, **updates}, math.ceil(ttl) + 1)
+        return result, remaining, retry_after, reset_after
+
+    def reset(self, key):
+        self.store.delete(key)
+
+
+class RedisBackend:
+    """GCRA state in Redis, one script call per check"""
+
+    def __init__(self, alias: str):
+        from django_redis import get_redis_connection
+
+        self.client = get_redis_connection(alias)
+        self.script = self.client.register_script(GCRA_SCRIPT)
+
+    def check(self, key, now, rates, consume, lockout):
+        args = [repr(now), int(consume), lockout]
+        for rate in rates:
+            args.extend([repr(rate.interval), rate.field])
+        result, remaining, retry_after, reset_after = self.script(keys=[key], args=args)
+        if isinstance(result, bytes):
+            result = result.decode()
+        return result, int(remaining), float(retry_after), float(reset_after)
+
+    def reset(self, key):
+        self.client.delete(key)
+
+
+class RateLimiter:
+    """
+    Rate limit checks against the Redis or cache backend
+    """
+
+    def __init__(self, cache_alias: Optional[str] = None, backend=None):
+        self._store = SharedStore(
+            "rate-limiter",
+            "RATE_LIMIT_CACHE_ALIAS",
+            CacheBackend,
+            RedisBackend,
+            cache_alias=cache_alias,
+            backend=backend,
+            local_entries=10000,
+        )
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def key(scope: str, identifier: str) -> str:
+        return f"{KEY_PREFIX}:{scope}:{identifier}"
+
+    def hit(
+        self,
+        scope: str,
+        identifier: str,
+        rates: List[Rate],
+        lockout: float = 0,
+        now: Optional[float] = None,
+    ) -> Decision:
+        """
+        Count one request against ``rates``; a denied request is not counted.
+        With ``lockout``, exceeding a rate blocks the identity for that many
+        seconds.
+        """
+        return self._check(scope, identifier, rates, True, lockout, now)
+
+    def peek(
+        self,
+        scope: str,
+        identifier: str,
+        rates: List[Rate],
+        lockout: float = 0,
+        now: Optional[float] = None,
+    ) -> Decision:
+        """Whether one more request would be allowed, without counting it"""
+        return self._check(scope, identifier, rates, False, lockout, now)
+
+    def reset(self, scope: str, identifier: str) -> None:
+        self._store.reset(self.key(scope, identifier))
+
+    def _check(self, scope, identifier, rates, consume, lockout, now):
+        key = self.key(scope, identifier)
+        now = time.time() if now is None else now
+        result = self._store.call("check", key, now, rates, consume, lockout)
+        state, remaining, retry_after, reset_after = result
+        with self._stats_lock:
+            self._stats[scope][state] += 1
+        return Decision(
+            state=state,
+            limit=min(rate.limit for rate in rates),
+            remaining=remaining,
+            retry_after=retry_after,
+            reset_after=reset_after,
+        )
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Decision counts per scope in this process"""
+        with self._stats_lock:
+            return {scope: dict(states) for scope, states in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats.clear()
+
+
+# Global limiter shared by the rate-limit middlewares
+rate_limiter = RateLimiter()
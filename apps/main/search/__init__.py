@@ -5,10 +5,12 @@ This package contains modular search components following SOLID principles.
 Complexity reduced from D:27 to B:≤6 through strategic design patterns.
 """
 
+from .analytics import SearchTelemetry, search_telemetry
 from .base_search_engine import SearchEngine, search_engine
 from .formatters.base_formatter import SearchResultFormatter
 from .formatters.metadata_collector import MetadataCollector
 from .formatters.url_builder import URLBuilder
+from .result_cache import SearchResultCache, search_result_cache
 from .scorers.relevance_scorer import RelevanceScorer
 
 __all__ = [
@@ -18,4 +20,8 @@ __all__ = [
     "URLBuilder",
     "MetadataCollector",
     "RelevanceScorer",
+    "SearchResultCache",
+    "search_result_cache",
+    "SearchTelemetry",
+    "search_telemetry",
 ]
@@ -0,0 +1,289 @@
+"""
+Search Telemetry
+
+Records search events without touching shared cache payloads on the
+request path:
+
+- Events are buffered in process memory and written with one
+  ``bulk_create`` of SearchLog rows per flush (by size, interval or at
+  process exit)
+- The same flush folds the batch into per-day SearchQueryStat rollups
+  with atomic ``F()`` increments, so concurrent workers never overwrite
+  each other's counts
+- Analytics read the rollups (a few aggregate queries over at most
+  ``days`` x distinct-queries rows) instead of re-scanning raw events
+- Raw events carry IPs and user agents, so they are pruned after
+  SEARCH_LOG_RETENTION_DAYS (``manage.py prune_search_logs``); rollups
+  are kept for SEARCH_STATS_RETENTION_DAYS
+- Client IPs are validated when recorded (invalid ones are stored as
+  NULL), and a failed flush puts its events and rollups back in the
+  buffer, keeping at most LOG_MAX_PENDING events
+
+Complexity: B:6
+"""
+
+import atexit
+import ipaddress
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from .result_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 10  # seconds
+FLUSH_SIZE = 200  # buffered search events
+MAX_QUERY_LENGTH = 200
+LOG_RETENTION_DAYS = 30
+STATS_RETENTION_DAYS = 365
+PRUNE_BATCH_SIZE = 5000
+LOG_MAX_PENDING = 10000  # buffered events kept while the database fails
+
+StatKey = Tuple[date, str]
+
+
+def clean_ip(value: str):
+    """
+    The IP address in ``value``, or None when it is not one (e.g. a forged
+    X-Forwarded-For of "unknown"), so one bad value cannot fail a batch
+    """
+    try:
+        return str(ipaddress.ip_address((value or "").strip()))
+    except ValueError:
+        return None
+
+
+class SearchTelemetry:
+    """
+    Write-behind search log with per-day query rollups
+
+    Complexity: B:6
+    """
+
+    def __init__(self, flush_interval: float = None, flush_size: int = None):
+        self.flush_interval = flush_interval or getattr(
+            settings, "SEARCH_LOG_FLUSH_INTERVAL", FLUSH_INTERVAL
+        )
+        self.flush_size = flush_size or getattr(
+            settings, "SEARCH_LOG_FLUSH_SIZE", FLUSH_SIZE
+        )
+        self._rows: List = []
+        self._stats: Dict[StatKey, List[int]] = defaultdict(lambda: [0, 0, 0])
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        query: str,
+        result_count: int,
+        category: str = "",
+        ip_address: str = "",
+        user_agent: str = "",
+        referer: str = "",
+    ) -> None:
+        """
+        Buffer one search event
+
+        Complexity: A:3
+        """
+        from apps.main.models import SearchLog
+
+        now = timezone.now()
+        normalized = normalize_query(query)[:MAX_QUERY_LENGTH]
+        row = SearchLog(
+            query=query[:MAX_QUERY_LENGTH],
+            normalized_query=normalized,
+            category=(category or "")[:50],
+            result_count=result_count,
+            ip_address=clean_ip(ip_address),
+            user_agent=user_agent[:300],
+            referer=referer[:500],
+            created_at=now,
+        )
+
+        with self._lock:
+            self._rows.append(row)
+            stat = self._stats[(timezone.localdate(now), normalized)]
+            stat[0] += 1
+            stat[1] += result_count == 0
+            stat[2] += result_count
+            due = (
+                len(self._rows) >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if due:
+            self.flush()
+
+    def pending(self) -> int:
+        """
+        Number of buffered search events
+        """
+        return len(self._rows)
+
+    def flush(self) -> int:
+        """
+        Write buffered events and rollups, returning the events written
+
+        Complexity: A:4
+        """
+        from apps.main.models import SearchLog, SearchQueryStat
+
+        with self._lock:
+            rows, self._rows = self._rows, []
+            stats, self._stats = self._stats, defaultdict(lambda: [0, 0, 0])
+            self._last_flush = time.monotonic()
+
+        if not rows:
+            return 0
+
+        try:
+            with transaction.atomic():
+                SearchLog.objects.bulk_create(rows, batch_size=500)
+                SearchQueryStat.objects.bulk_create(
+                    [SearchQueryStat(date=day, query=query) for day, query in stats],
+                    batch_size=500,
+                    ignore_conflicts=True,
+                )
+                for (day, query), (searches, zero, results) in stats.items():
+                    SearchQueryStat.objects.filter(date=day, query=query).update(
+                        searches=F("searches") + searches,
+                        zero_results=F("zero_results") + zero,
+                        total_results=F("total_results") + results,
+                    )
+        except Exception as e:
+            logger.error(f"Failed to flush {len(rows)} search log rows: {e}")
+            self._requeue(rows, stats)
+            return 0
+
+        return len(rows)
+
+    def _requeue(self, rows: List, stats: Dict[StatKey, List[int]]) -> None:
+        """
+        Merge a failed batch back in front of newer events, keeping at most
+        LOG_MAX_PENDING events (the oldest are dropped first; their rollups
+        are kept)
+        """
+        with self._lock:
+            for key, (searches, zero, results) in stats.items():
+                stat = self._stats[key]
+                stat[0] += searches
+                stat[1] += zero
+                stat[2] += results
+            self._rows = rows + self._rows
+            dropped = len(self._rows) - LOG_MAX_PENDING
+            if dropped > 0:
+                del self._rows[:dropped]
+                logger.warning(f"Dropped {dropped} buffered search log rows")
+
+    def flush_at_exit(self) -> None:
+        """
+        Flush from atexit, only when events are pending and the database
+        can still be reached (not after test teardown or a lost connection)
+        """
+        if not self._rows:
+            return
+        try:
+            connection.ensure_connection()
+        except Exception:
+            return
+        self.flush()
+
+    def prune(self, log_days: int = None, stats_days: int = None) -> Dict[str, int]:
+        """
+        Delete raw events and rollups older than their retention windows
+
+        Raw events go in primary-key batches so a large backlog never holds
+        one long delete transaction. Returns the rows deleted per model.
+
+        Complexity: A:3
+        """
+        from apps.main.models import SearchLog, SearchQueryStat
+
+        log_days = log_days or getattr(
+            settings, "SEARCH_LOG_RETENTION_DAYS", LOG_RETENTION_DAYS
+        )
+        stats_days = stats_days or getattr(
+            settings, "SEARCH_STATS_RETENTION_DAYS", STATS_RETENTION_DAYS
+        )
+
+        expired = SearchLog.objects.filter(
+            created_at__lt=timezone.now() - timedelta(days=log_days)
+        )
+        logs = 0
+        while True:
+            ids = list(expired.values_list("id", flat=True)[:PRUNE_BATCH_SIZE])
+            if not ids:
+                break
+            logs += SearchLog.objects.filter(id__in=ids).delete()[0]
+
+        stats, _ = SearchQueryStat.objects.filter(
+            date__lt=timezone.localdate() - timedelta(days=stats_days)
+        ).delete()
+        return {"search_logs": logs, "query_stats": stats}
+
+    def summary(self, days: int) -> Dict[str, Any]:
+        """
+        Analytics for the last ``days`` days, read from the rollups
+
+        Complexity: A:3
+        """
+        from apps.main.models import SearchQueryStat
+
+        today = timezone.localdate()
+        start = today - timedelta(days=days - 1)
+        stats = SearchQueryStat.objects.filter(date__gte=start, date__lte=today)
+
+        totals = stats.aggregate(
+            searches=Sum("searches"),
+            results=Sum("total_results"),
+            unique=Count("query", distinct=True),
+        )
+        total_searches = totals["searches"] or 0
+
+        popular = (
+            stats.values("query")
+            .annotate(count=Sum("searches"))
+            .order_by("-count", "query")[:10]
+        )
+        no_results = (
+            stats.filter(zero_results__gt=0)
+            .values("query")
+            .annotate(count=Sum("zero_results"))
+            .order_by("-count", "query")[:5]
+        )
+        per_day = dict(
+            stats.values_list("date").annotate(count=Sum("searches")).order_by()
+        )
+
+        return {
+            "total_searches": total_searches,
+            "unique_queries": totals["unique"],
+            "average_results": (
+                round((totals["results"] or 0) / total_searches)
+                if total_searches
+                else 0
+            ),
+            "popular_queries": list(popular),
+            "no_result_queries": list(no_results),
+            "search_trends": {
+                (today - timedelta(days=i)).isoformat(): per_day.get(
+                    today - timedelta(days=i), 0
+                )
+                for i in range(days)
+            },
+        }
+
+
+# Global telemetry buffer used by the search API
+search_telemetry = SearchTelemetry()
+atexit.register(search_telemetry.flush_at_exit)
@@ -0,0 +1,256 @@
+"""
+Search Result Cache
+
+Caches the ranked hit list of a search per normalized (query, category)
+key instead of the formatted results:
+
+- A cache entry holds ``(type, id, score, highlights)`` tuples for up to
+  MAX_CACHED_RESULTS hits plus facets computed once over the whole set
+- Pages are sliced from the cached hits, so every page is reachable at
+  constant cost, and only the requested page's rows are loaded
+  (one ``in_bulk`` query per content type)
+- Content changes bump a generation counter that is part of every key,
+  which retires all cached searches at once
+
+Complexity: B:6
+"""
+
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "search_results:generation"
+RESULT_TTL = 300  # 5 minutes
+MAX_CACHED_RESULTS = 500
+
+# Result "type" values of the PostgreSQL engine -> SearchEngine.models keys
+TYPE_ALIASES = {"blog_post": "blog_posts", "tool": "tools", "ai_tool": "ai_tools"}
+
+Hit = Tuple[str, Any, float, Any, Any]
+
+
+def normalize_query(query: str) -> str:
+    """
+    Case- and whitespace-insensitive form of a query
+
+    Complexity: A:1
+    """
+    return " ".join(query.lower().split())
+
+
+def _parse_date(value):
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return value
+
+
+def compute_facets(results: List[Dict]) -> Dict[str, List]:
+    """
+    Category, date range and tag facets over a full result set
+
+    Complexity: B:7
+    """
+    categories: Dict[str, int] = {}
+    date_ranges: Dict[str, int] = {}
+    tags: Dict[str, int] = {}
+    now = timezone.now()
+
+    for result in results:
+        category = result.get("category") or result.get("category_name") or "Other"
+        categories[category] = categories.get(category, 0) + 1
+
+        date = _parse_date(result.get("date") or result.get("metadata"))
+        if isinstance(date, datetime):
+            if timezone.is_naive(date):
+                date = timezone.make_aware(date)
+            if date >= now - timedelta(days=7):
+                date_ranges["week"] = date_ranges.get("week", 0) + 1
+            elif date >= now - timedelta(days=30):
+                date_ranges["month"] = date_ranges.get("month", 0) + 1
+            elif date >= now - timedelta(days=365):
+                date_ranges["year"] = date_ranges.get("year", 0) + 1
+
+        for tag in (result.get("tags") or [])[:3]:
+            tags[tag] = tags.get(tag, 0) + 1
+
+    return {
+        "categories": [
+            {"name": name, "count": count}
+            for name, count in sorted(
+                categories.items(), key=lambda x: x[1], reverse=True
+            )
+        ][:5],
+        "date_ranges": [
+            {"name": name, "count": count} for name, count in date_ranges.items()
+        ],
+        "popular_tags": [
+            {"name": tag, "count": count}
+            for tag, count in sorted(tags.items(), key=lambda x: x[1], reverse=True)
+        ][:10],
+    }
+
+
+class SearchResultCache:
+    """
+    Ranked-id cache with page hydration
+
+    Complexity: B:6
+    """
+
+    def __init__(self, engine=None, ttl: int = None, max_results: int = None):
+        self._engine = engine
+        self.ttl = ttl or getattr(settings, "SEARCH_RESULT_CACHE_TTL", RESULT_TTL)
+        self.max_results = max_results or MAX_CACHED_RESULTS
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from .base_search_engine import search_engine
+
+            self._engine = search_engine
+        return self._engine
+
+    # ------------------------------------------------------------------
+    # Keys and invalidation
+    # ------------------------------------------------------------------
+
+    def generation(self) -> int:
+        return cache.get_or_set(GENERATION_KEY, 1, None)
+
+    def cache_key(self, query: str, category: str = "") -> str:
+        digest = hashlib.md5(
+            f"{normalize_query(query)}|{category}".encode(), usedforsecurity=False
+        ).hexdigest()
+        return f"search_results:{self.generation()}:{digest}"
+
+    def invalidate(self) -> None:
+        """
+        Retire every cached search (call on content changes)
+
+        Complexity: A:2
+        """
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            cache.set(GENERATION_KEY, 2, None)
+
+    # ------------------------------------------------------------------
+    # Ranking
+    # ------------------------------------------------------------------
+
+    def build_entry(self, results: List[Dict], suggestions=None) -> Dict[str, Any]:
+        """
+        Reduce engine output to a compact, cacheable hit list
+
+        Complexity: A:3
+        """
+        hits: List[Hit] = []
+        for result in results[: self.max_results]:
+            if result.get("id") is None:
+                continue
+            result_type = result.get("search_category") or result.get("type", "")
+            hits.append(
+                (
+                    TYPE_ALIASES.get(result_type, result_type),
+                    result["id"],
+                    float(result.get("rank", result.get("relevance_score", 0)) or 0),
+                    result.get("title_highlight"),
+                    result.get("content_highlight"),
+                )
+            )
+
+        return {
+            "hits": hits,
+            "facets": compute_facets(results),
+            "suggestions": suggestions or [],
+        }
+
+    def get_or_compute(
+        self, query: str, category: str, compute: Callable[[int], Dict]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return (entry, from_cache); ``compute(limit)`` runs the engine search
+
+        Complexity: A:2
+        """
+        key = self.cache_key(query, category)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry, True
+
+        search = compute(self.max_results)
+        entry = self.build_entry(search["results"], search.get("suggestions"))
+        cache.set(key, entry, self.ttl)
+        return entry, False
+
+    # ------------------------------------------------------------------
+    # Pagination and hydration
+    # ------------------------------------------------------------------
+
+    def page(self, entry: Dict[str, Any], page: int, per_page: int):
+        """
+        Slice a page of hits and hydrate it
+
+        Complexity: A:1
+        """
+        page_obj = Paginator(entry["hits"], per_page).get_page(page)
+        return page_obj, self.hydrate(list(page_obj))
+
+    def hydrate(self, hits: List[Hit]) -> List[Dict[str, Any]]:
+        """
+        Load and format the rows for ``hits``, one query per content type
+
+        Hits whose rows were deleted or unpublished since ranking are
+        dropped.
+
+        Complexity: B:6
+        """
+        ids_by_type: Dict[str, List] = {}
+        for result_type, pk, *_ in hits:
+            ids_by_type.setdefault(result_type, []).append(pk)
+
+        objects: Dict[Tuple[str, Any], Any] = {}
+        for result_type, ids in ids_by_type.items():
+            config = self.engine.models.get(result_type)
+            if config is None:
+                continue
+            queryset = config["model"].objects.all()
+            if config.get("filters"):
+                queryset = queryset.filter(config["filters"])
+            for pk, obj in queryset.in_bulk(ids).items():
+                objects[(result_type, pk)] = obj
+
+        results = []
+        for result_type, pk, score, title_highlight, content_highlight in hits:
+            obj = objects.get((result_type, pk))
+            if obj is None:
+                continue
+            config = self.engine.models[result_type]
+            result = self.engine.formatter.format(obj, config, score)
+            if not result:
+                continue
+            result.pop("object", None)
+            result.update(
+                type=result_type,
+                date=result.pop("metadata", None),
+                rank=score,
+                title_highlight=title_highlight,
+                content_highlight=content_highlight,
+            )
+            results.append(result)
+        return results
+
+
+# Global result cache used by the search API
+search_result_cache = SearchResultCache()
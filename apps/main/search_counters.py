@@ -0,0 +1,328 @@
+"""
+Search Monitor Counters
+=======================
+
+Counters, latency histogram and recent query/error logs behind
+SearchMonitor, updated without read-modify-write races.
+
+- Redis (django-redis SEARCH_COUNTERS_CACHE_ALIAS): one Lua script call
+  per query does HINCRBY/HINCRBYFLOAT on a metrics hash and LPUSH+LTRIM on
+  capped lists; a snapshot is one MULTI/EXEC pipeline (HGETALL + LRANGE)
+- Other caches: queries are batched in process memory and merged into the
+  cache every FLUSH_INTERVAL seconds or FLUSH_SIZE queries; a snapshot
+  flushes and reads all keys with one ``get_many``
+- Queries the shared store cannot take are counted in this process
+  (apps.core.shared_store), so the monitor keeps its recent history
+  through a Redis outage
+"""
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from apps.core.shared_store import SharedStore
+
+KEY_METRICS = "search:counters:metrics"
+KEY_QUERIES = "search:counters:queries"
+KEY_ERRORS = "search:counters:errors"
+
+MAX_QUERIES = 100
+MAX_ERRORS = 50
+METRICS_TTL = 3600  # 1 hour
+QUERIES_TTL = 3600  # 1 hour
+ERRORS_TTL = 86400  # 24 hours
+
+FLUSH_INTERVAL = 5  # seconds
+FLUSH_SIZE = 50  # queries
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+BUCKETS = [f"le_{edge}" for edge in LATENCY_BUCKETS_MS] + [
+    f"gt_{LATENCY_BUCKETS_MS[-1]}"
+]
+
+# KEYS: metrics hash, queries list, errors list
+# ARGV: duration_ms, error (0/1), bucket, entry json, timestamp,
+#       max queries, max errors, metrics ttl, queries ttl, errors ttl
+RECORD_SCRIPT = """
+local duration = tonumber(ARGV[1])
+redis.call('HINCRBY', KEYS[1], 'total_queries', 1)
+if ARGV[2] == '1' then
+    redis.call('HINCRBY', KEYS[1], 'total_errors', 1)
+end
+redis.call('HINCRBYFLOAT', KEYS[1], 'total_duration_ms', ARGV[1])
+redis.call('HINCRBY', KEYS[1], ARGV[3], 1)
+local low = redis.call('HGET', KEYS[1], 'min_duration_ms')
+if not low or duration < tonumber(low) then
+    redis.call('HSET', KEYS[1], 'min_duration_ms', ARGV[1])
+end
+local high = redis.call('HGET', KEYS[1], 'max_duration_ms')
+if not high or duration > tonumber(high) then
+    redis.call('HSET', KEYS[1], 'max_duration_ms', ARGV[1])
+end
+redis.call('HSET', KEYS[1], 'last_updated', ARGV[5])
+redis.call('EXPIRE', KEYS[1], ARGV[8])
+
+redis.call('LPUSH', KEYS[2], ARGV[4])
+redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[6]) - 1)
+redis.call('EXPIRE', KEYS[2], ARGV[9])
+if ARGV[2] == '1' then
+    redis.call('LPUSH', KEYS[3], ARGV[4])
+    redis.call('LTRIM', KEYS[3], 0, tonumber(ARGV[7]) - 1)
+    redis.call('EXPIRE', KEYS[3], ARGV[10])
+end
+
+return {
+    redis.call('HGET', KEYS[1], 'total_queries'),
+    redis.call('HGET', KEYS[1], 'total_errors') or 0,
+}
+"""
+
+
+def latency_bucket(duration_ms: float) -> str:
+    for edge in LATENCY_BUCKETS_MS:
+        if duration_ms <= edge:
+            return f"le_{edge}"
+    return BUCKETS[-1]
+
+
+def empty_counters() -> Dict:
+    return {
+        "total_queries": 0,
+        "total_errors": 0,
+        "total_duration_ms": 0.0,
+        "min_duration_ms": None,
+        "max_duration_ms": None,
+        "last_updated": None,
+        "histogram": {bucket: 0 for bucket in BUCKETS},
+    }
+
+
+def merge_counters(into: Dict, delta: Dict) -> Dict:
+    """Add the counters of ``delta`` to ``into`` (in place)"""
+    into["total_queries"] += delta["total_queries"]
+    into["total_errors"] += delta["total_errors"]
+    into["total_duration_ms"] += delta["total_duration_ms"]
+    for field, pick in (("min_duration_ms", min), ("max_duration_ms", max)):
+        values = [v for v in (into[field], delta[field]) if v is not None]
+        into[field] = pick(values) if values else None
+    into["last_updated"] = delta["last_updated"] or into["last_updated"]
+    for bucket, count in delta["histogram"].items():
+        into["histogram"][bucket] = into["histogram"].get(bucket, 0) + count
+    return into
+
+
+def metrics_from_counters(counters: Dict) -> Dict:
+    """SearchMonitor metrics (totals, averages, histogram) from counters"""
+    total = counters["total_queries"]
+    return {
+        "total_queries": total,
+        "total_errors": counters["total_errors"],
+        "total_duration_ms": round(counters["total_duration_ms"], 2),
+        "min_duration_ms": counters["min_duration_ms"] or 0,
+        "max_duration_ms": counters["max_duration_ms"] or 0,
+        "avg_duration_ms": counters["total_duration_ms"] / total if total else 0,
+        "error_rate": counters["total_errors"] / total if total else 0,
+        "latency_histogram_ms": dict(counters["histogram"]),
+        "last_updated": counters["last_updated"],
+    }
+
+
+class RedisSearchCounters:
+    """Counters in Redis: one script call per query"""
+
+    def __init__(self, alias: str):
+        from django_redis import get_redis_connection
+
+        self.client = get_redis_connection(alias)
+        self.script = self.client.register_script(RECORD_SCRIPT)
+
+    def record(self, duration_ms: float, error: bool, entry: Dict) -> Tuple[int, int]:
+        total, errors = self.script(
+            keys=[KEY_METRICS, KEY_QUERIES, KEY_ERRORS],
+            args=[
+                repr(duration_ms),
+                int(error),
+                latency_bucket(duration_ms),
+                json.dumps(entry),
+                entry["timestamp"],
+                MAX_QUERIES,
+                MAX_ERRORS,
+                METRICS_TTL,
+                QUERIES_TTL,
+                ERRORS_TTL,
+            ],
+        )
+        return int(total), int(errors)
+
+    def snapshot(self, queries: int = 0, errors: int = 0) -> Dict:
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hgetall(KEY_METRICS)
+        pipe.lrange(KEY_QUERIES, 0, max(queries, 1) - 1)
+        pipe.lrange(KEY_ERRORS, 0, max(errors, 1) - 1)
+        fields, recent_queries, recent_errors = pipe.execute()
+
+        fields = {
+            (k.decode() if isinstance(k, bytes) else k): (
+                v.decode() if isinstance(v, bytes) else v
+            )
+            for k, v in fields.items()
+        }
+        counters = empty_counters()
+        counters["total_queries"] = int(fields.get("total_queries", 0))
+        counters["total_errors"] = int(fields.get("total_errors", 0))
+        counters["total_duration_ms"] = float(fields.get("total_duration_ms", 0))
+        for field in ("min_duration_ms", "max_duration_ms"):
+            if field in fields:
+                counters[field] = float(fields[field])
+        counters["last_updated"] = fields.get("last_updated")
+        for bucket in BUCKETS:
+            counters["histogram"][bucket] = int(fields.get(bucket, 0))
+
+        return {
+            "counters": counters,
+            "recent_queries": [json.loads(e) for e in recent_queries[:queries]],
+            "recent_errors": [json.loads(e) for e in recent_errors[:errors]],
+        }
+
+    def reset(self) -> None:
+        self.client.delete(KEY_METRICS, KEY_QUERIES, KEY_ERRORS)
+
+
+class CacheSearchCounters:
+    """
+    Counters in a Django cache: queries are batched in process memory and
+    merged into the cache under a process-wide lock
+    """
+
+    def __init__(
+        self,
+        store,
+        flush_interval: float = FLUSH_INTERVAL,
+        flush_size: int = FLUSH_SIZE,
+    ):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._reset_pending()
+        self._flushed = (0, 0)  # (total queries, total errors) at last flush
+        self._last_flush = time.monotonic()
+
+    def _reset_pending(self) -> None:
+        self._pending = empty_counters()
+        self._queries: List[Dict] = []
+        self._errors: List[Dict] = []
+
+    def record(self, duration_ms: float, error: bool, entry: Dict) -> Tuple[int, int]:
+        delta = {
+            "total_queries": 1,
+            "total_errors": int(error),
+            "total_duration_ms": duration_ms,
+            "min_duration_ms": duration_ms,
+            "max_duration_ms": duration_ms,
+            "last_updated": entry["timestamp"],
+            "histogram": {latency_bucket(duration_ms): 1},
+        }
+        with self._lock:
+            pending = merge_counters(self._pending, delta)
+            self._queries.append(entry)
+            if error:
+                self._errors.append(entry)
+            totals = (
+                self._flushed[0] + pending["total_queries"],
+                self._flushed[1] + pending["total_errors"],
+            )
+            due = (
+                pending["total_queries"] >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if due:
+            self.flush()
+        return totals
+
+    def flush(self) -> None:
+        """Merge the batched queries into the cache"""
+        with self._lock:
+            pending, queries, errors = self._pending, self._queries, self._errors
+            self._reset_pending()
+            self._last_flush = time.monotonic()
+        if not pending["total_queries"]:
+            return
+
+        with self._flush_lock:
+            stored = self.store.get_many([KEY_METRICS, KEY_QUERIES, KEY_ERRORS])
+            counters = merge_counters(
+                stored.get(KEY_METRICS) or empty_counters(), pending
+            )
+            self.store.set_many(
+                {
+                    KEY_METRICS: counters,
+                    KEY_QUERIES: (queries[::-1] + stored.get(KEY_QUERIES, []))[
+                        :MAX_QUERIES
+                    ],
+                },
+                METRICS_TTL,
+            )
+            if errors:
+                self.store.set(
+                    KEY_ERRORS,
+                    (errors[::-1] + stored.get(KEY_ERRORS, []))[:MAX_ERRORS],
+                    ERRORS_TTL,
+                )
+        with self._lock:
+            self._flushed = (counters["total_queries"], counters["total_errors"])
+
+    def snapshot(self, queries: int = 0, errors: int = 0) -> Dict:
+        self.flush()
+        stored = self.store.get_many([KEY_METRICS, KEY_QUERIES, KEY_ERRORS])
+        return {
+            "counters": stored.get(KEY_METRICS) or empty_counters(),
+            "recent_queries": stored.get(KEY_QUERIES, [])[:queries],
+            "recent_errors": stored.get(KEY_ERRORS, [])[:errors],
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset_pending()
+            self._flushed = (0, 0)
+        self.store.delete_many([KEY_METRICS, KEY_QUERIES, KEY_ERRORS])
+
+
+class SearchCounters:
+    """
+    Search counters against the Redis or cache backend
+    """
+
+    def __init__(self, cache_alias: Optional[str] = None, backend=None):
+        self._store = SharedStore(
+            "search-counters",
+            "SEARCH_COUNTERS_CACHE_ALIAS",
+            CacheSearchCounters,
+            RedisSearchCounters,
+            cache_alias=cache_alias,
+            backend=backend,
+            local_entries=100,
+        )
+
+    def record(self, duration_ms: float, error: bool, entry: Dict) -> Tuple[int, int]:
+        """
+        Count one query and log ``entry`` (which carries a ``timestamp``);
+        returns (total queries, total errors) as known to the backend
+        """
+        return self._store.call("record", duration_ms, error, entry)
+
+    def snapshot(self, queries: int = 0, errors: int = 0) -> Dict:
+        """
+        Counters and the most recent ``queries``/``errors`` log entries,
+        read together
+        """
+        return self._store.call("snapshot", queries, errors)
+
+    def flush(self) -> None:
+        self._store.flush()
+
+    def reset(self) -> None:
+        self._store.reset()
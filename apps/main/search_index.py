@@ -572,6 +572,32 @@ class SearchIndexManager:
             logger.error(f"Failed to delete document {model_name}:{object_id}: {e}")
             return False
 
+    def delete_documents(self, model_name: str, object_ids) -> bool:
+        """
+        Delete several documents of one model from the index in one task.
+
+        Args:
+            model_name: Model class name (e.g., 'BlogPost')
+            object_ids: Object IDs
+
+        Returns:
+            True if successful, False otherwise
+        """
+        document_ids = [f"{model_name}:{object_id}" for object_id in object_ids]
+        try:
+            task = self.index.delete_documents(document_ids)
+            logger.info(
+                f"Deleted {len(document_ids)} {model_name} documents from index "
+                f"(task: {task['taskUid']})"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Failed to delete {len(document_ids)} {model_name} documents: {e}"
+            )
+            return False
+
     def bulk_index(
         self,
         objects: List[Model],
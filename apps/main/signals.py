@@ -1,6 +1,7 @@
 """
 Django signals for intelligent cache invalidation.
-Automatically clears cache when models are saved or deleted.
+Automatically clears cache and syncs the search index when models are saved
+or deleted, coalesced per transaction by apps.core.invalidation.
 """
 
 import logging
@@ -9,17 +10,9 @@ from django.core.cache import cache
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-logger = logging.getLogger(__name__)
+from apps.core.invalidation import invalidation_dispatcher
 
-# Import cache manager for advanced invalidation
-try:
-    from .cache_utils import cache_manager
-except ImportError:
-    cache_manager = None
-    logger.warning("cache_utils not available, using basic cache invalidation")
-
-# Import models (conditional imports above are intentional)
-from .models import (  # noqa: E402
+from .models import (
     AITool,
     BlogPost,
     CybersecurityResource,
@@ -28,6 +21,8 @@ from .models import (  # noqa: E402
     UsefulResource,
 )
 
+logger = logging.getLogger(__name__)
+
 try:
     from apps.blog.models import Post
 except ImportError:
@@ -39,123 +34,85 @@ except ImportError:
     Tool = None
 
 
-# Enhanced cache invalidation handlers with smart pattern matching
+# Cache invalidation handlers: keys and patterns are queued on the
+# invalidation dispatcher and deleted once per commit
 
 
 @receiver([post_save, post_delete], sender=PersonalInfo)
-def invalidate_personalinfo_cache(sender, instance, created=False, **kwargs):
+def invalidate_personalinfo_cache(sender, instance, **kwargs):
     """
     Invalidate PersonalInfo related caches when saved or deleted.
     PersonalInfo affects: home page, personal page, and portfolio statistics.
     """
-    try:
-        if cache_manager:
-            # Invalidate all home page data variations (handles time-based key patterns)
-            cache_manager.invalidate_pattern("home_page_data_*")
-            # Invalidate personal page
-            cache_manager.invalidate_cache("personal_page_data")
-            # Invalidate portfolio statistics
-            cache_manager.invalidate_cache("portfolio_statistics")
-        else:
-            # Fallback to basic invalidation
-            cache.delete("home_page_data")
-            cache.delete("personal_page_data")
-            cache.delete("portfolio_statistics")
-
-        action = (
-            "created"
-            if created
-            else ("updated" if kwargs.get("update_fields") is None else "updated")
-        )
-        logger.info(f"Cache invalidated on PersonalInfo {action}: {instance.id}")
-    except Exception as e:
-        logger.error(f"Error invalidating PersonalInfo cache: {e}")
+    invalidation_dispatcher.invalidate(
+        sender,
+        instance,
+        keys=["home_page_data", "personal_page_data", "portfolio_statistics"],
+        # All home page data variations (time-based key patterns)
+        patterns=["home_page_data_*"],
+    )
 
 
 @receiver([post_save, post_delete], sender=SocialLink)
-def invalidate_sociallink_cache(sender, instance, created=False, **kwargs):
+def invalidate_sociallink_cache(sender, instance, **kwargs):
     """
     Invalidate SocialLink related caches.
     SocialLink affects: home page and personal page.
     """
-    try:
-        if cache_manager:
-            cache_manager.invalidate_pattern("home_page_data_*")
-            cache_manager.invalidate_cache("personal_page_data")
-        else:
-            cache.delete("home_page_data")
-            cache.delete("personal_page_data")
-
-        action = "created" if created else "updated"
-        logger.info(f"Cache invalidated on SocialLink {action}: {instance.id}")
-    except Exception as e:
-        logger.error(f"Error invalidating SocialLink cache: {e}")
+    invalidation_dispatcher.invalidate(
+        sender,
+        instance,
+        keys=["home_page_data", "personal_page_data"],
+        patterns=["home_page_data_*"],
+    )
 
 
 if Post:
 
     @receiver([post_save, post_delete], sender=Post)
-    def invalidate_post_cache(sender, instance, created=False, **kwargs):
+    def invalidate_post_cache(sender, instance, **kwargs):
         """
         Invalidate blog Post related caches.
         Post affects: home page (recent posts) and blog pages.
         """
-        try:
-            if cache_manager:
-                cache_manager.invalidate_pattern("home_page_data_*")
-                cache_manager.invalidate_pattern("blog_posts_*")
-            else:
-                cache.delete("home_page_data")
-                cache.delete("blog_posts")
-
-            action = "created" if created else "updated"
-            logger.info(f"Cache invalidated on Post {action}: {instance.id}")
-        except Exception as e:
-            logger.error(f"Error invalidating Post cache: {e}")
+        invalidation_dispatcher.invalidate(
+            sender,
+            instance,
+            keys=["home_page_data", "blog_posts"],
+            patterns=["home_page_data_*", "blog_posts_*"],
+        )
 
 
 if Tool:
 
     @receiver([post_save, post_delete], sender=Tool)
-    def invalidate_tool_cache(sender, instance, created=False, **kwargs):
+    def invalidate_tool_cache(sender, instance, **kwargs):
         """
         Invalidate Tool related caches.
         Tool affects: home page (featured tools) and tool pages.
         """
-        try:
-            if cache_manager:
-                cache_manager.invalidate_pattern("home_page_data_*")
-                cache_manager.invalidate_pattern("tools_*")
-            else:
-                cache.delete("home_page_data")
-                cache.delete("tools")
-
-            action = "created" if created else "updated"
-            logger.info(f"Cache invalidated on Tool {action}: {instance.id}")
-        except Exception as e:
-            logger.error(f"Error invalidating Tool cache: {e}")
+        invalidation_dispatcher.invalidate(
+            sender,
+            instance,
+            keys=["home_page_data", "tools"],
+            patterns=["home_page_data_*", "tools_*"],
+        )
 
 
 if AITool:
 
     @receiver([post_save, post_delete], sender=AITool)
-    def invalidate_aitool_cache(sender, instance, created=False, **kwargs):
+    def invalidate_aitool_cache(sender, instance, **kwargs):
         """
         Invalidate AITool related caches.
         AITool affects: home page (featured AI tools) and AI optimizer pages.
         """
-        try:
-            if cache_manager:
-                cache_manager.invalidate_pattern("home_page_data_*")
-                cache_manager.invalidate_pattern("ai_tools_*")
-            else:
-                cache.delete("home_page_data")
-                cache.delete("ai_tools")
-
-            action = "created" if created else "updated"
-            logger.info(f"Cache invalidated on AITool {action}: {instance.id}")
-        except Exception as e:
-            logger.error(f"Error invalidating AITool cache: {e}")
+        invalidation_dispatcher.invalidate(
+            sender,
+            instance,
+            keys=["home_page_data", "ai_tools"],
+            patterns=["home_page_data_*", "ai_tools_*"],
+        )
 
 
 def clear_home_cache(**kwargs):
@@ -172,8 +129,8 @@ def clear_home_cache(**kwargs):
 
 def sync_to_search_index(sender, instance, created, **kwargs):
     """
-    Generic signal handler to sync model to search index.
-    Called after save for searchable models.
+    Sync a single model instance to the search index right away.
+    The signal receivers below queue a bulk upsert per commit instead.
     """
     import time
 
@@ -232,8 +189,8 @@ def sync_to_search_index(sender, instance, created, **kwargs):
 
 def remove_from_search_index(sender, instance, **kwargs):
     """
-    Generic signal handler to remove document from search index.
-    Called before delete for searchable models.
+    Remove a single document from the search index right away.
+    The signal receivers below queue a bulk delete per commit instead.
     """
     import time
 
@@ -291,7 +248,8 @@ def remove_from_search_index(sender, instance, **kwargs):
         )
 
 
-# Register search index signals for indexable models
+# Register search index signals for indexable models (batched per commit by
+# the invalidation dispatcher)
 
 # BlogPost (from apps.main.models)
 
@@ -299,73 +257,73 @@ def remove_from_search_index(sender, instance, **kwargs):
 @receiver([post_save], sender=BlogPost)
 def index_blogpost_on_save(sender, instance, created=False, **kwargs):
     """Index BlogPost to search engine on save"""
-    sync_to_search_index(sender, instance, created, **kwargs)
+    invalidation_dispatcher.index(sender, instance)
 
 
 @receiver([post_delete], sender=BlogPost)
 def remove_blogpost_on_delete(sender, instance, **kwargs):
     """Remove BlogPost from search engine on delete"""
-    remove_from_search_index(sender, instance, **kwargs)
+    invalidation_dispatcher.unindex(sender, instance)
 
 
 @receiver([post_save], sender=AITool)
 def index_aitool_on_save(sender, instance, created=False, **kwargs):
     """Index AITool to search engine on save"""
-    sync_to_search_index(sender, instance, created, **kwargs)
+    invalidation_dispatcher.index(sender, instance)
 
 
 @receiver([post_delete], sender=AITool)
 def remove_aitool_on_delete(sender, instance, **kwargs):
     """Remove AITool from search engine on delete"""
-    remove_from_search_index(sender, instance, **kwargs)
+    invalidation_dispatcher.unindex(sender, instance)
 
 
 @receiver([post_save], sender=UsefulResource)
 def index_usefulresource_on_save(sender, instance, created=False, **kwargs):
     """Index UsefulResource to search engine on save"""
-    sync_to_search_index(sender, instance, created, **kwargs)
+    invalidation_dispatcher.index(sender, instance)
 
 
 @receiver([post_delete], sender=UsefulResource)
 def remove_usefulresource_on_delete(sender, instance, **kwargs):
     """Remove UsefulResource from search engine on delete"""
-    remove_from_search_index(sender, instance, **kwargs)
+    invalidation_dispatcher.unindex(sender, instance)
 
 
 @receiver([post_save], sender=CybersecurityResource)
 def index_cybersecurity_on_save(sender, instance, created=False, **kwargs):
     """Index CybersecurityResource to search engine on save"""
-    sync_to_search_index(sender, instance, created, **kwargs)
+    invalidation_dispatcher.index(sender, instance)
 
 
 @receiver([post_delete], sender=CybersecurityResource)
 def remove_cybersecurity_on_delete(sender, instance, **kwargs):
     """Remove CybersecurityResource from search engine on delete"""
-    remove_from_search_index(sender, instance, **kwargs)
+    invalidation_dispatcher.unindex(sender, instance)
 
 
 @receiver([post_save], sender=PersonalInfo)
 def index_personalinfo_on_save(sender, instance, created=False, **kwargs):
     """Index PersonalInfo to search engine on save"""
-    sync_to_search_index(sender, instance, created, **kwargs)
+    invalidation_dispatcher.index(sender, instance)
 
 
 @receiver([post_delete], sender=PersonalInfo)
 def remove_personalinfo_on_delete(sender, instance, **kwargs):
     """Remove PersonalInfo from search engine on delete"""
-    remove_from_search_index(sender, instance, **kwargs)
+    invalidation_dispatcher.unindex(sender, instance)
 
 
 @receiver([post_save], sender=SocialLink)
 def index_sociallink_on_save(sender, instance, created=False, **kwargs):
     """Index SocialLink to search engine on save"""
-    sync_to_search_index(sender, instance, created, **kwargs)
+    invalidation_dispatcher.index(sender, instance)
 
 
 @receiver([post_delete], sender=SocialLink)
 def remove_sociallink_on_delete(sender, instance, **kwargs):
     """Remove SocialLink from search engine on delete"""
-    remove_from_search_index(sender, instance, **kwargs)
+    invalidation_dispatcher.unindex(sender, instance)
 
 
 # Try to register Tool model signals if available
@@ -374,9 +332,9 @@ if Tool:
     @receiver([post_save], sender=Tool)
     def index_tool_on_save(sender, instance, created=False, **kwargs):
         """Index Tool to search engine on save"""
-        sync_to_search_index(sender, instance, created, **kwargs)
+        invalidation_dispatcher.index(sender, instance)
 
     @receiver([post_delete], sender=Tool)
     def remove_tool_on_delete(sender, instance, **kwargs):
         """Remove Tool from search engine on delete"""
-        remove_from_search_index(sender, instance, **kwargs)
+        invalidation_dispatcher.unindex(sender, instance)
@@ -1,6 +1,7 @@
 from django.urls import path
 
 from . import admin_views, views
+from .feeds import CombinedFeed, LatestPostsFeed, LatestProjectsFeed
 from .views import search_views
 
 app_name = "main"
@@ -14,6 +15,10 @@ urlpatterns = [
     # Projects/Portfolio URLs
     path("projects/", views.projects_view, name="projects"),
     path("projects/<slug:slug>/", views.project_detail_view, name="project_detail"),
+    # RSS Feeds
+    path("feed/", CombinedFeed(), name="combined_feed"),
+    path("feed/blog/", LatestPostsFeed(), name="blog_feed"),
+    path("feed/projects/", LatestProjectsFeed(), name="projects_feed"),
     # Search URLs
     path("api/search/", search_views.search_api, name="search_api"),
     path("api/search/suggest/", search_views.search_suggest, name="search_suggest"),
@@ -0,0 +1,126 @@
+"""
+Snippet View and Like Counters
+==============================
+
+Write-behind counters for CodeSnippet.views and CodeSnippet.likes.
+
+Hits are accumulated per snippet in process memory and flushed with
+``F()`` increments, so concurrent hits are never lost and a popular
+snippet costs one UPDATE per flush instead of one per request. Snippets
+with the same pending deltas share a single ``UPDATE ... WHERE id IN``.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import CodeSnippet
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FLUSH_INTERVAL = 10  # seconds
+COUNTER_FLUSH_SIZE = 500  # buffered hits
+
+
+class SnippetCounterBuffer:
+    """
+    Buffered view/like deltas per snippet, flushed when FLUSH_SIZE hits are
+    pending, when the flush interval elapsed, or at process exit
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = COUNTER_FLUSH_INTERVAL,
+        flush_size: int = COUNTER_FLUSH_SIZE,
+    ):
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        # snippet id -> [views, likes]
+        self._deltas: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        self._hits = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _record(self, snippet_id, views: int, likes: int) -> None:
+        with self._lock:
+            delta = self._deltas[str(snippet_id)]
+            delta[0] += views
+            delta[1] += likes
+            self._hits += 1
+            due = (
+                self._hits >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if due:
+            self.flush()
+
+    def record_view(self, snippet_id) -> None:
+        """
+        Buffer one snippet view
+        """
+        self._record(snippet_id, 1, 0)
+
+    def record_like(self, snippet_id, delta: int = 1) -> None:
+        """
+        Buffer a like (``delta=1``) or an unlike (``delta=-1``)
+        """
+        self._record(snippet_id, 0, delta)
+
+    def pending(self, snippet_id) -> Tuple[int, int]:
+        """
+        Unflushed (views, likes) for a snippet, for up-to-date display
+        """
+        with self._lock:
+            delta = self._deltas.get(str(snippet_id))
+            return (delta[0], delta[1]) if delta else (0, 0)
+
+    def flush(self) -> int:
+        """
+        Apply buffered deltas, returning the number of snippets updated
+        """
+        with self._lock:
+            deltas, self._deltas = self._deltas, defaultdict(lambda: [0, 0])
+            self._hits = 0
+            self._last_flush = time.monotonic()
+
+        groups: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+        for snippet_id, (views, likes) in deltas.items():
+            if views or likes:
+                groups[(views, likes)].append(snippet_id)
+
+        if not groups:
+            return 0
+
+        try:
+            with transaction.atomic():
+                for (views, likes), snippet_ids in groups.items():
+                    CodeSnippet.objects.filter(pk__in=snippet_ids).update(
+                        views=F("views") + views, likes=F("likes") + likes
+                    )
+        except Exception as e:
+            logger.error(f"Failed to flush counters for {len(deltas)} snippets: {e}")
+            self._requeue(deltas)
+            return 0
+
+        return sum(len(snippet_ids) for snippet_ids in groups.values())
+
+    def _requeue(self, deltas: Dict[str, List[int]]) -> None:
+        """
+        Merge the deltas of a failed flush back into the buffer
+        """
+        with self._lock:
+            for snippet_id, (views, likes) in deltas.items():
+                delta = self._deltas[snippet_id]
+                delta[0] += views
+                delta[1] += likes
+
+
+snippet_counters = SnippetCounterBuffer()
+atexit.register(snippet_counters.flush)
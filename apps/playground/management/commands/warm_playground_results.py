@@ -0,0 +1,72 @@
+"""
+Management command to pre-execute featured playground templates.
+
+Usage:
+    python manage.py warm_playground_results --all-templates
+
+Runs featured templates (or every template with --all-templates) through
+the execution result cache, so their first run after a deploy is served
+from the cache. Rows of the cache unused for PLAYGROUND_RESULT_RETENTION_DAYS
+are pruned first.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.playground.models import CodeTemplate
+from apps.playground.result_cache import result_cache
+from apps.playground.sandbox import ExecutionRejected
+
+
+class Command(BaseCommand):
+    help = "Pre-execute featured playground templates into the result cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all-templates",
+            action="store_true",
+            help="Run every template, not only featured ones",
+        )
+        parser.add_argument(
+            "--no-prune",
+            action="store_true",
+            help="Keep cache rows past the retention period",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        if not options["no_prune"]:
+            pruned = result_cache.prune()
+            self.stdout.write(f"Pruned {pruned} stale cached results")
+
+        templates = CodeTemplate.objects.filter(language__is_active=True)
+        if not options["all_templates"]:
+            templates = templates.filter(is_featured=True)
+
+        counts = {"cached": 0, "executed": 0, "skipped": 0}
+        for template in templates.select_related("language"):
+            try:
+                result = result_cache.run(template.language, template.code)
+            except ExecutionRejected:
+                counts["skipped"] += 1
+                continue
+
+            if result["cached"]:
+                counts["cached"] += 1
+            else:
+                counts["executed"] += 1
+                self.stdout.write(
+                    f"{template.name} ({template.language.name}): "
+                    f"{result.get('outcome')} in {result['execution_time']:.0f}ms"
+                )
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Executed {counts['executed']} templates, "
+                f"{counts['cached']} already cached, {counts['skipped']} skipped "
+                f"in {elapsed:.2f}s"
+            )
+        )
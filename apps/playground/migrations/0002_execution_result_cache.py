@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("playground", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="executionresult",
+            name="cache_key",
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name="executionresult",
+            name="hits",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="executionresult",
+            name="language",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="playground.programminglanguage",
+            ),
+        ),
+        migrations.AddField(
+            model_name="executionresult",
+            name="last_used_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="executionresult",
+            name="snippet",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="playground.codesnippet",
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:19
+
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, migrations, models, transaction
+
+TRIGRAM_INDEX = "playground_snippet_title_trgm"
+
+# The logger schema editors report through
+logger = logging.getLogger("django.db.backends.schema")
+
+
+def create_title_trigram_index(apps, schema_editor):
+    """
+    Trigram index for the gallery's case-insensitive title search
+    (``title__icontains`` compiles to ``UPPER(title) LIKE ...``), PostgreSQL
+    only; skipped when pg_trgm cannot be installed.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} "
+                "ON playground_codesnippet USING gin (UPPER(title) gin_trgm_ops)"
+            )
+    except DatabaseError as e:
+        logger.warning(f"Skipping {TRIGRAM_INDEX}: {e}")
+
+
+def drop_title_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("playground", "0002_execution_result_cache"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="codesnippet",
+            index=models.Index(
+                fields=["is_public", "-created_at", "-id"],
+                name="playground_snippet_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="codesnippet",
+            index=models.Index(
+                fields=["is_public", "language", "-created_at", "-id"],
+                name="playground_snippet_lang_idx",
+            ),
+        ),
+        migrations.RunPython(create_title_trigram_index, drop_title_trigram_index),
+    ]
@@ -66,6 +66,17 @@ class CodeSnippet(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Gallery keyset pagination, optionally per language
+            models.Index(
+                fields=["is_public", "-created_at", "-id"],
+                name="playground_snippet_recent_idx",
+            ),
+            models.Index(
+                fields=["is_public", "language", "-created_at", "-id"],
+                name="playground_snippet_lang_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title or f"Code #{self.id}"
@@ -90,14 +101,28 @@ class CodeLike(models.Model):
 
 
 class ExecutionResult(models.Model):
-    """Code execution results and stats"""
-
-    snippet = models.ForeignKey(CodeSnippet, on_delete=models.CASCADE)
+    """
+    Code execution results and stats
+
+    Rows with a cache_key back the execution result cache
+    (apps/playground/result_cache.py).
+    """
+
+    snippet = models.ForeignKey(
+        CodeSnippet, on_delete=models.CASCADE, null=True, blank=True
+    )
+    language = models.ForeignKey(
+        ProgrammingLanguage, on_delete=models.CASCADE, null=True, blank=True
+    )
+    # sha256 over language, source hash and stdin hash
+    cache_key = models.CharField(max_length=64, unique=True, null=True, blank=True)
     output = models.TextField()
     error_output = models.TextField(blank=True)
     execution_time = models.FloatField()  # in milliseconds
     memory_usage = models.IntegerField(default=0)  # in KB
     success = models.BooleanField(default=True)
+    hits = models.PositiveIntegerField(default=0)
+    last_used_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -0,0 +1,69 @@
+"""
+Keyset pagination for the snippet gallery.
+
+Pages are ordered by ``(-created_at, -id)`` and continue after the last
+row of the previous page, so every page costs one index range scan no
+matter how deep it is (OFFSET pagination re-reads all skipped rows).
+"""
+
+import base64
+import binascii
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+
+ORDERING = ("-created_at", "-id")
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows and the cursor of the next page, if any"""
+
+    object_list: List
+    next_cursor: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def encode_cursor(created_at: datetime, pk) -> str:
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, uuid.UUID]]:
+    """(created_at, id) of a cursor, or None when it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def keyset_paginate(
+    queryset: QuerySet, cursor: Optional[str], page_size: int
+) -> KeysetPage:
+    """
+    Page of ``queryset`` after ``cursor`` (first page when missing/invalid)
+    """
+    queryset = queryset.order_by(*ORDERING)
+
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, pk = position
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    rows = list(queryset[: page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].pk)
+
+    return KeysetPage(rows, next_cursor)
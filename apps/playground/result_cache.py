@@ -0,0 +1,271 @@
+"""
+Playground Execution Result Cache
+=================================
+
+Content-addressed cache of playground executions: the key is a hash of
+the language, the source hash and the stdin hash, so re-running a template
+or an unchanged snippet returns the stored result instead of executing.
+
+- Front: in-process LRU of PLAYGROUND_RESULT_CACHE_SIZE results
+- Back: ExecutionResult rows with a ``cache_key``, shared by all workers,
+  pruned by age (PLAYGROUND_RESULT_RETENTION_DAYS) and, least recently used
+  first, down to PLAYGROUND_RESULT_MAX_ROWS
+- Only successful runs and compile errors are stored; runtime failures,
+  timeouts and sandbox errors may not repeat and are always re-executed
+- Sources using clocks, randomness, hashing/identity, set ordering,
+  directory listings or threads are not stored. The check is a heuristic,
+  so clients can also opt out per request (``"cache": false``)
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ExecutionResult, ProgrammingLanguage
+from .sandbox import execution_service
+
+logger = logging.getLogger(__name__)
+
+MAX_ROWS = 10000
+COMPILE_ERROR_PREFIX = "Compilation error:"
+PRUNE_EVERY = 200  # stores between table size checks
+
+# Identifiers whose output changes between runs of the same source
+NONDETERMINISTIC = re.compile(
+    r"\b(random|randint|rand|srand|random_device|mt19937|urandom|getrandom|"
+    r"time|clock|chrono|datetime|Date|uuid|uuid4|secrets|getpid|performance|"
+    r"hrtime|hash|id|set|frozenset|listdir|scandir|readdir|glob|"
+    r"thread|threading|Thread|multiprocessing|asyncio|Promise|setTimeout)\b"
+    r"|/dev/u?random"
+)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def result_key(language: str, code: str, stdin: str = "") -> str:
+    """Cache key over (language, source hash, stdin hash)"""
+    return _sha256(f"{language.lower()}\0{_sha256(code)}\0{_sha256(stdin)}")
+
+
+def is_deterministic(code: str) -> bool:
+    return NONDETERMINISTIC.search(code) is None
+
+
+def is_cacheable(result: Dict) -> bool:
+    """Successful runs and compile errors; other failures may not repeat"""
+    outcome = result.get("outcome")
+    return outcome == "succeeded" or (
+        outcome == "failed" and bool(result.get("compile_error"))
+    )
+
+
+class ExecutionResultCache:
+    """
+    LRU front over ExecutionResult rows, wrapping the execution service
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stored": 0}
+        self._stores_since_prune = 0
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        return getattr(settings, "PLAYGROUND_RESULT_CACHE_SIZE", 512)
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _remember(self, key: str, result: Dict) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, language: str, code: str, stdin: str = "") -> Optional[Dict]:
+        """Cached result for the run, or None"""
+        key = result_key(language, code, stdin)
+
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return {**result, "cached": True}
+
+        row = ExecutionResult.objects.filter(cache_key=key).first()
+        if row is None or not (
+            row.success or row.error_output.startswith(COMPILE_ERROR_PREFIX)
+        ):
+            # Runtime failures stored by older versions are not served
+            self._count("misses")
+            return None
+
+        ExecutionResult.objects.filter(pk=row.pk).update(
+            hits=F("hits") + 1, last_used_at=timezone.now()
+        )
+        result = {
+            "success": row.success,
+            "output": row.output,
+            "error": row.error_output,
+            "execution_time": row.execution_time,
+            "outcome": "succeeded" if row.success else "failed",
+            "compile_error": not row.success,
+        }
+        self._remember(key, result)
+        self._count("db_hits")
+        return {**result, "cached": True}
+
+    def store(
+        self,
+        language: ProgrammingLanguage,
+        code: str,
+        stdin: str,
+        result: Dict,
+    ) -> bool:
+        """Store a cacheable, deterministic run; returns whether it was stored"""
+        if not is_cacheable(result):
+            return False
+        if not is_deterministic(code):
+            return False
+
+        key = result_key(language.name, code, stdin)
+        entry = {
+            "success": result["success"],
+            "output": result["output"],
+            "error": result["error"],
+            "execution_time": result["execution_time"],
+            "outcome": result["outcome"],
+            "compile_error": bool(result.get("compile_error")),
+        }
+        try:
+            ExecutionResult.objects.update_or_create(
+                cache_key=key,
+                defaults={
+                    "language": language,
+                    "output": entry["output"],
+                    "error_output": entry["error"],
+                    "execution_time": entry["execution_time"],
+                    "success": entry["success"],
+                    "last_used_at": timezone.now(),
+                },
+            )
+        except IntegrityError:
+            # Stored concurrently by another worker
+            pass
+
+        self._remember(key, entry)
+        self._count("stored")
+
+        with self._lock:
+            self._stores_since_prune += 1
+            due = self._stores_since_prune >= PRUNE_EVERY
+            if due:
+                self._stores_since_prune = 0
+        if due:
+            self.trim()
+        return True
+
+    def run(
+        self,
+        language: ProgrammingLanguage,
+        code: str,
+        stdin: str = "",
+        use_cache: bool = True,
+    ) -> Dict:
+        """Cached result, or execute through the service and store"""
+        if use_cache:
+            cached = self.get(language.name, code, stdin)
+            if cached is not None:
+                return cached
+
+        result = execution_service.run(code, language.name, stdin)
+        if use_cache:
+            self.store(language, code, stdin, result)
+        return {**result, "cached": False}
+
+    def submit(
+        self,
+        language: ProgrammingLanguage,
+        code: str,
+        stdin: str = "",
+        use_cache: bool = True,
+    ):
+        """
+        (cached result, None) on a hit, else (None, job_id) with the result
+        stored when the job finishes
+        """
+        if not use_cache:
+            return None, execution_service.submit(code, language.name, stdin)
+
+        cached = self.get(language.name, code, stdin)
+        if cached is not None:
+            return cached, None
+
+        job_id = execution_service.submit(
+            code,
+            language.name,
+            stdin,
+            on_complete=lambda result: self.store(language, code, stdin, result),
+        )
+        return None, job_id
+
+    def prune(self, days: Optional[int] = None) -> int:
+        """
+        Delete cache rows not used for ``days``, then trim the table to its
+        size cap; returns the count
+        """
+        if days is None:
+            days = getattr(settings, "PLAYGROUND_RESULT_RETENTION_DAYS", 30)
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = ExecutionResult.objects.filter(
+            cache_key__isnull=False, last_used_at__lt=cutoff
+        ).delete()
+        return deleted + self.trim()
+
+    def trim(self, max_rows: Optional[int] = None) -> int:
+        """Delete the least recently used cache rows beyond ``max_rows``"""
+        if max_rows is None:
+            max_rows = getattr(settings, "PLAYGROUND_RESULT_MAX_ROWS", MAX_ROWS)
+        rows = ExecutionResult.objects.filter(cache_key__isnull=False)
+        overflow = list(
+            rows.order_by("-last_used_at", "-id").values_list("id", flat=True)[
+                max_rows:
+            ]
+        )
+        if not overflow:
+            return 0
+        deleted, _ = ExecutionResult.objects.filter(id__in=overflow).delete()
+        return deleted
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop the in-process LRU (database rows are kept)"""
+        with self._lock:
+            self._entries.clear()
+            for stat in self._stats:
+                self._stats[stat] = 0
+
+
+# Global cache used by the playground views
+result_cache = ExecutionResultCache()
@@ -0,0 +1,691 @@
+"""
+Playground Execution Service
+============================
+
+Runs playground code off the request thread, on a bounded pool of
+executor threads, in resource-limited child processes.
+
+- Interpreted languages (Python, JavaScript) run in pre-warmed worker
+  processes: the interpreter is already started and waits for code on
+  stdin, so a run only pays for the code itself. Each worker runs one
+  submission and is then replaced in the background. Runs that read
+  program input start a fresh interpreter on a source file instead.
+- Compiled languages (C, C++) compile once per source hash into an on-disk
+  compile cache; repeated runs of the same code skip the compiler.
+- Every child gets CPU, memory, file size and open-file rlimits, a wall
+  clock timeout, a private working directory and a minimal environment.
+- Submissions can be awaited (``run``) or queued and polled by job id
+  (``submit``/``job``); queue wait, run time (with a latency histogram)
+  and throughput are measured per language.
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import shutil
+import signal
+import subprocess  # nosec B404 - sandboxed execution is the purpose of this module
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+JOB_CACHE_PREFIX = "playground:job"
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+DEFAULT_LIMITS = {
+    "cpu_seconds": 5,
+    "wall_seconds": 10,
+    "compile_seconds": 30,
+    "memory_mb": 256,
+    "file_size_mb": 1,
+    "open_files": 64,
+    "output_bytes": 64 * 1024,
+}
+
+PYTHON_RUNNER = (
+    "import sys\n"
+    "source = sys.stdin.read()\n"
+    "sys.argv = ['main.py']\n"
+    "exec(compile(source, 'main.py', 'exec'), {'__name__': '__main__'})\n"
+)
+
+NODE_RUNNER = (
+    "const chunks = [];"
+    "process.stdin.on('data', (c) => chunks.push(c));"
+    "process.stdin.on('end', () => {"
+    "  const Module = require('module');"
+    "  const m = new Module('main.js');"
+    "  m.filename = 'main.js';"
+    "  m.paths = [];"
+    "  m._compile(Buffer.concat(chunks).toString(), 'main.js');"
+    "});"
+)
+
+
+class ExecutionRejected(Exception):
+    """Raised when the execution queue is full"""
+
+
+@dataclass(frozen=True)
+class LanguageSpec:
+    """How to run one playground language"""
+
+    name: str
+    kind: str  # "warm", "compiled" or "cold"
+    command: Optional[Callable[[dict], List[str]]] = None
+    compile_command: Optional[Callable[[str, str], List[str]]] = None
+    # Warm languages: runs ``source_file`` when the program reads stdin
+    script_command: Optional[Callable[[dict], List[str]]] = None
+    source_file: Optional[str] = None
+    limit_memory: bool = True
+
+
+def _node_command(limits, *args):
+    return ["node", f"--max-old-space-size={limits['memory_mb']}", *args]
+
+
+LANGUAGES: Dict[str, LanguageSpec] = {
+    "python": LanguageSpec(
+        "python",
+        "warm",
+        lambda limits: [sys.executable, "-I", "-u", "-c", PYTHON_RUNNER],
+        script_command=lambda limits: [sys.executable, "-I", "-u", "main.py"],
+        source_file="main.py",
+    ),
+    # V8 reserves far more address space than it uses: cap the heap instead
+    "javascript": LanguageSpec(
+        "javascript",
+        "warm",
+        lambda limits: _node_command(limits, "-e", NODE_RUNNER),
+        script_command=lambda limits: _node_command(limits, "main.js"),
+        source_file="main.js",
+        limit_memory=False,
+    ),
+    "c": LanguageSpec(
+        "c",
+        "compiled",
+        compile_command=lambda source, output: [
+            "gcc",
+            "-O2",
+            "-x",
+            "c",
+            source,
+            "-o",
+            output,
+            "-lm",
+        ],
+    ),
+    "c++": LanguageSpec(
+        "c++",
+        "compiled",
+        compile_command=lambda source, output: [
+            "g++",
+            "-O2",
+            "-x",
+            "c++",
+            source,
+            "-o",
+            output,
+        ],
+    ),
+    "c#": LanguageSpec(
+        "c#",
+        "cold",
+        lambda limits: ["dotnet", "run", "--project", "main.cs"],
+        source_file="main.cs",
+        limit_memory=False,
+    ),
+}
+
+
+def get_limits() -> dict:
+    return {**DEFAULT_LIMITS, **getattr(settings, "PLAYGROUND_LIMITS", {})}
+
+
+def _sandbox_env() -> dict:
+    """Minimal environment: no secrets from the web process"""
+    return {
+        "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+        "LANG": "C.UTF-8",
+        "HOME": "/tmp",  # nosec B108 - throwaway HOME for sandboxed children
+    }
+
+
+def _resource_limiter(limits: dict, limit_memory: bool):
+    """preexec_fn applying the sandbox rlimits in the child"""
+    if resource is None:
+        return None
+
+    def apply():
+        cpu = int(limits["cpu_seconds"])
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+        if limit_memory:
+            memory = int(limits["memory_mb"]) * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        file_size = int(limits["file_size_mb"]) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_FSIZE, (file_size, file_size))
+        files = int(limits["open_files"])
+        resource.setrlimit(resource.RLIMIT_NOFILE, (files, files))
+
+    return apply
+
+
+def _kill(process: subprocess.Popen) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    except AttributeError:  # pragma: no cover - non-POSIX platforms
+        process.kill()
+
+
+def _result(success, output="", error="", execution_time=0.0, **extra) -> dict:
+    return {
+        "success": success,
+        "output": output,
+        "error": error,
+        "execution_time": execution_time,
+        **extra,
+    }
+
+
+class Worker:
+    """A started child process with its own working directory"""
+
+    def __init__(
+        self,
+        command: List[str],
+        limits: dict,
+        limit_memory: bool,
+        files: Optional[Dict[str, str]] = None,
+    ):
+        self.workdir = tempfile.mkdtemp(prefix="playground-")
+        for name, content in (files or {}).items():
+            Path(self.workdir, name).write_text(content)
+        self.process = subprocess.Popen(  # nosec B603 - fixed argv, no shell
+            command,
+            cwd=self.workdir,
+            env=_sandbox_env(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            preexec_fn=_resource_limiter(limits, limit_memory),
+            start_new_session=True,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, stdin: bytes, limits: dict) -> Tuple[int, bytes, bytes, bool]:
+        """Feed stdin and wait; returns (returncode, stdout, stderr, timed_out)"""
+        try:
+            stdout, stderr = self.process.communicate(
+                stdin, timeout=limits["wall_seconds"]
+            )
+            return self.process.returncode, stdout, stderr, False
+        except subprocess.TimeoutExpired:
+            _kill(self.process)
+            stdout, stderr = self.process.communicate()
+            return self.process.returncode, stdout, stderr, True
+
+    def close(self) -> None:
+        if self.alive:
+            _kill(self.process)
+            self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout, self.process.stderr):
+            if stream:
+                stream.close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class WarmPool:
+    """
+    Idle, pre-started interpreter processes for one language
+    """
+
+    def __init__(self, spec: LanguageSpec, size: int):
+        self.spec = spec
+        self.size = size
+        self._idle: "queue.Queue[Worker]" = queue.Queue()
+        self._refilling = threading.Lock()
+
+    def _spawn(self) -> Worker:
+        limits = get_limits()
+        return Worker(self.spec.command(limits), limits, self.spec.limit_memory)
+
+    def acquire(self) -> Tuple[Worker, bool]:
+        """A ready worker and whether it was warm; starts a refill"""
+        worker, warm = None, False
+        while worker is None:
+            try:
+                candidate = self._idle.get_nowait()
+            except queue.Empty:
+                worker = self._spawn()
+                break
+            if candidate.alive:
+                worker, warm = candidate, True
+            else:
+                candidate.close()
+
+        self.refill_async()
+        return worker, warm
+
+    def refill(self) -> None:
+        if not self._refilling.acquire(blocking=False):
+            return
+        try:
+            while self._idle.qsize() < self.size:
+                self._idle.put(self._spawn())
+        except OSError as e:
+            logger.warning(f"Could not start {self.spec.name} worker: {e}")
+        finally:
+            self._refilling.release()
+
+    def refill_async(self) -> None:
+        if self.size > 0:
+            threading.Thread(target=self.refill, daemon=True).start()
+
+    @property
+    def idle(self) -> int:
+        return self._idle.qsize()
+
+    def shutdown(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class CompileCache:
+    """
+    Compiled binaries on disk keyed by a hash of compiler command and source;
+    least recently used entries beyond ``max_entries`` are removed
+    """
+
+    def __init__(self, directory: Path, max_entries: int = 256):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, spec: LanguageSpec, code: str) -> str:
+        command = " ".join(spec.compile_command("{source}", "{output}"))
+        return hashlib.sha256(f"{command}\0{code}".encode()).hexdigest()
+
+    def binary(self, spec: LanguageSpec, code: str) -> Tuple[Optional[Path], str]:
+        """(binary path, "") or (None, compiler errors)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        key = self.key(spec, code)
+        binary = self.directory / key
+        errors = self.directory / f"{key}.err"
+
+        for cached in (binary, errors):
+            if cached.exists():
+                with self._lock:
+                    self.hits += 1
+                os.utime(cached)
+                if cached is errors:
+                    return None, cached.read_text()
+                return binary, ""
+
+        with self._lock:
+            self.misses += 1
+        return self._compile(spec, code, binary, errors)
+
+    def _compile(self, spec, code, binary, errors):
+        limits = get_limits()
+        with tempfile.TemporaryDirectory(prefix="playground-cc-") as workdir:
+            source = Path(workdir) / "main.src"
+            output = Path(workdir) / "main"
+            source.write_text(code)
+            try:
+                compiled = subprocess.run(  # nosec B603 - fixed argv, no shell
+                    spec.compile_command(str(source), str(output)),
+                    cwd=workdir,
+                    env=_sandbox_env(),
+                    capture_output=True,
+                    text=True,
+                    timeout=limits["compile_seconds"],
+                )
+            except subprocess.TimeoutExpired:
+                return None, "Compilation timed out"
+
+            if compiled.returncode != 0:
+                message = compiled.stderr.replace(str(source), "main")
+                errors.write_text(message)
+                self._evict()
+                return None, message
+
+            # Publish atomically so concurrent runs never see a partial file
+            staged = self.directory / f".{binary.name}.{uuid.uuid4().hex}"
+            shutil.move(str(output), staged)
+            os.replace(staged, binary)
+
+        self._evict()
+        return binary, ""
+
+    def _evict(self) -> None:
+        entries = sorted(
+            (p for p in self.directory.iterdir() if not p.name.startswith(".")),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for path in entries[: max(0, len(entries) - self.max_entries)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+class ExecutionStats:
+    """Queue wait, run time and throughput per language in this process"""
+
+    def __init__(self):
+        self._languages: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self._completed: deque = deque(maxlen=10000)
+        self._lock = threading.Lock()
+
+    def record(self, language, queue_wait, run_time, outcome, warm) -> None:
+        run_ms = run_time * 1000
+        bucket = next(
+            (f"le_{edge}" for edge in LATENCY_BUCKETS_MS if run_ms <= edge),
+            f"gt_{LATENCY_BUCKETS_MS[-1]}",
+        )
+        with self._lock:
+            stats = self._languages[language]
+            stats["executions"] += 1
+            stats[outcome] += 1
+            stats["warm_starts" if warm else "cold_starts"] += 1
+            stats["queue_wait"] += queue_wait
+            stats["max_queue_wait"] = max(stats["max_queue_wait"], queue_wait)
+            stats["run_time"] += run_time
+            stats[bucket] += 1
+            self._completed.append(time.monotonic())
+
+    def report(self) -> Dict:
+        with self._lock:
+            cutoff = time.monotonic() - 60
+            throughput = sum(1 for t in self._completed if t >= cutoff)
+            languages = {}
+            for language, stats in self._languages.items():
+                count = stats["executions"]
+                languages[language] = {
+                    "executions": int(count),
+                    "succeeded": int(stats["succeeded"]),
+                    "failed": int(stats["failed"]),
+                    "timed_out": int(stats["timed_out"]),
+                    "errors": int(stats["error"]),
+                    "warm_starts": int(stats["warm_starts"]),
+                    "cold_starts": int(stats["cold_starts"]),
+                    "avg_queue_wait_ms": round(stats["queue_wait"] / count * 1000, 2),
+                    "max_queue_wait_ms": round(stats["max_queue_wait"] * 1000, 2),
+                    "avg_run_ms": round(stats["run_time"] / count * 1000, 2),
+                    "latency_histogram_ms": {
+                        bucket: int(stats[bucket])
+                        for bucket in [f"le_{edge}" for edge in LATENCY_BUCKETS_MS]
+                        + [f"gt_{LATENCY_BUCKETS_MS[-1]}"]
+                    },
+                }
+        return {"completed_last_minute": throughput, "languages": languages}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._languages.clear()
+            self._completed.clear()
+
+
+class ExecutionService:
+    """
+    Bounded execution queue in front of the warm pools and compile cache
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pools: Dict[str, WarmPool] = {}
+        self._compile_cache: Optional[CompileCache] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.stats = ExecutionStats()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "PLAYGROUND_WORKERS", 4),
+                    thread_name_prefix="playground",
+                )
+            return self._executor
+
+    @property
+    def compile_cache(self) -> CompileCache:
+        with self._lock:
+            if self._compile_cache is None:
+                self._compile_cache = CompileCache(
+                    getattr(
+                        settings,
+                        "PLAYGROUND_COMPILE_CACHE_DIR",
+                        Path(tempfile.gettempdir()) / "playground-compile-cache",
+                    ),
+                    getattr(settings, "PLAYGROUND_COMPILE_CACHE_ENTRIES", 256),
+                )
+            return self._compile_cache
+
+    def pool(self, spec: LanguageSpec) -> WarmPool:
+        with self._lock:
+            if spec.name not in self._pools:
+                sizes = getattr(settings, "PLAYGROUND_WARM_WORKERS", {})
+                self._pools[spec.name] = WarmPool(spec, sizes.get(spec.name, 1))
+            return self._pools[spec.name]
+
+    def warm_up(self) -> None:
+        """Start the configured idle workers ahead of the first request"""
+        for spec in LANGUAGES.values():
+            if spec.kind == "warm":
+                self.pool(spec).refill_async()
+
+    def _enqueue(self, code, language, stdin, job_id=None, on_complete=None):
+        with self._lock:
+            if self._pending >= getattr(settings, "PLAYGROUND_MAX_QUEUE", 32):
+                raise ExecutionRejected("Execution queue is full")
+            self._pending += 1
+        return self.executor.submit(
+            self._run, code, language, stdin, time.monotonic(), job_id, on_complete
+        )
+
+    def run(
+        self,
+        code: str,
+        language: str,
+        stdin: str = "",
+        on_complete: Optional[Callable[[dict], None]] = None,
+    ) -> dict:
+        """
+        Execute through the queue and wait for the result; ``on_complete``
+        is called with the result in the executor thread
+        """
+        future = self._enqueue(code, language, stdin, on_complete=on_complete)
+        limits = get_limits()
+        try:
+            return future.result(
+                timeout=limits["wall_seconds"] + limits["compile_seconds"] + 30
+            )
+        except FutureTimeoutError:
+            return _result(False, error="Execution queue timed out", outcome="error")
+
+    def submit(
+        self,
+        code: str,
+        language: str,
+        stdin: str = "",
+        on_complete: Optional[Callable[[dict], None]] = None,
+    ) -> str:
+        """Queue an execution; poll ``job(job_id)`` for the result"""
+        job_id = uuid.uuid4().hex
+        self._store_job(job_id, {"status": "queued"})
+        self._enqueue(code, language, stdin, job_id, on_complete)
+        return job_id
+
+    def job(self, job_id: str) -> Optional[dict]:
+        return cache.get(f"{JOB_CACHE_PREFIX}:{job_id}")
+
+    def _store_job(self, job_id: str, payload: dict) -> None:
+        cache.set(
+            f"{JOB_CACHE_PREFIX}:{job_id}",
+            payload,
+            getattr(settings, "PLAYGROUND_JOB_TTL", 300),
+        )
+
+    def _run(self, code, language, stdin, enqueued_at, job_id, on_complete):
+        queue_wait = time.monotonic() - enqueued_at
+        with self._lock:
+            self._pending -= 1
+        if job_id:
+            self._store_job(job_id, {"status": "running"})
+
+        started = time.monotonic()
+        try:
+            result, outcome, warm = self.execute(code, language, stdin)
+        except Exception as e:
+            logger.error(f"Playground execution failed: {e}")
+            result, outcome, warm = (
+                _result(False, error="Execution error"),
+                "error",
+                False,
+            )
+        run_time = time.monotonic() - started
+
+        result["outcome"] = outcome
+        result["queue_time"] = round(queue_wait * 1000, 2)
+        self.stats.record(language, queue_wait, run_time, outcome, warm)
+        if on_complete:
+            try:
+                on_complete(result)
+            except Exception as e:
+                logger.error(f"Playground completion callback failed: {e}")
+        if job_id:
+            self._store_job(job_id, {"status": "finished", "result": result})
+        return result
+
+    def execute(
+        self, code: str, language: str, stdin: str = ""
+    ) -> Tuple[dict, str, bool]:
+        """
+        Run ``code`` now in this thread; returns (result, outcome, warm).
+
+        ``outcome`` is succeeded, failed (including compile errors),
+        timed_out or error (the sandbox itself failed).
+        """
+        spec = LANGUAGES.get(language.lower())
+        if spec is None:
+            return (
+                _result(
+                    False, error=f"Language {language} not yet supported for execution"
+                ),
+                "failed",
+                False,
+            )
+
+        limits = get_limits()
+        started = time.monotonic()
+        warm = False
+
+        if spec.kind == "warm" and not stdin:
+            worker, warm = self.pool(spec).acquire()
+            stdin = code
+        elif spec.kind == "compiled":
+            binary, errors = self.compile_cache.binary(spec, code)
+            if binary is None:
+                elapsed = (time.monotonic() - started) * 1000
+                return (
+                    _result(
+                        False,
+                        error=f"Compilation error:\n{errors}",
+                        execution_time=elapsed,
+                        compile_error=True,
+                    ),
+                    "failed",
+                    False,
+                )
+            worker = Worker([str(binary)], limits, spec.limit_memory)
+        else:
+            command = spec.script_command if spec.kind == "warm" else spec.command
+            worker = Worker(
+                command(limits),
+                limits,
+                spec.limit_memory,
+                files={spec.source_file: code},
+            )
+
+        run_started = time.monotonic()
+        try:
+            returncode, stdout, stderr, timed_out = worker.run(stdin.encode(), limits)
+        finally:
+            worker.close()
+        execution_time = (time.monotonic() - run_started) * 1000
+
+        output = stdout[: limits["output_bytes"]].decode(errors="replace")
+        error = stderr[: limits["output_bytes"]].decode(errors="replace")
+
+        if timed_out:
+            message = (
+                f"Code execution timed out ({limits['wall_seconds']} seconds limit)"
+            )
+            return _result(False, output, message, execution_time), "timed_out", warm
+        if returncode == -signal.SIGXCPU or returncode == -signal.SIGKILL:
+            message = f"Code exceeded its CPU limit ({limits['cpu_seconds']} seconds)"
+            return _result(False, output, message, execution_time), "timed_out", warm
+
+        success = returncode == 0
+        return (
+            _result(success, output, "" if success else error, execution_time),
+            "succeeded" if success else "failed",
+            warm,
+        )
+
+    def report(self) -> Dict:
+        report = self.stats.report()
+        with self._lock:
+            report["queued"] = self._pending
+            pools = dict(self._pools)
+            compile_cache = self._compile_cache
+        report["idle_workers"] = {name: pool.idle for name, pool in pools.items()}
+        if compile_cache is not None:
+            report["compile_cache"] = {
+                "hits": compile_cache.hits,
+                "misses": compile_cache.misses,
+            }
+        return report
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown()
+
+
+# Global service used by the playground views
+execution_service = ExecutionService()
@@ -12,9 +12,12 @@ urlpatterns = [
     path("gallery/", views.gallery, name="gallery"),
     # API endpoints
     path("api/execute/", views.execute_code, name="execute_code"),
+    path("api/jobs/", views.submit_code, name="submit_code"),
+    path("api/jobs/<str:job_id>/", views.job_status, name="job_status"),
     path("api/save/", views.save_snippet, name="save_snippet"),
     path("api/template/<int:template_id>/", views.get_template, name="get_template"),
     # Snippet sharing
     path("snippet/<uuid:pk>/", views.snippet_detail, name="snippet_detail"),
     path("share/<uuid:pk>/", views.snippet_detail, name="share_snippet"),
+    path("snippet/<uuid:pk>/like/", views.like_snippet, name="like_snippet"),
 ]
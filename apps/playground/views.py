@@ -1,14 +1,18 @@
 import json
-import os
-import subprocess
-import tempfile
-import time
 
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
 
-from .models import CodeSnippet, CodeTemplate, ProgrammingLanguage
+from .counters import snippet_counters
+from .models import CodeLike, CodeSnippet, CodeTemplate, ProgrammingLanguage
+from .pagination import keyset_paginate
+from .result_cache import result_cache
+from .sandbox import ExecutionRejected, execution_service
+
+GALLERY_PAGE_SIZE = 24
 
 
 def index(request):
@@ -45,134 +49,88 @@ def editor(request, language_id=None):
     return render(request, "playground/editor.html", context)
 
 
-@csrf_exempt
-def execute_code(request):
-    """Execute code and return results"""
+def _parse_execution_request(request):
+    """
+    (code, language, stdin, use cache, error response) from a JSON execution
+    request; clients opt out of the result cache with ``"cache": false``
+    """
     if request.method != "POST":
-        return JsonResponse({"error": "POST method required"}, status=405)
+        error = JsonResponse({"error": "POST method required"}, status=405)
+        return None, None, None, False, error
 
     try:
         data = json.loads(request.body)
-        code = data.get("code", "").strip()
-        language_id = data.get("language_id")
+    except json.JSONDecodeError:
+        error = JsonResponse({"error": "Invalid JSON"}, status=400)
+        return None, None, None, False, error
 
-        if not code or not language_id:
-            return JsonResponse({"error": "Code and language required"}, status=400)
+    code = data.get("code", "").strip()
+    language_id = data.get("language_id")
+    stdin = data.get("stdin") or ""
+    if not code or not language_id or not isinstance(stdin, str):
+        error = JsonResponse({"error": "Code and language required"}, status=400)
+        return None, None, None, False, error
 
-        language = get_object_or_404(ProgrammingLanguage, id=language_id)
+    language = get_object_or_404(ProgrammingLanguage, id=language_id)
+    return code, language, stdin, data.get("cache", True) is not False, None
 
-        # Execute code based on language
-        result = _execute_code_safely(code, language)
 
-        return JsonResponse(result)
+def _busy_response():
+    return JsonResponse(
+        {"error": "The playground is busy, please try again shortly"}, status=503
+    )
 
-    except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+@csrf_exempt
+def execute_code(request):
+    """Execute code and return results (served from the result cache when
+    the same source and input ran before)"""
+    code, language, stdin, use_cache, error = _parse_execution_request(request)
+    if error:
+        return error
+
+    try:
+        result = result_cache.run(language, code, stdin, use_cache=use_cache)
+    except ExecutionRejected:
+        return _busy_response()
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
+    return JsonResponse(result)
+
 
-def _execute_code_safely(code, language):  # noqa: C901
-    """Safely execute code in a sandbox"""
-    start_time = time.time()
+@csrf_exempt
+def submit_code(request):
+    """Queue code for execution; poll the returned status URL for the result"""
+    code, language, stdin, use_cache, error = _parse_execution_request(request)
+    if error:
+        return error
 
     try:
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=f".{language.extension}", delete=False
-        ) as f:
-            f.write(code)
-            temp_file = f.name
-
-        # Simple execution based on language
-        if language.name.lower() == "python":
-            result = subprocess.run(
-                ["python", temp_file],
-                capture_output=True,
-                text=True,
-                timeout=10,  # 10 second timeout
-            )
-        elif language.name.lower() == "javascript":
-            result = subprocess.run(
-                ["node", temp_file], capture_output=True, text=True, timeout=10
-            )
-        elif language.name.lower() in ["c", "c++"]:
-            # Compile first
-            exe_file = temp_file.replace(f".{language.extension}", ".exe")
-            compiler = "gcc" if language.name.lower() == "c" else "g++"
-
-            compile_result = subprocess.run(
-                [compiler, temp_file, "-o", exe_file],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            if compile_result.returncode != 0:
-                return {
-                    "success": False,
-                    "output": "",
-                    "error": f"Compilation error:\n{compile_result.stderr}",
-                    "execution_time": (time.time() - start_time) * 1000,
-                }
-
-            # Run executable
-            result = subprocess.run(
-                [exe_file], capture_output=True, text=True, timeout=10
-            )
-
-            # Clean up exe file
-            try:
-                os.unlink(exe_file)
-            except OSError:
-                # File may already be deleted
-                pass
-
-        elif language.name.lower() == "c#":
-            # Basic C# execution (requires mono or dotnet)
-            result = subprocess.run(
-                ["dotnet", "run", "--project", temp_file],
-                capture_output=True,
-                text=True,
-                timeout=15,
-            )
-        else:
-            return {
-                "success": False,
-                "output": "",
-                "error": f"Language {language.name} not yet supported for execution",
-                "execution_time": 0,
-            }
+        cached, job_id = result_cache.submit(language, code, stdin, use_cache=use_cache)
+    except ExecutionRejected:
+        return _busy_response()
 
-        execution_time = (time.time() - start_time) * 1000
+    if cached is not None:
+        return JsonResponse({"status": "finished", "result": cached})
 
-        # Clean up temp file
-        try:
-            os.unlink(temp_file)
-        except OSError:
-            # File may already be deleted
-            pass
+    return JsonResponse(
+        {
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": reverse("playground:job_status", args=[job_id]),
+        },
+        status=202,
+    )
 
-        return {
-            "success": result.returncode == 0,
-            "output": result.stdout,
-            "error": result.stderr if result.returncode != 0 else "",
-            "execution_time": execution_time,
-        }
 
-    except subprocess.TimeoutExpired:
-        return {
-            "success": False,
-            "output": "",
-            "error": "Code execution timed out (10 seconds limit)",
-            "execution_time": 10000,
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "output": "",
-            "error": f"Execution error: {str(e)}",
-            "execution_time": (time.time() - start_time) * 1000,
-        }
+@require_GET
+def job_status(request, job_id):
+    """Status of a queued execution, with the result once finished"""
+    job = execution_service.job(job_id)
+    if job is None:
+        return JsonResponse({"error": "Unknown or expired job"}, status=404)
+    return JsonResponse({"job_id": job_id, **job})
 
 
 @csrf_exempt
@@ -205,13 +163,29 @@ def save_snippet(request):
         return JsonResponse({"error": str(e)}, status=500)
 
 
+def _record_counts(snippet, views=0, likes=0):
+    """
+    Buffer a view/like and show up-to-date counts on ``snippet``
+
+    Pending deltas are read before recording: if recording triggers a
+    flush, the loaded row is stale by exactly those deltas.
+    """
+    pending_views, pending_likes = snippet_counters.pending(snippet.pk)
+    if views:
+        snippet_counters.record_view(snippet.pk)
+    if likes:
+        snippet_counters.record_like(snippet.pk, likes)
+    snippet.views += pending_views + views
+    snippet.likes += pending_likes + likes
+    return snippet
+
+
 def snippet_detail(request, pk):
     """View a specific code snippet"""
     snippet = get_object_or_404(CodeSnippet, id=pk)
 
-    # Increment view count
-    snippet.views += 1
-    snippet.save(update_fields=["views"])
+    # Buffered view count, flushed in bulk
+    _record_counts(snippet, views=1)
 
     context = {
         "snippet": snippet,
@@ -219,25 +193,45 @@ def snippet_detail(request, pk):
     return render(request, "playground/snippet_detail.html", context)
 
 
+@require_POST
+def like_snippet(request, pk):
+    """Toggle the current user's like on a snippet"""
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+
+    snippet = get_object_or_404(CodeSnippet, id=pk)
+    like, created = CodeLike.objects.get_or_create(user=request.user, snippet=snippet)
+    if not created:
+        like.delete()
+    _record_counts(snippet, likes=1 if created else -1)
+
+    return JsonResponse({"liked": created, "likes": snippet.likes})
+
+
 def gallery(request):
-    """Public code gallery"""
+    """Public code gallery, keyset-paginated newest first"""
     snippets = CodeSnippet.objects.filter(is_public=True).select_related(
         "language", "user"
     )
     languages = ProgrammingLanguage.objects.filter(is_active=True)
 
-    # Filter by language
+    # Filter by language (resolved to an id so the composite index applies)
     language_filter = request.GET.get("language")
     if language_filter:
-        snippets = snippets.filter(language__name=language_filter)
+        language = languages.filter(name=language_filter).first()
+        snippets = snippets.filter(language=language) if language else snippets.none()
 
-    # Search
-    search = request.GET.get("search")
+    # Search (trigram-indexed on PostgreSQL)
+    search = request.GET.get("search", "").strip()
     if search:
         snippets = snippets.filter(title__icontains=search)
 
+    page = keyset_paginate(snippets, request.GET.get("after"), GALLERY_PAGE_SIZE)
+
     context = {
-        "snippets": snippets,
+        "snippets": page.object_list,
+        "page": page,
+        "next_cursor": page.next_cursor,
         "languages": languages,
         "current_language": language_filter,
         "search_query": search,
@@ -8,7 +8,8 @@ from datetime import datetime, timedelta
 
 from django.conf import settings
 from django.core.cache import cache
-from django.core.mail import send_mail
+
+from apps.main.mail_outbox import queue_mail_or_send
 
 logger = logging.getLogger(__name__)
 
@@ -121,12 +122,11 @@ class AlertManager:
             # Create email content
             message = self._format_email_message(alert)
 
-            send_mail(
+            queue_mail_or_send(
                 subject=subject,
                 message=message,
                 from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[recipient],
-                fail_silently=True,
             )
 
             logger.info(f"Email alert sent for {alert['id']}")
@@ -17,12 +17,17 @@ Features:
 - Email alerting with cooldown periods
 - Structured logging and history tracking
 - Uptime statistics with daily history
+- Concurrent check execution with per-check timeouts and result TTLs
+- Snapshot (liveness) mode that serves the last computed results
 """
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 import requests
 
@@ -39,10 +44,11 @@ import logging
 
 from django.conf import settings
 from django.core.cache import cache
-from django.core.mail import send_mail
 from django.db import connection
 from django.utils import timezone
 
+from apps.main.mail_outbox import queue_mail_or_send
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,6 +77,28 @@ class AlertConfig:
     warning_threshold: int = 2
 
 
+@dataclass
+class CheckPolicy:
+    """Execution policy for one health check"""
+
+    ttl: float  # seconds a result is reused
+    timeout: float  # seconds a probe waits for the check
+    timeout_status: str = "error"
+
+
+# Cheap local checks refresh often; network and configuration checks rarely
+CHECK_POLICIES = {
+    "database": CheckPolicy(ttl=10, timeout=3),
+    "cache": CheckPolicy(ttl=10, timeout=2),
+    "disk_space": CheckPolicy(ttl=60, timeout=2),
+    "memory": CheckPolicy(ttl=15, timeout=2),
+    "external_services": CheckPolicy(ttl=300, timeout=5, timeout_status="warning"),
+    "application": CheckPolicy(ttl=60, timeout=3),
+    "security": CheckPolicy(ttl=600, timeout=2),
+}
+DEFAULT_CHECK_POLICY = CheckPolicy(ttl=30, timeout=5)
+
+
 class HealthCheckSystem:
     """
     Comprehensive health monitoring system
@@ -109,6 +137,15 @@ class HealthCheckSystem:
             ),
         }
 
+        self.check_policies = dict(CHECK_POLICIES)
+        self._results: Dict[str, tuple] = {}  # name -> (expires_at, result)
+        self._inflight: Dict[str, Any] = {}  # name -> Future
+        self._snapshot: Optional[Dict] = None
+        self._snapshot_at = 0.0
+        self._refreshing = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
     def _execute_single_check(self, check_name, check_method):
         """
         Execute a single health check and return result.
@@ -183,13 +220,100 @@ class HealthCheckSystem:
             ("security", self.check_security_status),
         ]
 
-    def run_all_checks(self) -> Dict:
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=len(self._get_check_registry()) + 1,
+                    thread_name_prefix="health-check",
+                )
+            return self._executor
+
+    def _policy(self, check_name) -> CheckPolicy:
+        return self.check_policies.get(check_name, DEFAULT_CHECK_POLICY)
+
+    def _run_in_worker(self, check_name, check_method):
         """
-        Run all health checks and return comprehensive status.
+        Execute a check on a pool thread and cache its result.
+
+        Args:
+            check_name: Name of the health check
+            check_method: Callable method to execute
+
+        Returns:
+            Tuple of (check_result dict, error flag bool)
+        """
+        try:
+            outcome = self._execute_single_check(check_name, check_method)
+        finally:
+            # Pool threads own their DB connection
+            connection.close()
+
+        expires_at = time.monotonic() + self._policy(check_name).ttl
+        with self._lock:
+            self._results[check_name] = (expires_at, outcome[0])
+            self._inflight.pop(check_name, None)
+        return outcome
+
+    def _submit(self, check_name, check_method, force: bool = False):
+        """
+        Return a cached result or a Future for a (possibly running) check.
 
-        Refactored to reduce complexity: C:16 → C:5
-        Uses registry pattern with separate execution/summary methods.
+        A check that is still running from an earlier probe is joined
+        rather than started again, so a hanging dependency never ties up
+        more than one worker.
+        """
+        executor = self.executor
+        with self._lock:
+            cached = self._results.get(check_name)
+            if cached and not force and cached[0] > time.monotonic():
+                return cached[1]
+
+            future = self._inflight.get(check_name)
+            if future is None:
+                future = executor.submit(self._run_in_worker, check_name, check_method)
+                self._inflight[check_name] = future
+            return future
+
+    def _collect(self, check_name, pending, started_at) -> Dict:
         """
+        Wait for a submitted check until its own deadline.
+
+        Returns:
+            Check result dict (a timeout result if the deadline passed)
+        """
+        if isinstance(pending, dict):
+            return pending
+
+        policy = self._policy(check_name)
+        remaining = policy.timeout - (time.monotonic() - started_at)
+        try:
+            return pending.result(timeout=max(remaining, 0))[0]
+        except FutureTimeoutError:
+            logger.warning(
+                f"Health check {check_name} timed out after {policy.timeout}s"
+            )
+            return {
+                "status": policy.timeout_status,
+                "message": f"Check timed out after {policy.timeout}s",
+                "timestamp": timezone.now().isoformat(),
+            }
+
+    def run_checks(self, names: Optional[Iterable[str]] = None, force=False) -> Dict:
+        """
+        Run registered checks concurrently, reusing results within their TTL.
+
+        Args:
+            names: Subset of check names to run (all checks if None)
+            force: Ignore cached results
+
+        Returns:
+            Results dict with per-check results and summary counters
+        """
+        return self._run_checks(names, force)[0]
+
+    def _run_checks(self, names, force):
         results = {
             "timestamp": timezone.now().isoformat(),
             "overall_status": "healthy",
@@ -197,27 +321,86 @@ class HealthCheckSystem:
             "summary": {"total_checks": 0, "passed": 0, "failed": 0, "warnings": 0},
         }
 
-        # Execute all registered checks
-        check_methods = self._get_check_registry()
+        registry = self._get_check_registry()
+        if names is not None:
+            wanted = set(names)
+            registry = [(name, method) for name, method in registry if name in wanted]
 
-        for check_name, check_method in check_methods:
-            check_result, had_error = self._execute_single_check(
-                check_name, check_method
-            )
+        started_at = time.monotonic()
+        pending = [
+            (check_name, self._submit(check_name, check_method, force))
+            for check_name, check_method in registry
+        ]
+
+        for check_name, item in pending:
+            check_result = self._collect(check_name, item, started_at)
             results["checks"][check_name] = check_result
             self._update_check_summary(results, check_result)
 
-        # Determine final status
         results["overall_status"] = self._determine_overall_status(results["summary"])
+        executed = any(not isinstance(item, dict) for _, item in pending)
+        return results, executed
 
-        # Store and alert
-        self._store_check_history(results)
+    def run_all_checks(self, force: bool = False) -> Dict:
+        """
+        Run all health checks and return comprehensive status.
 
-        if results["overall_status"] in ["unhealthy", "warning"]:
-            self._send_health_alerts(results)
+        Checks run concurrently with per-check timeouts; results younger
+        than their TTL are reused. The outcome becomes the snapshot served
+        by ``snapshot()``.
+        """
+        results, executed = self._run_checks(None, force)
+
+        with self._lock:
+            self._snapshot = results
+            self._snapshot_at = time.monotonic()
+
+        # Store and alert only when something was actually re-checked
+        if executed:
+            self._store_check_history(results)
+
+            if results["overall_status"] in ["unhealthy", "warning"]:
+                self._send_health_alerts(results)
 
         return results
 
+    def snapshot(self, max_age: Optional[float] = None) -> Dict:
+        """
+        Return the last computed results without running any check.
+
+        If the snapshot is missing or older than ``max_age`` seconds, a
+        refresh is started in the background; the caller never waits.
+        """
+        max_age = max_age if max_age is not None else DEFAULT_CHECK_POLICY.ttl
+        with self._lock:
+            current = self._snapshot
+            age = time.monotonic() - self._snapshot_at
+            start_refresh = (current is None or age > max_age) and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+
+        if start_refresh:
+            self.executor.submit(self._refresh_snapshot)
+
+        if current is None:
+            return {
+                "timestamp": timezone.now().isoformat(),
+                "overall_status": "unknown",
+                "checks": {},
+                "age_seconds": None,
+            }
+        return {**current, "age_seconds": round(age, 2)}
+
+    def _refresh_snapshot(self):
+        try:
+            self.run_all_checks()
+        except Exception as e:
+            logger.error(f"Health snapshot refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+            connection.close()
+
     def check_database(self) -> Dict:
         """Check database connectivity and performance"""
         try:
@@ -658,12 +841,11 @@ Warning Checks:
             # Send email if configured
             if hasattr(settings, "HEALTH_CHECK_EMAIL"):
                 try:
-                    send_mail(
+                    queue_mail_or_send(
                         subject=f'Health Check Alert - {results["overall_status"].upper()}',
                         message=alert_message,
                         from_email=settings.DEFAULT_FROM_EMAIL,
                         recipient_list=[settings.HEALTH_CHECK_EMAIL],
-                        fail_silently=True,
                     )
                 except Exception:
                     pass  # Don't fail health checks if email fails
@@ -729,7 +911,7 @@ Details: {json.dumps(details, indent=2) if details else 'None'}
                 and settings.EMAIL_HOST
             ):
                 try:
-                    send_mail(
+                    queue_mail_or_send(
                         subject=f"Custom Health Alert - {check_name} - {status.upper()}",
                         message=alert_message,
                         from_email=getattr(
@@ -738,7 +920,6 @@ Details: {json.dumps(details, indent=2) if details else 'None'}
                         recipient_list=getattr(
                             settings, "ADMIN_EMAIL_LIST", ["admin@example.com"]
                         ),
-                        fail_silently=False,
                     )
                 except Exception as e:
                     logger.error(f"Failed to send custom email alert: {e}")
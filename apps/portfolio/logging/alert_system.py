@@ -16,10 +16,11 @@ from typing import Any, Dict, List, Optional
 
 from django.conf import settings
 from django.core.cache import cache
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils import timezone
 
+from apps.main.mail_outbox import queue_mail_or_send
+
 logger = logging.getLogger(__name__)
 
 
@@ -125,7 +126,7 @@ View Dashboard: {site_url}/admin/logging/dashboard/
                     settings, "ADMIN_EMAIL_LIST", ["admin@example.com"]
                 )
 
-            send_mail(
+            queue_mail_or_send(
                 subject=subject,
                 message=email_body,
                 html_message=email_body,
@@ -133,7 +134,6 @@ View Dashboard: {site_url}/admin/logging/dashboard/
                     settings, "DEFAULT_FROM_EMAIL", "noreply@example.com"
                 ),
                 recipient_list=recipients,
-                fail_silently=False,
             )
 
             logger.info(
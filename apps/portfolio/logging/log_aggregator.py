@@ -15,7 +15,7 @@ from collections import Counter, defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from django.conf import settings
 from django.core.cache import cache
@@ -78,8 +78,15 @@ class LogAggregator:
         }
         self._lock = threading.Lock()
 
-    def parse_log_file(self, file_path: Path) -> Iterator[LogEntry]:
-        """Parse log file and yield structured log entries"""
+    def parse_log_file(
+        self, file_path: Path, line_filter: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[LogEntry]:
+        """
+        Parse log file and yield structured log entries
+
+        ``line_filter`` is checked on each raw line first; lines it rejects
+        are not parsed.
+        """
         try:
             # Handle gzipped files
             if file_path.suffix == ".gz":
@@ -91,6 +98,8 @@ class LogAggregator:
 
             with open_func(file_path, mode, encoding="utf-8", errors="ignore") as f:
                 for line_num, line in enumerate(f, 1):
+                    if line_filter is not None and not line_filter(line):
+                        continue
                     try:
                         # Try to parse as JSON first
                         if line.strip().startswith("{"):
@@ -278,12 +287,13 @@ class LogAggregator:
 
     def _get_log_files(self) -> List[Path]:
         """Get all log files sorted by modification time"""
-        log_files = []
+        log_files = set()
 
-        # Find all log files
+        # Find all log files ("*.log.gz" also matches "*.log.*")
         patterns = ["*.log", "*.log.*", "*.log.gz"]
         for pattern in patterns:
-            log_files.extend(self.log_directory.glob(pattern))
+            log_files.update(self.log_directory.glob(pattern))
+        log_files = list(log_files)
 
         # Sort by modification time (newest first)
         log_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
@@ -0,0 +1,83 @@
+"""
+Management command to pre-generate responsive image derivatives.
+"""
+
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.portfolio.services.image_derivatives import (
+    SOURCE_EXTENSIONS,
+    image_derivative_service,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate width-bucketed AVIF/WebP/JPEG derivatives for media and static images"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            type=str,
+            choices=["all", "media", "static"],
+            default="all",
+            help="Which image tree to process",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Process pool size (defaults to the CPU count, 1 renders inline)",
+        )
+
+    def handle(self, *args, **options):
+        service = image_derivative_service
+        if not service.enabled:
+            self.stdout.write(self.style.ERROR("Image derivatives are disabled"))
+            return
+
+        urls = []
+        if options["source"] in ["all", "media"]:
+            urls += self.collect_urls(
+                [Path(settings.MEDIA_ROOT)], settings.MEDIA_URL, exclude=service.root
+            )
+        if options["source"] in ["all", "static"]:
+            urls += self.collect_urls(
+                [Path(d) for d in getattr(settings, "STATICFILES_DIRS", [])],
+                settings.STATIC_URL,
+            )
+
+        self.stdout.write(
+            f"Found {len(urls)} source images, formats: {', '.join(service.formats)}"
+        )
+
+        start = time.perf_counter()
+        stats = service.generate_batch(urls, max_workers=options["workers"])
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {stats['generated']} derivatives "
+                f"({stats['bytes'] / 1024:.1f} KB) from {stats['sources']} sources "
+                f"in {elapsed:.2f}s, {stats['failed']} failed"
+            )
+        )
+
+    def collect_urls(self, roots, url_prefix, exclude=None):
+        """Map image files under the given roots to their public URLs."""
+        urls = []
+        for root in roots:
+            if not root.exists():
+                continue
+            for file_path in root.rglob("*"):
+                if file_path.suffix.lower() not in SOURCE_EXTENSIONS:
+                    continue
+                if exclude is not None and exclude in file_path.parents:
+                    continue
+                relative = file_path.relative_to(root).as_posix()
+                urls.append(f"{url_prefix.rstrip('/')}/{relative}")
+        return urls
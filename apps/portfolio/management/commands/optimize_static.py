@@ -5,11 +5,19 @@ Management command for comprehensive static file optimization.
 import gzip
 import json
 import shutil
+import time
 from pathlib import Path
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from .utils.asset_pipeline import (
+    BROTLI_QUALITY,
+    GZIP_LEVEL,
+    AssetPipeline,
+    minify_css,
+    minify_js,
+)
 from .utils.minify_helpers import CSSMinifier, JSMinifier
 
 
@@ -20,7 +28,15 @@ class Command(BaseCommand):
         parser.add_argument(
             "--action",
             type=str,
-            choices=["all", "minify", "images", "clean", "analyze", "compress"],
+            choices=[
+                "all",
+                "minify",
+                "images",
+                "clean",
+                "analyze",
+                "compress",
+                "build",
+            ],
             default="all",
             help="Optimization action to perform",
         )
@@ -37,6 +53,18 @@ class Command(BaseCommand):
             default="gzip",
             help="Compression type for assets",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Process pool size for the build action (1 builds inline)",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Output directory for the build action (defaults to STATIC_ROOT)",
+        )
 
     def handle(self, *args, **options):
         action = options["action"]
@@ -83,6 +111,11 @@ class Command(BaseCommand):
         if action in ["all", "compress"]:
             self.compress_assets(compression=compression)
 
+        if action == "build":
+            self.build_assets(
+                force=force, workers=options["workers"], output=options["output"]
+            )
+
         self.stdout.write("=" * 60)
         self.stdout.write(
             self.style.SUCCESS(
@@ -211,45 +244,31 @@ class Command(BaseCommand):
 
     def basic_css_minify(self, css_content):
         """Basic CSS minification."""
-        import re
-
-        # Remove comments
-        css_content = re.sub(r"/\*.*?\*/", "", css_content, flags=re.DOTALL)
-
-        # Remove unnecessary whitespace
-        css_content = re.sub(r"\s+", " ", css_content)
-
-        # Remove whitespace around specific characters
-        css_content = re.sub(r"\s*([{}:;,>+~])\s*", r"\1", css_content)
-
-        # Remove trailing semicolons
-        css_content = re.sub(r";}", "}", css_content)
-
-        # Remove unnecessary quotes from URLs
-        css_content = re.sub(r'url\(["\']([^"\']*)["\']?\)', r"url(\1)", css_content)
-
-        return css_content.strip()
+        return minify_css(css_content)
 
     def basic_js_minify(self, js_content):
         """Basic JavaScript minification."""
-        import re
-
-        # Remove single-line comments
-        js_content = re.sub(r"//.*$", "", js_content, flags=re.MULTILINE)
+        return minify_js(js_content)
 
-        # Remove multi-line comments
-        js_content = re.sub(r"/\*.*?\*/", "", js_content, flags=re.DOTALL)
-
-        # Remove unnecessary whitespace
-        js_content = re.sub(r"\s+", " ", js_content)
+    def build_assets(self, force=False, workers=None, output=None):
+        """Incrementally build hashed, minified and pre-compressed assets."""
+        self.stdout.write(f"\n{self.style.WARNING('BUILDING ASSETS')}")
+        self.stdout.write("-" * 40)
 
-        # Remove whitespace around specific characters
-        js_content = re.sub(r"\s*([{}();,=+\-*/<>!&|])\s*", r"\1", js_content)
+        output_root = Path(output) if output else self.static_root
+        pipeline = AssetPipeline(self.static_dirs, output_root, workers=workers)
 
-        # Remove unnecessary semicolons
-        js_content = re.sub(r";;+", ";", js_content)
+        start = time.perf_counter()
+        stats = pipeline.build(force=force)
+        elapsed = time.perf_counter() - start
 
-        return js_content.strip()
+        self.stdout.write(
+            f"Scanned {stats['scanned']} files: {stats['built']} built, "
+            f"{stats['unchanged']} unchanged, {stats['removed']} removed, "
+            f"{stats['failed']} failed in {elapsed:.2f}s"
+        )
+        self.stdout.write(f"Manifest written to: {pipeline.manifest.path}")
+        return stats
 
     def optimize_images(self, force=False, backup=True):  # noqa: C901
         """Optimize image files."""
@@ -369,7 +388,7 @@ class Command(BaseCommand):
         gzip_path = file_path.parent / f"{file_path.name}.gz"
 
         with open(file_path, "rb") as f_in:
-            with gzip.open(gzip_path, "wb") as f_out:
+            with gzip.open(gzip_path, "wb", compresslevel=GZIP_LEVEL) as f_out:
                 shutil.copyfileobj(f_in, f_out)
 
         original_size = file_path.stat().st_size
@@ -388,7 +407,7 @@ class Command(BaseCommand):
             brotli_path = file_path.parent / f"{file_path.name}.br"
 
             with open(file_path, "rb") as f:
-                compressed_data = brotli.compress(f.read())
+                compressed_data = brotli.compress(f.read(), quality=BROTLI_QUALITY)
 
             with open(brotli_path, "wb") as f:
                 f.write(compressed_data)
@@ -1,5 +1,6 @@
 """Database Performance and Minification Utilities"""
 
+from .asset_pipeline import AssetManifest, AssetPipeline
 from .minify_helpers import (
     BackupManager,
     CompressionStats,
@@ -18,4 +19,6 @@ __all__ = [
     "BackupManager",
     "SourceMapGenerator",
     "CompressionStats",
+    "AssetManifest",
+    "AssetPipeline",
 ]
@@ -0,0 +1,297 @@
+"""
+In-memory metadata index for static and media files.
+
+Maps URL paths to size, mtime, ETag and available pre-compressed/WebP
+variants so StaticFileOptimizationMiddleware can negotiate encodings and
+answer conditional requests without touching the filesystem.
+
+Static roots are indexed eagerly; the index is rebuilt when a build
+manifest (collectstatic's ``staticfiles.json`` or optimize_static's
+``asset-manifest.json``) changes. Media uploads and index misses are
+resolved lazily and memoized for a short TTL.
+
+Files under STATICFILES_DIRS and MEDIA_ROOT can change without a manifest
+update, so their entries are re-stat()ed on every hit; with DEBUG (or
+STATIC_FILE_INDEX_VERIFY) every entry is, and misses are not memoized.
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.utils.http import http_date
+
+logger = logging.getLogger(__name__)
+
+ENCODING_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+WEBP_SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif")
+WATCHED_MANIFESTS = ("staticfiles.json", "asset-manifest.json")
+LAZY_ENTRY_TTL = 60  # seconds
+MAX_LAZY_ENTRIES = 10000
+
+
+@dataclass
+class StaticFileEntry:
+    """Cached metadata for one servable file and its variants"""
+
+    path: Path
+    size: int
+    mtime: float
+    etag: str
+    last_modified: str
+    content_type: str
+    encodings: Dict[str, Tuple[Path, int]] = field(default_factory=dict)
+    webp: Optional["StaticFileEntry"] = None
+    # Re-stat on lookup: the file may change without a manifest update
+    verify: bool = False
+
+    def is_current(self) -> bool:
+        """Check the file still has the size and mtime this entry was built from"""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return False
+        return stat.st_mtime == self.mtime and stat.st_size == self.size
+
+
+def build_entry(
+    url_path: str, file_path: Path, stat: os.stat_result
+) -> StaticFileEntry:
+    """Create an index entry from a stat result"""
+    etag_data = f"{stat.st_mtime}_{stat.st_size}_{url_path}"
+    etag = hashlib.md5(etag_data.encode(), usedforsecurity=False).hexdigest()[:16]
+    content_type, _ = mimetypes.guess_type(str(file_path))
+
+    return StaticFileEntry(
+        path=file_path,
+        size=stat.st_size,
+        mtime=stat.st_mtime,
+        etag=f'"{etag}"',
+        last_modified=http_date(stat.st_mtime),
+        content_type=content_type or "application/octet-stream",
+    )
+
+
+def locate(root: Path, relative: str) -> Optional[Tuple[Path, os.stat_result]]:
+    """
+    Find a regular file for a URL-relative path strictly inside ``root``
+
+    Absolute paths, empty segments ("//etc/passwd"), "." / ".." steps and
+    symlinks leading outside the root are rejected.
+    """
+    segments = relative.replace("\\", "/").split("/")
+    if not relative or any(part in ("", ".", "..") for part in segments):
+        return None
+
+    path = root / relative
+    try:
+        if not path.resolve().is_relative_to(root.resolve()):
+            return None
+        stat = path.stat()
+    except (OSError, RuntimeError):
+        return None
+    if not path.is_file():
+        return None
+    return path, stat
+
+
+class StaticFileIndex:
+    """
+    Thread-safe URL path -> StaticFileEntry index
+    """
+
+    def __init__(self, refresh_interval: Optional[float] = None):
+        self.static_url = getattr(settings, "STATIC_URL", "/static/")
+        self.media_url = getattr(settings, "MEDIA_URL", "/media/")
+        self.refresh_interval = (
+            refresh_interval
+            if refresh_interval is not None
+            else getattr(settings, "STATIC_FILE_INDEX_REFRESH_INTERVAL", 5)
+        )
+        self.verify_all = getattr(
+            settings, "STATIC_FILE_INDEX_VERIFY", getattr(settings, "DEBUG", False)
+        )
+        self._entries: Dict[str, StaticFileEntry] = {}
+        self._lazy: Dict[str, Tuple[float, Optional[StaticFileEntry]]] = {}
+        self._manifest_mtimes: Tuple[float, ...] = ()
+        self._last_check = 0.0
+        self._built = False
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def static_roots(self) -> List[Path]:
+        """Static directories in lookup priority order"""
+        roots = []
+        static_root = getattr(settings, "STATIC_ROOT", None)
+        if static_root:
+            roots.append(Path(static_root))
+        roots.extend(self.source_dirs())
+        return [root for root in roots if root.is_dir()]
+
+    @staticmethod
+    def source_dirs() -> List[Path]:
+        """STATICFILES_DIRS, editable without touching any manifest"""
+        dirs = getattr(settings, "STATICFILES_DIRS", [])
+        # Entries may be (prefix, path) pairs
+        return [Path(d[1] if isinstance(d, (list, tuple)) else d) for d in dirs]
+
+    def _manifest_state(self) -> Tuple[float, ...]:
+        state = []
+        for root in self.static_roots():
+            for name in WATCHED_MANIFESTS:
+                try:
+                    state.append((root / name).stat().st_mtime)
+                except OSError:
+                    state.append(0.0)
+        return tuple(state)
+
+    @staticmethod
+    def _walk(root: Path) -> Iterator[Tuple[str, Path, os.stat_result]]:
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for item in it:
+                        if item.is_dir(follow_symlinks=False):
+                            stack.append(Path(item.path))
+                        elif item.is_file():
+                            path = Path(item.path)
+                            yield path.relative_to(root).as_posix(), path, item.stat()
+            except OSError as e:
+                logger.warning(f"Cannot index static directory {directory}: {e}")
+
+    def build(self) -> int:
+        """Rebuild the static index from disk and return the entry count"""
+        files: Dict[str, Tuple[Path, os.stat_result, bool]] = {}
+        source_dirs = set(self.source_dirs())
+        for root in self.static_roots():
+            verify = self.verify_all or root in source_dirs
+            for relative, path, stat in self._walk(root):
+                files.setdefault(relative, (path, stat, verify))
+
+        entries = {}
+        for relative, (path, stat, verify) in files.items():
+            if relative.endswith((".br", ".gz")):
+                continue
+            url_path = self.static_url + relative
+            entry = build_entry(url_path, path, stat)
+            entry.verify = verify
+            for encoding, suffix in ENCODING_SUFFIXES:
+                variant = files.get(relative + suffix)
+                if variant:
+                    entry.encodings[encoding] = (variant[0], variant[1].st_size)
+            entries[url_path] = entry
+
+        for url_path, entry in entries.items():
+            base, ext = os.path.splitext(url_path)
+            if ext.lower() in WEBP_SOURCE_EXTENSIONS:
+                entry.webp = entries.get(base + ".webp")
+
+        with self._lock:
+            self._entries = entries
+            self._lazy = {}
+            self._manifest_mtimes = self._manifest_state()
+            self._last_check = time.monotonic()
+            self._built = True
+
+        logger.debug(f"Static file index built with {len(entries)} entries")
+        return len(entries)
+
+    def maybe_refresh(self) -> None:
+        """Rebuild if never built or if a watched manifest changed"""
+        if not self._built:
+            self.build()
+            return
+
+        now = time.monotonic()
+        if now - self._last_check < self.refresh_interval:
+            return
+
+        self._last_check = now
+        if self._manifest_state() != self._manifest_mtimes:
+            self.build()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def lookup(self, url_path: str) -> Optional[StaticFileEntry]:
+        """Return the entry for a static/media URL path, or None"""
+        self.maybe_refresh()
+
+        entry = self._entries.get(url_path)
+        if entry is not None:
+            if not entry.verify or entry.is_current():
+                return entry
+            # Changed or removed behind the index: resolve it again below
+            with self._lock:
+                self._entries.pop(url_path, None)
+
+        cached = self._lazy.get(url_path)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < LAZY_ENTRY_TTL:
+            if cached[1] is None or not cached[1].verify or cached[1].is_current():
+                return cached[1]
+
+        entry = self._resolve_lazily(url_path)
+        if entry is None and self.verify_all:
+            return None
+        with self._lock:
+            if len(self._lazy) >= MAX_LAZY_ENTRIES:
+                self._lazy.clear()
+            self._lazy[url_path] = (now, entry)
+        return entry
+
+    def _resolve_lazily(self, url_path: str) -> Optional[StaticFileEntry]:
+        if url_path.startswith(self.media_url):
+            root = getattr(settings, "MEDIA_ROOT", None)
+            roots = [Path(root)] if root else []
+            relative = url_path[len(self.media_url) :]
+            mutable_roots = set(roots)
+        elif url_path.startswith(self.static_url):
+            roots = self.static_roots()
+            relative = url_path[len(self.static_url) :]
+            mutable_roots = set(self.source_dirs())
+        else:
+            return None
+
+        for root in roots:
+            located = locate(root, relative)
+            if located is None:
+                continue
+
+            path, stat = located
+            entry = build_entry(url_path, path, stat)
+            entry.verify = self.verify_all or root in mutable_roots
+            for encoding, suffix in ENCODING_SUFFIXES:
+                variant = path.with_name(path.name + suffix)
+                try:
+                    entry.encodings[encoding] = (variant, variant.stat().st_size)
+                except OSError:
+                    pass
+
+            if path.suffix.lower() in WEBP_SOURCE_EXTENSIONS:
+                webp_path = path.with_suffix(".webp")
+                try:
+                    webp_url = url_path.rsplit(".", 1)[0] + ".webp"
+                    entry.webp = build_entry(webp_url, webp_path, webp_path.stat())
+                except OSError:
+                    pass
+            return entry
+
+        return None
+
+
+# Global index instance shared by the static middleware
+static_file_index = StaticFileIndex()
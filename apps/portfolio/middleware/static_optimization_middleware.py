@@ -2,21 +2,30 @@
 Middleware for static file optimization and caching headers.
 """
 
-import hashlib
 import logging
 import mimetypes
 from pathlib import Path
 
 from django.conf import settings
-from django.http import FileResponse
-from django.utils import timezone
+from django.http import FileResponse, HttpResponseNotModified
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import parse_http_date_safe
+
+from apps.main.middleware.fast_path import route_aware
+
+from .static_file_index import static_file_index
 
 logger = logging.getLogger(__name__)
 
 
+@route_aware()
 class StaticFileOptimizationMiddleware(MiddlewareMixin):
-    """Middleware for optimizing static file delivery."""
+    """
+    Middleware for optimizing static file delivery.
+
+    File metadata comes from an in-memory StaticFileIndex, so encoding
+    negotiation and conditional requests are answered without stat calls.
+    """
 
     def __init__(self, get_response):
         self.get_response = get_response
@@ -24,6 +33,8 @@ class StaticFileOptimizationMiddleware(MiddlewareMixin):
         self.media_url = getattr(settings, "MEDIA_URL", "/media/")
         self.enable_compression = getattr(settings, "STATIC_COMPRESSION", True)
         self.enable_webp = getattr(settings, "STATIC_WEBP_SUPPORT", True)
+        self.index = static_file_index
+        self.index.maybe_refresh()
         super().__init__(get_response)
 
     def process_request(self, request):
@@ -34,19 +45,26 @@ class StaticFileOptimizationMiddleware(MiddlewareMixin):
         if not (path.startswith(self.static_url) or path.startswith(self.media_url)):
             return None
 
+        if request.method not in ("GET", "HEAD"):
+            return None
+
+        entry = self.index.lookup(path)
+        if entry is None:
+            return None
+
         # Check for WebP support for images
         if self.enable_webp and self.is_image_request(path):
-            webp_response = self.try_serve_webp(request, path)
+            webp_response = self.try_serve_webp(request, path, entry)
             if webp_response:
                 return webp_response
 
         # Check for compressed versions
         if self.enable_compression and self.is_compressible(path):
-            compressed_response = self.try_serve_compressed(request, path)
+            compressed_response = self.try_serve_compressed(request, path, entry)
             if compressed_response:
                 return compressed_response
 
-        return None
+        return self.serve_entry(request, entry)
 
     def process_response(self, request, response):
         """Add optimization headers to static file responses."""
@@ -74,75 +92,111 @@ class StaticFileOptimizationMiddleware(MiddlewareMixin):
         compressible_extensions = [".css", ".js", ".html", ".svg", ".json", ".xml"]
         return any(path.lower().endswith(ext) for ext in compressible_extensions)
 
-    def try_serve_webp(self, request, path):
+    def is_not_modified(self, request, etag, entry):
+        """Evaluate If-None-Match / If-Modified-Since against cached metadata."""
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if if_none_match is not None:
+            candidates = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+        if_modified_since = request.META.get("HTTP_IF_MODIFIED_SINCE")
+        if if_modified_since:
+            since = parse_http_date_safe(if_modified_since)
+            return since is not None and int(entry.mtime) <= since
+
+        return False
+
+    def serve_entry(
+        self, request, entry, file_path=None, etag=None, content_type=None, vary=None
+    ):
+        """Serve an indexed file, or a 304 when the client copy is current."""
+        etag = etag or entry.etag
+
+        if self.is_not_modified(request, etag, entry):
+            response = HttpResponseNotModified()
+        else:
+            # FileResponse hands the file object to wsgi.file_wrapper, which
+            # lets the server use sendfile() instead of copying through Python.
+            response = self.serve_static_file(
+                file_path or entry.path, content_type or entry.content_type
+            )
+
+        response["ETag"] = etag
+        response["Last-Modified"] = entry.last_modified
+        if vary:
+            response["Vary"] = vary
+        return response
+
+    def try_serve_webp(self, request, path, entry=None):
         """Try to serve WebP version if available."""
         # Check if client supports WebP
         accept = request.META.get("HTTP_ACCEPT", "")
         if "image/webp" not in accept:
             return None
 
-        # Get WebP version path
-        webp_path = self.get_webp_path(path)
-        if not webp_path:
+        entry = entry or self.index.lookup(path)
+        if entry is None or entry.webp is None:
             return None
 
         try:
-            # Serve WebP file if it exists
-            webp_file = Path(webp_path)
-            if webp_file.exists():
-                return self.serve_static_file(webp_file, "image/webp")
+            return self.serve_entry(
+                request, entry.webp, content_type="image/webp", vary="Accept"
+            )
         except Exception as e:
-            logger.error(f"Error serving WebP file {webp_path}: {e}")
+            logger.error(f"Error serving WebP file {entry.webp.path}: {e}")
 
         return None
 
-    def try_serve_compressed(self, request, path):
+    def try_serve_compressed(self, request, path, entry=None):
         """Try to serve compressed version if available."""
         # Check client encoding support
         encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
 
+        entry = entry or self.index.lookup(path)
+        if entry is None:
+            return None
+
         # Prefer Brotli over Gzip
         if "br" in encoding:
-            brotli_response = self.try_serve_brotli(path)
+            brotli_response = self.try_serve_brotli(request, entry)
             if brotli_response:
                 return brotli_response
 
         if "gzip" in encoding:
-            gzip_response = self.try_serve_gzip(path)
+            gzip_response = self.try_serve_gzip(request, entry)
             if gzip_response:
                 return gzip_response
 
         return None
 
-    def try_serve_brotli(self, path):
-        """Try to serve Brotli compressed version."""
-        brotli_path = self.get_file_path(path + ".br")
-        if not brotli_path or not Path(brotli_path).exists():
+    def try_serve_encoded(self, request, entry, encoding):
+        """Serve a pre-compressed variant recorded in the index."""
+        variant = entry.encodings.get(encoding)
+        if variant is None:
             return None
 
         try:
-            response = self.serve_static_file(Path(brotli_path))
-            response["Content-Encoding"] = "br"
-            response["Vary"] = "Accept-Encoding"
+            response = self.serve_entry(
+                request,
+                entry,
+                file_path=variant[0],
+                etag=f'{entry.etag[:-1]}-{encoding}"',
+                vary="Accept-Encoding",
+            )
+            if response.status_code == 200:
+                response["Content-Encoding"] = encoding
             return response
         except Exception as e:
-            logger.error(f"Error serving Brotli file {brotli_path}: {e}")
+            logger.error(f"Error serving {encoding} file {variant[0]}: {e}")
             return None
 
-    def try_serve_gzip(self, path):
-        """Try to serve Gzip compressed version."""
-        gzip_path = self.get_file_path(path + ".gz")
-        if not gzip_path or not Path(gzip_path).exists():
-            return None
+    def try_serve_brotli(self, request, entry):
+        """Try to serve Brotli compressed version."""
+        return self.try_serve_encoded(request, entry, "br")
 
-        try:
-            response = self.serve_static_file(Path(gzip_path))
-            response["Content-Encoding"] = "gzip"
-            response["Vary"] = "Accept-Encoding"
-            return response
-        except Exception as e:
-            logger.error(f"Error serving Gzip file {gzip_path}: {e}")
-            return None
+    def try_serve_gzip(self, request, entry):
+        """Try to serve Gzip compressed version."""
+        return self.try_serve_encoded(request, entry, "gzip")
 
     def serve_static_file(self, file_path, content_type=None):
         """Serve static file with proper headers."""
@@ -150,12 +204,7 @@ class StaticFileOptimizationMiddleware(MiddlewareMixin):
             content_type, _ = mimetypes.guess_type(str(file_path))
             content_type = content_type or "application/octet-stream"
 
-        response = FileResponse(open(file_path, "rb"), content_type=content_type)
-
-        # Add file size header
-        response["Content-Length"] = file_path.stat().st_size
-
-        return response
+        return FileResponse(open(file_path, "rb"), content_type=content_type)
 
     def add_static_file_headers(self, request, response, path):
         """Add caching headers for static files."""
@@ -207,72 +256,21 @@ class StaticFileOptimizationMiddleware(MiddlewareMixin):
 
     def generate_etag(self, request, path):
         """Generate ETag for file."""
-        try:
-            file_path = self.get_file_path(path)
-            if file_path and Path(file_path).exists():
-                file_stat = Path(file_path).stat()
-                etag_data = f"{file_stat.st_mtime}_{file_stat.st_size}_{path}"
-                etag = hashlib.md5(
-                    etag_data.encode(), usedforsecurity=False
-                ).hexdigest()[:16]
-                return f'"{etag}"'
-        except Exception as e:
-            logger.error(f"Error generating ETag for {path}: {e}")
-
-        return None
+        entry = self.index.lookup(path)
+        return entry.etag if entry else None
 
     def get_last_modified(self, path):
         """Get last modified time for file."""
-        try:
-            file_path = self.get_file_path(path)
-            if file_path and Path(file_path).exists():
-                mtime = Path(file_path).stat().st_mtime
-                return timezone.datetime.fromtimestamp(mtime, tz=timezone.utc).strftime(
-                    "%a, %d %b %Y %H:%M:%S GMT"
-                )
-        except Exception as e:
-            logger.error(f"Error getting last modified time for {path}: {e}")
-
-        return None
+        entry = self.index.lookup(path)
+        return entry.last_modified if entry else None
 
     def get_file_path(self, path):
         """Get file system path for URL path."""
-        try:
-            if path.startswith(self.static_url):
-                # Static file
-                relative_path = path[len(self.static_url) :]
-                if hasattr(settings, "STATIC_ROOT") and settings.STATIC_ROOT:
-                    return Path(settings.STATIC_ROOT) / relative_path
-                else:
-                    # Development - check STATICFILES_DIRS
-                    for static_dir in getattr(settings, "STATICFILES_DIRS", []):
-                        full_path = Path(static_dir) / relative_path
-                        if full_path.exists():
-                            return str(full_path)
-
-            elif path.startswith(self.media_url):
-                # Media file
-                relative_path = path[len(self.media_url) :]
-                if hasattr(settings, "MEDIA_ROOT"):
-                    return str(Path(settings.MEDIA_ROOT) / relative_path)
-
-        except Exception as e:
-            logger.error(f"Error getting file path for {path}: {e}")
-
-        return None
-
-    def get_webp_path(self, path):
-        """Get WebP version path for image."""
-        if not self.is_image_request(path):
-            return None
-
-        # Replace extension with .webp
-        base_path = path.rsplit(".", 1)[0]
-        webp_path = base_path + ".webp"
-
-        return self.get_file_path(webp_path)
+        entry = self.index.lookup(path)
+        return str(entry.path) if entry else None
 
 
+@route_aware("analytics")
 class TTFBOptimizationMiddleware(MiddlewareMixin):
     """Middleware for Time To First Byte (TTFB) optimization."""
 
@@ -337,6 +335,7 @@ class TTFBOptimizationMiddleware(MiddlewareMixin):
             response["Link"] = ", ".join(link_headers)
 
 
+@route_aware()
 class ResourceHintsMiddleware(MiddlewareMixin):
     """Middleware for adding resource hints."""
 
@@ -378,6 +377,7 @@ class ResourceHintsMiddleware(MiddlewareMixin):
         return response
 
 
+@route_aware()
 class StaticFileMetricsMiddleware(MiddlewareMixin):
     """Middleware for collecting static file performance metrics."""
 
@@ -25,9 +25,9 @@ from typing import Any, Dict, List, Tuple
 
 from django.conf import settings
 from django.core.cache import cache
-from django.core.mail import send_mail
 from django.utils import timezone
 
+from apps.main.mail_outbox import queue_mail_or_send
 from apps.portfolio.utils.metrics_summary import create_summary_generator
 
 logger = logging.getLogger(__name__)
@@ -395,12 +395,11 @@ This metric has exceeded the configured threshold. Please investigate.
 Dashboard: {getattr(settings, 'SITE_URL', 'http://localhost:8000')}/dashboard/
             """.strip()
 
-            send_mail(
+            queue_mail_or_send(
                 subject=subject,
                 message=message,
                 from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[settings.PERFORMANCE_ALERT_EMAIL],
-                fail_silently=True,
             )
 
         except Exception as e:
@@ -3,7 +3,8 @@ Rate Limiting Module
 ===================
 
 Implements comprehensive rate limiting for all endpoints with
-different limits based on endpoint sensitivity.
+different limits based on endpoint sensitivity. Counting is done by the
+shared engine in apps.main.rate_limiter.
 """
 
 import hashlib
@@ -11,10 +12,11 @@ import logging
 import time
 
 from django.conf import settings
-from django.core.cache import cache
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
 
+from apps.main.rate_limiter import Rate, rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -68,8 +70,7 @@ class RateLimitMiddleware(MiddlewareMixin):
 
         # Create a unique identifier combining IP, path, and user agent
         identifier = f"{ip}:{path}:{user_agent}"
-        key_hash = hashlib.md5(identifier.encode(), usedforsecurity=False).hexdigest()
-        return f"ratelimit:{key_hash}"
+        return hashlib.md5(identifier.encode(), usedforsecurity=False).hexdigest()
 
     def get_limit_for_path(self, path):
         """Get the rate limit for a given path."""
@@ -90,29 +91,12 @@ class RateLimitMiddleware(MiddlewareMixin):
         key = self.get_rate_limit_key(request)
         limit, burst = self.get_limit_for_path(request.path)
 
-        # TODO: Use timestamp for advanced rate limiting logic
-        _now = time.time()  # noqa: F841
-        minute_key = f"{key}:minute"
-        burst_key = f"{key}:burst"
-
-        # Check minute-based rate limit
-        minute_count = cache.get(minute_key, 0)
-        burst_count = cache.get(burst_key, 0)
-
-        if minute_count >= limit:
-            # Rate limit exceeded for the minute
-            return False, 0, 60
-
-        if burst_count >= burst:
-            # Burst limit exceeded
-            return False, 0, 10
+        # Per-minute limit plus a 10-second burst limit, checked together
+        decision = rate_limiter.hit("global", key, [Rate(limit, 60), Rate(burst, 10)])
+        if not decision.allowed:
+            return False, 0, decision.retry_after_seconds
 
-        # Increment counters
-        cache.set(minute_key, minute_count + 1, 60)  # Reset after 60 seconds
-        cache.set(burst_key, burst_count + 1, 10)  # Reset after 10 seconds
-
-        remaining = limit - minute_count - 1
-        return True, remaining, 60
+        return True, decision.remaining, 60
 
     def process_request(self, request):
         """Process the request and apply rate limiting."""
@@ -200,35 +184,28 @@ class APIRateLimitMiddleware(MiddlewareMixin):
             limit = 100
             window = 3600  # 1 hour
 
-        # Create cache key
-        cache_key = f"api_ratelimit:{identifier}"
-
-        # Get current count
-        current_count = cache.get(cache_key, 0)
+        decision = rate_limiter.hit("api_hourly", identifier, [Rate(limit, window)])
 
-        if current_count >= limit:
+        if not decision.allowed:
             logger.warning(f"API rate limit exceeded for {identifier}")
 
             response = JsonResponse(
                 {
                     "error": "API rate limit exceeded",
                     "message": f"Maximum {limit} requests per hour exceeded",
-                    "retry_after": window,
+                    "retry_after": decision.retry_after_seconds,
                 },
                 status=429,
             )
 
             response["X-API-RateLimit-Limit"] = str(limit)
             response["X-API-RateLimit-Remaining"] = "0"
-            response["Retry-After"] = str(window)
+            response["Retry-After"] = str(decision.retry_after_seconds)
 
             return response
 
-        # Increment counter
-        cache.set(cache_key, current_count + 1, window)
-
         # Store for response headers
-        request.api_rate_limit_remaining = limit - current_count - 1
+        request.api_rate_limit_remaining = decision.remaining
         request.api_rate_limit_limit = limit
 
         return None
@@ -257,61 +234,43 @@ def ratelimit_view(key="ip", rate="10/m", method="ALL", block=True):
     def decorator(view_func):
         def wrapped_view(request, *args, **kwargs):
             # Parse rate string (e.g., "10/m" = 10 per minute)
-            import re
-
-            match = re.match(r"(\d+)/([mhd])", rate)
-            if not match:
+            try:
+                parsed = Rate.parse(rate)
+            except ValueError:
                 return view_func(request, *args, **kwargs)
 
-            limit = int(match.group(1))
-            period = match.group(2)
-
-            # Convert period to seconds
-            periods = {"m": 60, "h": 3600, "d": 86400}
-            window = periods.get(period, 60)
-
             # Check method
             if method != "ALL" and request.method != method:
                 return view_func(request, *args, **kwargs)
 
             # Get identifier based on key
-            if key == "ip":
-                identifier = request.META.get("REMOTE_ADDR", "")
-            elif key == "user":
-                identifier = (
-                    str(request.user.id)
-                    if request.user.is_authenticated
-                    else request.META.get("REMOTE_ADDR", "")
-                )
+            if key == "user" and request.user.is_authenticated:
+                identifier = str(request.user.id)
             else:
                 identifier = request.META.get("REMOTE_ADDR", "")
 
-            # Create cache key
-            cache_key = f"view_ratelimit:{view_func.__name__}:{identifier}"
-
-            # Check rate limit
-            current_count = cache.get(cache_key, 0)
+            decision = rate_limiter.hit(
+                f"view:{view_func.__name__}", identifier, [parsed]
+            )
 
-            if current_count >= limit and block:
+            if not decision.allowed and block:
                 return JsonResponse(
                     {
                         "error": "Rate limit exceeded",
-                        "message": f"Maximum {limit} requests per {period} exceeded",
+                        "message": (
+                            f"Maximum {parsed.limit} requests per "
+                            f"{rate.split('/', 1)[1]} exceeded"
+                        ),
                     },
                     status=429,
                 )
 
-            # Increment counter
-            cache.set(cache_key, current_count + 1, window)
-
             # Call the view
             response = view_func(request, *args, **kwargs)
 
             # Add rate limit headers
-            response["X-View-RateLimit-Limit"] = str(limit)
-            response["X-View-RateLimit-Remaining"] = str(
-                max(0, limit - current_count - 1)
-            )
+            response["X-View-RateLimit-Limit"] = str(parsed.limit)
+            response["X-View-RateLimit-Remaining"] = str(decision.remaining)
 
             return response
 
@@ -0,0 +1,502 @@
+"""
+Image Derivative Service for Django Portfolio Application
+
+Generates width-bucketed AVIF/WebP/JPEG variants and LQIP placeholders for
+media and static images, either on first request or ahead of time.
+
+Features:
+- Content-addressed derivative storage (source digest + width + format)
+- Signed on-demand URLs so only whitelisted widths/formats can be rendered
+- Process pool batch generation for uploads and static trees
+- srcset builders used by the image template tags
+"""
+
+import base64
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core import signing
+from django.core.cache import cache
+from django.urls import NoReverseMatch, reverse
+
+try:
+    from PIL import Image, ImageFilter, ImageOps, features
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WIDTHS = (320, 480, 640, 768, 1024, 1280, 1600, 1920)
+DEFAULT_FORMATS = ("avif", "webp", "jpeg")
+SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+
+FORMAT_EXTENSIONS = {"avif": "avif", "webp": "webp", "jpeg": "jpg"}
+FORMAT_CONTENT_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
+PIL_FORMATS = {"avif": "AVIF", "webp": "WEBP", "jpeg": "JPEG"}
+
+SIGNING_SALT = "portfolio.image-derivatives"
+LQIP_WIDTH = 24
+CACHE_PREFIX = "image_derivatives"
+CACHE_TIMEOUT = 60 * 60 * 24 * 30  # 30 days
+
+# In-process memo sizes, and how long srcsets still pointing at the
+# on-demand endpoint are reused before checking for rendered files again
+SOURCE_MEMO_SIZE = 1024
+SRCSET_MEMO_SIZE = 1024
+SRCSET_RECHECK_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class SourceImage:
+    """Resolved source image with its content digest and intrinsic size"""
+
+    url: str
+    path: Path
+    digest: str
+    width: int
+    height: int
+
+
+def _render_derivative(
+    source_path: str, target_path: str, width: int, fmt: str, quality: int
+) -> int:
+    """
+    Render a single derivative to disk.
+
+    Module-level so it can be pickled into ProcessPoolExecutor workers.
+    Writes to a temporary file and renames it so concurrent renders of the
+    same derivative never expose a partial file.
+    """
+    target = Path(target_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(
+        f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+
+    with Image.open(source_path) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.width > width:
+            height = max(1, round(img.height * width / img.width))
+            img = img.resize((width, height), Image.LANCZOS)
+
+        if fmt == "jpeg" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA", "L"):
+            img = img.convert("RGBA")
+
+        save_kwargs = {"quality": quality}
+        if fmt == "jpeg":
+            save_kwargs.update(optimize=True, progressive=True)
+        elif fmt == "webp":
+            save_kwargs["method"] = 4
+
+        img.save(tmp_path, PIL_FORMATS[fmt], **save_kwargs)
+
+    os.replace(tmp_path, target)
+    return target.stat().st_size
+
+
+class ImageDerivativeService:
+    """
+    Service class for resolving, rendering and addressing image derivatives
+    """
+
+    def __init__(self):
+        """Initialize the derivative service from settings"""
+        self.root = Path(
+            getattr(
+                settings,
+                "IMAGE_DERIVATIVE_ROOT",
+                Path(settings.MEDIA_ROOT) / "derivatives",
+            )
+        )
+        self.url_prefix = getattr(
+            settings,
+            "IMAGE_DERIVATIVE_URL",
+            f"{settings.MEDIA_URL.rstrip('/')}/derivatives/",
+        )
+        self.widths = tuple(
+            sorted(getattr(settings, "IMAGE_DERIVATIVE_WIDTHS", DEFAULT_WIDTHS))
+        )
+        self.quality = getattr(settings, "IMAGE_QUALITY_COMPRESSION", 85)
+        self.formats = tuple(
+            fmt
+            for fmt in getattr(settings, "IMAGE_DERIVATIVE_FORMATS", DEFAULT_FORMATS)
+            if self.format_supported(fmt)
+        )
+        # path -> (mtime_ns, size, source), least recently used first
+        self._sources: "OrderedDict[str, Tuple[int, int, SourceImage]]" = OrderedDict()
+        # url -> (path, mtime_ns, size, recheck deadline, srcsets)
+        self._srcsets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether derivatives can be produced in this environment"""
+        return Image is not None and getattr(
+            settings, "IMAGE_DERIVATIVES_ENABLED", True
+        )
+
+    @staticmethod
+    def format_supported(fmt: str) -> bool:
+        """Check whether Pillow can encode the given derivative format"""
+        if Image is None or fmt not in PIL_FORMATS:
+            return False
+        if fmt == "avif":
+            return bool(features.check("avif"))
+        if fmt == "webp":
+            return bool(features.check("webp"))
+        return True
+
+    # ------------------------------------------------------------------
+    # Source resolution
+    # ------------------------------------------------------------------
+
+    def resolve_path(self, url: str) -> Optional[Path]:
+        """
+        Map a media or static URL to a file on disk.
+
+        Returns None for external URLs, unknown prefixes, unsupported
+        extensions and paths escaping their root directory.
+        """
+        if not url or "://" in url or url.startswith("//"):
+            return None
+
+        url = url.split("?", 1)[0].split("#", 1)[0]
+        if Path(url).suffix.lower() not in SOURCE_EXTENSIONS:
+            return None
+
+        media_url = settings.MEDIA_URL
+        static_url = settings.STATIC_URL
+
+        if media_url and url.startswith(media_url):
+            root = Path(settings.MEDIA_ROOT).resolve()
+            candidate = (root / url[len(media_url) :]).resolve()
+            if root in candidate.parents and candidate.is_file():
+                return candidate
+            return None
+
+        if static_url and url.startswith(static_url):
+            relative = url[len(static_url) :]
+            if ".." in Path(relative).parts:
+                return None
+            found = finders.find(relative)
+            if found:
+                return Path(found)
+            static_root = getattr(settings, "STATIC_ROOT", None)
+            if static_root:
+                candidate = Path(static_root) / relative
+                if candidate.is_file():
+                    return candidate
+
+        return None
+
+    def get_source(self, url: str) -> Optional[SourceImage]:
+        """
+        Resolve a URL to a SourceImage, memoized per (path, mtime, size).
+
+        The digest and dimensions are also kept in the shared cache so that
+        other worker processes do not need to rehash the same file.
+        """
+        if not self.enabled:
+            return None
+
+        path = self.resolve_path(url)
+        if path is None:
+            return None
+
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        key = str(path)
+        with self._lock:
+            cached = self._sources.get(key)
+            if cached:
+                self._sources.move_to_end(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        cache_key = self._source_cache_key(key, stat.st_mtime_ns, stat.st_size)
+        meta = cache.get(cache_key)
+        if meta is None:
+            try:
+                meta = self._inspect_source(path)
+            except Exception as e:
+                logger.warning(f"Cannot inspect image {path}: {e}")
+                return None
+            cache.set(cache_key, meta, CACHE_TIMEOUT)
+
+        source = SourceImage(
+            url=url, path=path, digest=meta[0], width=meta[1], height=meta[2]
+        )
+        with self._lock:
+            self._sources[key] = (stat.st_mtime_ns, stat.st_size, source)
+            self._sources.move_to_end(key)
+            while len(self._sources) > SOURCE_MEMO_SIZE:
+                self._sources.popitem(last=False)
+        return source
+
+    @staticmethod
+    def _inspect_source(path: Path) -> Tuple[str, int, int]:
+        """Hash the source bytes and read its intrinsic dimensions"""
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(chunk)
+
+        with Image.open(path) as img:
+            width, height = ImageOps.exif_transpose(img).size
+
+        return sha.hexdigest(), width, height
+
+    @staticmethod
+    def _source_cache_key(path: str, mtime_ns: int, size: int) -> str:
+        path_hash = hashlib.md5(path.encode(), usedforsecurity=False).hexdigest()
+        return f"{CACHE_PREFIX}:source:{path_hash}:{mtime_ns}:{size}"
+
+    # ------------------------------------------------------------------
+    # Addressing
+    # ------------------------------------------------------------------
+
+    def widths_for(self, source: SourceImage) -> List[int]:
+        """Width buckets worth generating for a source (never upscales)"""
+        widths = [w for w in self.widths if w < source.width]
+        if source.width <= self.widths[-1]:
+            widths.append(source.width)
+        return widths
+
+    def derivative_key(self, source: SourceImage, width: int, fmt: str) -> str:
+        """Content address of a derivative"""
+        material = f"{source.digest}:{width}:{fmt}:{self.quality}"
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def derivative_path(self, source: SourceImage, width: int, fmt: str) -> Path:
+        """On-disk location of a derivative"""
+        key = self.derivative_key(source, width, fmt)
+        return self.root / key[:2] / key[2:4] / f"{key}.{FORMAT_EXTENSIONS[fmt]}"
+
+    def sign(self, source: SourceImage, width: int, fmt: str) -> str:
+        """Build a signed token describing a derivative request"""
+        payload = {"s": source.url, "d": source.digest[:16], "w": width, "f": fmt}
+        return signing.dumps(payload, salt=SIGNING_SALT, compress=True)
+
+    def unsign(self, token: str) -> Optional[dict]:
+        """Verify a derivative token, returning None when invalid"""
+        try:
+            payload = signing.loads(token, salt=SIGNING_SALT)
+        except signing.BadSignature:
+            return None
+
+        width = payload.get("w")
+        if payload.get("f") not in self.formats or not isinstance(width, int):
+            return None
+        if not 0 < width <= self.widths[-1]:
+            return None
+        return payload
+
+    def derivative_url(self, source: SourceImage, width: int, fmt: str) -> str:
+        """
+        URL for a derivative.
+
+        Points straight at the content-addressed file once it exists, and at
+        the signed on-demand endpoint otherwise.
+        """
+        return self._derivative_url(source, width, fmt)[0]
+
+    def _derivative_url(
+        self, source: SourceImage, width: int, fmt: str
+    ) -> Tuple[str, bool]:
+        """Derivative URL and whether it points at a rendered file"""
+        path = self.derivative_path(source, width, fmt)
+        if path.exists():
+            relative = path.relative_to(self.root).as_posix()
+            return f"{self.url_prefix.rstrip('/')}/{relative}", True
+
+        try:
+            token = self.sign(source, width, fmt)
+            return reverse("image_derivative", args=[token]), False
+        except NoReverseMatch:
+            return source.url, False
+
+    def build_srcset(self, source: SourceImage, fmt: str) -> str:
+        """Build a srcset attribute value for one format"""
+        return self._build_srcset(source, fmt)[0]
+
+    def _build_srcset(self, source: SourceImage, fmt: str) -> Tuple[str, bool]:
+        entries, rendered = [], True
+        for width in self.widths_for(source):
+            url, exists = self._derivative_url(source, width, fmt)
+            entries.append(f"{url} {width}w")
+            rendered = rendered and exists
+        return ", ".join(entries), rendered
+
+    def srcsets(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        Build srcsets for every enabled format, or None if not derivable
+
+        Memoized per URL and source (path, mtime, size): a repeat render
+        costs one stat. Srcsets that still use the on-demand endpoint are
+        rebuilt after SRCSET_RECHECK_SECONDS to pick up rendered files.
+        """
+        with self._lock:
+            memo = self._srcsets.get(url)
+            if memo:
+                self._srcsets.move_to_end(url)
+        if memo:
+            path, mtime_ns, size, recheck_at, result = memo
+            try:
+                stat = path.stat()
+            except OSError:
+                stat = None
+            if (
+                stat is not None
+                and (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size)
+                and time.monotonic() < recheck_at
+            ):
+                return result
+
+        source = self.get_source(url)
+        if source is None:
+            with self._lock:
+                self._srcsets.pop(url, None)
+            return None
+
+        result, rendered = {}, True
+        for fmt in self.formats:
+            result[fmt], fmt_rendered = self._build_srcset(source, fmt)
+            rendered = rendered and fmt_rendered
+
+        try:
+            stat = source.path.stat()
+        except OSError:
+            return result
+        recheck_at = (
+            float("inf") if rendered else time.monotonic() + SRCSET_RECHECK_SECONDS
+        )
+        with self._lock:
+            self._srcsets[url] = (
+                source.path,
+                stat.st_mtime_ns,
+                stat.st_size,
+                recheck_at,
+                result,
+            )
+            self._srcsets.move_to_end(url)
+            while len(self._srcsets) > SRCSET_MEMO_SIZE:
+                self._srcsets.popitem(last=False)
+        return result
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def ensure_derivative(self, source: SourceImage, width: int, fmt: str) -> Path:
+        """Render a derivative if it is not on disk yet and return its path"""
+        path = self.derivative_path(source, width, fmt)
+        if not path.exists():
+            _render_derivative(str(source.path), str(path), width, fmt, self.quality)
+        return path
+
+    def placeholder(self, url: str) -> Optional[str]:
+        """Return a tiny blurred JPEG data URI usable as an LQIP"""
+        source = self.get_source(url)
+        if source is None:
+            return None
+
+        cache_key = f"{CACHE_PREFIX}:lqip:{source.digest}"
+        data_uri = cache.get(cache_key)
+        if data_uri is not None:
+            return data_uri
+
+        try:
+            with Image.open(source.path) as img:
+                img = ImageOps.exif_transpose(img).convert("RGB")
+                height = max(1, round(img.height * LQIP_WIDTH / img.width))
+                img = img.resize((LQIP_WIDTH, height), Image.BILINEAR)
+                img = img.filter(ImageFilter.GaussianBlur(1))
+                buffer = io.BytesIO()
+                img.save(buffer, "JPEG", quality=40)
+        except Exception as e:
+            logger.warning(f"LQIP generation failed for {source.path}: {e}")
+            return None
+
+        encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+        data_uri = f"data:image/jpeg;base64,{encoded}"
+        cache.set(cache_key, data_uri, CACHE_TIMEOUT)
+        return data_uri
+
+    def pending_jobs(
+        self, sources: Iterable[SourceImage]
+    ) -> List[Tuple[str, str, int, str, int]]:
+        """List render jobs for derivatives missing on disk"""
+        jobs = []
+        for source in sources:
+            for fmt in self.formats:
+                for width in self.widths_for(source):
+                    path = self.derivative_path(source, width, fmt)
+                    if not path.exists():
+                        jobs.append(
+                            (str(source.path), str(path), width, fmt, self.quality)
+                        )
+        return jobs
+
+    def generate_batch(
+        self, urls: Iterable[str], max_workers: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Generate every missing derivative for the given URLs.
+
+        Work is spread across a process pool; ``max_workers=1`` renders
+        inline, which is what tests and small uploads want.
+        """
+        sources = [s for s in (self.get_source(url) for url in urls) if s]
+        jobs = self.pending_jobs(sources)
+        stats = {"sources": len(sources), "generated": 0, "failed": 0, "bytes": 0}
+
+        if not jobs:
+            return stats
+
+        if max_workers == 1:
+            for job in jobs:
+                try:
+                    stats["bytes"] += _render_derivative(*job)
+                    stats["generated"] += 1
+                except Exception as e:
+                    stats["failed"] += 1
+                    logger.error(f"Derivative render failed for {job[0]}: {e}")
+            return stats
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_render_derivative, *job): job for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    stats["bytes"] += future.result()
+                    stats["generated"] += 1
+                except Exception as e:
+                    stats["failed"] += 1
+                    logger.error(
+                        f"Derivative render failed for {futures[future][0]}: {e}"
+                    )
+
+        return stats
+
+
+# Global service instance
+image_derivative_service = ImageDerivativeService()
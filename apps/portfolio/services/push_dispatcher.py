@@ -0,0 +1,329 @@
+"""
+Concurrent Web Push Dispatcher
+==============================
+
+Fans a notification out to many WebPushSubscription rows at once:
+
+- Bounded thread pool; each worker keeps one keep-alive HTTP session per
+  push-service host, so TLS connections are reused across subscribers
+- VAPID headers are signed once per audience origin and reused until
+  shortly before they expire
+- Per-subscriber RFC 8291 (aes128gcm) payload encryption runs inside the
+  workers in parallel, using http_ece directly
+- Outcomes are written per batch with one UPDATE for deliveries, one
+  ``bulk_update`` for failures and one ``bulk_create`` of NotificationLog
+"""
+
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+try:
+    import http_ece
+    import requests
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from py_vapid import Vapid
+except ImportError:
+    http_ece = None
+    requests = None
+    ec = None
+    Vapid = None
+
+from ..models import NotificationLog, WebPushSubscription
+
+logger = logging.getLogger(__name__)
+
+VAPID_LIFETIME = 12 * 60 * 60  # seconds, push services reject > 24h
+VAPID_REFRESH_MARGIN = 60 * 60
+EXPIRED_STATUS_CODES = (404, 410)
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_TIMEOUT = 10
+
+SubscriptionRow = Tuple[int, str, str, str]
+
+
+@dataclass
+class PushOutcome:
+    """Result of one delivery attempt"""
+
+    subscription_id: int
+    status_code: Optional[int]
+    error: str = ""
+
+    @property
+    def success(self) -> bool:
+        return not self.error
+
+    @property
+    def expired(self) -> bool:
+        return self.status_code in EXPIRED_STATUS_CODES
+
+
+def audience(endpoint: str) -> str:
+    """VAPID audience (scheme://host) for a push endpoint"""
+    url = urlparse(endpoint)
+    return f"{url.scheme}://{url.netloc}"
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def encrypt_payload(data: bytes, p256dh: str, auth: str) -> bytes:
+    """
+    Encrypt a message body for one subscriber (fresh ephemeral ECDH key)
+    """
+    return http_ece.encrypt(
+        data,
+        salt=None,
+        private_key=ec.generate_private_key(ec.SECP256R1()),
+        dh=_b64decode(p256dh),
+        auth_secret=_b64decode(auth),
+        version="aes128gcm",
+    )
+
+
+class VapidHeaderCache:
+    """
+    Signed VAPID headers per audience origin
+    """
+
+    def __init__(self, private_key: Optional[str], subject: str):
+        self.private_key = private_key
+        self.subject = subject
+        self._vapid = None
+        self._headers: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def _load_vapid(self):
+        if self._vapid is None:
+            if os.path.isfile(self.private_key):
+                self._vapid = Vapid.from_file(private_key_file=self.private_key)
+            else:
+                self._vapid = Vapid.from_string(private_key=self.private_key)
+        return self._vapid
+
+    def headers_for(self, endpoint: str) -> Dict[str, str]:
+        origin = audience(endpoint)
+        now = time.time()
+
+        with self._lock:
+            cached = self._headers.get(origin)
+            if cached and cached[0] - VAPID_REFRESH_MARGIN > now:
+                return cached[1]
+
+            expires = int(now) + VAPID_LIFETIME
+            claims = {"sub": self.subject, "aud": origin, "exp": expires}
+            headers = self._load_vapid().sign(claims)
+            self._headers[origin] = (expires, headers)
+            return headers
+
+
+class PushDispatcher:
+    """
+    Bounded-concurrency push sender with batched outcome recording
+    """
+
+    def __init__(
+        self,
+        vapid_private_key: Optional[str] = None,
+        vapid_subject: str = "mailto:admin@localhost",
+        max_concurrent: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.vapid = VapidHeaderCache(vapid_private_key, vapid_subject)
+        self.max_concurrent = max_concurrent or getattr(
+            settings, "WEBPUSH_MAX_CONCURRENCY", 32
+        )
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Worker side (no database access)
+    # ------------------------------------------------------------------
+
+    def _session_for(self, endpoint: str):
+        sessions = getattr(self._local, "sessions", None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+
+        host = urlparse(endpoint).netloc
+        session = sessions.get(host)
+        if session is None:
+            session = sessions[host] = requests.Session()
+        return session
+
+    def deliver(self, row: SubscriptionRow, data: bytes, ttl: int) -> PushOutcome:
+        """Encrypt and POST one message; runs on a worker thread"""
+        subscription_id, endpoint, p256dh, auth = row
+        if http_ece is None:
+            return PushOutcome(subscription_id, None, "pywebpush not installed")
+
+        try:
+            headers = dict(self.vapid.headers_for(endpoint))
+            headers.update({"content-encoding": "aes128gcm", "ttl": str(ttl)})
+            response = self._session_for(endpoint).post(
+                endpoint,
+                data=encrypt_payload(data, p256dh, auth),
+                headers=headers,
+                timeout=self.timeout,
+            )
+        except Exception as e:
+            return PushOutcome(subscription_id, None, str(e))
+
+        if response.status_code > 202:
+            return PushOutcome(
+                subscription_id,
+                response.status_code,
+                f"Push failed: {response.status_code} {response.reason}",
+            )
+        return PushOutcome(subscription_id, response.status_code)
+
+    # ------------------------------------------------------------------
+    # Orchestration
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _rows(subscriptions) -> Iterator[SubscriptionRow]:
+        if hasattr(subscriptions, "values_list"):
+            yield from subscriptions.values_list(
+                "id", "endpoint", "p256dh", "auth"
+            ).iterator(chunk_size=DEFAULT_BATCH_SIZE)
+        else:
+            for s in subscriptions:
+                yield (s.id, s.endpoint, s.p256dh, s.auth)
+
+    def _batches(self, rows: Iterable[SubscriptionRow]) -> Iterator[List]:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def dispatch(
+        self,
+        subscriptions,
+        payload: Dict[str, Any],
+        ttl: int = 86400,
+        log_fields: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send ``payload`` to every subscription and record the outcomes
+
+        Returns the same summary shape as
+        PushNotificationService.send_notification_to_subscriptions.
+        """
+        data = json.dumps(payload).encode("utf-8")
+        log_fields = log_fields or {}
+        results = []
+        success_count = failure_count = 0
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrent, thread_name_prefix="webpush"
+        ) as executor:
+            for batch in self._batches(self._rows(subscriptions)):
+                outcomes = list(
+                    executor.map(lambda row: self.deliver(row, data, ttl), batch)
+                )
+                self.record(outcomes, log_fields)
+
+                for outcome in outcomes:
+                    if outcome.success:
+                        success_count += 1
+                        results.append(
+                            {
+                                "success": True,
+                                "subscription_id": outcome.subscription_id,
+                                "response_code": outcome.status_code,
+                            }
+                        )
+                    else:
+                        failure_count += 1
+                        results.append(
+                            {
+                                "success": False,
+                                "subscription_id": outcome.subscription_id,
+                                "error": outcome.error,
+                            }
+                        )
+
+        total_count = success_count + failure_count
+        return {
+            "total_count": total_count,
+            "success_count": success_count,
+            "failure_count": failure_count,
+            "success_rate": (
+                (success_count / total_count * 100) if total_count > 0 else 0
+            ),
+            "results": results,
+        }
+
+    def record(self, outcomes: List[PushOutcome], log_fields: Dict[str, Any]) -> None:
+        """Persist a batch of outcomes with a fixed number of queries"""
+        now = timezone.now()
+        delivered = [o.subscription_id for o in outcomes if o.success]
+        failed = [
+            WebPushSubscription(
+                id=o.subscription_id,
+                total_sent=F("total_sent") + 1,
+                total_failed=F("total_failed") + 1,
+                last_failure=now,
+                failure_reason=o.error[:200],
+                enabled=not o.expired,
+            )
+            for o in outcomes
+            if not o.success
+        ]
+        logs = [
+            NotificationLog(
+                subscription_id=o.subscription_id,
+                status="sent" if o.success else ("expired" if o.expired else "failed"),
+                error_message=o.error,
+                sent_at=now,
+                **log_fields,
+            )
+            for o in outcomes
+        ]
+
+        with transaction.atomic():
+            if delivered:
+                WebPushSubscription.objects.filter(id__in=delivered).update(
+                    total_sent=F("total_sent") + 1,
+                    total_delivered=F("total_delivered") + 1,
+                    last_success=now,
+                    failure_reason="",
+                )
+            if failed:
+                WebPushSubscription.objects.bulk_update(
+                    failed,
+                    [
+                        "total_sent",
+                        "total_failed",
+                        "last_failure",
+                        "failure_reason",
+                        "enabled",
+                    ],
+                    batch_size=500,
+                )
+            NotificationLog.objects.bulk_create(logs, batch_size=500)
+
+        expired = sum(1 for o in outcomes if o.expired)
+        if expired:
+            logger.info(f"Disabled {expired} expired push subscriptions")
@@ -28,6 +28,7 @@ except ImportError:
     WebPushException = Exception
 
 from ..models import NotificationLog, WebPushSubscription
+from .push_dispatcher import PushDispatcher
 from .push_helpers import NotificationSender, PayloadBuilder, SubscriptionValidator
 
 logger = logging.getLogger(__name__)
@@ -145,7 +146,8 @@ class PushNotificationService:
         notification_type: str = "custom",
         additional_data: Optional[Dict[str, Any]] = None,
         topics: Optional[List[str]] = None,
-        max_concurrent: int = 10,
+        max_concurrent: Optional[int] = None,
+        ttl: int = 86400,
     ) -> Dict[str, Any]:
         """
         Send a push notification to multiple subscriptions
@@ -163,7 +165,8 @@ class PushNotificationService:
             notification_type: Notification type
             additional_data: Additional payload data
             topics: Filter subscriptions by topics (if provided)
-            max_concurrent: Maximum concurrent sends
+            max_concurrent: Maximum concurrent sends (WEBPUSH_MAX_CONCURRENCY)
+            ttl: Time to live in seconds
 
         Returns:
             Dict with results summary
@@ -177,49 +180,49 @@ class PushNotificationService:
         # Ensure we have enabled subscriptions only
         subscriptions = subscriptions.filter(enabled=True)
 
-        total_count = (
-            subscriptions.count()
-            if hasattr(subscriptions, "count")
-            else len(subscriptions)
+        payload = PayloadBuilder.build(
+            title=title,
+            body=body,
+            icon=icon,
+            image=image,
+            badge=badge,
+            url=url,
+            tag=tag,
+            actions=actions,
+            notification_type=notification_type,
+            additional_data=additional_data,
         )
-        success_count = 0
-        failure_count = 0
-        results = []
 
-        logger.info(f"Sending push notification to {total_count} subscriptions")
-
-        # Send notifications (in batches if needed for large numbers)
-        for subscription in subscriptions:
-            result = self.send_notification_to_subscription(
-                subscription=subscription,
-                title=title,
-                body=body,
-                icon=icon,
-                image=image,
-                badge=badge,
-                url=url,
-                tag=tag,
-                actions=actions,
-                notification_type=notification_type,
-                additional_data=additional_data,
-            )
-
-            results.append(result)
+        dispatcher = PushDispatcher(
+            vapid_private_key=self.vapid_private_key,
+            vapid_subject=self.vapid_subject,
+            max_concurrent=max_concurrent,
+        )
+        summary = dispatcher.dispatch(
+            subscriptions,
+            payload,
+            ttl=ttl,
+            log_fields={
+                "title": title[:200],
+                "body": body,
+                "icon": icon or "",
+                "image": image or "",
+                "badge": badge or "",
+                "url": url or "",
+                "tag": tag or "",
+                "actions": actions or [],
+                "notification_type": notification_type[:20],
+                "topics": topics or [],
+                "additional_data": additional_data or {},
+            },
+        )
 
-            if result["success"]:
-                success_count += 1
-            else:
-                failure_count += 1
+        logger.info(
+            f"Push notification sent to {summary['total_count']} subscriptions: "
+            f"{summary['success_count']} delivered, {summary['failure_count']} failed"
+        )
 
-        return {
-            "total_count": total_count,
-            "success_count": success_count,
-            "failure_count": failure_count,
-            "success_rate": (
-                (success_count / total_count * 100) if total_count > 0 else 0
-            ),
-            "results": results,
-        }
+        return summary
 
     def send_broadcast_notification(
         self,
@@ -1,9 +1,12 @@
+from functools import partial
+
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from apps.blog.models import Post
+from apps.core.invalidation import invalidation_dispatcher
 
-from .cache_keys import invalidate_model_cache
+from .cache_keys import CacheKeyManager
 from .models import (
     AITool,
     BlogCategory,
@@ -24,54 +27,48 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-@receiver([post_save, post_delete], sender=PersonalInfo)
-def invalidate_personal_info_cache(sender, instance, **kwargs):
-    """Invalidate cache when PersonalInfo changes"""
-    try:
-        # Use centralized cache invalidation
-        invalidate_model_cache(
-            "portfolio.PersonalInfo", instance.id if hasattr(instance, "id") else None
-        )
+def queue_model_invalidation(model_label, sender, instance):
+    """
+    Queue the cache keys and patterns mapped to ``model_label`` on the
+    invalidation dispatcher, so they are cleared once per commit
+    """
+    instance_id = instance.id if hasattr(instance, "id") else None
 
-        logger.info(
-            f"Invalidated PersonalInfo cache after {kwargs.get('signal', 'unknown')} signal"
+    keys = []
+    for key_name in CacheKeyManager.get_keys_for_model(model_label):
+        try:
+            keys.append(CacheKeyManager.get_cache_key(key_name))
+            # Also the instance-specific key
+            if instance_id:
+                keys.append(CacheKeyManager.get_cache_key(key_name, instance_id))
+        except ValueError as e:
+            logger.error(f"Error building cache key {key_name}: {e}")
+
+    hooks = {
+        f"portfolio_pattern:{pattern}": partial(
+            CacheKeyManager.invalidate_pattern, pattern
         )
+        for pattern in CacheKeyManager.get_patterns_for_model(model_label)
+    }
+    invalidation_dispatcher.invalidate(sender, instance, keys=keys, hooks=hooks)
+
 
-    except Exception as e:
-        logger.error(f"Error invalidating PersonalInfo cache: {e}")
+@receiver([post_save, post_delete], sender=PersonalInfo)
+def invalidate_personal_info_cache(sender, instance, **kwargs):
+    """Invalidate cache when PersonalInfo changes"""
+    queue_model_invalidation("portfolio.PersonalInfo", sender, instance)
 
 
 @receiver([post_save, post_delete], sender=SocialLink)
 def invalidate_social_links_cache(sender, instance, **kwargs):
     """Invalidate cache when SocialLink changes"""
-    try:
-        invalidate_model_cache(
-            "portfolio.SocialLink", instance.id if hasattr(instance, "id") else None
-        )
-
-        logger.info(
-            f"Invalidated SocialLink cache after {kwargs.get('signal', 'unknown')} signal"
-        )
-
-    except Exception as e:
-        logger.error(f"Error invalidating SocialLink cache: {e}") @ receiver(
-            [post_save, post_delete], sender=Post
-        )
+    queue_model_invalidation("portfolio.SocialLink", sender, instance)
 
 
+@receiver([post_save, post_delete], sender=Post)
 def invalidate_blog_cache(sender, instance, **kwargs):
     """Invalidate cache when Post changes"""
-    try:
-        invalidate_model_cache(
-            "blog.Post", instance.id if hasattr(instance, "id") else None
-        )
-
-        logger.info(
-            f"Invalidated Post cache after {kwargs.get('signal', 'unknown')} signal"
-        )
-
-    except Exception as e:
-        logger.error(f"Error invalidating Post cache: {e}")
+    queue_model_invalidation("blog.Post", sender, instance)
 
 
 if Tool:
@@ -79,95 +76,34 @@ if Tool:
     @receiver([post_save, post_delete], sender=Tool)
     def invalidate_tools_cache(sender, instance, **kwargs):
         """Invalidate cache when Tool changes"""
-        try:
-            invalidate_model_cache(
-                "tools.Tool", instance.id if hasattr(instance, "id") else None
-            )
-
-            logger.info(
-                f"Invalidated Tool cache after {kwargs.get('signal', 'unknown')} signal"
-            )
-
-        except Exception as e:
-            logger.error(f"Error invalidating Tool cache: {e}")
+        queue_model_invalidation("tools.Tool", sender, instance)
 
 
 @receiver([post_save, post_delete], sender=AITool)
 def invalidate_ai_tools_cache(sender, instance, **kwargs):
     """Invalidate cache when AITool changes"""
-    try:
-        invalidate_model_cache(
-            "portfolio.AITool", instance.id if hasattr(instance, "id") else None
-        )
-
-        logger.info(
-            f"Invalidated AITool cache after {kwargs.get('signal', 'unknown')} signal"
-        )
-
-    except Exception as e:
-        logger.error(f"Error invalidating AITool cache: {e}")
+    queue_model_invalidation("portfolio.AITool", sender, instance)
 
 
 @receiver([post_save, post_delete], sender=CybersecurityResource)
 def invalidate_security_cache(sender, instance, **kwargs):
     """Invalidate cache when CybersecurityResource changes"""
-    try:
-        invalidate_model_cache(
-            "portfolio.CybersecurityResource",
-            instance.id if hasattr(instance, "id") else None,
-        )
-
-        logger.info(
-            f"Invalidated CybersecurityResource cache after {kwargs.get('signal', 'unknown')} signal"
-        )
-
-    except Exception as e:
-        logger.error(f"Error invalidating CybersecurityResource cache: {e}")
+    queue_model_invalidation("portfolio.CybersecurityResource", sender, instance)
 
 
 @receiver([post_save, post_delete], sender=BlogCategory)
 def invalidate_blog_category_cache(sender, instance, **kwargs):
     """Invalidate cache when BlogCategory changes"""
-    try:
-        invalidate_model_cache(
-            "portfolio.BlogCategory", instance.id if hasattr(instance, "id") else None
-        )
-
-        logger.info(
-            f"Invalidated BlogCategory cache after {kwargs.get('signal', 'unknown')} signal"
-        )
-
-    except Exception as e:
-        logger.error(f"Error invalidating BlogCategory cache: {e}")
+    queue_model_invalidation("portfolio.BlogCategory", sender, instance)
 
 
 @receiver([post_save, post_delete], sender=MusicPlaylist)
 def invalidate_music_cache(sender, instance, **kwargs):
     """Invalidate cache when MusicPlaylist changes"""
-    try:
-        invalidate_model_cache(
-            "portfolio.MusicPlaylist", instance.id if hasattr(instance, "id") else None
-        )
-
-        logger.info(
-            f"Invalidated MusicPlaylist cache after {kwargs.get('signal', 'unknown')} signal"
-        )
-
-    except Exception as e:
-        logger.error(f"Error invalidating MusicPlaylist cache: {e}")
+    queue_model_invalidation("portfolio.MusicPlaylist", sender, instance)
 
 
 @receiver([post_save, post_delete], sender=UsefulResource)
 def invalidate_useful_cache(sender, instance, **kwargs):
     """Invalidate cache when UsefulResource changes"""
-    try:
-        invalidate_model_cache(
-            "portfolio.UsefulResource", instance.id if hasattr(instance, "id") else None
-        )
-
-        logger.info(
-            f"Invalidated UsefulResource cache after {kwargs.get('signal', 'unknown')} signal"
-        )
-
-    except Exception as e:
-        logger.error(f"Error invalidating UsefulResource cache: {e}")
+    queue_model_invalidation("portfolio.UsefulResource", sender, instance)
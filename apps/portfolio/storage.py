@@ -0,0 +1,45 @@
+"""
+Static Files Storage
+====================
+
+WhiteNoise manifest storage that also knows about assets built by
+``optimize_static --action build``. The build writes content-hashed copies
+and their ``.gz``/``.br`` siblings to STATIC_ROOT and records them in
+``asset-manifest.json``; this storage merges that mapping over
+collectstatic's ``staticfiles.json`` so ``{% static %}`` serves the built,
+minified copies under immutable-cache names.
+"""
+
+import json
+import logging
+
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from apps.portfolio.management.commands.utils.asset_pipeline import MANIFEST_NAME
+
+logger = logging.getLogger(__name__)
+
+
+class AssetManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    CompressedManifestStaticFilesStorage preferring asset pipeline outputs
+    """
+
+    asset_manifest_name = MANIFEST_NAME
+
+    def load_manifest(self):
+        hashed_files, manifest_hash = super().load_manifest()
+        hashed_files.update(self.load_asset_manifest())
+        return hashed_files, manifest_hash
+
+    def load_asset_manifest(self):
+        """Source path -> hashed name mapping of the last asset build"""
+        try:
+            with self.manifest_storage.open(self.asset_manifest_name) as manifest:
+                payload = json.loads(manifest.read().decode("utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable {self.asset_manifest_name}: {e}")
+            return {}
+        return payload.get("paths", {})
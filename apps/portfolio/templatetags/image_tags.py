@@ -7,9 +7,18 @@ from django.conf import settings
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
+from ..services.image_derivatives import image_derivative_service
+
 register = template.Library()
 
 
+def _largest_entry(srcset):
+    """Return the URL of the widest candidate in a srcset string"""
+    if not srcset:
+        return ""
+    return srcset.rsplit(", ", 1)[-1].rsplit(" ", 1)[0]
+
+
 @register.simple_tag
 def lazy_image(
     src,
@@ -37,6 +46,12 @@ def lazy_image(
     Returns:
         HTML string for optimized image
     """
+    srcsets = image_derivative_service.srcsets(src) or {}
+    if not placeholder and srcsets:
+        placeholder = image_derivative_service.placeholder(src) or ""
+    if not webp_src:
+        webp_src = _largest_entry(srcsets.get("webp"))
+
     classes = ["lazy-load"]
     if css_class:
         classes.append(css_class)
@@ -64,6 +79,8 @@ def lazy_image(
             'data:image/svg+xml,%3Csvg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1 1"%3E%3C/svg%3E'
         )
 
+    if srcsets.get("jpeg"):
+        attrs["data-srcset"] = srcsets["jpeg"]
     if webp_src:
         attrs["data-webp"] = webp_src
     if fallback:
@@ -94,6 +111,11 @@ def responsive_image(
     Returns:
         HTML string for responsive image
     """
+    if not srcset and not webp_srcset:
+        srcsets = image_derivative_service.srcsets(src) or {}
+        srcset = srcsets.get("jpeg", "")
+        webp_srcset = srcsets.get("webp", "")
+
     classes = []
     if lazy:
         classes.append("lazy-load")
@@ -244,6 +266,11 @@ def picture_tag(
     Returns:
         Dictionary for picture_element.html template
     """
+    if not webp_src and not avif_src:
+        srcsets = image_derivative_service.srcsets(src) or {}
+        webp_src = srcsets.get("webp", "")
+        avif_src = srcsets.get("avif", "")
+
     return {
         "src": src,
         "alt": alt,
@@ -12,7 +12,6 @@ from io import StringIO
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.mail import send_mail
 from django.db import models
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
@@ -22,6 +21,7 @@ from django.utils import timezone
 from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_http_methods
 
+from apps.main.mail_outbox import queue_mail
 from apps.main.models import CookieConsent
 from apps.portfolio.models import AccountDeletionRequest
 
@@ -513,12 +513,11 @@ def send_export_email(user, email, filename):
         },
     )
 
-    send_mail(
+    queue_mail(
         subject,
         message,
         settings.DEFAULT_FROM_EMAIL,
         [email],
-        fail_silently=False,
     )
 
 
@@ -537,12 +536,11 @@ def send_deletion_confirmation_email(user, token):
         },
     )
 
-    send_mail(
+    queue_mail(
         subject,
         message,
         settings.DEFAULT_FROM_EMAIL,
         [user.email],
-        fail_silently=False,
     )
 
 
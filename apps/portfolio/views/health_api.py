@@ -24,14 +24,19 @@ def health_check_endpoint(request):
     """
     Basic health check endpoint for load balancers and monitoring
     Returns 200 if system is healthy, 503 if unhealthy
+
+    ``?mode=live`` returns the last computed snapshot without running any
+    check, for high-frequency probes.
     """
     try:
-        # Run basic checks only for performance
-        basic_checks = {
-            "database": health_checker.check_database(),
-            "cache": health_checker.check_cache(),
-            "application": health_checker.check_application_health(),
-        }
+        if request.GET.get("mode") == "live":
+            snapshot = health_checker.snapshot()
+            status_code = 503 if snapshot["overall_status"] == "unhealthy" else 200
+            return JsonResponse(snapshot, status=status_code)
+
+        # Run basic checks only for performance (concurrent, TTL-cached)
+        basic = health_checker.run_checks(["database", "cache", "application"])
+        basic_checks = basic["checks"]
 
         # Determine overall status
         overall_healthy = all(
@@ -148,8 +153,9 @@ def readiness_probe(request):
     """
     try:
         # Quick readiness checks
-        db_check = health_checker.check_database()
-        cache_check = health_checker.check_cache()
+        checks = health_checker.run_checks(["database", "cache"])["checks"]
+        db_check = checks["database"]
+        cache_check = checks["cache"]
 
         ready = db_check["status"] in ["healthy", "warning"] and cache_check[
             "status"
@@ -0,0 +1,58 @@
+"""
+Image Derivative Views
+======================
+
+Serves width-bucketed image derivatives on first request. Tokens are signed
+by ImageDerivativeService, so only derivatives the template tags emitted can
+be rendered.
+"""
+
+import logging
+
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.views.decorators.http import require_GET
+
+from ..services.image_derivatives import FORMAT_CONTENT_TYPES, image_derivative_service
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@require_GET
+def image_derivative_view(request, token):
+    """
+    Render (if needed) and serve a signed image derivative
+    """
+    payload = image_derivative_service.unsign(token)
+    if payload is None:
+        raise Http404("Invalid image token")
+
+    source = image_derivative_service.get_source(payload["s"])
+    if source is None:
+        raise Http404("Image source not found")
+
+    width, fmt = payload["w"], payload["f"]
+    etag = f'"{image_derivative_service.derivative_key(source, width, fmt)}"'
+
+    # The source changed since the URL was issued; serve the current
+    # rendition but do not let caches pin it forever.
+    fresh = source.digest.startswith(payload["d"])
+    cache_control = IMMUTABLE_CACHE_CONTROL if fresh else "public, max-age=60"
+
+    if request.META.get("HTTP_IF_NONE_MATCH") == etag:
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        return response
+
+    try:
+        path = image_derivative_service.ensure_derivative(source, width, fmt)
+    except Exception as e:
+        logger.error(f"Failed to render derivative for {source.path}: {e}")
+        raise Http404("Image derivative unavailable")
+
+    response = FileResponse(open(path, "rb"), content_type=FORMAT_CONTENT_TYPES[fmt])
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control
+    return response
@@ -7,6 +7,7 @@ Dashboard views for centralized log analysis, monitoring, and alerting.
 
 import json
 import logging
+from datetime import datetime, timedelta
 
 from django.contrib.auth.decorators import login_required
 from django.core.cache import cache
@@ -17,11 +18,23 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from ..logging.log_aggregator import log_aggregator
+from ..logging.log_export import EXPORT_FORMATS, LogFilter, log_exporter
 from ..utils.apm_decorators import trace_function
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_datetime_param(value):
+    """Naive datetime from an ISO 8601 query parameter (None when absent)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid datetime: {value}")
+    return parsed.replace(tzinfo=None)
+
+
 @login_required
 @trace_function(
     operation_name="view.logging_dashboard", description="Log analysis dashboard"
@@ -303,109 +316,13 @@ def acknowledge_alert_api(request):
 def log_export_view(request):
     """
     Export logs in various formats
+
+    The export is streamed from the log files (see log_export.py); filters
+    are applied while reading and the number of rows is not capped.
     """
     try:
         export_format = request.GET.get("format", "json")
-        hours_back = int(request.GET.get("hours", 24))
-        level = request.GET.get("level")
-        logger_name = request.GET.get("logger")
-        query = request.GET.get("q", "")
-
-        # Search logs
-        logs = log_aggregator.search_logs(
-            query=query,
-            level=level,
-            logger=logger_name,
-            hours_back=hours_back,
-            limit=1000,  # Max export limit
-        )
-
-        if export_format == "json":
-            response_data = [
-                {
-                    "timestamp": entry.timestamp.isoformat(),
-                    "level": entry.level,
-                    "logger": entry.logger,
-                    "message": entry.message,
-                    "service": entry.service,
-                    "environment": entry.environment,
-                    "trace_id": entry.trace_id,
-                    "request_id": entry.request_id,
-                    "source": entry.source,
-                    "exception": entry.exception,
-                    "extra": entry.extra,
-                    "django": entry.django,
-                    "performance": entry.performance,
-                    "security": entry.security,
-                }
-                for entry in logs
-            ]
-
-            response = JsonResponse(
-                {
-                    "logs": response_data,
-                    "export_info": {
-                        "format": "json",
-                        "count": len(response_data),
-                        "exported_at": timezone.now().isoformat(),
-                        "filters": {
-                            "hours_back": hours_back,
-                            "level": level,
-                            "logger": logger_name,
-                            "query": query,
-                        },
-                    },
-                }
-            )
-
-            response["Content-Disposition"] = (
-                f'attachment; filename="logs_export_{timezone.now().strftime("%Y%m%d_%H%M")}.json"'
-            )
-
-        elif export_format == "csv":
-            import csv
-            from io import StringIO
-
-            output = StringIO()
-            writer = csv.writer(output)
-
-            # Write header
-            writer.writerow(
-                [
-                    "timestamp",
-                    "level",
-                    "logger",
-                    "message",
-                    "service",
-                    "trace_id",
-                    "request_id",
-                    "exception_type",
-                    "exception_message",
-                ]
-            )
-
-            # Write data
-            for entry in logs:
-                writer.writerow(
-                    [
-                        entry.timestamp.isoformat(),
-                        entry.level,
-                        entry.logger,
-                        entry.message,
-                        entry.service,
-                        entry.trace_id,
-                        entry.request_id,
-                        entry.exception.get("type") if entry.exception else "",
-                        entry.exception.get("message") if entry.exception else "",
-                    ]
-                )
-
-            response = HttpResponse(output.getvalue(), content_type="text/csv")
-            response["Content-Disposition"] = (
-                f'attachment; filename="logs_export_{timezone.now().strftime("%Y%m%d_%H%M")}.csv"'
-            )
-
-        else:
+        if export_format not in EXPORT_FORMATS:
             return JsonResponse(
                 {
                     "success": False,
@@ -414,22 +331,34 @@ def log_export_view(request):
                 status=400,
             )
 
+        end = _parse_datetime_param(request.GET.get("until")) or datetime.now()
+        start = _parse_datetime_param(request.GET.get("since")) or (
+            end - timedelta(hours=int(request.GET.get("hours", 24)))
+        )
+        log_filter = LogFilter(
+            start=start,
+            end=end,
+            level=request.GET.get("level") or None,
+            logger=request.GET.get("logger") or None,
+            query=request.GET.get("q", ""),
+        )
+        compress = request.GET.get("gzip", "").lower() in ("1", "true", "yes")
+
+        response = log_exporter.response(log_filter, export_format, compress)
+
         logger.info(
             f"Logs exported by user {request.user}",
             extra={
                 "export_format": export_format,
-                "count": len(logs),
-                "filters": {
-                    "hours_back": hours_back,
-                    "level": level,
-                    "logger": logger_name,
-                    "query": query,
-                },
+                "gzip": compress,
+                "filters": log_filter.as_dict(),
             },
         )
 
         return response
 
+    except ValueError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
     except Exception as e:
         logger.error(f"Error exporting logs: {e}", exc_info=True)
         return JsonResponse(
@@ -4,8 +4,8 @@ Performance monitoring and dashboard views
 
 import json
 import logging
-import statistics
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime
 
 from django.conf import settings
 from django.db import connection
@@ -15,28 +15,23 @@ from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_http_methods
 
 from ..alerting import alert_manager
+from ..web_vitals import METRIC_TYPES, web_vitals_store
 
 logger = logging.getLogger(__name__)
 
 
 class PerformanceMetrics:
     """
-    In-memory performance metrics storage and analysis
+    Performance metrics storage and analysis
+
+    Values are aggregated in the shared Web Vitals store (see
+    web_vitals.py), so every worker process reports the same summary.
     """
 
-    def __init__(self):
-        self.metrics = {
-            "lcp": [],
-            "fid": [],
-            "cls": [],
-            "fcp": [],
-            "ttfb": [],
-            "resource_load": [],
-            "long_task": [],
-            "network_change": [],
-            "memory_usage": [],
-        }
-        self.alerts = []
+    def __init__(self, store=None):
+        self.store = store or web_vitals_store
+        self.metric_types = METRIC_TYPES
+        self.alerts = deque(maxlen=100)
         self.thresholds = {
             "lcp": 2500,  # milliseconds
             "fid": 100,  # milliseconds
@@ -47,20 +42,9 @@ class PerformanceMetrics:
         }
 
     def add_metric(self, metric_type, value, metadata=None):
-        """Add a performance metric with timestamp"""
-        timestamp = datetime.now().isoformat()
-
-        metric_data = {
-            "value": value,
-            "timestamp": timestamp,
-            "metadata": metadata or {},
-        }
-
-        if metric_type in self.metrics:
-            # Keep only last 1000 metrics per type
-            self.metrics[metric_type].append(metric_data)
-            if len(self.metrics[metric_type]) > 1000:
-                self.metrics[metric_type].pop(0)
+        """Add a performance metric to the current time bucket"""
+        if metric_type in self.metric_types:
+            self.store.record(metric_type, value)
 
         # Check for performance alerts
         self._check_alert_threshold(metric_type, value)
@@ -80,52 +64,14 @@ class PerformanceMetrics:
                 "timestamp": datetime.now().isoformat(),
                 "severity": "warning" if value < threshold * 1.5 else "critical",
             }
+            # Only the last 100 alerts are kept
             self.alerts.append(alert)
 
-            # Keep only last 100 alerts
-            if len(self.alerts) > 100:
-                self.alerts.pop(0)
-
             logger.warning(f"Performance alert: {metric_type} = {value} > {threshold}")
 
     def get_summary(self, hours=24):
         """Get performance summary for the last N hours"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        summary = {}
-
-        for metric_type, data in self.metrics.items():
-            if not data:
-                continue
-
-            # Filter by time
-            recent_data = [
-                item
-                for item in data
-                if datetime.fromisoformat(item["timestamp"]) > cutoff_time
-            ]
-
-            if recent_data:
-                values = [item["value"] for item in recent_data]
-                summary[metric_type] = {
-                    "count": len(values),
-                    "avg": round(statistics.mean(values), 2),
-                    "min": min(values),
-                    "max": max(values),
-                    "median": round(statistics.median(values), 2),
-                    "p95": round(self._percentile(values, 95), 2),
-                    "recent": values[-10:] if len(values) >= 10 else values,
-                }
-
-        return summary
-
-    def _percentile(self, values, p):
-        """Calculate percentile"""
-        k = (len(values) - 1) * p / 100
-        f = int(k)
-        c = k - f
-        if f == len(values) - 1:
-            return values[f]
-        return values[f] * (1 - c) + values[f + 1] * c
+        return self.store.summary(hours=hours, metric_types=self.metric_types)
 
     def get_health_score(self):
         """Calculate overall performance health score (0-100)"""
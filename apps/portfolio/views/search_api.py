@@ -8,20 +8,18 @@ Provides REST API endpoints for:
 """
 
 import logging
-from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
 from django.core.cache import cache
-from django.core.paginator import Paginator
 from django.http import JsonResponse
 from django.utils import timezone
 from django.views import View
 from django.views.decorators.http import require_http_methods
 
 from apps.blog.models import Post
-from apps.main.fulltext_search import postgresql_search
 from apps.main.models import AITool
-from apps.main.search import search_engine
+from apps.main.search import search_engine, search_result_cache, search_telemetry
+from apps.portfolio.fulltext_search import postgresql_search
 from apps.tools.models import Tool
 
 logger = logging.getLogger(__name__)
@@ -197,31 +195,15 @@ class SearchAPIView(View):
             )
 
         try:
-            # Use PostgreSQL full-text search if available, fallback to basic search
-            if self._has_postgresql():
-                search_results = postgresql_search.full_text_search(
-                    query=query,
-                    models=[category] if category else None,
-                    limit=per_page * 3,  # Get more results for pagination
-                    highlight=True,
-                )
-                results = search_results["results"]
-            else:
-                # Fallback to basic search engine
-                search_results = search_engine.search(
-                    query=query,
-                    categories=[category] if category else None,
-                    limit=per_page * 3,
-                )
-                results = search_results["results"]
-
-            # Paginate results
-            paginator = Paginator(results, per_page)
-            page_obj = paginator.get_page(page)
+            # Ranked hits (and facets) are cached per normalized query/category
+            entry, cached = search_result_cache.get_or_compute(
+                query, category, lambda limit: self._run_search(query, category, limit)
+            )
+            page_obj, results = search_result_cache.page(entry, page, per_page)
 
             # Format results for API response
             formatted_results = []
-            for result in page_obj:
+            for result in results:
                 formatted_result = {
                     "id": result.get("id"),
                     "title": result.get("title"),
@@ -240,22 +222,23 @@ class SearchAPIView(View):
                 formatted_results.append(formatted_result)
 
             # Log search for analytics
-            self._log_search_analytics(query, len(results), category, request)
+            self._log_search_analytics(query, len(entry["hits"]), category, request)
 
             return JsonResponse(
                 {
                     "query": query,
                     "results": formatted_results,
                     "pagination": {
-                        "page": page,
+                        "page": page_obj.number,
                         "per_page": per_page,
-                        "total_pages": paginator.num_pages,
-                        "total_results": paginator.count,
+                        "total_pages": page_obj.paginator.num_pages,
+                        "total_results": page_obj.paginator.count,
                         "has_next": page_obj.has_next(),
                         "has_previous": page_obj.has_previous(),
                     },
-                    "filters": self._get_available_filters(results),
-                    "suggestions": search_results.get("suggestions", []),
+                    "filters": entry["facets"],
+                    "suggestions": entry["suggestions"],
+                    "cached": cached,
                 }
             )
 
@@ -265,6 +248,22 @@ class SearchAPIView(View):
                 {"error": "Search unavailable", "results": [], "total": 0}, status=500
             )
 
+    def _run_search(self, query: str, category: str, limit: int) -> Dict[str, Any]:
+        """Run the backend search for the full ranked result set"""
+        # Use PostgreSQL full-text search if available, fallback to basic search
+        if self._has_postgresql():
+            return postgresql_search.full_text_search(
+                query=query,
+                models=[category] if category else None,
+                limit=limit,
+                highlight=True,
+            )
+        return search_engine.search(
+            query=query,
+            categories=[category] if category else None,
+            limit=limit,
+        )
+
     def _has_postgresql(self) -> bool:
         """Check if PostgreSQL is available"""
         try:
@@ -274,77 +273,20 @@ class SearchAPIView(View):
         except Exception:
             return False
 
-    def _get_available_filters(self, results: List[Dict]) -> Dict[str, List]:
-        """Get available filters based on search results"""
-        categories = {}
-        date_ranges = {}
-        tags = {}
-
-        for result in results[:50]:  # Analyze first 50 results
-            # Categories
-            category = result.get("category", "Other")
-            categories[category] = categories.get(category, 0) + 1
-
-            # Date ranges (for blog posts)
-            date = result.get("date")
-            if date:
-                try:
-                    if isinstance(date, str):
-                        date = datetime.fromisoformat(date.replace("Z", "+00:00"))
-
-                    now = timezone.now()
-                    if date >= now - timedelta(days=7):
-                        date_ranges["week"] = date_ranges.get("week", 0) + 1
-                    elif date >= now - timedelta(days=30):
-                        date_ranges["month"] = date_ranges.get("month", 0) + 1
-                    elif date >= now - timedelta(days=365):
-                        date_ranges["year"] = date_ranges.get("year", 0) + 1
-                except Exception:
-                    pass
-
-            # Tags
-            for tag in result.get("tags", [])[:3]:  # Limit to 3 tags per result
-                tags[tag] = tags.get(tag, 0) + 1
-
-        return {
-            "categories": [
-                {"name": cat, "count": count}
-                for cat, count in sorted(
-                    categories.items(), key=lambda x: x[1], reverse=True
-                )
-            ][:5],
-            "date_ranges": [
-                {"name": range_name, "count": count}
-                for range_name, count in date_ranges.items()
-            ],
-            "popular_tags": [
-                {"name": tag, "count": count}
-                for tag, count in sorted(tags.items(), key=lambda x: x[1], reverse=True)
-            ][:10],
-        }
-
     def _log_search_analytics(
         self, query: str, result_count: int, category: str, request
     ):
         """Log search query for analytics"""
         try:
-            analytics_data = {
-                "query": query,
-                "result_count": result_count,
-                "category": category,
-                "timestamp": timezone.now().isoformat(),
-                "user_agent": request.META.get("HTTP_USER_AGENT", ""),
-                "ip_address": self._get_client_ip(request),
-                "referer": request.META.get("HTTP_REFERER", ""),
-            }
-
-            # Store in cache for analytics aggregation
-            analytics_key = f"search_analytics_{timezone.now().strftime('%Y-%m-%d')}"
-            daily_searches = cache.get(analytics_key, [])
-            daily_searches.append(analytics_data)
-            cache.set(analytics_key, daily_searches, 86400)  # 24 hours
-
-            logger.info(f"Search: {query} -> {result_count} results")
+            search_telemetry.record(
+                query,
+                result_count,
+                category=category,
+                ip_address=self._get_client_ip(request),
+                user_agent=request.META.get("HTTP_USER_AGENT", ""),
+                referer=request.META.get("HTTP_REFERER", ""),
+            )
+            logger.debug(f"Search: {query} -> {result_count} results")
 
         except Exception as e:
             logger.error(f"Error logging search analytics: {e}")
@@ -415,9 +357,9 @@ class SearchAnalyticsView(View):
 
     def get(self, request):
         try:
-            days = int(request.GET.get("days", 7))
+            days = min(max(int(request.GET.get("days", 7)), 1), 365)
 
-            # Get analytics data from cache
+            # Read precomputed per-day rollups
             analytics = self._get_analytics_data(days)
 
             return JsonResponse({"analytics": analytics, "period": f"Last {days} days"})
@@ -430,78 +372,7 @@ class SearchAnalyticsView(View):
 
     def _get_analytics_data(self, days: int) -> Dict[str, Any]:
         """Get search analytics data for specified number of days"""
-        all_searches = []
-
-        # Collect search data from cache for each day
-        for i in range(days):
-            date = (timezone.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-            analytics_key = f"search_analytics_{date}"
-            daily_searches = cache.get(analytics_key, [])
-            all_searches.extend(daily_searches)
-
-        if not all_searches:
-            return {
-                "total_searches": 0,
-                "unique_queries": 0,
-                "average_results": 0,
-                "popular_queries": [],
-                "no_result_queries": [],
-                "search_trends": {},
-            }
-
-        # Process analytics
-        queries = [search["query"] for search in all_searches]
-        result_counts = [search["result_count"] for search in all_searches]
-
-        # Popular queries
-        query_counts = {}
-        for query in queries:
-            query_counts[query] = query_counts.get(query, 0) + 1
-
-        popular_queries = sorted(
-            query_counts.items(), key=lambda x: x[1], reverse=True
-        )[:10]
-
-        # No result queries
-        no_result_queries = [
-            search["query"] for search in all_searches if search["result_count"] == 0
-        ]
-
-        no_result_counts = {}
-        for query in no_result_queries:
-            no_result_counts[query] = no_result_counts.get(query, 0) + 1
-
-        top_no_results = sorted(
-            no_result_counts.items(), key=lambda x: x[1], reverse=True
-        )[:5]
-
-        return {
-            "total_searches": len(all_searches),
-            "unique_queries": len(set(queries)),
-            "average_results": (
-                round(sum(result_counts) / len(result_counts)) if result_counts else 0
-            ),
-            "popular_queries": [
-                {"query": query, "count": count} for query, count in popular_queries
-            ],
-            "no_result_queries": [
-                {"query": query, "count": count} for query, count in top_no_results
-            ],
-            "search_trends": self._calculate_search_trends(all_searches, days),
-        }
-
-    def _calculate_search_trends(
-        self, searches: List[Dict], days: int
-    ) -> Dict[str, int]:
-        """Calculate daily search trends"""
-        trends = {}
-
-        for i in range(days):
-            date = (timezone.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-            daily_count = len([s for s in searches if s["timestamp"].startswith(date)])
-            trends[date] = daily_count
-
-        return trends
+        return search_telemetry.summary(days)
 
 
 @require_http_methods(["GET"])
@@ -0,0 +1,418 @@
+"""
+Shared Web Vitals Store
+=======================
+
+Time-bucketed aggregates of the client performance metrics (LCP, FID, CLS,
+...) shared by all worker processes, so every worker serves the same
+monitoring dashboard.
+
+- Each metric value updates the aggregate of its BUCKET_SECONDS bucket:
+  count, sum, min, max and a value histogram with per-metric edges (the
+  Web Vitals thresholds are edges, so "good/poor" counts are exact)
+- Summaries add up the buckets of the requested window; median and p95
+  are interpolated from the histogram instead of sorting raw values
+- Redis (django-redis WEB_VITALS_CACHE_ALIAS): one Lua script call per
+  value; a window is one pipeline of HGETALL per bucket
+- Other caches: values are batched in process memory and merged into the
+  cache every FLUSH_INTERVAL seconds or FLUSH_SIZE values (shared across
+  workers when the cache is)
+- Values the shared store cannot take are aggregated in this process
+  (apps.core.shared_store); the dashboard then shows this worker's
+  values until the store is back
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from apps.core.shared_store import SharedStore
+
+KEY_PREFIX = "vitals"
+
+METRIC_TYPES = (
+    "lcp",
+    "fid",
+    "cls",
+    "fcp",
+    "ttfb",
+    "resource_load",
+    "long_task",
+    "network_change",
+    "memory_usage",
+)
+
+BUCKET_SECONDS = 300  # 5 minutes
+RETENTION_SECONDS = 25 * 3600  # a 24 hour window plus the current hour
+RECENT_VALUES = 10
+
+FLUSH_INTERVAL = 5  # seconds
+FLUSH_SIZE = 100  # values
+
+# Histogram edges (upper bounds); values above the last edge are overflow
+MS_EDGES = (
+    50,
+    100,
+    200,
+    300,
+    500,
+    800,
+    1000,
+    1500,
+    1800,
+    2500,
+    3000,
+    4000,
+    6000,
+    10000,
+)
+HISTOGRAM_EDGES = {
+    "cls": (0.01, 0.025, 0.05, 0.1, 0.15, 0.25, 0.5, 1.0),
+    "memory_usage": (10, 25, 50, 100, 200, 400, 800, 1600),
+}
+
+# KEYS: bucket hash, recent values list
+# ARGV: metric type, value, histogram field, ttl, recent values kept
+RECORD_SCRIPT = """
+local prefix = ARGV[1] .. ':'
+local value = tonumber(ARGV[2])
+redis.call('HINCRBY', KEYS[1], prefix .. 'count', 1)
+redis.call('HINCRBYFLOAT', KEYS[1], prefix .. 'sum', ARGV[2])
+redis.call('HINCRBY', KEYS[1], prefix .. ARGV[3], 1)
+local low = redis.call('HGET', KEYS[1], prefix .. 'min')
+if not low or value < tonumber(low) then
+    redis.call('HSET', KEYS[1], prefix .. 'min', ARGV[2])
+end
+local high = redis.call('HGET', KEYS[1], prefix .. 'max')
+if not high or value > tonumber(high) then
+    redis.call('HSET', KEYS[1], prefix .. 'max', ARGV[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+
+redis.call('LPUSH', KEYS[2], ARGV[2])
+redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[5]) - 1)
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return 1
+"""
+
+
+def histogram_edges(metric_type: str) -> tuple:
+    return HISTOGRAM_EDGES.get(metric_type, MS_EDGES)
+
+
+def histogram_index(metric_type: str, value: float) -> int:
+    edges = histogram_edges(metric_type)
+    for index, edge in enumerate(edges):
+        if value <= edge:
+            return index
+    return len(edges)
+
+
+def bucket_id(timestamp: float) -> int:
+    return int(timestamp // BUCKET_SECONDS)
+
+
+def window_buckets(hours: float, now: Optional[float] = None) -> List[int]:
+    """Buckets covering the last ``hours``, oldest first"""
+    current = bucket_id(time.time() if now is None else now)
+    count = int(hours * 3600 // BUCKET_SECONDS)
+    count = max(1, min(count, RETENTION_SECONDS // BUCKET_SECONDS))
+    return list(range(current - count + 1, current + 1))
+
+
+def bucket_key(bucket: int) -> str:
+    return f"{KEY_PREFIX}:bucket:{bucket}"
+
+
+def recent_key(metric_type: str) -> str:
+    return f"{KEY_PREFIX}:recent:{metric_type}"
+
+
+def empty_aggregate(metric_type: str) -> Dict:
+    return {
+        "count": 0,
+        "sum": 0.0,
+        "min": None,
+        "max": None,
+        "histogram": [0] * (len(histogram_edges(metric_type)) + 1),
+    }
+
+
+def merge_aggregate(into: Dict, delta: Dict) -> Dict:
+    """Add the aggregate ``delta`` to ``into`` (in place)"""
+    into["count"] += delta["count"]
+    into["sum"] += delta["sum"]
+    for field, pick in (("min", min), ("max", max)):
+        values = [v for v in (into[field], delta[field]) if v is not None]
+        into[field] = pick(values) if values else None
+    for index, count in enumerate(delta["histogram"]):
+        into["histogram"][index] += count
+    return into
+
+
+def histogram_percentile(metric_type: str, aggregate: Dict, p: float) -> float:
+    """
+    Percentile ``p`` interpolated within the histogram bucket holding it,
+    clamped to the observed min/max
+    """
+    edges = histogram_edges(metric_type)
+    rank = (aggregate["count"] - 1) * p / 100
+    seen = 0
+    for index, count in enumerate(aggregate["histogram"]):
+        if not count or seen + count <= rank:
+            seen += count
+            continue
+        low = edges[index - 1] if index else aggregate["min"]
+        high = edges[index] if index < len(edges) else aggregate["max"]
+        low, high = max(low, aggregate["min"]), min(high, aggregate["max"])
+        fraction = (rank - seen + 0.5) / count
+        return low + (high - low) * min(fraction, 1.0)
+    return aggregate["max"]
+
+
+def summarize(metric_type: str, aggregate: Dict, recent: List[float]) -> Dict:
+    """Dashboard summary of one metric type"""
+    return {
+        "count": aggregate["count"],
+        "avg": round(aggregate["sum"] / aggregate["count"], 2),
+        "min": aggregate["min"],
+        "max": aggregate["max"],
+        "median": round(histogram_percentile(metric_type, aggregate, 50), 2),
+        "p95": round(histogram_percentile(metric_type, aggregate, 95), 2),
+        "recent": recent,
+    }
+
+
+class RedisVitalsStore:
+    """Aggregates in Redis: one script call per value"""
+
+    def __init__(self, alias: str):
+        from django_redis import get_redis_connection
+
+        self.client = get_redis_connection(alias)
+        self.script = self.client.register_script(RECORD_SCRIPT)
+
+    def record(self, metric_type: str, value: float, timestamp: float) -> None:
+        self.script(
+            keys=[bucket_key(bucket_id(timestamp)), recent_key(metric_type)],
+            args=[
+                metric_type,
+                repr(value),
+                f"b{histogram_index(metric_type, value)}",
+                RETENTION_SECONDS,
+                RECENT_VALUES,
+            ],
+        )
+
+    def window(self, buckets: List[int], metric_types: Iterable[str]) -> Dict:
+        metric_types = list(metric_types)
+        pipe = self.client.pipeline(transaction=False)
+        for bucket in buckets:
+            pipe.hgetall(bucket_key(bucket))
+        for metric_type in metric_types:
+            pipe.lrange(recent_key(metric_type), 0, RECENT_VALUES - 1)
+        results = pipe.execute()
+
+        aggregates = {}
+        for fields in results[: len(buckets)]:
+            for name, raw in fields.items():
+                name = name.decode() if isinstance(name, bytes) else name
+                metric_type, _, field = name.partition(":")
+                if metric_type not in metric_types:
+                    continue
+                aggregate = aggregates.setdefault(
+                    metric_type, empty_aggregate(metric_type)
+                )
+                value = float(raw)
+                if field == "count":
+                    aggregate["count"] += int(value)
+                elif field == "sum":
+                    aggregate["sum"] += value
+                elif field in ("min", "max"):
+                    pick = min if field == "min" else max
+                    current = aggregate[field]
+                    aggregate[field] = (
+                        value if current is None else pick(current, value)
+                    )
+                else:
+                    aggregate["histogram"][int(field[1:])] += int(value)
+
+        recent = {
+            metric_type: [float(v) for v in reversed(values)]
+            for metric_type, values in zip(metric_types, results[len(buckets) :])
+        }
+        return {"aggregates": aggregates, "recent": recent}
+
+    def reset(self) -> None:
+        keys = list(self.client.scan_iter(f"{KEY_PREFIX}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class CacheVitalsStore:
+    """
+    Aggregates in a Django cache: values are batched in process memory and
+    merged into the cache under a process-wide lock
+    """
+
+    def __init__(
+        self,
+        store,
+        flush_interval: float = FLUSH_INTERVAL,
+        flush_size: int = FLUSH_SIZE,
+    ):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._reset_pending()
+        self._last_flush = time.monotonic()
+
+    def _reset_pending(self) -> None:
+        # bucket -> metric type -> aggregate
+        self._pending: Dict[int, Dict[str, Dict]] = defaultdict(dict)
+        self._recent: Dict[str, List[float]] = defaultdict(list)
+        self._pending_values = 0
+
+    def record(self, metric_type: str, value: float, timestamp: float) -> None:
+        with self._lock:
+            bucket = self._pending[bucket_id(timestamp)]
+            aggregate = bucket.get(metric_type)
+            if aggregate is None:
+                aggregate = bucket[metric_type] = empty_aggregate(metric_type)
+            aggregate["count"] += 1
+            aggregate["sum"] += value
+            if aggregate["min"] is None or value < aggregate["min"]:
+                aggregate["min"] = value
+            if aggregate["max"] is None or value > aggregate["max"]:
+                aggregate["max"] = value
+            aggregate["histogram"][histogram_index(metric_type, value)] += 1
+            self._recent[metric_type].append(value)
+            self._pending_values += 1
+            due = (
+                self._pending_values >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Merge the batched values into the cache"""
+        with self._lock:
+            pending, recent = self._pending, self._recent
+            self._reset_pending()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+
+        keys = [bucket_key(bucket) for bucket in pending]
+        keys += [recent_key(metric_type) for metric_type in recent]
+        with self._flush_lock:
+            stored = self.store.get_many(keys)
+            updates = {}
+            for bucket, metrics in pending.items():
+                key = bucket_key(bucket)
+                merged = stored.get(key) or {}
+                for metric_type, delta in metrics.items():
+                    merged[metric_type] = merge_aggregate(
+                        merged.get(metric_type) or empty_aggregate(metric_type),
+                        delta,
+                    )
+                updates[key] = merged
+            for metric_type, values in recent.items():
+                key = recent_key(metric_type)
+                updates[key] = (stored.get(key, []) + values)[-RECENT_VALUES:]
+            self.store.set_many(updates, RETENTION_SECONDS)
+
+    def window(self, buckets: List[int], metric_types: Iterable[str]) -> Dict:
+        self.flush()
+        metric_types = list(metric_types)
+        stored = self.store.get_many(
+            [bucket_key(bucket) for bucket in buckets]
+            + [recent_key(metric_type) for metric_type in metric_types]
+        )
+
+        aggregates = {}
+        for bucket in buckets:
+            for metric_type, delta in (stored.get(bucket_key(bucket)) or {}).items():
+                if metric_type not in metric_types:
+                    continue
+                aggregate = aggregates.setdefault(
+                    metric_type, empty_aggregate(metric_type)
+                )
+                merge_aggregate(aggregate, delta)
+
+        recent = {
+            metric_type: stored.get(recent_key(metric_type), [])
+            for metric_type in metric_types
+        }
+        return {"aggregates": aggregates, "recent": recent}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset_pending()
+        now = time.time()
+        self.store.delete_many(
+            [bucket_key(bucket) for bucket in window_buckets(25, now)]
+            + [recent_key(metric_type) for metric_type in METRIC_TYPES]
+        )
+
+
+class WebVitalsStore:
+    """
+    Web Vitals aggregates against the Redis or cache backend
+    """
+
+    def __init__(self, cache_alias: Optional[str] = None, backend=None):
+        self._store = SharedStore(
+            "web-vitals",
+            "WEB_VITALS_CACHE_ALIAS",
+            CacheVitalsStore,
+            RedisVitalsStore,
+            cache_alias=cache_alias,
+            backend=backend,
+        )
+
+    def record(
+        self, metric_type: str, value: float, timestamp: Optional[float] = None
+    ) -> None:
+        """Add one value to the current bucket of ``metric_type``"""
+        timestamp = time.time() if timestamp is None else timestamp
+        self._store.call("record", metric_type, value, timestamp)
+
+    def summary(
+        self,
+        hours: float = 24,
+        metric_types: Iterable[str] = METRIC_TYPES,
+        now: Optional[float] = None,
+    ) -> Dict[str, Dict]:
+        """
+        Per-type count/avg/min/max/median/p95 over the last ``hours`` plus
+        the most recent values; types without values are left out
+        """
+        metric_types = list(metric_types)
+        buckets = window_buckets(hours, now)
+        window = self._store.call("window", buckets, metric_types)
+
+        aggregates = window["aggregates"]
+        return {
+            metric_type: summarize(
+                metric_type,
+                aggregates[metric_type],
+                window["recent"].get(metric_type, []),
+            )
+            for metric_type in metric_types
+            if aggregates.get(metric_type, {}).get("count")
+        }
+
+    def flush(self) -> None:
+        self._store.flush()
+
+    def reset(self) -> None:
+        self._store.reset()
+
+
+# Global store shared by the monitoring views
+web_vitals_store = WebVitalsStore()
@@ -89,6 +89,7 @@ for app in OPTIONAL_APPS:
         pass
 
 MIDDLEWARE = [
+    "apps.main.middleware.fast_path.RouteClassMiddleware",  # Fast path + latency accounting (keep first)
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "apps.main.ratelimit.RateLimitMiddleware",  # Global rate limiting
@@ -220,12 +221,20 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
-# WhiteNoise configuration for static files
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# WhiteNoise configuration for static files (plus optimize_static build outputs)
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "apps.portfolio.storage.AssetManifestStaticFilesStorage",
+    },
+}
 
 # Static file optimization settings
 STATIC_COMPRESSION = True
 STATIC_WEBP_SUPPORT = True
+STATIC_FILE_INDEX_REFRESH_INTERVAL = 5  # seconds between manifest mtime checks
 WHITENOISE_MAX_AGE = 31536000  # 1 year for static files
 WHITENOISE_MANIFEST_STRICT = False
 WHITENOISE_ALLOW_ALL_ORIGINS = True
@@ -269,6 +278,13 @@ IMAGE_QUALITY_COMPRESSION = 85
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Responsive image derivatives (see apps.portfolio.services.image_derivatives)
+IMAGE_DERIVATIVES_ENABLED = config("IMAGE_DERIVATIVES_ENABLED", default=True, cast=bool)
+IMAGE_DERIVATIVE_ROOT = MEDIA_ROOT / "derivatives"
+IMAGE_DERIVATIVE_URL = f"{MEDIA_URL}derivatives/"
+IMAGE_DERIVATIVE_WIDTHS = (320, 480, 640, 768, 1024, 1280, 1600, 1920)
+IMAGE_DERIVATIVE_FORMATS = ("avif", "webp", "jpeg")
+
 # API Configuration
 API_VERSION = "v1"
 
@@ -297,6 +313,49 @@ REST_FRAMEWORK = {
     ],
 }
 
+# JWT revocation: seconds between shared blacklist version checks
+JWT_REVOCATION_REFRESH_INTERVAL = 1
+
+# WebSocket auth: seconds a resolved session/user (or an anonymous result)
+# stays cached, so reconnect storms skip the database
+WEBSOCKET_AUTH_CACHE_ALIAS = "default"
+WEBSOCKET_AUTH_CACHE_TTL = 60
+WEBSOCKET_AUTH_NEGATIVE_TTL = 10
+
+# Pre-rendered RSS feeds: cache holding them and the longest they are kept
+# (content changes re-render them, see apps/main/feed_cache.py)
+FEED_CACHE_ALIAS = "default"
+FEED_CACHE_TIMEOUT = 3600
+
+# Admin dashboard counts: cache holding the snapshot and its lifetime
+# (content changes drop it, see apps/core/dashboard_stats.py)
+DASHBOARD_STATS_CACHE_ALIAS = "default"
+DASHBOARD_STATS_TTL = 300
+
+# GDPR data exports (kept outside MEDIA_ROOT, served only via the download view)
+GDPR_EXPORT_ROOT = BASE_DIR / "private" / "exports"
+GDPR_EXPORT_WORKERS = 2
+GDPR_EXPORT_STALE_AFTER = 900  # seconds without progress before an export is retried
+
+# Code playground execution (apps/playground/sandbox.py): concurrent runs per
+# process, queued runs before 503, idle pre-started interpreters per language
+PLAYGROUND_WORKERS = 4
+PLAYGROUND_MAX_QUEUE = 32
+PLAYGROUND_WARM_WORKERS = {"python": 2, "javascript": 1}
+PLAYGROUND_LIMITS = {
+    "cpu_seconds": 5,
+    "wall_seconds": 10,
+    "memory_mb": 256,
+}
+PLAYGROUND_COMPILE_CACHE_DIR = BASE_DIR / "private" / "playground-cache"
+PLAYGROUND_COMPILE_CACHE_ENTRIES = 256
+PLAYGROUND_JOB_TTL = 300
+# Execution result cache: in-process LRU size, days unused before pruning and
+# the most rows kept (least recently used rows beyond it are deleted)
+PLAYGROUND_RESULT_CACHE_SIZE = 512
+PLAYGROUND_RESULT_RETENTION_DAYS = 30
+PLAYGROUND_RESULT_MAX_ROWS = 10000
+
 # Security settings
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -349,6 +408,57 @@ AUTHENTICATION_BACKENDS = [
 
 SENTRY_DSN = config("SENTRY_DSN", default="")
 
+# Query profiler (apps.main.query_profiler): share of requests whose SQL is
+# fingerprinted, and repeats of one fingerprint per request flagged as N+1
+QUERY_PROFILER_SAMPLE_RATE = config(
+    "QUERY_PROFILER_SAMPLE_RATE", default=0.1, cast=float
+)
+QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = 5
+
+# Middleware fast path (apps.main.middleware.fast_path): route classes by
+# path prefix ("=" for an exact path), and the @route_aware middleware groups
+# each class bypasses
+MIDDLEWARE_ROUTE_CLASSES = {
+    "static": [
+        "/static/",
+        "/media/",
+        "/img/",
+        "/favicon.ico",
+        "/robots.txt",
+        "/sw.js",
+        "/manifest.json",
+    ],
+    "health": ["/health/", "/api/health/"],
+    # Exact path: /api/performance/dashboard/ is a staff view, not a beacon
+    "beacon": ["=/api/performance/"],
+}
+MIDDLEWARE_FAST_PATH = {
+    "static": ["analytics", "gdpr", "apm", "caching"],
+    "health": ["analytics", "gdpr", "apm", "caching"],
+    "beacon": ["analytics", "gdpr", "apm", "caching"],
+}
+MIDDLEWARE_LATENCY_TRACKING = config(
+    "MIDDLEWARE_LATENCY_TRACKING", default=True, cast=bool
+)
+
+# Cache holding rate limiter state; a django-redis cache makes every check a
+# single atomic Lua script call (see apps/main/rate_limiter.py)
+RATE_LIMIT_CACHE_ALIAS = "default"
+
+# Cache holding SearchMonitor counters and query logs; a django-redis cache
+# makes recording a search one Lua script call (see apps/main/search_counters.py)
+SEARCH_COUNTERS_CACHE_ALIAS = "default"
+
+# Raw SearchLog rows hold IPs and user agents; prune_search_logs deletes them
+# after this many days (the per-day query rollups are kept longer)
+SEARCH_LOG_RETENTION_DAYS = 30
+SEARCH_STATS_RETENTION_DAYS = 365
+
+# Cache holding the Web Vitals aggregates behind the monitoring dashboard;
+# it must be shared by the workers (django-redis: one Lua call per value,
+# see apps/portfolio/web_vitals.py)
+WEB_VITALS_CACHE_ALIAS = "default"
+
 # Performance budget configuration for APM
 PERFORMANCE_BUDGETS = {
     "SLOW_TRANSACTION_THRESHOLD": config(
@@ -623,6 +733,7 @@ WEBPUSH_SETTINGS = {
     "VAPID_PRIVATE_KEY": config("VAPID_PRIVATE_KEY", default=""),
     "VAPID_ADMIN_EMAIL": config("VAPID_ADMIN_EMAIL", default="admin@example.com"),
 }
+WEBPUSH_MAX_CONCURRENCY = config("WEBPUSH_MAX_CONCURRENCY", default=32, cast=int)
 
 # ==========================================================================
 # PERFORMANCE MONITORING SETTINGS
@@ -733,6 +844,14 @@ if not DEBUG:
         )
         EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
+# Mail outbox (apps.main.mail_outbox): queued delivery off the request path
+MAIL_OUTBOX_AUTOSTART = config("MAIL_OUTBOX_AUTOSTART", default=True, cast=bool)
+MAIL_OUTBOX_BATCH_SIZE = 50
+MAIL_OUTBOX_MAX_ATTEMPTS = 5
+MAIL_OUTBOX_RETRY_BACKOFF = 30  # seconds, doubled per attempt
+MAIL_OUTBOX_DEDUP_WINDOW = 600  # seconds
+MAIL_OUTBOX_RETENTION_DAYS = 7  # sent rows are deleted after this
+
 # ==========================================================================
 # REDIS CACHE CONFIGURATION (Production & Development)
 # ==========================================================================
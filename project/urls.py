@@ -38,6 +38,7 @@ from apps.core.health import (
     readiness_check_view,
 )
 from apps.main.views import home, logout_view
+from apps.portfolio.views.images import image_derivative_view
 
 # Import API views from apps.main.views
 # from apps.main.views import (
@@ -59,6 +60,8 @@ urlpatterns = [
     path("health/", health_check_view, name="health_check"),
     path("health/readiness/", readiness_check_view, name="readiness_check"),
     path("health/liveness/", liveness_check_view, name="liveness_check"),
+    # Responsive image derivatives (signed, rendered on first request)
+    path("img/<str:token>/", image_derivative_view, name="image_derivative"),
     # PWA and JSON endpoints
     path(
         "manifest.json",
@@ -99,6 +99,14 @@ else
     warning "Static files collection skipped"
 fi
 
+# Pre-execute featured playground templates into the result cache
+log "Pre-executing featured playground templates..."
+if python manage.py warm_playground_results; then
+    success "Playground results warmed"
+else
+    warning "Playground warmup skipped"
+fi
+
 # Warm up cache if Redis is available
 if [ -n "$REDIS_URL" ]; then
     log "Warming up cache..."
@@ -0,0 +1,88 @@
+"""
+Fixtures for the benchmark suite.
+
+Benchmarks only run when RUN_BENCHMARKS=1 (see ``make benchmark``); the
+corpus is generated once per session from a fixed seed.
+"""
+
+import os
+import random
+
+import generators
+import pytest
+from harness import BenchmarkSession
+
+SEED = int(os.environ.get("BENCHMARK_SEED", "20240601"))
+
+CORPUS_SIZES = {
+    "posts": 2000,
+    "tools": 1000,
+    "ai_tools": 500,
+    "metrics": 10000,
+    "log_lines": 20000,
+}
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="set RUN_BENCHMARKS=1 to run benchmarks")
+    for item in items:
+        if "tests/benchmarks" in str(item.fspath):
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def bench():
+    session = BenchmarkSession.from_env()
+    yield session
+    session.write()
+
+
+def seeded(name: str) -> random.Random:
+    """Independent stream per dataset, so fixture order does not matter"""
+    return random.Random(f"{SEED}:{name}")
+
+
+@pytest.fixture(scope="session")
+def corpus(django_db_setup, django_db_blocker):
+    """Posts, tools and AI tools committed for the whole session"""
+    from apps.blog.models import Post
+    from apps.main.models import AITool
+    from apps.tools.models import Tool
+
+    with django_db_blocker.unblock():
+        author = generators.make_author()
+        data = {
+            "posts": generators.make_posts(
+                seeded("posts"),
+                CORPUS_SIZES["posts"],
+                author,
+            ),
+            "tools": generators.make_tools(seeded("tools"), CORPUS_SIZES["tools"]),
+            "ai_tools": generators.make_ai_tools(
+                seeded("ai_tools"), CORPUS_SIZES["ai_tools"]
+            ),
+        }
+
+    yield data
+
+    with django_db_blocker.unblock():
+        Post.objects.filter(author=author).delete()
+        Tool.objects.filter(url__startswith="https://example.com/tools/").delete()
+        AITool.objects.filter(url__startswith="https://example.com/ai/").delete()
+        author.delete()
+
+
+@pytest.fixture(scope="session")
+def metrics():
+    return generators.make_metrics(seeded("metrics"), CORPUS_SIZES["metrics"])
+
+
+@pytest.fixture(scope="session")
+def log_directory(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("bench-logs")
+    generators.write_log_file(
+        seeded("logs"), directory / "app.log", CORPUS_SIZES["log_lines"]
+    )
+    return directory
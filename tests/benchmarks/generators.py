@@ -0,0 +1,174 @@
+"""
+Seeded fixture generators for benchmarks.
+
+Every generator takes a ``random.Random`` so a given seed always produces
+the same corpus, which keeps benchmark runs comparable.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+from django.utils.text import slugify
+
+WORDS = (
+    "django python security performance cache database search index query "
+    "async tooling design cloud docker kubernetes testing api frontend "
+    "backend monitoring logging deploy pipeline profiling latency network "
+    "encryption auth token session template static storage queue worker"
+).split()
+
+TAGS = [
+    "python",
+    "django",
+    "security",
+    "devops",
+    "testing",
+    "frontend",
+    "ai",
+    "database",
+    "cloud",
+    "performance",
+]
+
+WEB_VITALS = {
+    "lcp": (1200, 5000),
+    "fid": (10, 400),
+    "cls": (0.0, 0.4),
+    "inp": (50, 700),
+    "ttfb": (100, 2200),
+    "fcp": (600, 3500),
+}
+
+LOG_LEVELS = ["INFO"] * 14 + ["WARNING"] * 4 + ["ERROR"] * 2
+LOGGERS = ["django.request", "apm", "apps.blog", "apps.main.search", "security"]
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def make_author(username: str = "bench-author"):
+    from apps.main.models import Admin
+
+    author, _ = Admin.objects.get_or_create(
+        username=username,
+        defaults={"email": f"{username}@example.com", "name": "Benchmark"},
+    )
+    return author
+
+
+def make_posts(rng: random.Random, count: int, author):
+    """Published blog posts (bulk inserted, so ``Post.save`` is skipped)"""
+    from apps.blog.models import Post
+
+    now = timezone.now()
+    posts = []
+    for i in range(count):
+        title = f"{sentence(rng, 5)} {i}"
+        content = "\n\n".join(sentence(rng, 40) for _ in range(rng.randint(3, 8)))
+        posts.append(
+            Post(
+                title=title,
+                slug=slugify(title),
+                excerpt=sentence(rng, 20),
+                content=content,
+                meta_description=content[:160],
+                status="published",
+                tags=rng.sample(TAGS, rng.randint(1, 4)),
+                author=author,
+                published_at=now - timedelta(minutes=i),
+                view_count=rng.randint(0, 5000),
+            )
+        )
+    return Post.objects.bulk_create(posts, batch_size=500)
+
+
+def make_tools(rng: random.Random, count: int):
+    from apps.tools.models import Tool
+
+    categories = [choice for choice, _ in Tool.CATEGORY_CHOICES]
+    tools = []
+    for i in range(count):
+        title = f"{sentence(rng, 3)} {i}"
+        tools.append(
+            Tool(
+                title=title,
+                slug=slugify(title),
+                description=sentence(rng, 30),
+                url=f"https://example.com/tools/{i}",
+                category=rng.choice(categories),
+                tags=rng.sample(TAGS, rng.randint(1, 3)),
+                is_favorite=rng.random() < 0.05,
+                rating=rng.randint(1, 5),
+            )
+        )
+    return Tool.objects.bulk_create(tools, batch_size=500)
+
+
+def make_ai_tools(rng: random.Random, count: int):
+    from apps.main.models import AITool
+
+    categories = [choice for choice, _ in AITool.CATEGORY_CHOICES]
+    return AITool.objects.bulk_create(
+        [
+            AITool(
+                name=f"{sentence(rng, 2)} {i}",
+                description=sentence(rng, 25),
+                url=f"https://example.com/ai/{i}",
+                category=rng.choice(categories),
+                tags=", ".join(rng.sample(TAGS, rng.randint(1, 3))),
+                rating=round(rng.uniform(0, 5), 1),
+                order=i,
+            )
+            for i in range(count)
+        ],
+        batch_size=500,
+    )
+
+
+def make_metrics(rng: random.Random, count: int):
+    """A ``PerformanceMetrics`` store filled with Web Vitals samples"""
+    from apps.portfolio.performance import PerformanceMetrics
+
+    metrics = PerformanceMetrics(max_entries=count)
+    for alert in metrics.alerts.values():
+        alert.enabled = False
+
+    names = list(WEB_VITALS)
+    for i in range(count):
+        name = names[i % len(names)]
+        low, high = WEB_VITALS[name]
+        metrics.add_metric(
+            name,
+            rng.uniform(low, high),
+            url=f"/blog/post-{rng.randint(1, 200)}/",
+            device_type=rng.choice(["desktop", "mobile", "tablet"]),
+        )
+    return metrics
+
+
+def write_log_file(rng: random.Random, path, count: int, hours: int = 24):
+    """JSON-lines application log spread over the last ``hours``"""
+    now = datetime.now()
+    with open(path, "w") as f:
+        for i in range(count):
+            level = rng.choice(LOG_LEVELS)
+            record = {
+                "timestamp": (
+                    now - timedelta(seconds=rng.randint(0, hours * 3600))
+                ).isoformat(),
+                "level": level,
+                "logger": rng.choice(LOGGERS),
+                "message": f"{sentence(rng, 6)} #{rng.randint(1, 50)}",
+                "service": "portfolio",
+                "environment": "benchmark",
+                "trace_id": f"trace-{i}",
+            }
+            if rng.random() < 0.05:
+                record["performance"] = {"response_time": rng.uniform(0.5, 5)}
+            if rng.random() < 0.02:
+                record["security"] = {"event": "failed_login"}
+            f.write(json.dumps(record) + "\n")
+    return path
@@ -0,0 +1,185 @@
+"""
+Benchmark harness.
+
+A small pytest-benchmark equivalent that needs no extra dependency:
+
+- Each benchmark runs ``warmup`` untimed and ``rounds`` timed iterations
+  (optional untimed ``setup`` before every iteration, e.g. cache clears)
+- Timings are divided by a calibration workload measured at session start,
+  so results recorded on one machine remain comparable on another
+- Results are written as JSON and compared against a stored baseline; a
+  benchmark whose normalized median exceeds ``baseline * tolerance`` fails
+"""
+
+import json
+import os
+import platform
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_OUTPUT = BENCHMARK_DIR.parent.parent / "reports" / "benchmarks.json"
+DEFAULT_TOLERANCE = 1.5
+
+
+class BenchmarkRegression(AssertionError):
+    """A benchmark got slower than its baseline allows"""
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    rounds: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    p95_ms: float
+    stdev_ms: float
+    normalized: float  # median / calibration unit
+
+
+def calibrate(repeats: int = 5) -> float:
+    """
+    Seconds taken by a fixed pure-Python workload (best of ``repeats``)
+    """
+    rng = random.Random(1234)
+    data = [rng.random() for _ in range(50_000)]
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ordered = sorted(data)
+        index = {round(value, 4): i for i, value in enumerate(ordered)}
+        " ".join(str(key) for key in list(index)[:5_000]).split()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(
+    func: Callable[[], object],
+    rounds: int,
+    warmup: int = 1,
+    setup: Optional[Callable[[], object]] = None,
+) -> list:
+    """Run ``func`` and return the timed durations in seconds"""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+
+    durations = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(name: str, durations: list, unit: float) -> BenchmarkResult:
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    median = statistics.median(ordered)
+    return BenchmarkResult(
+        name=name,
+        rounds=len(ordered),
+        min_ms=round(ordered[0] * 1000, 3),
+        median_ms=round(median * 1000, 3),
+        mean_ms=round(statistics.fmean(ordered) * 1000, 3),
+        p95_ms=round(p95 * 1000, 3),
+        stdev_ms=round(statistics.pstdev(ordered) * 1000, 3),
+        normalized=round(median / unit, 4),
+    )
+
+
+class BenchmarkSession:
+    """
+    Collects results for one run and checks them against the baseline
+    """
+
+    def __init__(
+        self,
+        baseline_path: Path = DEFAULT_BASELINE,
+        output_path: Path = DEFAULT_OUTPUT,
+        tolerance: float = DEFAULT_TOLERANCE,
+        save_baseline: bool = False,
+    ):
+        self.baseline_path = Path(baseline_path)
+        self.output_path = Path(output_path)
+        self.tolerance = tolerance
+        self.save_baseline = save_baseline
+        self.unit = calibrate()
+        self.results: Dict[str, BenchmarkResult] = {}
+        self.baseline = self._load_baseline()
+
+    @classmethod
+    def from_env(cls) -> "BenchmarkSession":
+        return cls(
+            baseline_path=os.environ.get("BENCHMARK_BASELINE", DEFAULT_BASELINE),
+            output_path=os.environ.get("BENCHMARK_OUTPUT", DEFAULT_OUTPUT),
+            tolerance=float(os.environ.get("BENCHMARK_TOLERANCE", DEFAULT_TOLERANCE)),
+            save_baseline=os.environ.get("BENCHMARK_SAVE_BASELINE") == "1",
+        )
+
+    def _load_baseline(self) -> Dict[str, dict]:
+        if not self.baseline_path.exists():
+            return {}
+        with open(self.baseline_path) as f:
+            return json.load(f).get("results", {})
+
+    def __call__(
+        self,
+        name: str,
+        func: Callable[[], object],
+        rounds: int = 20,
+        warmup: int = 2,
+        setup: Optional[Callable[[], object]] = None,
+    ) -> BenchmarkResult:
+        """Run, record and check one benchmark"""
+        result = summarize(name, measure(func, rounds, warmup, setup), self.unit)
+        self.results[name] = result
+        self.check(result)
+        return result
+
+    def check(self, result: BenchmarkResult) -> None:
+        if self.save_baseline or result.name not in self.baseline:
+            return
+        allowed = self.baseline[result.name]["normalized"] * self.tolerance
+        if result.normalized > allowed:
+            raise BenchmarkRegression(
+                f"{result.name} regressed: normalized median {result.normalized} "
+                f"> {allowed:.4f} (baseline "
+                f"{self.baseline[result.name]['normalized']} x {self.tolerance}); "
+                f"median {result.median_ms}ms"
+            )
+
+    def report(self) -> dict:
+        return {
+            "calibration_ms": round(self.unit * 1000, 3),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": {name: asdict(r) for name, r in sorted(self.results.items())},
+        }
+
+    def write(self) -> None:
+        """Write the JSON report (and the baseline when requested)"""
+        if not self.results:
+            return
+        report = self.report()
+        paths = [self.output_path]
+        if self.save_baseline:
+            merged = {**self.baseline, **report["results"]}
+            report = {**report, "results": dict(sorted(merged.items()))}
+            paths.append(self.baseline_path)
+
+        for path in paths:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
@@ -0,0 +1,148 @@
+"""
+Benchmarks for hot paths.
+
+Run with ``make benchmark``. Each benchmark's normalized median is compared
+against ``baseline.json``; refresh the baseline with
+``make benchmark-baseline`` after an intentional change.
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+QUERIES = ["django security", "python", "cache database performance"]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_search_engine(bench, corpus):
+    from apps.main.search.base_search_engine import SearchEngine
+
+    engine = SearchEngine()
+
+    def run():
+        for query in QUERIES:
+            engine.search(query, categories=["blog_posts", "tools"], limit=50)
+
+    bench("search_engine.search", run, rounds=10)
+
+
+def test_full_text_search(bench, corpus):
+    if connection.vendor != "postgresql":
+        pytest.skip("full_text_search requires PostgreSQL")
+
+    from apps.portfolio.fulltext_search import PostgreSQLSearchEngine
+
+    engine = PostgreSQLSearchEngine()
+
+    def run():
+        for query in QUERIES:
+            engine.full_text_search(query, limit=50)
+
+    bench("fulltext.full_text_search", run, rounds=10, setup=cache.clear)
+
+
+def test_relevance_scorer(bench, corpus):
+    from apps.main.search.scorers import RelevanceScorer
+
+    scorer = RelevanceScorer()
+    posts = corpus["posts"][:500]
+    fields = ["title", "content", "excerpt", "meta_description"]
+    keywords = ["django", "security", "cache"]
+
+    def run():
+        for post in posts:
+            scorer.calculate_score(post, keywords, fields, "tags", 10)
+
+    bench("relevance_scorer.calculate_score", run)
+
+
+def test_collect_all_tags(bench, corpus):
+    from apps.main.tag_collectors import TagCollectorRegistry
+
+    registry = TagCollectorRegistry()
+
+    bench("tag_collectors.collect_all_tags", registry.collect_all_tags, rounds=10)
+
+
+def test_metrics_summary(bench, metrics):
+    bench(
+        "performance_metrics.get_metrics_summary",
+        lambda: metrics.get_metrics_summary(hours=24),
+        rounds=10,
+        setup=metrics._stats_cache.clear,
+    )
+
+
+def test_aggregate_logs(bench, log_directory):
+    from apps.portfolio.logging.log_aggregator import LogAggregator
+
+    aggregator = LogAggregator()
+    aggregator.log_directory = log_directory
+
+    bench(
+        "log_aggregator.aggregate_logs",
+        lambda: aggregator.aggregate_logs(hours_back=24),
+        rounds=5,
+        warmup=1,
+        setup=cache.clear,
+    )
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_log_export(bench, log_directory, export_format):
+    from apps.portfolio.logging.log_aggregator import LogAggregator
+    from apps.portfolio.logging.log_export import LogExporter, LogFilter
+
+    aggregator = LogAggregator()
+    aggregator.log_directory = log_directory
+    exporter = LogExporter(aggregator)
+
+    def run():
+        for _ in exporter.stream(LogFilter(), export_format):
+            pass
+
+    bench(f"log_export.stream_{export_format}", run, rounds=5, warmup=1)
+
+
+def test_middleware_stack(bench):
+    client = Client()
+
+    def run():
+        response = client.get("/health/liveness/")
+        assert response.status_code == 200
+
+    bench("middleware.liveness_request", run, rounds=50)
+
+
+@pytest.mark.parametrize(
+    "name,url",
+    [
+        ("home", lambda corpus: reverse("home")),
+        ("blog_list", lambda corpus: reverse("blog:list")),
+        (
+            "blog_detail",
+            lambda corpus: reverse("blog:detail", args=[corpus["posts"][0].slug]),
+        ),
+        ("tools_list", lambda corpus: reverse("tools:list")),
+    ],
+)
+def test_page_views(bench, corpus, name, url):
+    client = Client()
+    path = url(corpus)
+
+    def run():
+        response = client.get(path)
+        assert response.status_code == 200
+
+    bench(f"views.{name}", run, rounds=10, setup=cache.clear)
@@ -0,0 +1,94 @@
+"""
+Benchmark for the web push dispatcher against a local stub push service.
+
+Measures end-to-end encryption + delivery throughput with keep-alive
+connections; outcome recording is stubbed so no database is needed.
+"""
+
+import base64
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from apps.portfolio.services.push_dispatcher import PushDispatcher
+
+SUBSCRIBERS = 2000
+CONCURRENCY = 16
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class StubPushHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        StubPushHandler.connections.add(self.client_address)
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_push_service():
+    StubPushHandler.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPushHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.performance
+def test_broadcast_throughput(stub_push_service):
+    vapid_key = ec.generate_private_key(ec.SECP256R1())
+    dispatcher = PushDispatcher(
+        b64url(vapid_key.private_numbers().private_value.to_bytes(32, "big")),
+        "mailto:bench@example.com",
+        max_concurrent=CONCURRENCY,
+    )
+    dispatcher.record = lambda outcomes, fields: None
+
+    subscriber = ec.generate_private_key(ec.SECP256R1())
+    p256dh = b64url(
+        subscriber.public_key().public_bytes(
+            serialization.Encoding.X962,
+            serialization.PublicFormat.UncompressedPoint,
+        )
+    )
+    subscriptions = [
+        SimpleNamespace(
+            id=i,
+            endpoint=f"{stub_push_service}/push/{i}",
+            p256dh=p256dh,
+            auth=b64url(os.urandom(16)),
+        )
+        for i in range(SUBSCRIBERS)
+    ]
+
+    start = time.perf_counter()
+    summary = dispatcher.dispatch(subscriptions, {"title": "Benchmark", "body": "x"})
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\n[BENCH] {SUBSCRIBERS} pushes in {elapsed:.2f}s "
+        f"({SUBSCRIBERS / elapsed:.0f}/s) over "
+        f"{len(StubPushHandler.connections)} connections"
+    )
+    assert summary["success_count"] == SUBSCRIBERS
+    assert len(StubPushHandler.connections) <= CONCURRENCY
+    assert elapsed < 30
@@ -19,6 +19,7 @@ from apps.core.middleware.rate_limiting import (
     AuthenticationRateLimiter,
     RateLimitMiddleware,
 )
+from apps.main.rate_limiter import Rate, rate_limiter
 
 User = get_user_model()
 
@@ -164,10 +165,9 @@ class TestAuthenticationRateLimiter(TestCase):
         # (In real scenario, wait ATTEMPT_WINDOW seconds)
         # For testing, we verify the logic works with mock
 
-        # This test verifies the cleanup logic exists
-        cache_key = self.rate_limiter._get_cache_key(ip_address, "ip")
-        attempts = cache.get(cache_key, [])
-        assert len(attempts) == 3
+        # Three attempts counted: one more attempt leaves one remaining
+        decision = rate_limiter.peek("auth:ip", ip_address, [Rate(5, 300)])
+        assert decision.remaining == 1
 
 
 @override_settings(
@@ -0,0 +1,152 @@
+"""
+Unit tests for cached API key verification and write-behind usage accounting.
+
+Tests cover:
+- Positive and negative caching in APIKeyManager.get_from_key
+- Cache invalidation on revoke
+- Atomic rate counter and batched usage flushes
+- Re-queueing of usage when a flush fails
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from apps.core.models import api_key as api_key_module
+from apps.core.models.api_key import APIKey, APIKeyUsage, APIKeyUsageBuffer
+
+User = get_user_model()
+
+
+@pytest.fixture
+def issued_key(db):
+    cache.clear()
+    user = User.objects.create_user(
+        username="keyowner", email="keyowner@example.com", password="pass12345"
+    )
+    return APIKey.objects.create_key(user=user, name="Server", permissions="write")
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    buffer = APIKeyUsageBuffer(flush_interval=3600, flush_size=1000)
+    monkeypatch.setattr(api_key_module, "usage_buffer", buffer)
+    return buffer
+
+
+@pytest.mark.django_db
+class TestAPIKeyVerificationCache:
+    """Test cached key lookups."""
+
+    def test_verified_key_is_served_from_cache(self, issued_key):
+        raw_key = issued_key["key"]
+        assert APIKey.objects.get_from_key(raw_key).pk == issued_key["api_key"].pk
+
+        with CaptureQueriesContext(connection) as queries:
+            api_key = APIKey.objects.get_from_key(raw_key)
+        assert len(queries) == 0
+        assert api_key.pk == issued_key["api_key"].pk
+        assert api_key.has_permission("write")
+        assert api_key.user.username == "keyowner"
+
+    def test_cached_value_is_json_safe(self, issued_key, monkeypatch):
+        api_key = issued_key["api_key"]
+        api_key.expires_at = api_key.created_at
+        api_key.save()
+        APIKey.objects.get_from_key(issued_key["key"])
+
+        cached = cache.get(api_key_module._auth_cache_key(api_key.key_hash))
+        monkeypatch.setattr(
+            api_key_module.cache, "get", lambda key: json.loads(json.dumps(cached))
+        )
+        restored = APIKey.objects.get_from_key(issued_key["key"])
+        assert restored.expires_at == api_key.expires_at
+        assert restored.is_expired
+
+    def test_unknown_key_is_negatively_cached(self, issued_key):
+        assert APIKey.objects.get_from_key("not-a-real-key") is None
+
+        with CaptureQueriesContext(connection) as queries:
+            assert APIKey.objects.get_from_key("not-a-real-key") is None
+        assert len(queries) == 0
+
+    def test_revoke_invalidates_cache(self, issued_key):
+        raw_key = issued_key["key"]
+        APIKey.objects.get_from_key(raw_key).revoke()
+        assert APIKey.objects.get_from_key(raw_key) is None
+
+
+@pytest.mark.django_db
+class TestAPIKeyUsageAccounting:
+    """Test atomic counting and batched flushes."""
+
+    def test_record_usage_defers_writes(self, issued_key, buffer):
+        api_key = issued_key["api_key"]
+
+        with CaptureQueriesContext(connection) as queries:
+            counts = [api_key.record_usage("/api/v1/x/", "127.0.0.1") for _ in range(5)]
+        assert len(queries) == 0
+        assert counts == [1, 2, 3, 4, 5]
+        assert api_key.check_rate_limit()
+        assert buffer.pending() == 5
+
+        assert buffer.flush() == 5
+        api_key.refresh_from_db()
+        assert api_key.usage_count == 5
+        assert api_key.last_used_at is not None
+        assert APIKeyUsage.objects.filter(api_key=api_key).count() == 5
+
+    def test_flush_triggers_at_buffer_size(self, issued_key, monkeypatch):
+        buffer = APIKeyUsageBuffer(flush_interval=3600, flush_size=3)
+        monkeypatch.setattr(api_key_module, "usage_buffer", buffer)
+        api_key = issued_key["api_key"]
+
+        for _ in range(3):
+            api_key.record_usage("/api/v1/x/", "127.0.0.1")
+
+        assert buffer.pending() == 0
+        assert APIKeyUsage.objects.count() == 3
+
+    def test_rate_limit_enforced_from_counter(self, issued_key, buffer):
+        api_key = issued_key["api_key"]
+        api_key.rate_limit_per_hour = 2
+        api_key.record_usage("/a/", "127.0.0.1")
+        assert api_key.check_rate_limit()
+        api_key.record_usage("/a/", "127.0.0.1")
+        assert not api_key.check_rate_limit()
+
+    def test_failed_flush_requeues_usage(self, issued_key, buffer, monkeypatch):
+        api_key = issued_key["api_key"]
+        for _ in range(3):
+            api_key.record_usage("/a/", "127.0.0.1")
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("database is down")
+
+        with monkeypatch.context() as patched:
+            patched.setattr(APIKeyUsage.objects, "bulk_create", broken)
+            assert buffer.flush() == 0
+        assert buffer.pending() == 3
+
+        api_key.record_usage("/a/", "127.0.0.1")
+        assert buffer.flush() == 4
+        api_key.refresh_from_db()
+        assert api_key.usage_count == 4
+
+    def test_requeue_is_capped(self, issued_key, buffer, monkeypatch):
+        monkeypatch.setattr(api_key_module, "USAGE_MAX_PENDING", 2)
+        monkeypatch.setattr(
+            APIKeyUsage.objects,
+            "bulk_create",
+            lambda *args, **kwargs: 1 / 0,
+        )
+        for _ in range(5):
+            issued_key["api_key"].record_usage("/a/", "127.0.0.1")
+
+        buffer.flush()
+        assert buffer.pending() == 2
@@ -0,0 +1,138 @@
+"""
+Unit tests for the incremental static asset pipeline.
+
+Tests cover:
+- Hashed output names and pre-compressed siblings
+- No-op rebuilds driven by the manifest
+- Rebuilds of changed files and cleanup of deleted or superseded outputs
+- Storage lookups of built assets
+"""
+
+import gzip
+import json
+
+from django.test import override_settings
+
+import pytest
+
+from apps.portfolio.management.commands.utils import asset_pipeline
+from apps.portfolio.management.commands.utils.asset_pipeline import (
+    MANIFEST_NAME,
+    AssetPipeline,
+    minify_css,
+    minify_js,
+    should_minify,
+)
+from apps.portfolio.storage import AssetManifestStaticFilesStorage
+
+
+@pytest.fixture
+def static_tree(tmp_path):
+    source = tmp_path / "static"
+    (source / "css").mkdir(parents=True)
+    (source / "js").mkdir()
+    (source / "css" / "site.css").write_text(
+        "/* header */\nbody {\n  color: red;\n  margin: 0;\n}\n" * 20
+    )
+    (source / "js" / "app.js").write_text(
+        "// boot\nfunction  boot ( ) { return 1 ; }\n"
+    )
+    (source / "js" / "sw.js").write_text("self.addEventListener('fetch', () => {});\n")
+    return source, tmp_path / "out"
+
+
+class TestAssetPipeline:
+    """Test incremental asset builds."""
+
+    def test_minify_css(self):
+        assert minify_css("a {\n color: red;\n}") == "a{color:red}"
+
+    def test_js_is_left_alone_without_a_real_minifier(self, monkeypatch):
+        monkeypatch.setattr(asset_pipeline, "rjsmin", None)
+        source = 'var u = "https://example.com/api";\nfoo(u);'
+        assert minify_js(source) == source
+
+    def test_js_minifier_keeps_strings(self):
+        pytest.importorskip("rjsmin")
+        source = 'var u = "https://example.com//api"; // note\nfoo( u );'
+        assert minify_js(source) == 'var u="https://example.com//api";foo(u);'
+
+    def test_prebuilt_bundles_are_not_minified(self):
+        assert should_minify("js/app.js")
+        assert not should_minify("js/dist/main.bundle.js")
+        assert not should_minify("js/vendor.min.js")
+
+    def test_full_build_writes_hashed_and_compressed_outputs(self, static_tree):
+        source, output = static_tree
+        stats = AssetPipeline([source], output, workers=1).build()
+
+        assert stats["built"] == 3
+        assert stats["failed"] == 0
+
+        manifest = json.loads((output / MANIFEST_NAME).read_text())
+        hashed = manifest["paths"]["css/site.css"]
+        assert hashed.startswith("css/site.") and hashed.endswith(".css")
+
+        built = (output / hashed).read_text()
+        assert "/*" not in built
+        assert gzip.decompress((output / f"{hashed}.gz").read_bytes()).decode() == built
+
+    def test_noop_rebuild_skips_everything(self, static_tree):
+        source, output = static_tree
+        AssetPipeline([source], output, workers=1).build()
+
+        stats = AssetPipeline([source], output, workers=1).build()
+        assert stats["built"] == 0
+        assert stats["unchanged"] == 3
+
+    def test_changed_and_deleted_files(self, static_tree):
+        source, output = static_tree
+        AssetPipeline([source], output, workers=1).build()
+        old = json.loads((output / MANIFEST_NAME).read_text())["paths"]
+
+        (source / "css" / "site.css").write_text("body { color: blue; }")
+        (source / "js" / "sw.js").unlink()
+
+        stats = AssetPipeline([source], output, workers=1).build()
+        assert stats["built"] == 1
+        assert stats["removed"] == 1
+
+        new = json.loads((output / MANIFEST_NAME).read_text())["paths"]
+        assert new["css/site.css"] != old["css/site.css"]
+        assert (output / new["css/site.css"]).exists()
+        assert not (output / old["css/site.css"]).exists()
+        assert not (output / f"{old['css/site.css']}.gz").exists()
+        assert "js/sw.js" not in new
+        assert not (output / old["js/sw.js"]).exists()
+
+    def test_parallel_build_matches_inline(self, static_tree, tmp_path):
+        source, output = static_tree
+        AssetPipeline([source], output, workers=1).build()
+        AssetPipeline([source], tmp_path / "parallel", workers=2).build()
+
+        inline = json.loads((output / MANIFEST_NAME).read_text())["paths"]
+        parallel = json.loads((tmp_path / "parallel" / MANIFEST_NAME).read_text())
+        assert parallel["paths"] == inline
+
+
+class TestAssetManifestStorage:
+    """Test that built assets are served under their hashed names."""
+
+    def test_storage_prefers_built_assets(self, static_tree):
+        source, output = static_tree
+        AssetPipeline([source], output, workers=1).build()
+        hashed = json.loads((output / MANIFEST_NAME).read_text())["paths"]
+
+        with override_settings(STATIC_ROOT=output, STATIC_URL="/static/"):
+            storage = AssetManifestStaticFilesStorage()
+            assert storage.url("css/site.css") == f"/static/{hashed['css/site.css']}"
+
+    def test_storage_is_configured(self):
+        from project.settings import base
+
+        backend = base.STORAGES["staticfiles"]["BACKEND"]
+        assert backend == "apps.portfolio.storage.AssetManifestStaticFilesStorage"
+
+    def test_storage_without_asset_manifest(self, tmp_path):
+        with override_settings(STATIC_ROOT=tmp_path, STATIC_URL="/static/"):
+            assert AssetManifestStaticFilesStorage().load_asset_manifest() == {}
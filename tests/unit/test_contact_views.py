@@ -131,7 +131,7 @@ class TestContactFormPOSTValid:
         assert len(messages) > 0
         assert any("success" in str(m).lower() for m in messages)
 
-    @patch("apps.contact.views.send_mail")
+    @patch("apps.contact.views.queue_mail")
     def test_valid_post_sends_email(self, mock_send_mail, client, valid_form_data):
         """Test valid POST sends email notification"""
         response = client.post(reverse("contact:form"), data=valid_form_data)
@@ -141,7 +141,7 @@ class TestContactFormPOSTValid:
         assert "New Contact Message" in kwargs["subject"]
         assert "john@example.com" in kwargs["message"]
 
-    @patch("apps.contact.views.send_mail")
+    @patch("apps.contact.views.queue_mail")
     def test_email_failure_doesnt_break_submission(
         self, mock_send_mail, client, valid_form_data
     ):
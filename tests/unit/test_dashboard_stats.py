@@ -0,0 +1,112 @@
+"""
+Tests for the cached admin dashboard statistics
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from apps.core.admin_views import modern_admin_dashboard
+from apps.core.dashboard_stats import CACHE_KEY, dashboard_stats
+from apps.core.invalidation import invalidation_dispatcher
+from apps.main.models import AITool, CybersecurityResource
+from apps.tools.models import Tool
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    invalidation_dispatcher.reset()
+    yield
+    invalidation_dispatcher.reset()
+    cache.clear()
+
+
+def make_resource(i, **fields):
+    return CybersecurityResource.objects.create(
+        title=f"Resource {i}",
+        description="A resource",
+        content="Details",
+        **fields,
+    )
+
+
+def test_one_query_per_model():
+    make_resource(1, type="tool", severity_level=4, is_urgent=True)
+    make_resource(2, type="tool", severity_level=1)
+    make_resource(3, type="news", severity_level=4, is_featured=True)
+
+    # Post, BlogPost, Tool, AITool, UsefulResource, CybersecurityResource
+    with CaptureQueriesContext(connection) as queries:
+        snapshot = dashboard_stats.compute()
+    assert len(queries) == 6
+
+    cyber = snapshot["cybersecurity"]
+    assert cyber["total"] == 3
+    assert cyber["urgent"] == 1
+    assert cyber["critical"] == 2
+    assert cyber["featured"] == 1
+    assert cyber["by_type"] == [
+        {"type": "tool", "count": 2},
+        {"type": "news", "count": 1},
+    ]
+    assert cyber["by_severity"] == [
+        {"severity_level": 1, "count": 1},
+        {"severity_level": 4, "count": 2},
+    ]
+
+
+def test_snapshot_is_cached(django_assert_num_queries):
+    AITool.objects.create(
+        name="Model", description="An AI tool", url="https://example.com"
+    )
+    first = dashboard_stats.get()
+
+    with django_assert_num_queries(0):
+        assert dashboard_stats.get() == first
+    assert first["ai_tools"]["total"] == 1
+
+
+def test_content_change_drops_snapshot_on_commit(django_capture_on_commit_callbacks):
+    dashboard_stats.get()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Tool.objects.create(
+            title="Tool",
+            slug="tool",
+            description="A tool",
+            url="https://example.com",
+            category="Development",
+        )
+        assert cache.get(CACHE_KEY) is not None
+
+    assert cache.get(CACHE_KEY) is None
+    assert dashboard_stats.get()["tools"] == {"total": 1, "visible": 1, "favorite": 0}
+
+
+def test_refresh_command():
+    call_command("refresh_dashboard_stats", stdout=open("/dev/null", "w"))
+
+    assert cache.get(CACHE_KEY)["cybersecurity"]["total"] == 0
+
+
+def test_dashboard_view_reads_snapshot(django_assert_max_num_queries):
+    make_resource(1, severity_level=4, is_urgent=True)
+    request = RequestFactory().get("/admin/")
+    request.user = get_user_model().objects.create_user(
+        username="staff", email="staff@example.com", password="x", is_staff=True
+    )
+    dashboard_stats.refresh()
+
+    # Only the recent-activity lists hit the database
+    with django_assert_max_num_queries(2):
+        response = modern_admin_dashboard(request)
+
+    assert response.status_code == 200
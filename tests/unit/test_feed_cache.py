@@ -0,0 +1,160 @@
+"""
+Tests for the pre-rendered RSS feeds
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from django_redis.serializers.json import JSONSerializer
+
+from apps.blog.models import Post
+from apps.main.feed_cache import FeedStore, feed_store
+from apps.main.feeds import LatestPostsFeed
+from apps.tools.models import Tool
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_feeds():
+    feed_store.clear()
+    yield
+    feed_store.clear()
+
+
+@pytest.fixture
+def author():
+    return User.objects.create_user(
+        username="writer", email="writer@example.com", password="pass12345"
+    )
+
+
+class JSONCache(LocMemCache):
+    """LocMemCache storing values the way django_redis's JSONSerializer does"""
+
+    serializer = JSONSerializer({})
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        super().set(key, self.serializer.dumps(value), timeout, version)
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, version=version)
+        return default if value is None else self.serializer.loads(value)
+
+
+def make_post(author, title, **kwargs):
+    defaults = {
+        "slug": title.lower().replace(" ", "-"),
+        "content": "<p>Hello <b>feed</b> readers</p>",
+        "status": "published",
+        "published_at": timezone.now() - timedelta(hours=1),
+        "author": author,
+    }
+    defaults.update(kwargs)
+    return Post.objects.create(title=title, **defaults)
+
+
+def test_feed_is_rendered_once(client, author, django_assert_num_queries):
+    make_post(author, "First post")
+    url = reverse("main:blog_feed")
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert b"First post" in first.content
+    assert b"Hello feed readers" in first.content
+    assert first["ETag"].startswith('"')
+    assert "Last-Modified" in first
+
+    with django_assert_num_queries(0):
+        second = client.get(url)
+
+    assert second.content == first.content
+    assert feed_store.stats()["renders"] == 1
+
+
+def test_conditional_requests_get_304_without_queries(
+    client, author, django_assert_num_queries
+):
+    make_post(author, "First post")
+    url = reverse("main:blog_feed")
+    first = client.get(url)
+
+    with django_assert_num_queries(0):
+        by_etag = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        by_date = client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+
+    assert by_etag.status_code == 304
+    assert by_date.status_code == 304
+    assert by_etag["ETag"] == first["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH='"stale"').status_code == 200
+
+
+def test_saving_a_post_re_renders_dependent_feeds(
+    client, author, django_capture_on_commit_callbacks
+):
+    make_post(author, "First post")
+    client.get(reverse("main:blog_feed"))
+    client.get(reverse("main:combined_feed"))
+    client.get(reverse("main:projects_feed"))
+    renders = feed_store.stats()["renders"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        make_post(author, "Second post")
+
+    # Posts and combined feeds re-rendered; the projects feed is untouched
+    assert feed_store.stats()["renders"] == renders + 2
+    response = client.get(reverse("main:blog_feed"))
+    assert b"Second post" in response.content
+    assert feed_store.stats()["renders"] == renders + 2
+
+
+def test_projects_feed_lists_visible_tools(client):
+    Tool.objects.create(
+        title="Django",
+        slug="django",
+        description="Web framework",
+        url="https://djangoproject.com",
+        category="Framework",
+        tags=["python"],
+    )
+
+    response = client.get(reverse("main:projects_feed"))
+
+    assert response.status_code == 200
+    assert b"Django - Framework" in response.content
+    assert b"<category>python</category>" in response.content
+
+
+def test_scheduled_post_bounds_the_feed_lifetime(client, author):
+    make_post(author, "Live post")
+    scheduled = make_post(
+        author, "Scheduled", published_at=timezone.now() + timedelta(hours=1)
+    )
+
+    response = client.get(reverse("main:blog_feed"))
+
+    assert b"Scheduled" not in response.content
+    assert LatestPostsFeed().next_change() == scheduled.published_at
+
+
+def test_renderings_round_trip_through_json_serializer(client, author, monkeypatch):
+    json_cache = JSONCache("test-feeds", {})
+    monkeypatch.setattr(FeedStore, "store", property(lambda self: json_cache))
+    make_post(author, "First post")
+    url = reverse("main:blog_feed")
+
+    first = client.get(url)
+    second = client.get(url)
+
+    assert json_cache.get("feeds:posts:http:testserver")["etag"] == first["ETag"]
+    assert second.content == first.content
+    assert feed_store.stats()["renders"] == 1
+    assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
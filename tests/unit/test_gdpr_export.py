@@ -0,0 +1,215 @@
+"""
+Unit tests for the streaming GDPR data export worker.
+
+Tests cover:
+- JSON-lines and CSV archives written in chunks with progress on the row
+- Single claim of a request across workers
+- Retry of exports left processing by a stopped worker
+- Resumable (HTTP Range) export downloads
+"""
+
+import csv
+import io
+import json
+import zipfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from django.utils import timezone
+
+import pytest
+
+from apps.core.gdpr_export import DataExportWorker
+from apps.core.models.gdpr import (
+    ConsentRecord,
+    DataCollectionLog,
+    DataExportRequest,
+    PrivacyPreferences,
+)
+from apps.core.views.gdpr_views import download_data_export
+
+User = get_user_model()
+
+
+@pytest.fixture
+def export_root(tmp_path, settings):
+    settings.GDPR_EXPORT_ROOT = tmp_path / "exports"
+    return settings.GDPR_EXPORT_ROOT
+
+
+@pytest.fixture
+def user(db):
+    user = User.objects.create_user(
+        username="exporter", email="exporter@example.com", password="pass12345"
+    )
+    PrivacyPreferences.objects.create(user=user, allow_analytics=True)
+    ConsentRecord.objects.create(
+        user=user, consent_type="analytics", consent_text="Analytics cookies"
+    )
+    DataCollectionLog.objects.bulk_create(
+        DataCollectionLog(
+            user=user,
+            collection_type="contact_form",
+            endpoint=f"/contact/{i}/",
+            data_categories=["email"],
+            purpose="Reply to message",
+        )
+        for i in range(25)
+    )
+    return user
+
+
+def make_request(user, export_format="json"):
+    return DataExportRequest.objects.create(
+        user=user,
+        export_format=export_format,
+        include_categories=["profile", "activity", "preferences"],
+    )
+
+
+@pytest.mark.django_db
+class TestDataExportWorker:
+    """Test archive generation."""
+
+    def test_json_lines_export(self, user, export_root):
+        export_request = make_request(user)
+
+        assert DataExportWorker(chunk_size=10).process(export_request.pk) is True
+
+        export_request.refresh_from_db()
+        assert export_request.status == "completed"
+        assert export_request.progress == 100
+        assert export_request.rows_exported == 28
+        assert export_request.file_size > 0
+        assert export_request.download_expires_at is not None
+
+        with zipfile.ZipFile(export_request.file_path) as zf:
+            names = set(zf.namelist())
+            assert "activity/data_collection_logs.jsonl" in names
+            assert "content/code_snippets.jsonl" not in names
+            lines = zf.read("activity/data_collection_logs.jsonl").splitlines()
+            account = json.loads(zf.read("profile/account.jsonl"))
+
+        assert len(lines) == 25
+        assert json.loads(lines[0])["data_categories"] == ["email"]
+        assert account["username"] == "exporter"
+
+    def test_csv_export(self, user, export_root):
+        export_request = make_request(user, export_format="csv")
+
+        DataExportWorker().process(export_request.pk)
+
+        export_request.refresh_from_db()
+        with zipfile.ZipFile(export_request.file_path) as zf:
+            data = zf.read("preferences/consent_records.csv").decode()
+        rows = list(csv.reader(io.StringIO(data)))
+        assert rows[0][0] == "consent_type"
+        assert rows[1][0] == "analytics"
+
+    def test_request_is_claimed_once(self, user, export_root):
+        export_request = make_request(user)
+        worker = DataExportWorker()
+
+        assert worker.process(export_request.pk) is True
+        assert worker.process(export_request.pk) is False
+
+    def test_interrupted_export_is_retried(self, user, export_root, monkeypatch):
+        running = make_request(user)
+        stale = make_request(user)
+        DataExportRequest.objects.filter(pk=running.pk).update(
+            status="processing", heartbeat_at=timezone.now()
+        )
+        DataExportRequest.objects.filter(pk=stale.pk).update(
+            status="processing", heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        export_root.mkdir(parents=True)
+        leftover = export_root / f"{stale.pk}.zip.tmp"
+        leftover.write_bytes(b"partial")
+
+        worker = DataExportWorker()
+        submitted = []
+        monkeypatch.setattr(worker, "_run", submitted.append)
+
+        assert worker.process_pending() == 1
+        assert submitted == [stale.pk]
+        assert worker.process(running.pk) is False
+        assert worker.process(stale.pk) is True
+
+        running.refresh_from_db()
+        stale.refresh_from_db()
+        assert running.status == "processing"
+        assert stale.status == "completed"
+        assert zipfile.is_zipfile(stale.file_path)
+        assert not leftover.exists()
+
+    def test_failure_is_recorded(self, user, export_root, monkeypatch):
+        export_request = make_request(user)
+        worker = DataExportWorker()
+
+        def explode(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(worker, "_write_archive", explode)
+        worker.process(export_request.pk)
+
+        export_request.refresh_from_db()
+        assert export_request.status == "failed"
+        assert "disk full" in export_request.error_message
+
+
+@pytest.mark.django_db
+class TestRangedDownload:
+    """Test resumable downloads."""
+
+    @pytest.fixture
+    def completed(self, user, export_root):
+        export_request = make_request(user)
+        DataExportWorker().process(export_request.pk)
+        export_request.refresh_from_db()
+        return export_request
+
+    def get(self, user, export_request, **headers):
+        request = RequestFactory().get("/", **headers)
+        request.user = user
+        response = download_data_export(request, export_request.pk)
+        body = b"".join(response.streaming_content) if response.streaming else b""
+        return response, body
+
+    def test_full_download(self, user, completed):
+        response, body = self.get(user, completed)
+
+        assert response.status_code == 200
+        assert response["Accept-Ranges"] == "bytes"
+        assert len(body) == completed.file_size
+
+    def test_partial_download(self, user, completed):
+        with open(completed.file_path, "rb") as f:
+            expected = f.read()[10:20]
+
+        response, body = self.get(user, completed, HTTP_RANGE="bytes=10-19")
+
+        assert response.status_code == 206
+        assert body == expected
+        assert response["Content-Range"] == f"bytes 10-19/{completed.file_size}"
+
+    def test_resume_from_offset(self, user, completed):
+        response, body = self.get(user, completed, HTTP_RANGE="bytes=100-")
+
+        assert response.status_code == 206
+        assert len(body) == completed.file_size - 100
+
+    def test_unsatisfiable_range(self, user, completed):
+        response, _ = self.get(
+            user, completed, HTTP_RANGE=f"bytes={completed.file_size}-"
+        )
+
+        assert response.status_code == 416
+
+    def test_stale_if_range_returns_full_file(self, user, completed):
+        response, body = self.get(
+            user, completed, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+        )
+
+        assert response.status_code == 200
+        assert len(body) == completed.file_size
@@ -0,0 +1,145 @@
+"""
+Unit tests for concurrent health check execution.
+
+Tests cover:
+- Checks running in parallel with per-check timeouts
+- Per-check result TTLs
+- Snapshot (liveness) mode that never runs checks inline
+"""
+
+import threading
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+import pytest
+
+from apps.portfolio.health_checks import CheckPolicy, HealthCheckSystem
+
+
+class FakeCheckSystem(HealthCheckSystem):
+    """Health check system with controllable checks"""
+
+    def __init__(self, delays):
+        super().__init__()
+        self.delays = delays
+        self.calls = {name: 0 for name in delays}
+        self.check_policies = {
+            name: CheckPolicy(ttl=60, timeout=0.5) for name in delays
+        }
+
+    def _make_check(self, name):
+        def check():
+            self.calls[name] += 1
+            time.sleep(self.delays[name])
+            return {"status": "healthy", "timestamp": timezone.now().isoformat()}
+
+        return check
+
+    def _get_check_registry(self):
+        return [(name, self._make_check(name)) for name in self.delays]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_checks_run_concurrently():
+    system = FakeCheckSystem({"a": 0.2, "b": 0.2, "c": 0.2})
+
+    start = time.perf_counter()
+    results = system.run_all_checks()
+    elapsed = time.perf_counter() - start
+
+    assert results["overall_status"] == "healthy"
+    assert results["summary"]["passed"] == 3
+    assert elapsed < 0.5
+
+
+def test_slow_check_times_out_without_blocking_others():
+    system = FakeCheckSystem({"fast": 0, "slow": 2})
+    system.check_policies["slow"] = CheckPolicy(
+        ttl=60, timeout=0.1, timeout_status="warning"
+    )
+
+    start = time.perf_counter()
+    results = system.run_checks()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1
+    assert results["checks"]["fast"]["status"] == "healthy"
+    assert results["checks"]["slow"]["status"] == "warning"
+    assert "timed out" in results["checks"]["slow"]["message"]
+
+
+def test_hanging_check_is_not_started_twice():
+    system = FakeCheckSystem({"slow": 0.5})
+    system.check_policies["slow"] = CheckPolicy(ttl=60, timeout=0.05)
+
+    system.run_checks()
+    system.run_checks()
+
+    assert system.calls["slow"] == 1
+
+
+def test_results_are_reused_within_ttl():
+    system = FakeCheckSystem({"a": 0, "b": 0})
+    system.check_policies["b"] = CheckPolicy(ttl=0, timeout=1)
+
+    system.run_checks()
+    system.run_checks()
+
+    assert system.calls == {"a": 1, "b": 2}
+
+
+def test_force_ignores_cached_results():
+    system = FakeCheckSystem({"a": 0})
+
+    system.run_checks()
+    system.run_checks(force=True)
+
+    assert system.calls["a"] == 2
+
+
+def test_subset_of_checks():
+    system = FakeCheckSystem({"a": 0, "b": 0})
+
+    results = system.run_checks(["b"])
+
+    assert list(results["checks"]) == ["b"]
+    assert system.calls["a"] == 0
+
+
+def test_snapshot_never_waits_for_checks():
+    system = FakeCheckSystem({"a": 0.3})
+
+    start = time.perf_counter()
+    first = system.snapshot()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.1
+    assert first["overall_status"] == "unknown"
+
+    deadline = time.monotonic() + 2
+    while system.snapshot()["overall_status"] == "unknown":
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+    assert system.snapshot()["overall_status"] == "healthy"
+    assert system.calls["a"] == 1
+
+
+def test_snapshot_refresh_is_started_once():
+    system = FakeCheckSystem({"a": 0.2})
+    threads = [threading.Thread(target=system.snapshot) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    time.sleep(0.4)
+    assert system.calls["a"] == 1
@@ -0,0 +1,180 @@
+"""
+Unit tests for the responsive image derivative pipeline.
+
+Tests cover:
+- Source resolution and path traversal protection
+- Width bucketing, content addressing and srcset generation
+- Signed on-demand rendering endpoint
+- Template tag srcset emission
+"""
+
+from django.core.cache import cache
+from django.test import override_settings
+
+import pytest
+from PIL import Image
+
+from apps.portfolio.services import image_derivatives
+from apps.portfolio.services.image_derivatives import ImageDerivativeService
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    """Media root with a single 1000x500 JPEG upload."""
+    uploads = tmp_path / "uploads"
+    uploads.mkdir()
+    Image.new("RGB", (1000, 500), (200, 30, 30)).save(uploads / "photo.jpg", "JPEG")
+    cache.clear()
+    with override_settings(
+        MEDIA_ROOT=tmp_path,
+        MEDIA_URL="/media/",
+        IMAGE_DERIVATIVE_ROOT=tmp_path / "derivatives",
+        IMAGE_DERIVATIVE_URL="/media/derivatives/",
+        IMAGE_DERIVATIVE_WIDTHS=(320, 640, 1280),
+        IMAGE_DERIVATIVE_FORMATS=("webp", "jpeg"),
+    ):
+        yield tmp_path
+
+
+@pytest.fixture
+def service(media_root, monkeypatch):
+    service = ImageDerivativeService()
+    monkeypatch.setattr(image_derivatives, "image_derivative_service", service)
+    return service
+
+
+class TestImageDerivativeService:
+    """Test derivative addressing and rendering."""
+
+    def test_resolves_media_source(self, service):
+        source = service.get_source("/media/uploads/photo.jpg")
+        assert source is not None
+        assert (source.width, source.height) == (1000, 500)
+        assert len(source.digest) == 64
+
+    def test_rejects_external_and_traversal_urls(self, service):
+        assert service.get_source("https://example.com/a.jpg") is None
+        assert service.get_source("/media/../etc/passwd.jpg") is None
+        assert service.get_source("/media/uploads/missing.jpg") is None
+
+    def test_widths_never_upscale(self, service):
+        source = service.get_source("/media/uploads/photo.jpg")
+        assert service.widths_for(source) == [320, 640, 1000]
+
+    def test_srcset_uses_signed_urls_until_rendered(self, service):
+        srcsets = service.srcsets("/media/uploads/photo.jpg")
+        assert set(srcsets) == {"webp", "jpeg"}
+        assert srcsets["webp"].count("/img/") == 3
+        assert srcsets["webp"].endswith(" 1000w")
+
+    def test_srcsets_are_memoized_until_source_changes(
+        self, service, media_root, monkeypatch
+    ):
+        url = "/media/uploads/photo.jpg"
+        first = service.srcsets(url)
+        monkeypatch.setattr(
+            service, "get_source", lambda url: pytest.fail("not memoized")
+        )
+        assert service.srcsets(url) is first
+
+        monkeypatch.undo()
+        Image.new("RGB", (600, 300)).save(media_root / "uploads" / "photo.jpg")
+        assert service.srcsets(url)["webp"].endswith(" 600w")
+
+    def test_memos_are_bounded(self, service, media_root, monkeypatch):
+        monkeypatch.setattr(image_derivatives, "SOURCE_MEMO_SIZE", 2)
+        monkeypatch.setattr(image_derivatives, "SRCSET_MEMO_SIZE", 2)
+        for name in ("a", "b", "c"):
+            Image.new("RGB", (400, 200)).save(media_root / "uploads" / f"{name}.jpg")
+            service.srcsets(f"/media/uploads/{name}.jpg")
+
+        assert list(service._srcsets) == [
+            "/media/uploads/b.jpg",
+            "/media/uploads/c.jpg",
+        ]
+        assert len(service._sources) == 2
+
+    def test_batch_generation_is_content_addressed(self, service):
+        stats = service.generate_batch(["/media/uploads/photo.jpg"], max_workers=1)
+        assert stats["generated"] == 6
+        assert stats["failed"] == 0
+
+        source = service.get_source("/media/uploads/photo.jpg")
+        path = service.derivative_path(source, 320, "webp")
+        with Image.open(path) as img:
+            assert img.size == (320, 160)
+
+        srcset = service.build_srcset(source, "webp")
+        assert "/img/" not in srcset
+        assert srcset.startswith("/media/derivatives/")
+
+        # Nothing left to do on a second run
+        again = service.generate_batch(["/media/uploads/photo.jpg"], max_workers=1)
+        assert again["generated"] == 0
+
+    def test_placeholder_is_inline_data_uri(self, service):
+        placeholder = service.placeholder("/media/uploads/photo.jpg")
+        assert placeholder.startswith("data:image/jpeg;base64,")
+
+    def test_tampered_token_is_rejected(self, service):
+        source = service.get_source("/media/uploads/photo.jpg")
+        token = service.sign(source, 640, "webp")
+        assert service.unsign(token)["w"] == 640
+        assert service.unsign(token[:-2] + "xx") is None
+
+
+@pytest.mark.django_db
+class TestImageDerivativeView:
+    """Test the on-demand rendering endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def patch_view_service(self, service, monkeypatch):
+        from apps.portfolio.views import images
+
+        monkeypatch.setattr(images, "image_derivative_service", service)
+
+    def test_renders_and_serves_derivative(self, client, service):
+        source = service.get_source("/media/uploads/photo.jpg")
+        token = service.sign(source, 640, "webp")
+
+        response = client.get(f"/img/{token}/")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "image/webp"
+        assert "immutable" in response["Cache-Control"]
+        assert service.derivative_path(source, 640, "webp").exists()
+
+        cached = client.get(f"/img/{token}/", HTTP_IF_NONE_MATCH=response["ETag"])
+        assert cached.status_code == 304
+
+    def test_invalid_token_returns_404(self, client, service):
+        response = client.get("/img/not-a-valid-token/")
+        assert response.status_code == 404
+
+
+class TestImageTemplateTags:
+    """Test automatic srcset emission in image template tags."""
+
+    def test_responsive_image_emits_srcset(self, service, monkeypatch):
+        from apps.portfolio.templatetags import image_tags
+
+        monkeypatch.setattr(image_tags, "image_derivative_service", service)
+        html = image_tags.responsive_image("/media/uploads/photo.jpg", lazy=False)
+        assert 'srcset="' in html
+        assert "1000w" in html
+
+    def test_responsive_image_keeps_explicit_srcset(self, service, monkeypatch):
+        from apps.portfolio.templatetags import image_tags
+
+        monkeypatch.setattr(image_tags, "image_derivative_service", service)
+        html = image_tags.responsive_image(
+            "/media/uploads/photo.jpg", srcset="a.jpg 1x", lazy=False
+        )
+        assert 'srcset="a.jpg 1x"' in html
+
+    def test_lazy_image_external_url_unchanged(self, service, monkeypatch):
+        from apps.portfolio.templatetags import image_tags
+
+        monkeypatch.setattr(image_tags, "image_derivative_service", service)
+        html = image_tags.lazy_image("https://cdn.example.com/a.jpg", alt="x")
+        assert "data-srcset" not in html
+        assert 'data-src="https://cdn.example.com/a.jpg"' in html
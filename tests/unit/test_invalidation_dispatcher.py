@@ -0,0 +1,125 @@
+"""
+Tests for the per-commit invalidation dispatcher
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+import pytest
+
+from apps.core.invalidation import invalidation_dispatcher
+from apps.main.search.result_cache import search_result_cache
+from apps.tools.models import Tool
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def reset_dispatcher():
+    cache.clear()
+    invalidation_dispatcher.reset()
+    yield
+    invalidation_dispatcher.reset()
+    cache.clear()
+
+
+def make_tool(i):
+    return Tool.objects.create(
+        title=f"Tool {i}",
+        slug=f"tool-{i}",
+        description="A tool",
+        url="https://example.com",
+        category="Development",
+    )
+
+
+class FakeIndex:
+    def __init__(self):
+        self.indexed = []
+        self.deleted = []
+
+    def bulk_index(self, objects):
+        self.indexed.append(sorted(obj.pk for obj in objects))
+        return {"indexed": len(objects), "skipped": 0, "failed": 0}
+
+    def delete_documents(self, model_name, object_ids):
+        self.deleted.append((model_name, sorted(object_ids)))
+        return True
+
+
+def test_bulk_saves_flush_once_per_commit(
+    monkeypatch, django_capture_on_commit_callbacks
+):
+    calls = []
+    monkeypatch.setattr(search_result_cache, "invalidate", lambda: calls.append(1))
+    cache.set("tool_list", "stale")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for i in range(20):
+            make_tool(i)
+        # Nothing is invalidated before the commit
+        assert cache.get("tool_list") == "stale"
+
+    stats = invalidation_dispatcher.stats()
+    assert stats["flushes"] == 1
+    assert stats["last_flush"]["instances"] == 20
+    assert stats["last_flush"]["hooks"] == 2  # search results, dashboard stats
+    assert "duration_ms" in stats["last_flush"]
+    assert calls == [1]
+    assert cache.get("tool_list") is None
+
+
+def test_flush_without_queued_work_is_a_no_op():
+    assert invalidation_dispatcher.flush() is None
+    assert invalidation_dispatcher.stats()["flushes"] == 0
+
+
+def test_index_work_is_deduplicated(monkeypatch, django_capture_on_commit_callbacks):
+    fake = FakeIndex()
+    monkeypatch.setattr("apps.main.search_index.search_index_manager", fake)
+    kept, removed = make_tool(1), make_tool(2)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidation_dispatcher.index(Tool, kept)
+        invalidation_dispatcher.index(Tool, kept)
+        invalidation_dispatcher.index(Tool, removed)
+        invalidation_dispatcher.unindex(Tool, removed)
+
+    assert fake.indexed == [[kept.pk]]
+    assert fake.deleted == [("Tool", [removed.pk])]
+    assert invalidation_dispatcher.stats()["last_flush"]["indexed"] == 2
+
+
+def test_failing_hook_does_not_stop_the_flush(django_capture_on_commit_callbacks):
+    tool = make_tool(1)
+    invalidation_dispatcher.reset()  # only the broken hook below
+    cache.set("stale", 1)
+
+    def broken():
+        raise RuntimeError("boom")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidation_dispatcher.invalidate(
+            Tool, tool, keys=["stale"], hooks={"broken": broken}
+        )
+
+    assert cache.get("stale") is None
+    assert invalidation_dispatcher.stats()["errors"] == 1
+
+
+def test_rolled_back_work_is_not_flushed_by_a_later_commit(
+    django_capture_on_commit_callbacks,
+):
+    tool = Tool(pk=1)  # unsaved: no flush registered by its own save
+    cache.set("rolled_back", 1)
+
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            invalidation_dispatcher.invalidate(Tool, tool, keys=["rolled_back"])
+            raise RuntimeError("abort")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidation_dispatcher.invalidate(Tool, tool, keys=["committed"])
+
+    assert cache.get("rolled_back") == 1
+    assert invalidation_dispatcher.stats()["last_flush"]["keys"] == 1
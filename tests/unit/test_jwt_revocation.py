@@ -0,0 +1,175 @@
+"""
+Tests for the Bloom filter backed JWT revocation cache
+"""
+
+import json
+
+from django.core.cache import cache
+from django.db import transaction
+
+import pytest
+
+from apps.core.auth import revocation as revocation_module
+from apps.core.auth.revocation import (
+    VERSION_CACHE_KEY,
+    BloomFilter,
+    TokenRevocationCache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class Backend:
+    """In-memory stand-in for the BlacklistedToken table"""
+
+    def __init__(self, jtis=()):
+        self.jtis = set(jtis)
+        self.loads = 0
+        self.confirms = 0
+
+    def load(self):
+        self.loads += 1
+        return list(self.jtis)
+
+    def confirm(self, jti):
+        self.confirms += 1
+        return jti in self.jtis
+
+
+def make_cache(backend, refresh_interval=0):
+    return TokenRevocationCache(
+        loader=backend.load,
+        confirm=backend.confirm,
+        refresh_interval=refresh_interval,
+    )
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 50
+
+
+def test_bloom_filter_snapshot_roundtrip():
+    bloom = BloomFilter(capacity=100)
+    bloom.add("abc")
+
+    # Must survive django_redis's JSONSerializer
+    restored = BloomFilter.from_snapshot(json.loads(json.dumps(bloom.to_snapshot())))
+
+    assert "abc" in restored
+    assert restored.size == bloom.size
+    assert restored.hash_count == bloom.hash_count
+
+
+def test_unrevoked_token_skips_database():
+    backend = Backend({"revoked"})
+    revocation = make_cache(backend)
+
+    assert revocation.is_revoked("fresh") is False
+    assert revocation.is_revoked("fresh") is False
+    assert backend.confirms == 0
+    assert backend.loads == 1
+
+
+def test_revoked_token_is_confirmed_against_database():
+    backend = Backend({"revoked"})
+    revocation = make_cache(backend)
+
+    assert revocation.is_revoked("revoked") is True
+    assert backend.confirms == 1
+
+
+def test_missing_jti_is_not_revoked():
+    backend = Backend()
+    revocation = make_cache(backend)
+
+    assert revocation.is_revoked(None) is False
+    assert backend.loads == 0
+
+
+@pytest.mark.django_db
+def test_blacklist_event_reaches_other_workers(django_capture_on_commit_callbacks):
+    backend = Backend()
+    worker_a = make_cache(backend)
+    worker_b = make_cache(backend)
+    assert worker_a.is_revoked("token") is False
+    assert worker_b.is_revoked("token") is False
+
+    backend.jtis.add("token")
+    with django_capture_on_commit_callbacks(execute=True):
+        worker_a.mark_revoked("token")
+
+    assert worker_a.is_revoked("token") is True
+    assert worker_b.is_revoked("token") is True
+
+
+def test_snapshot_is_shared_between_workers():
+    backend = Backend({"revoked"})
+    make_cache(backend).is_revoked("x")
+    make_cache(backend).is_revoked("x")
+
+    assert backend.loads == 1
+
+
+def test_version_check_is_throttled():
+    backend = Backend()
+    revocation = make_cache(backend, refresh_interval=3600)
+    revocation.is_revoked("token")
+
+    backend.jtis.add("token")
+    cache.set(VERSION_CACHE_KEY, 99, None)
+
+    assert revocation.is_revoked("token") is False
+    assert backend.loads == 1
+
+
+def test_malformed_snapshot_is_rebuilt():
+    backend = Backend({"revoked"})
+    cache.set("jwt_revocation:snapshot:0", (1, 2, b"legacy"), None)
+
+    assert make_cache(backend).is_revoked("revoked") is True
+    assert backend.loads == 1
+
+
+def test_cache_outage_falls_back_to_database(monkeypatch):
+    backend = Backend({"revoked"})
+    revocation = make_cache(backend)
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("cache down")
+
+    monkeypatch.setattr(revocation_module.cache, "get", unavailable)
+
+    assert revocation.is_revoked("revoked") is True
+    assert revocation.is_revoked("fresh") is False
+    assert backend.confirms == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_version_bumps_only_after_commit():
+    backend = Backend()
+    revocation = make_cache(backend)
+
+    with transaction.atomic():
+        revocation.mark_revoked("token")
+        assert cache.get(VERSION_CACHE_KEY) is None
+    assert cache.get(VERSION_CACHE_KEY) == 1
+
+    try:
+        with transaction.atomic():
+            revocation.mark_revoked("other")
+            raise RuntimeError("rollback")
+    except RuntimeError:
+        pass
+    assert cache.get(VERSION_CACHE_KEY) == 1
@@ -0,0 +1,145 @@
+"""
+Tests for the streaming log export
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+
+import pytest
+
+from apps.portfolio.logging.log_aggregator import LogAggregator
+from apps.portfolio.logging.log_export import LogExporter, LogFilter
+from apps.portfolio.views import logging_dashboard
+
+NOW = datetime.now().replace(microsecond=0)
+
+
+def write_log(path, records):
+    with open(path, "w") as f:
+        for minutes_ago, level, logger, message in records:
+            record = {
+                "timestamp": (NOW - timedelta(minutes=minutes_ago)).isoformat(),
+                "level": level,
+                "logger": logger,
+                "message": message,
+                "service": "portfolio",
+                "environment": "test",
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    write_log(
+        tmp_path / "app.log",
+        [
+            (50, "INFO", "apps.main", "Started"),
+            (30, "ERROR", "apps.blog", "Database timeout"),
+            (10, "ERROR", "apps.main", "Güncelleme başarısız"),
+        ],
+    )
+    write_log(
+        tmp_path / "app.log.1",
+        [
+            (40, "WARNING", "apps.main", "Slow query"),
+            (20, "ERROR", "apps.main", "database gone"),
+        ],
+    )
+    aggregator = LogAggregator()
+    aggregator.log_directory = tmp_path
+    return LogExporter(aggregator, chunk_size=64)
+
+
+def export(exporter, log_filter, export_format="ndjson", compress=False):
+    return b"".join(exporter.stream(log_filter, export_format, compress))
+
+
+def export_request(params):
+    request = RequestFactory().get("/api/logs/export/", params)
+    request.user = type("User", (), {"is_authenticated": True})()
+    return request
+
+
+def messages(body):
+    return [json.loads(line)["message"] for line in body.decode().splitlines()]
+
+
+def test_entries_merged_by_timestamp(exporter):
+    body = export(exporter, LogFilter())
+
+    assert messages(body) == [
+        "Started",
+        "Slow query",
+        "Database timeout",
+        "database gone",
+        "Güncelleme başarısız",
+    ]
+    assert exporter.stats()["last_export"]["rows"] == 5
+    assert exporter.stats()["last_export"]["completed"]
+
+
+def test_filters_are_pushed_down_to_raw_lines(exporter):
+    log_filter = LogFilter(level="ERROR", logger="apps.main", query="DATABASE")
+
+    assert messages(export(exporter, log_filter)) == ["database gone"]
+    report = exporter.stats()["last_export"]
+    assert report["lines_scanned"] == 5
+    assert report["lines_parsed"] == 1
+
+
+def test_non_ascii_query_is_matched_after_parsing(exporter):
+    log_filter = LogFilter(query="güncelleme")
+
+    assert messages(export(exporter, log_filter)) == ["Güncelleme başarısız"]
+    assert exporter.stats()["last_export"]["lines_parsed"] == 5
+
+
+def test_time_window(exporter):
+    log_filter = LogFilter(start=NOW - timedelta(minutes=35), end=NOW)
+
+    assert len(messages(export(exporter, log_filter))) == 3
+
+
+def test_csv_and_gzip(exporter):
+    body = gzip.decompress(export(exporter, LogFilter(level="ERROR"), "csv", True))
+    rows = list(csv.reader(io.StringIO(body.decode())))
+
+    assert rows[0][:3] == ["timestamp", "level", "logger"]
+    assert [row[3] for row in rows[1:]] == [
+        "Database timeout",
+        "database gone",
+        "Güncelleme başarısız",
+    ]
+
+
+def test_json_document(exporter):
+    document = json.loads(export(exporter, LogFilter(level="WARNING"), "json"))
+
+    assert [entry["message"] for entry in document["logs"]] == ["Slow query"]
+    assert document["export_info"]["count"] == 1
+    assert document["export_info"]["filters"]["level"] == "WARNING"
+
+
+def test_view_streams_export(exporter, monkeypatch):
+    monkeypatch.setattr(logging_dashboard, "log_exporter", exporter)
+    request = export_request({"format": "ndjson", "level": "ERROR", "gzip": "1"})
+
+    response = logging_dashboard.log_export_view(request)
+
+    assert isinstance(response, StreamingHttpResponse)
+    assert response["Content-Type"] == "application/gzip"
+    assert response["Content-Disposition"].endswith('.ndjson.gz"')
+    body = gzip.decompress(b"".join(response.streaming_content))
+    assert len(messages(body)) == 3
+
+
+def test_view_rejects_unknown_format(exporter):
+    request = export_request({"format": "xml"})
+
+    assert logging_dashboard.log_export_view(request).status_code == 400
@@ -0,0 +1,191 @@
+"""
+Unit tests for the mail outbox.
+
+Tests cover:
+- Queueing one row per recipient with per-recipient dedup
+- Batched delivery over one SMTP connection (local SMTP stub)
+- Retry with backoff and giving up after the last attempt
+- Retention pruning and the direct-send fallback for alerts
+"""
+
+import socketserver
+import threading
+from datetime import timedelta
+
+from django.core import mail
+from django.utils import timezone
+
+import pytest
+
+from apps.main import mail_outbox as mail_outbox_module
+from apps.main.mail_outbox import MailOutbox, queue_mail_or_send
+from apps.main.models import OutboundEmail
+
+SMTP_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: accepts everything except rejected recipients"""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 stub ESMTP")
+        rejected = False
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 stub")
+            elif command == "RCPT":
+                rejected = any(r in line for r in server.reject)
+                self.reply("451 try later" if rejected else "250 OK")
+            elif command == "DATA":
+                if rejected:
+                    self.reply("503 no valid recipients")
+                    continue
+                self.reply("354 go ahead")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                server.messages += 1
+                self.reply("250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 OK")
+                rejected = False if command == "RSET" else rejected
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubSMTPHandler)
+        self.connections = 0
+        self.messages = 0
+        self.reject = set()
+
+
+@pytest.fixture
+def smtp_server(settings):
+    server = StubSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.EMAIL_HOST, settings.EMAIL_PORT = server.server_address
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def outbox(settings):
+    settings.MAIL_OUTBOX_AUTOSTART = False
+    return MailOutbox(batch_size=10, max_attempts=2, backend=SMTP_BACKEND)
+
+
+@pytest.mark.django_db
+class TestMailOutbox:
+    """Test queueing and delivery."""
+
+    def test_enqueue_one_row_per_recipient(self, outbox):
+        queued = outbox.enqueue(
+            "Hello", "Body", ["a@example.com", "A@example.com", "b@example.com"]
+        )
+
+        assert queued == 2
+        assert OutboundEmail.objects.filter(status="pending").count() == 2
+
+    def test_duplicate_messages_are_collapsed(self, outbox):
+        outbox.enqueue("Alert", "Disk full", ["ops@example.com"])
+        outbox.enqueue("Alert", "Disk full", ["ops@example.com", "dev@example.com"])
+
+        assert OutboundEmail.objects.count() == 2
+
+    def test_batch_reuses_one_connection(self, outbox, smtp_server):
+        for i in range(25):
+            outbox.enqueue(f"Message {i}", "Body", [f"user{i}@example.com"])
+
+        assert outbox.drain() == 25
+
+        assert smtp_server.messages == 25
+        assert smtp_server.connections == 3  # one per batch of 10
+        assert OutboundEmail.objects.filter(status="sent").count() == 25
+
+    def test_failed_delivery_is_retried_with_backoff(self, outbox, smtp_server):
+        smtp_server.reject.add("bad@example.com")
+        outbox.enqueue("Hi", "Body", ["bad@example.com", "good@example.com"])
+
+        outbox.send_pending()
+
+        bad = OutboundEmail.objects.get(recipient="bad@example.com")
+        assert bad.status == "pending"
+        assert bad.attempts == 1
+        assert bad.next_attempt_at > timezone.now()
+        assert OutboundEmail.objects.get(recipient="good@example.com").status == "sent"
+        assert outbox.send_pending() == 0  # not due yet
+
+        OutboundEmail.objects.filter(pk=bad.pk).update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        outbox.send_pending()
+
+        bad.refresh_from_db()
+        assert bad.status == "failed"
+        assert bad.attempts == 2
+
+    def test_unreachable_server_defers_batch(self, outbox, settings):
+        settings.EMAIL_HOST, settings.EMAIL_PORT = "127.0.0.1", 1
+        settings.EMAIL_TIMEOUT = 1
+        outbox.enqueue("Hi", "Body", ["a@example.com"])
+
+        outbox.send_pending()
+
+        row = OutboundEmail.objects.get()
+        assert row.status == "pending"
+        assert row.last_error
+
+    def test_refused_recipient_keeps_connection(self, outbox, smtp_server):
+        smtp_server.reject.add("bad@example.com")
+        outbox.enqueue(
+            "Hi", "Body", ["a@example.com", "bad@example.com", "b@example.com"]
+        )
+
+        outbox.send_pending()
+
+        assert smtp_server.connections == 1
+        assert smtp_server.messages == 2
+
+    def test_prune_deletes_old_sent_rows(self, outbox):
+        outbox.enqueue("Old", "Body", ["a@example.com"])
+        outbox.enqueue("New", "Body", ["a@example.com"])
+        outbox.enqueue("Pending", "Body", ["a@example.com"])
+        now = timezone.now()
+        OutboundEmail.objects.filter(subject="Old").update(
+            status="sent", sent_at=now - timedelta(days=10)
+        )
+        OutboundEmail.objects.filter(subject="New").update(status="sent", sent_at=now)
+
+        assert outbox.prune(days=7) == 1
+        assert sorted(OutboundEmail.objects.values_list("subject", flat=True)) == [
+            "New",
+            "Pending",
+        ]
+
+
+def test_alert_mail_falls_back_to_direct_send(settings, monkeypatch):
+    # No django_db mark: the outbox table is unreachable
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    monkeypatch.setattr(mail_outbox_module, "mail_outbox", MailOutbox())
+
+    queue_mail_or_send("Database down", "Body", None, ["ops@example.com"])
+
+    assert [message.subject for message in mail.outbox] == ["Database down"]
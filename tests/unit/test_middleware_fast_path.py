@@ -0,0 +1,151 @@
+"""
+Unit tests for the middleware fast path.
+
+Tests cover:
+- Route classification by path prefix or exact path
+- Skipping grouped middlewares for fast-path route classes
+- Per-middleware latency accounting (own time, excluding the inner chain)
+"""
+
+import time
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+import pytest
+
+from apps.main.middleware.fast_path import (
+    RouteClassMiddleware,
+    classify,
+    middleware_latency,
+    route_aware,
+)
+
+ROUTE_CLASSES = {
+    "static": ["/static/", "/media/"],
+    "health": ["/health/", "/api/health/"],
+}
+FAST_PATH = {"static": ["apm"], "health": ["apm", "analytics"]}
+
+
+@pytest.fixture(autouse=True)
+def fast_path_settings(settings):
+    settings.MIDDLEWARE_ROUTE_CLASSES = ROUTE_CLASSES
+    settings.MIDDLEWARE_FAST_PATH = FAST_PATH
+    settings.MIDDLEWARE_LATENCY_TRACKING = True
+    middleware_latency.reset()
+    yield
+    middleware_latency.reset()
+
+
+@route_aware("apm")
+class SleepyMiddleware:
+    delay = 0.05
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        time.sleep(self.delay)
+        response = self.get_response(request)
+        response["X-Sleepy"] = "1"
+        return response
+
+
+@route_aware()
+class HeaderMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        response["X-Header"] = "1"
+        return response
+
+
+def slow_view(request):
+    time.sleep(0.1)
+    return HttpResponse("ok")
+
+
+def build_chain(view=slow_view):
+    return RouteClassMiddleware(SleepyMiddleware(HeaderMiddleware(view)))
+
+
+def test_classify():
+    assert classify("/static/css/main.css") == "static"
+    assert classify("/api/health/") == "health"
+    assert classify("/blog/") is None
+
+
+def test_exact_entries_match_only_their_path(settings):
+    from project.settings import base
+
+    settings.MIDDLEWARE_ROUTE_CLASSES = base.MIDDLEWARE_ROUTE_CLASSES
+
+    assert classify("/api/performance/") == "beacon"
+    assert classify("/api/performance/dashboard/") is None
+
+
+def test_grouped_middleware_is_skipped_on_fast_path():
+    chain = build_chain(lambda request: HttpResponse("ok"))
+
+    static = chain(RequestFactory().get("/static/app.js"))
+    page = chain(RequestFactory().get("/blog/"))
+
+    assert "X-Sleepy" not in static
+    assert static["X-Header"] == "1"
+    assert page["X-Sleepy"] == "1"
+
+
+def test_own_time_excludes_inner_chain():
+    build_chain()(RequestFactory().get("/blog/"))
+
+    [route] = middleware_latency.report()
+    costs = {m["name"]: m["avg_ms"] for m in route["middleware"]}
+
+    assert route["route"] == "unresolved"
+    assert route["requests"] == 1
+    assert 45 <= costs["SleepyMiddleware"] < 90
+    assert costs["HeaderMiddleware"] < 20
+    assert route["avg_unattributed_ms"] >= 95
+    assert route["avg_total_ms"] >= 150
+
+
+def test_skipped_middleware_is_not_timed():
+    build_chain(lambda request: HttpResponse("ok"))(
+        RequestFactory().get("/static/app.js")
+    )
+
+    [route] = middleware_latency.report()
+
+    assert route["route"] == "static"
+    assert route["route_class"] == "static"
+    assert [m["name"] for m in route["middleware"]] == ["HeaderMiddleware"]
+
+
+def test_tracking_can_be_disabled(settings):
+    settings.MIDDLEWARE_LATENCY_TRACKING = False
+
+    response = build_chain(lambda request: HttpResponse("ok"))(
+        RequestFactory().get("/blog/")
+    )
+
+    assert response["X-Sleepy"] == "1"
+    assert middleware_latency.report() == []
+
+
+@pytest.mark.django_db
+def test_health_probe_skips_apm_in_full_stack(admin_client):
+    health = admin_client.get("/api/health/")
+    dashboard = admin_client.get("/api/performance/dashboard/")
+
+    assert "X-Transaction-Time" not in health
+    assert "X-Processing-Time" not in health
+    assert "X-Transaction-Time" in dashboard
+
+    routes = {r["route"]: r for r in dashboard.json()["data"]["middleware"]}
+    assert routes["api_health_check"]["route_class"] == "health"
+    names = {m["name"] for m in routes["api_health_check"]["middleware"]}
+    assert "APMMiddleware" not in names
+    assert "CompressionMiddleware" in names
@@ -0,0 +1,158 @@
+"""
+Tests for buffered snippet counters and gallery keyset pagination
+"""
+
+import threading
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+
+from apps.playground.counters import SnippetCounterBuffer, snippet_counters
+from apps.playground.models import CodeSnippet, ProgrammingLanguage
+from apps.playground.pagination import keyset_paginate
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def language():
+    return ProgrammingLanguage.objects.create(
+        name="Python", tagline="Python", extension="py"
+    )
+
+
+@pytest.fixture
+def snippets(language):
+    now = timezone.now()
+    created = [
+        CodeSnippet.objects.create(
+            title=f"Snippet {n}", language=language, code="print(1)", is_public=True
+        )
+        for n in range(7)
+    ]
+    for n, snippet in enumerate(created):
+        # Two snippets share a timestamp to exercise the id tie-breaker
+        CodeSnippet.objects.filter(pk=snippet.pk).update(
+            created_at=now - timedelta(minutes=min(n, 5))
+        )
+    return created
+
+
+def test_views_are_buffered_then_flushed(snippets):
+    buffer = SnippetCounterBuffer(flush_interval=3600, flush_size=1000)
+    first, second = snippets[:2]
+
+    for _ in range(3):
+        buffer.record_view(first.pk)
+    buffer.record_view(second.pk)
+    buffer.record_like(second.pk)
+
+    assert buffer.pending(first.pk) == (3, 0)
+    first.refresh_from_db()
+    assert first.views == 0
+
+    assert buffer.flush() == 2
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.views, second.views, second.likes) == (3, 1, 1)
+    assert buffer.pending(first.pk) == (0, 0)
+
+
+def test_concurrent_hits_are_not_lost(snippets):
+    buffer = SnippetCounterBuffer(flush_interval=3600, flush_size=100000)
+    snippet = snippets[0]
+
+    def hit():
+        for _ in range(500):
+            buffer.record_view(snippet.pk)
+
+    threads = [threading.Thread(target=hit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    buffer.flush()
+
+    snippet.refresh_from_db()
+    assert snippet.views == 4000
+
+
+def test_flush_size_triggers_flush(snippets):
+    buffer = SnippetCounterBuffer(flush_interval=3600, flush_size=2)
+
+    buffer.record_view(snippets[0].pk)
+    buffer.record_view(snippets[0].pk)
+
+    snippets[0].refresh_from_db()
+    assert snippets[0].views == 2
+
+
+def test_failed_flush_keeps_deltas(snippets, monkeypatch):
+    buffer = SnippetCounterBuffer(flush_interval=3600, flush_size=1000)
+    snippet = snippets[0]
+    buffer.record_view(snippet.pk)
+    buffer.record_like(snippet.pk)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("database is down")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(CodeSnippet.objects, "filter", broken)
+        assert buffer.flush() == 0
+    buffer.record_view(snippet.pk)
+
+    assert buffer.pending(snippet.pk) == (2, 1)
+    assert buffer.flush() == 1
+    snippet.refresh_from_db()
+    assert (snippet.views, snippet.likes) == (2, 1)
+
+
+def test_like_toggles(client, snippets):
+    user = get_user_model().objects.create_user(
+        username="liker", email="liker@example.com", password="pass-12345-word"
+    )
+    client.force_login(user)
+    url = reverse("playground:like_snippet", args=[snippets[0].pk])
+
+    liked = client.post(url).json()
+    unliked = client.post(url).json()
+    snippet_counters.flush()
+
+    assert liked == {"liked": True, "likes": 1}
+    assert unliked == {"liked": False, "likes": 0}
+    snippets[0].refresh_from_db()
+    assert snippets[0].likes == 0
+
+
+def test_like_requires_login(client, snippets):
+    url = reverse("playground:like_snippet", args=[snippets[0].pk])
+
+    assert client.post(url).status_code == 401
+
+
+def test_keyset_pages_cover_all_rows_in_order(snippets, django_assert_num_queries):
+    queryset = CodeSnippet.objects.filter(is_public=True)
+    expected = list(queryset.order_by("-created_at", "-id"))
+
+    seen, cursor = [], None
+    while True:
+        with django_assert_num_queries(1):
+            page = keyset_paginate(queryset, cursor, 3)
+        seen.extend(page.object_list)
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+
+    assert seen == expected
+
+
+def test_invalid_cursor_starts_from_first_page(snippets):
+    queryset = CodeSnippet.objects.filter(is_public=True)
+
+    page = keyset_paginate(queryset, "not-a-cursor", 3)
+
+    assert page.object_list == list(queryset.order_by("-created_at", "-id")[:3])
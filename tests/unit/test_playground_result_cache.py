@@ -0,0 +1,188 @@
+"""
+Tests for the playground execution result cache
+"""
+
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+
+from apps.playground.models import CodeTemplate, ExecutionResult, ProgrammingLanguage
+from apps.playground.result_cache import (
+    ExecutionResultCache,
+    is_deterministic,
+    result_cache,
+    result_key,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def sandbox_settings(settings, tmp_path):
+    settings.PLAYGROUND_COMPILE_CACHE_DIR = tmp_path / "compile-cache"
+    settings.PLAYGROUND_WARM_WORKERS = {"python": 1}
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
+
+@pytest.fixture
+def python():
+    return ProgrammingLanguage.objects.create(
+        name="Python", tagline="Python", extension="py"
+    )
+
+
+def finished(output="ok\n", outcome="succeeded", **extra):
+    return {
+        "success": outcome == "succeeded",
+        "output": output,
+        "error": "",
+        "execution_time": 12.5,
+        "outcome": outcome,
+        **extra,
+    }
+
+
+def test_key_covers_language_source_and_stdin():
+    base = result_key("Python", "print(input())", "a")
+
+    assert base == result_key("python", "print(input())", "a")
+    assert base != result_key("Python", "print(input())", "b")
+    assert base != result_key("JavaScript", "print(input())", "a")
+    assert base != result_key("Python", "print(input()) ", "a")
+
+
+def test_nondeterministic_sources_are_detected():
+    assert is_deterministic("print(sum(range(10)))")
+    assert not is_deterministic("import random\nprint(random.random())")
+    assert not is_deterministic("console.log(Date.now())")
+    assert not is_deterministic("print(hash('abc'))")
+    assert not is_deterministic("print(id(object()))")
+    assert not is_deterministic("print(list(set(words)))")
+    assert not is_deterministic("import os\nprint(os.listdir('.'))")
+    assert not is_deterministic("auto t = std::chrono::steady_clock::now();")
+    assert not is_deterministic('FILE *f = fopen("/dev/urandom", "rb");')
+
+
+def test_run_stores_and_serves_from_memory_then_database(python):
+    cache = ExecutionResultCache()
+
+    first = cache.run(python, "print(6 * 7)")
+    second = cache.run(python, "print(6 * 7)")
+    cache.clear()
+    third = cache.run(python, "print(6 * 7)")
+
+    assert first["output"] == second["output"] == third["output"] == "42\n"
+    assert not first["cached"]
+    assert second["cached"] and third["cached"]
+    row = ExecutionResult.objects.get(cache_key=result_key("Python", "print(6 * 7)"))
+    assert row.language == python
+    assert row.hits == 1
+    assert cache.stats()["db_hits"] == 1
+
+
+def test_stdin_is_part_of_the_run(python):
+    cache = ExecutionResultCache()
+
+    doubled = cache.run(python, "print(input() * 2)", "ab\n")
+    other = cache.run(python, "print(input() * 2)", "cd\n")
+
+    assert doubled["output"] == "abab\n"
+    assert other["output"] == "cdcd\n"
+    assert not other["cached"]
+
+
+def test_only_successes_and_compile_errors_are_stored(python):
+    cache = ExecutionResultCache()
+    compile_error = finished("", "failed", compile_error=True)
+
+    assert cache.store(python, "print(1)", "", finished())
+    assert cache.store(python, "print(", "", compile_error)
+    assert not cache.store(python, "raise SystemExit(1)", "", finished("", "failed"))
+    assert not cache.store(python, "while True: pass", "", finished("", "timed_out"))
+    assert not cache.store(python, "print(1)", "x", finished("", "error"))
+    assert not cache.store(python, "import time\nprint(time.time())", "", finished())
+    assert ExecutionResult.objects.count() == 2
+
+
+def test_table_is_trimmed_to_its_cap(python, settings):
+    settings.PLAYGROUND_RESULT_MAX_ROWS = 2
+    cache = ExecutionResultCache()
+    for n in range(4):
+        cache.store(python, f"print({n})", "", finished(f"{n}\n"))
+
+    assert cache.prune() == 2
+    kept = ExecutionResult.objects.values_list("output", flat=True)
+    assert sorted(kept) == ["2\n", "3\n"]
+
+
+def test_opting_out_skips_the_cache(client, python):
+    url = reverse("playground:execute_code")
+    payload = {"code": "print('hi')", "language_id": python.id, "cache": False}
+
+    for _ in range(2):
+        body = client.post(url, json.dumps(payload), "application/json").json()
+        assert not body["cached"]
+    assert not ExecutionResult.objects.exists()
+
+
+def test_memory_front_is_lru(python):
+    cache = ExecutionResultCache(max_entries=2)
+    for n in range(3):
+        cache.store(python, f"print({n})", "", finished(f"{n}\n"))
+
+    cache.get("Python", "print(1)")
+    cache.get("Python", "print(0)")
+
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["db_hits"] == 1
+
+
+def test_execute_view_uses_cache(client, python):
+    payload = json.dumps({"code": "print('hi')", "language_id": python.id})
+    url = reverse("playground:execute_code")
+
+    first = client.post(url, payload, content_type="application/json").json()
+    second = client.post(url, payload, content_type="application/json").json()
+
+    assert first["output"] == second["output"] == "hi\n"
+    assert second["cached"]
+
+
+def test_submit_view_returns_cached_result(client, python):
+    result_cache.store(python, "print('hi')", "", finished("hi\n"))
+
+    response = client.post(
+        reverse("playground:submit_code"),
+        json.dumps({"code": "print('hi')", "language_id": python.id}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert response.json()["result"]["output"] == "hi\n"
+
+
+def test_warm_command_executes_featured_templates(python):
+    CodeTemplate.objects.create(
+        name="Hello",
+        description="",
+        language=python,
+        code="print('hello')",
+        is_featured=True,
+    )
+    CodeTemplate.objects.create(
+        name="Other", description="", language=python, code="print('other')"
+    )
+
+    out = StringIO()
+    call_command("warm_playground_results", stdout=out)
+
+    assert "Executed 1 templates" in out.getvalue()
+    assert result_cache.get("Python", "print('hello')")["output"] == "hello\n"
+    assert result_cache.get("Python", "print('other')") is None
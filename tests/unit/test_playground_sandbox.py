@@ -0,0 +1,154 @@
+"""
+Tests for the playground execution service
+"""
+
+import json
+import shutil
+import time
+
+from django.core.cache import cache
+from django.urls import reverse
+
+import pytest
+
+from apps.playground.models import ProgrammingLanguage
+from apps.playground.sandbox import ExecutionRejected, ExecutionService
+
+needs_gcc = pytest.mark.skipif(shutil.which("gcc") is None, reason="gcc required")
+
+
+@pytest.fixture(autouse=True)
+def sandbox_settings(settings, tmp_path):
+    settings.PLAYGROUND_COMPILE_CACHE_DIR = tmp_path / "compile-cache"
+    settings.PLAYGROUND_WARM_WORKERS = {"python": 1}
+    settings.PLAYGROUND_LIMITS = {"cpu_seconds": 2, "wall_seconds": 5}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def service():
+    service = ExecutionService()
+    yield service
+    service.shutdown()
+
+
+def test_python_runs_in_sandbox(service):
+    result = service.run("import os\nprint(sorted(os.environ))", "Python")
+
+    assert result["success"]
+    assert result["output"] == "['HOME', 'LANG', 'PATH']\n"
+    assert "queue_time" in result
+
+
+def test_failed_run_reports_stderr(service):
+    result = service.run("raise ValueError('boom')", "python")
+
+    assert not result["success"]
+    assert "ValueError: boom" in result["error"]
+
+
+def test_warm_worker_is_used(service):
+    service.warm_up()
+    pool = service._pools["python"]
+    deadline = time.monotonic() + 5
+    while pool.idle < 1 and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    result, outcome, warm = service.execute("print('hi')", "python")
+
+    assert outcome == "succeeded"
+    assert warm
+    assert result["output"] == "hi\n"
+
+
+def test_wall_clock_timeout(service, settings):
+    settings.PLAYGROUND_LIMITS = {"wall_seconds": 0.5}
+
+    result = service.run("import time\ntime.sleep(5)", "python")
+
+    assert not result["success"]
+    assert "timed out" in result["error"]
+
+
+def test_cpu_limit(service, settings):
+    settings.PLAYGROUND_LIMITS = {"cpu_seconds": 1, "wall_seconds": 5}
+
+    result = service.run("while True:\n    pass", "python")
+
+    assert not result["success"]
+    assert "CPU limit" in result["error"]
+
+
+@needs_gcc
+def test_compiled_binaries_are_cached(service):
+    code = '#include <stdio.h>\nint main(void) { puts("hi"); return 0; }\n'
+
+    first = service.run(code, "C")
+    second = service.run(code, "C")
+
+    assert first["output"] == second["output"] == "hi\n"
+    assert service.compile_cache.misses == 1
+    assert service.compile_cache.hits == 1
+
+
+@needs_gcc
+def test_compile_errors_are_returned(service):
+    result = service.run("int main( {", "C")
+
+    assert not result["success"]
+    assert result["error"].startswith("Compilation error:")
+
+
+def test_unsupported_language(service):
+    result = service.run("puts 1", "Ruby")
+
+    assert not result["success"]
+    assert "not yet supported" in result["error"]
+
+
+def test_full_queue_is_rejected(service, settings):
+    settings.PLAYGROUND_MAX_QUEUE = 0
+
+    with pytest.raises(ExecutionRejected):
+        service.submit("print(1)", "python")
+
+
+def test_report_counts_executions(service):
+    service.run("print(1)", "python")
+    service.run("raise SystemExit(3)", "python")
+
+    report = service.report()
+
+    assert report["completed_last_minute"] == 2
+    assert report["languages"]["python"]["succeeded"] == 1
+    assert report["languages"]["python"]["failed"] == 1
+    assert sum(report["languages"]["python"]["latency_histogram_ms"].values()) == 2
+
+
+@pytest.mark.django_db
+def test_submit_and_poll_views(client):
+    language = ProgrammingLanguage.objects.create(
+        name="Python", tagline="Python", extension="py"
+    )
+
+    response = client.post(
+        reverse("playground:submit_code"),
+        json.dumps({"code": "print(6 * 7)", "language_id": language.id}),
+        content_type="application/json",
+    )
+    assert response.status_code == 202
+    status_url = response.json()["status_url"]
+
+    deadline = time.monotonic() + 10
+    job = client.get(status_url).json()
+    while job["status"] != "finished" and time.monotonic() < deadline:
+        time.sleep(0.05)
+        job = client.get(status_url).json()
+
+    assert job["result"]["success"]
+    assert job["result"]["output"] == "42\n"
+    assert (
+        client.get(reverse("playground:job_status", args=["nope"])).status_code == 404
+    )
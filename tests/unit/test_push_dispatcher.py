@@ -0,0 +1,185 @@
+"""
+Unit tests for the concurrent web push dispatcher.
+
+Tests cover:
+- VAPID header reuse per audience origin
+- Per-host session reuse on worker threads
+- Delivery outcomes and the dispatch summary
+"""
+
+import base64
+import os
+from types import SimpleNamespace
+
+import http_ece
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from apps.portfolio.services import push_dispatcher
+from apps.portfolio.services.push_dispatcher import (
+    PushDispatcher,
+    PushOutcome,
+    VapidHeaderCache,
+    audience,
+    encrypt_payload,
+)
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def vapid_private_key() -> str:
+    key = ec.generate_private_key(ec.SECP256R1())
+    return b64url(key.private_numbers().private_value.to_bytes(32, "big"))
+
+
+def subscriber_keys(with_private=False):
+    key = ec.generate_private_key(ec.SECP256R1())
+    p256dh = key.public_key().public_bytes(
+        serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint
+    )
+    auth = os.urandom(16)
+    if with_private:
+        return key, b64url(p256dh), auth, b64url(auth)
+    return b64url(p256dh), b64url(auth)
+
+
+class FakeSession:
+    def __init__(self, status_code=201):
+        self.status_code = status_code
+        self.posts = []
+
+    def post(self, endpoint, data=None, headers=None, timeout=None):
+        self.posts.append((endpoint, headers))
+        return SimpleNamespace(status_code=self.status_code, reason="Reason", text="")
+
+
+def test_audience_is_scheme_and_host():
+    assert audience("https://fcm.googleapis.com/fcm/send/abc") == (
+        "https://fcm.googleapis.com"
+    )
+
+
+def test_payload_decrypts_for_subscriber():
+    key, p256dh, auth, auth_b64 = subscriber_keys(with_private=True)
+
+    body = encrypt_payload(b'{"title": "Hi"}', p256dh, auth_b64)
+
+    assert (
+        http_ece.decrypt(body, private_key=key, auth_secret=auth, version="aes128gcm")
+        == b'{"title": "Hi"}'
+    )
+
+
+def test_vapid_headers_are_signed_once_per_origin(monkeypatch):
+    cache = VapidHeaderCache(vapid_private_key(), "mailto:admin@example.com")
+    calls = []
+    vapid = cache._load_vapid()
+    original_sign = vapid.sign
+
+    def counting_sign(claims):
+        calls.append(claims["aud"])
+        return original_sign(claims)
+
+    monkeypatch.setattr(vapid, "sign", counting_sign)
+
+    first = cache.headers_for("https://push.example.com/a")
+    second = cache.headers_for("https://push.example.com/b")
+    cache.headers_for("https://other.example.com/c")
+
+    assert first is second
+    assert "Authorization" in {k.title() for k in first}
+    assert calls == ["https://push.example.com", "https://other.example.com"]
+
+
+def test_deliver_reuses_session_per_host(monkeypatch):
+    dispatcher = PushDispatcher(vapid_private_key(), "mailto:admin@example.com")
+    session = FakeSession()
+    monkeypatch.setattr(dispatcher, "_session_for", lambda endpoint: session)
+    p256dh, auth = subscriber_keys()
+
+    first = dispatcher.deliver(
+        (1, "https://push.example.com/1", p256dh, auth), b"{}", 60
+    )
+    second = dispatcher.deliver(
+        (2, "https://push.example.com/2", p256dh, auth), b"{}", 60
+    )
+
+    assert first.success and second.success
+    assert len(session.posts) == 2
+    assert session.posts[0][1]["content-encoding"] == "aes128gcm"
+
+
+def test_session_cache_is_per_thread_and_host():
+    dispatcher = PushDispatcher(vapid_private_key())
+
+    a = dispatcher._session_for("https://push.example.com/1")
+    b = dispatcher._session_for("https://push.example.com/2")
+    c = dispatcher._session_for("https://other.example.com/1")
+
+    assert a is b
+    assert a is not c
+
+
+def test_expired_subscription_outcome(monkeypatch):
+    dispatcher = PushDispatcher(vapid_private_key())
+    monkeypatch.setattr(dispatcher, "_session_for", lambda endpoint: FakeSession(410))
+    p256dh, auth = subscriber_keys()
+
+    outcome = dispatcher.deliver(
+        (7, "https://push.example.com/7", p256dh, auth), b"{}", 0
+    )
+
+    assert not outcome.success
+    assert outcome.expired
+    assert "410" in outcome.error
+
+
+def test_invalid_keys_become_failed_outcome():
+    dispatcher = PushDispatcher(vapid_private_key())
+
+    outcome = dispatcher.deliver(
+        (3, "https://push.example.com/3", "bad", "bad"), b"{}", 0
+    )
+
+    assert not outcome.success
+    assert outcome.status_code is None
+
+
+def test_dispatch_summary_and_batched_recording(monkeypatch):
+    dispatcher = PushDispatcher(vapid_private_key(), max_concurrent=4, batch_size=3)
+    recorded = []
+
+    def fake_deliver(row, data, ttl):
+        return PushOutcome(
+            row[0], 201 if row[0] % 2 else 410, "" if row[0] % 2 else "gone"
+        )
+
+    monkeypatch.setattr(dispatcher, "deliver", fake_deliver)
+    monkeypatch.setattr(
+        dispatcher, "record", lambda outcomes, fields: recorded.append(len(outcomes))
+    )
+    subscriptions = [
+        SimpleNamespace(
+            id=i, endpoint=f"https://push.example.com/{i}", p256dh="", auth=""
+        )
+        for i in range(1, 8)
+    ]
+
+    summary = dispatcher.dispatch(subscriptions, {"title": "Hi"})
+
+    assert summary["total_count"] == 7
+    assert summary["success_count"] == 4
+    assert summary["failure_count"] == 3
+    assert recorded == [3, 3, 1]
+
+
+def test_missing_pywebpush_reports_failure(monkeypatch):
+    monkeypatch.setattr(push_dispatcher, "http_ece", None)
+    dispatcher = PushDispatcher()
+
+    outcome = dispatcher.deliver((1, "https://push.example.com/1", "", ""), b"{}", 0)
+
+    assert outcome.error == "pywebpush not installed"
@@ -0,0 +1,144 @@
+"""
+Unit tests for the production query profiler.
+
+Tests cover:
+- SQL normalization and fingerprints
+- Query counting with DEBUG=False via execute_wrapper
+- N+1 detection on sampled requests
+- Per-endpoint aggregates merged across published workers
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import ResolverMatch
+
+import pytest
+
+from apps.main.middleware import apm_middleware
+from apps.main.middleware.apm_middleware import DatabaseQueryTrackingMiddleware
+from apps.main.query_profiler import QueryProfiler, fingerprint, normalize_sql
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    profiler = QueryProfiler(sample_rate=1.0, n_plus_one_threshold=3)
+    monkeypatch.setattr(apm_middleware, "query_profiler", profiler)
+    return profiler
+
+
+def make_users(count):
+    return [
+        User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com")
+        for i in range(count)
+    ]
+
+
+def n_plus_one_view(request):
+    for user in User.objects.all():
+        User.objects.filter(pk=user.pk).exists()
+    return HttpResponse("ok")
+
+
+def run(view, view_name="users"):
+    request = RequestFactory().get("/users/")
+
+    def get_response(request):
+        request.resolver_match = ResolverMatch(view, (), {}, url_name=view_name)
+        return view(request)
+
+    return DatabaseQueryTrackingMiddleware(get_response)(request)
+
+
+def test_normalize_sql():
+    sql = "SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'bob' LIMIT 21"
+
+    assert (
+        normalize_sql(sql) == "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?"
+    )
+
+
+def test_fingerprint_ignores_literals():
+    assert fingerprint("SELECT 1 FROM t WHERE id = 5") == fingerprint(
+        "SELECT 1  FROM t WHERE id = 42"
+    )
+    assert fingerprint("SELECT 1 FROM t") != fingerprint("SELECT 1 FROM u")
+
+
+@pytest.mark.django_db
+class TestQueryTrackingMiddleware:
+    """Test per-request instrumentation."""
+
+    def test_counts_queries_without_debug(self, profiler, settings):
+        settings.DEBUG = False
+        make_users(4)
+
+        response = run(n_plus_one_view)
+
+        assert response["X-DB-Query-Count"] == "5"
+
+    def test_flags_n_plus_one(self, profiler, caplog):
+        make_users(4)
+
+        run(n_plus_one_view)
+
+        assert "Possible N+1 in users" in caplog.text
+        stats = profiler.local_stats()["users"]
+        assert stats["requests"] == 1
+        assert stats["n_plus_one"] == 1
+        assert max(e["count"] for e in stats["fingerprints"].values()) == 4
+
+    def test_unsampled_requests_only_count(self, profiler):
+        profiler._sample_rate = 0.0
+        make_users(4)
+
+        run(n_plus_one_view)
+
+        stats = profiler.local_stats()["users"]
+        assert stats["queries"] == 5
+        assert stats["sampled"] == 0
+        assert stats["fingerprints"] == {}
+
+
+@pytest.mark.django_db
+def test_endpoint_report_merges_workers(profiler):
+    make_users(3)
+    other = QueryProfiler(sample_rate=1.0)
+    other.process_key = "query_profiler:other:1"
+
+    run(n_plus_one_view)
+    other._endpoints = profiler.local_stats()
+    other.publish()
+    run(n_plus_one_view)
+
+    report = profiler.endpoint_report()
+
+    assert report[0]["endpoint"] == "users"
+    assert report[0]["requests"] == 3
+    assert report[0]["avg_queries"] == 4
+    assert report[0]["n_plus_one_requests"] == 3
+    assert report[0]["top_fingerprints"][0]["count"] == 9
+
+
+@pytest.mark.django_db
+def test_dashboard_data_is_staff_only(client, admin_client, django_user_model):
+    anonymous = client.get("/api/performance/dashboard/")
+    staff = admin_client.get("/api/performance/dashboard/")
+    # Not served to other users from the API response cache
+    client.force_login(django_user_model.objects.create_user("member"))
+    member = client.get("/api/performance/dashboard/")
+
+    assert anonymous.status_code == 302
+    assert staff.status_code == 200
+    assert "queries" in staff.json()["data"]
+    assert member.status_code == 302
@@ -0,0 +1,166 @@
+"""
+Unit tests for the shared rate limiter engine.
+
+Tests cover:
+- Rate parsing
+- GCRA allow/throttle decisions with single and multiple rates
+- Lockout, peek, reset and decision stats
+- Local fallback when the backend errors
+- The portfolio ratelimit_view decorator
+"""
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+import pytest
+
+from apps.main.rate_limiter import CacheBackend, Rate, RateLimiter
+from apps.portfolio.ratelimit import ratelimit_view
+
+NOW = 1_000_000.0
+
+
+@pytest.fixture
+def limiter():
+    store = LocMemCache("test-rate-limiter", {"OPTIONS": {}})
+    store.clear()
+    yield RateLimiter(backend=CacheBackend(store))
+    store.clear()
+
+
+class BrokenBackend:
+    def check(self, *args):
+        raise ConnectionError("redis down")
+
+    def reset(self, key):
+        raise ConnectionError("redis down")
+
+
+def test_rate_parse():
+    assert Rate.parse("10/m") == Rate(10, 60)
+    assert Rate.parse("100/h") == Rate(100, 3600)
+    assert Rate.parse("5/15m") == Rate(5, 900)
+    with pytest.raises(ValueError):
+        Rate.parse("10 per minute")
+
+
+def test_allows_limit_then_throttles(limiter):
+    rates = [Rate(3, 60)]
+
+    decisions = [limiter.hit("api", "a", rates, now=NOW) for _ in range(4)]
+
+    assert [d.state for d in decisions] == [
+        "allowed",
+        "allowed",
+        "allowed",
+        "throttled",
+    ]
+    assert [d.remaining for d in decisions[:3]] == [2, 1, 0]
+    assert decisions[3].retry_after == pytest.approx(20)
+    assert limiter.hit("api", "a", rates, now=NOW + 20).allowed
+
+
+def test_capacity_refills_one_request_per_interval(limiter):
+    rates = [Rate(2, 10)]
+    limiter.hit("api", "a", rates, now=NOW)
+    limiter.hit("api", "a", rates, now=NOW)
+
+    assert not limiter.hit("api", "a", rates, now=NOW + 4).allowed
+    assert limiter.hit("api", "a", rates, now=NOW + 5).allowed
+    assert not limiter.hit("api", "a", rates, now=NOW + 5).allowed
+
+
+def test_burst_rate_applies_alongside_sustained_rate(limiter):
+    rates = [Rate(60, 60), Rate(5, 1)]
+
+    burst = [limiter.hit("global", "a", rates, now=NOW).state for _ in range(6)]
+
+    assert burst.count("allowed") == 5
+    assert burst[-1] == "throttled"
+    assert limiter.hit("global", "a", rates, now=NOW + 1).allowed
+
+
+def test_identities_are_independent(limiter):
+    rates = [Rate(1, 60)]
+    limiter.hit("api", "a", rates, now=NOW)
+
+    assert not limiter.hit("api", "a", rates, now=NOW).allowed
+    assert limiter.hit("api", "b", rates, now=NOW).allowed
+    assert limiter.hit("other", "a", rates, now=NOW).allowed
+
+
+def test_peek_does_not_consume(limiter):
+    rates = [Rate(1, 60)]
+
+    assert limiter.peek("auth:ip", "a", rates, now=NOW).allowed
+    assert limiter.peek("auth:ip", "a", rates, now=NOW).allowed
+    assert limiter.hit("auth:ip", "a", rates, now=NOW).allowed
+    assert not limiter.peek("auth:ip", "a", rates, now=NOW).allowed
+
+
+def test_lockout_blocks_until_expired(limiter):
+    rates = [Rate(2, 60)]
+    for _ in range(2):
+        limiter.hit("ddos", "ip", rates, lockout=900, now=NOW)
+
+    locked = limiter.hit("ddos", "ip", rates, lockout=900, now=NOW)
+    blocked = limiter.hit("ddos", "ip", rates, lockout=900, now=NOW + 600)
+
+    assert locked.state == "locked"
+    assert blocked.state == "blocked"
+    assert blocked.reset_seconds == 300
+    assert limiter.hit("ddos", "ip", rates, lockout=900, now=NOW + 901).allowed
+
+
+def test_reset_clears_state(limiter):
+    rates = [Rate(1, 60)]
+    limiter.hit("api", "a", rates, now=NOW)
+
+    limiter.reset("api", "a")
+
+    assert limiter.hit("api", "a", rates, now=NOW).allowed
+
+
+def test_stats_count_decisions_per_scope(limiter):
+    rates = [Rate(1, 60)]
+    limiter.hit("api", "a", rates, now=NOW)
+    limiter.hit("api", "a", rates, now=NOW)
+    limiter.hit("ddos", "a", rates, now=NOW)
+
+    assert limiter.stats() == {
+        "api": {"allowed": 1, "throttled": 1},
+        "ddos": {"allowed": 1},
+    }
+    limiter.reset_stats()
+    assert limiter.stats() == {}
+
+
+def test_backend_error_falls_back_to_local_state():
+    limiter = RateLimiter(backend=BrokenBackend())
+    rates = [Rate(2, 60)]
+    limiter.reset("api", "a")
+
+    states = [limiter.hit("api", "a", rates, now=NOW).state for _ in range(3)]
+    limiter.reset("api", "a")
+
+    assert states == ["allowed", "allowed", "throttled"]
+    assert limiter.hit("api", "a", rates, now=NOW).allowed
+
+
+def test_ratelimit_view_returns_429_after_limit():
+    cache.clear()
+
+    @ratelimit_view(rate="2/m")
+    def view(request):
+        return HttpResponse("ok")
+
+    factory = RequestFactory()
+    codes = [
+        view(factory.get("/", REMOTE_ADDR="10.0.0.1")).status_code for _ in range(3)
+    ]
+
+    assert codes == [200, 200, 429]
+    assert view(factory.get("/", REMOTE_ADDR="10.0.0.2")).status_code == 200
+    cache.clear()
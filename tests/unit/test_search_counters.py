@@ -0,0 +1,121 @@
+"""
+Tests for the search counters behind SearchMonitor
+"""
+
+import threading
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+
+import pytest
+
+from apps.main.monitoring import SearchMonitor
+from apps.main.search_counters import (
+    KEY_METRICS,
+    CacheSearchCounters,
+    SearchCounters,
+    latency_bucket,
+)
+
+
+@pytest.fixture
+def store():
+    store = LocMemCache("search-counters-tests", {})
+    store.clear()
+    yield store
+    store.clear()
+
+
+@pytest.fixture
+def monitor(store):
+    cache.set(
+        SearchMonitor.CACHE_KEY_HEALTH,
+        {"status": "healthy", "message": "ok"},
+    )
+    yield SearchMonitor(SearchCounters(backend=CacheSearchCounters(store)))
+    cache.delete(SearchMonitor.CACHE_KEY_HEALTH)
+
+
+class BrokenBackend:
+    def record(self, *args):
+        raise ConnectionError("redis down")
+
+    def snapshot(self, *args):
+        raise ConnectionError("redis down")
+
+    def reset(self):
+        raise ConnectionError("redis down")
+
+
+def test_metrics_histogram_and_logs(monitor):
+    with monitor.track_query("django"):
+        pass
+    with monitor.track_query("python"):
+        pass
+    with pytest.raises(ValueError):
+        with monitor.track_query("broken"):
+            raise ValueError("boom")
+
+    metrics = monitor.get_metrics()
+
+    assert metrics["total_queries"] == 3
+    assert metrics["total_errors"] == 1
+    assert metrics["error_rate"] == pytest.approx(1 / 3)
+    assert sum(metrics["latency_histogram_ms"].values()) == 3
+    assert metrics["health_status"] == "healthy"
+    assert [q["query"] for q in monitor.get_recent_queries()] == [
+        "broken",
+        "python",
+        "django",
+    ]
+    assert [e["error_message"] for e in monitor.get_recent_errors()] == ["boom"]
+
+
+def test_queries_are_batched_until_read(store):
+    counters = CacheSearchCounters(store, flush_interval=60, flush_size=100)
+
+    for i in range(10):
+        counters.record(12.5, False, {"timestamp": f"t{i}", "query": str(i)})
+
+    assert store.get(KEY_METRICS) is None
+    snapshot = counters.snapshot(queries=3, errors=3)
+    assert snapshot["counters"]["total_queries"] == 10
+    assert snapshot["counters"]["histogram"][latency_bucket(12.5)] == 10
+    assert [q["query"] for q in snapshot["recent_queries"]] == ["9", "8", "7"]
+    assert snapshot["recent_errors"] == []
+
+
+def test_concurrent_queries_are_not_lost(store):
+    counters = CacheSearchCounters(store, flush_interval=60, flush_size=7)
+
+    def worker():
+        for _ in range(250):
+            counters.record(1.0, False, {"timestamp": "t"})
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counters.snapshot()["counters"]["total_queries"] == 2000
+
+
+def test_logs_are_capped(store):
+    counters = CacheSearchCounters(store, flush_interval=60, flush_size=30)
+
+    for i in range(250):
+        counters.record(1.0, True, {"timestamp": "t", "query": str(i)})
+
+    snapshot = counters.snapshot(queries=1000, errors=1000)
+    assert len(snapshot["recent_queries"]) == 100
+    assert len(snapshot["recent_errors"]) == 50
+    assert snapshot["recent_queries"][0]["query"] == "249"
+
+
+def test_backend_errors_fall_back_to_local_state():
+    counters = SearchCounters(backend=BrokenBackend())
+    counters.reset()
+
+    assert counters.record(3.0, True, {"timestamp": "t"}) == (1, 1)
+    assert counters.snapshot(errors=5)["counters"]["total_errors"] == 1
@@ -0,0 +1,137 @@
+"""
+Unit tests for the search result cache.
+
+Tests cover:
+- Ranked hit lists cached per normalized query
+- Deep pagination over the cached hit list
+- Page hydration with one query per content type
+- Generation-based invalidation on content changes
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+import pytest
+
+from apps.blog.models import Post
+from apps.main.search.result_cache import (
+    SearchResultCache,
+    compute_facets,
+    normalize_query,
+)
+from apps.portfolio.views import search_api
+from apps.portfolio.views.search_api import SearchAPIView
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def posts(db):
+    author = User.objects.create_user(
+        username="searcher", email="searcher@example.com", password="pass12345"
+    )
+    return [
+        Post.objects.create(
+            title=f"Django tips {i}",
+            slug=f"django-tips-{i}",
+            excerpt="Short django excerpt",
+            content="Django content " * 5,
+            status="published",
+            published_at=timezone.now(),
+            tags=["django", "python"],
+            author=author,
+        )
+        for i in range(90)
+    ]
+
+
+@pytest.fixture
+def result_cache(monkeypatch):
+    result_cache = SearchResultCache()
+    monkeypatch.setattr(search_api, "search_result_cache", result_cache)
+    monkeypatch.setattr(SearchAPIView, "_has_postgresql", lambda self: False)
+    return result_cache
+
+
+def search(params):
+    request = RequestFactory().get("/api/search/", params)
+    response = SearchAPIView.as_view()(request)
+    return response.status_code, json.loads(response.content)
+
+
+def test_normalize_query():
+    assert normalize_query("  Django   TIPS ") == "django tips"
+
+
+def test_compute_facets_counts_whole_result_set():
+    results = [{"category": "Blog Posts", "tags": ["a"]} for _ in range(80)]
+
+    facets = compute_facets(results)
+
+    assert facets["categories"] == [{"name": "Blog Posts", "count": 80}]
+    assert facets["popular_tags"] == [{"name": "a", "count": 80}]
+
+
+@pytest.mark.django_db
+class TestSearchAPIResultCache:
+    """Test cached ranking and deep pagination in SearchAPIView."""
+
+    def test_deep_pages_are_reachable(self, posts, result_cache):
+        status, body = search({"q": "django", "category": "blog_posts", "page": 5})
+
+        assert status == 200
+        assert body["pagination"]["total_results"] == 90
+        assert body["pagination"]["total_pages"] == 5
+        assert len(body["results"]) == 10
+        assert body["filters"]["categories"][0]["count"] == 90
+
+    def test_repeat_query_is_served_from_cache(self, posts, result_cache):
+        search({"q": "Django", "category": "blog_posts"})
+
+        with CaptureQueriesContext(connection) as queries:
+            status, body = search(
+                {"q": "  django ", "category": "blog_posts", "page": 3}
+            )
+
+        assert status == 200
+        assert body["cached"] is True
+        assert len(body["results"]) == 20
+        assert len(queries) == 1  # hydrate the page's posts in one query
+
+    def test_content_change_invalidates(
+        self, posts, result_cache, django_capture_on_commit_callbacks
+    ):
+        search({"q": "django", "category": "blog_posts"})
+
+        # Invalidation runs when the saving transaction commits
+        with django_capture_on_commit_callbacks(execute=True):
+            posts[0].title = "Changed title"
+            posts[0].save()
+        status, body = search({"q": "django", "category": "blog_posts"})
+
+        assert body["cached"] is False
+
+    def test_deleted_rows_are_skipped_on_hydration(self, posts, result_cache):
+        entry, _ = result_cache.get_or_compute(
+            "django",
+            "blog_posts",
+            lambda limit: {"results": [{"id": 999999, "type": "blog_post"}]},
+        )
+
+        page_obj, results = result_cache.page(entry, 1, 20)
+
+        assert page_obj.paginator.count == 1
+        assert results == []
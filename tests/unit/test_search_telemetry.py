@@ -0,0 +1,140 @@
+"""
+Unit tests for the search telemetry pipeline.
+
+Tests cover:
+- Buffered SearchLog writes flushed in batches
+- Per-day query rollups incremented across flushes
+- Analytics summaries read from the rollups
+- Retention pruning and the exit-time flush
+"""
+
+import json
+from datetime import timedelta
+
+from django.test import RequestFactory
+from django.utils import timezone
+
+import pytest
+
+from apps.main.models import SearchLog, SearchQueryStat
+from apps.main.search.analytics import SearchTelemetry
+from apps.portfolio.views import search_api
+from apps.portfolio.views.search_api import SearchAnalyticsView
+
+
+@pytest.fixture
+def telemetry(monkeypatch):
+    telemetry = SearchTelemetry(flush_interval=3600, flush_size=50)
+    monkeypatch.setattr(search_api, "search_telemetry", telemetry)
+    return telemetry
+
+
+@pytest.mark.django_db
+class TestSearchTelemetry:
+    """Test buffering and rollups."""
+
+    def test_events_are_buffered_until_flush(self, telemetry):
+        telemetry.record("Django", 3, ip_address="10.0.0.1")
+
+        assert telemetry.pending() == 1
+        assert SearchLog.objects.count() == 0
+
+        assert telemetry.flush() == 1
+        log = SearchLog.objects.get()
+        assert log.normalized_query == "django"
+        assert log.ip_address == "10.0.0.1"
+
+    def test_flush_when_buffer_is_full(self, telemetry):
+        for _ in range(50):
+            telemetry.record("python", 1)
+
+        assert telemetry.pending() == 0
+        assert SearchLog.objects.count() == 50
+
+    def test_rollups_accumulate_across_flushes(self, telemetry):
+        telemetry.record("Django", 4)
+        telemetry.record("django ", 0)
+        telemetry.flush()
+        telemetry.record("DJANGO", 2)
+        telemetry.flush()
+
+        stat = SearchQueryStat.objects.get(query="django")
+        assert stat.searches == 3
+        assert stat.zero_results == 1
+        assert stat.total_results == 6
+
+    def test_summary(self, telemetry):
+        for query, results in [("django", 5), ("django", 3), ("rust", 0)]:
+            telemetry.record(query, results)
+        telemetry.flush()
+
+        summary = telemetry.summary(7)
+
+        assert summary["total_searches"] == 3
+        assert summary["unique_queries"] == 2
+        assert summary["average_results"] == 3
+        assert summary["popular_queries"][0] == {"query": "django", "count": 2}
+        assert summary["no_result_queries"] == [{"query": "rust", "count": 1}]
+        assert len(summary["search_trends"]) == 7
+        assert sum(summary["search_trends"].values()) == 3
+
+    def test_analytics_view_reads_rollups(self, telemetry):
+        telemetry.record("django", 1)
+        telemetry.flush()
+
+        request = RequestFactory().get("/api/search/analytics/", {"days": 3})
+        response = SearchAnalyticsView.as_view()(request)
+        body = json.loads(response.content)
+
+        assert response.status_code == 200
+        assert body["analytics"]["total_searches"] == 1
+        assert len(body["analytics"]["search_trends"]) == 3
+
+    def test_prune_drops_expired_logs_and_rollups(self, telemetry):
+        telemetry.record("old", 1)
+        telemetry.record("new", 1)
+        telemetry.flush()
+        long_ago = timezone.now() - timedelta(days=40)
+        SearchLog.objects.filter(query="old").update(created_at=long_ago)
+        SearchQueryStat.objects.filter(query="old").update(
+            date=timezone.localdate() - timedelta(days=400)
+        )
+
+        deleted = telemetry.prune(log_days=30, stats_days=365)
+
+        assert deleted == {"search_logs": 1, "query_stats": 1}
+        assert list(SearchLog.objects.values_list("query", flat=True)) == ["new"]
+        assert SearchQueryStat.objects.filter(query="new").exists()
+
+    def test_invalid_client_ips_are_not_stored(self, telemetry):
+        telemetry.record("django", 1, ip_address=" 10.0.0.7")
+        telemetry.record("django", 1, ip_address="unknown")
+
+        assert telemetry.flush() == 2
+        ips = set(SearchLog.objects.values_list("ip_address", flat=True))
+        assert ips == {"10.0.0.7", None}
+
+    def test_failed_flush_keeps_events(self, telemetry, monkeypatch):
+        telemetry.record("django", 0)
+        telemetry.record("django", 4)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("database down")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(SearchLog.objects, "bulk_create", fail)
+            assert telemetry.flush() == 0
+        assert telemetry.pending() == 2
+
+        assert telemetry.flush() == 2
+        stat = SearchQueryStat.objects.get(query="django")
+        assert (stat.searches, stat.zero_results, stat.total_results) == (2, 1, 4)
+
+
+def test_exit_flush_skips_unusable_database(telemetry):
+    # No django_db mark: database access is blocked, as after teardown
+    telemetry.record("django", 1)
+
+    telemetry.flush_at_exit()
+
+    assert telemetry.pending() == 1
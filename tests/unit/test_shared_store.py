@@ -0,0 +1,83 @@
+"""
+Tests for the shared state backend selection
+"""
+
+from apps.core.shared_store import SharedStore
+
+
+class CacheImpl:
+    def __init__(self, store):
+        self.store = store
+        self.flushed = 0
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value):
+        self.store.set(key, value)
+
+    def flush(self):
+        self.flushed += 1
+
+    def reset(self):
+        self.store.clear()
+
+
+class RedisImpl:
+    def __init__(self, alias):
+        raise ConnectionError("no redis")
+
+
+class BrokenImpl:
+    def get(self, key):
+        raise ConnectionError("down")
+
+    def reset(self):
+        raise ConnectionError("down")
+
+
+def make_store(**kwargs):
+    return SharedStore(
+        "test-shared-store", "TEST_STORE_ALIAS", CacheImpl, RedisImpl, **kwargs
+    )
+
+
+def test_plain_cache_gets_the_cache_implementation(settings):
+    settings.TEST_STORE_ALIAS = "default"
+
+    store = make_store()
+
+    assert isinstance(store.backend, CacheImpl)
+    assert store.backend.store is not store.local.store
+
+
+def test_unavailable_redis_falls_back_to_the_cache_implementation(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        "redis": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": "redis://127.0.0.1:1/0",
+        },
+    }
+
+    store = make_store(cache_alias="redis")
+
+    assert isinstance(store.backend, CacheImpl)
+
+
+def test_failing_backend_uses_local_state():
+    store = make_store(backend=BrokenImpl())
+    store.local.set("key", 1)
+
+    assert store.call("get", "key") == 1
+
+    store.reset()
+    assert store.local.get("key") is None
+
+
+def test_flush_reaches_cache_implementations_only():
+    store = make_store(backend=BrokenImpl())
+
+    store.flush()
+
+    assert store.local.flushed == 1
@@ -0,0 +1,183 @@
+"""
+Unit tests for the static file metadata index and the middleware using it.
+
+Tests cover:
+- Index construction with pre-compressed and WebP variants
+- Manifest-triggered refresh and lazy media lookups
+- Encoding negotiation and 304 responses served from memory
+"""
+
+import os
+import time
+
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+import pytest
+
+from apps.portfolio.middleware.static_file_index import StaticFileIndex
+from apps.portfolio.middleware.static_optimization_middleware import (
+    StaticFileOptimizationMiddleware,
+)
+
+
+@pytest.fixture
+def static_tree(tmp_path):
+    static_root = tmp_path / "staticfiles"
+    (static_root / "css").mkdir(parents=True)
+    (static_root / "img").mkdir()
+    (static_root / "css" / "site.css").write_text("body{color:red}")
+    (static_root / "css" / "site.css.gz").write_bytes(b"gz-bytes")
+    (static_root / "css" / "site.css.br").write_bytes(b"br-bytes")
+    (static_root / "img" / "logo.png").write_bytes(b"png-bytes")
+    (static_root / "img" / "logo.webp").write_bytes(b"webp-bytes")
+    media_root = tmp_path / "media"
+    media_root.mkdir()
+    with override_settings(
+        STATIC_ROOT=static_root,
+        STATICFILES_DIRS=[],
+        MEDIA_ROOT=media_root,
+        STATIC_URL="/static/",
+        MEDIA_URL="/media/",
+    ):
+        yield static_root, media_root
+
+
+@pytest.fixture
+def middleware(static_tree):
+    middleware = StaticFileOptimizationMiddleware(lambda request: HttpResponse())
+    middleware.index = StaticFileIndex(refresh_interval=0)
+    return middleware
+
+
+def _body(response):
+    return b"".join(response.streaming_content)
+
+
+class TestStaticFileIndex:
+    """Test index construction and refresh."""
+
+    def test_index_records_variants(self, static_tree):
+        index = StaticFileIndex()
+        assert index.build() == 3
+
+        css = index.lookup("/static/css/site.css")
+        assert set(css.encodings) == {"br", "gzip"}
+        assert css.content_type == "text/css"
+        assert index.lookup("/static/img/logo.png").webp is not None
+
+    def test_manifest_change_triggers_rebuild(self, static_tree):
+        static_root, _ = static_tree
+        index = StaticFileIndex(refresh_interval=0)
+        index.build()
+
+        (static_root / "css" / "new.css").write_text("a{}")
+        manifest = static_root / "staticfiles.json"
+        manifest.write_text("{}")
+        os.utime(manifest, (time.time() + 10, time.time() + 10))
+
+        assert index.lookup("/static/css/new.css") is not None
+        assert "/static/css/new.css" in index._entries
+
+    def test_media_lookup_is_lazy_and_rejects_traversal(self, static_tree):
+        _, media_root = static_tree
+        (media_root / "upload.txt").write_text("hello")
+        index = StaticFileIndex()
+
+        assert index.lookup("/media/upload.txt").size == 5
+        assert index.lookup("/media/../secret.txt") is None
+        assert index.lookup("/media/missing.txt") is None
+
+    @pytest.mark.parametrize(
+        "url_path",
+        ["/media//etc/passwd", "/static//etc/hostname", "/static/css/./site.css"],
+    )
+    def test_rejects_absolute_and_empty_segments(self, static_tree, url_path):
+        assert StaticFileIndex().lookup(url_path) is None
+
+    def test_rejects_symlink_escaping_root(self, static_tree, tmp_path):
+        _, media_root = static_tree
+        (tmp_path / "secret.txt").write_text("secret")
+        (media_root / "link.txt").symlink_to(tmp_path / "secret.txt")
+
+        assert StaticFileIndex().lookup("/media/link.txt") is None
+
+    def test_source_dir_edits_refresh_entry(self, static_tree, tmp_path):
+        source_dir = tmp_path / "static"
+        source_dir.mkdir()
+        app_js = source_dir / "app.js"
+        app_js.write_text("one()")
+        with override_settings(STATICFILES_DIRS=[source_dir]):
+            index = StaticFileIndex()
+            index.build()
+            before = index.lookup("/static/app.js")
+
+            app_js.write_text("two(); three()")
+            after = index.lookup("/static/app.js")
+
+        assert before.verify
+        assert after.size == app_js.stat().st_size
+        assert after.etag != before.etag
+
+    def test_debug_verifies_static_root_and_skips_negative_cache(self, static_tree):
+        static_root, _ = static_tree
+        with override_settings(DEBUG=True):
+            index = StaticFileIndex()
+        index.build()
+        assert index.lookup("/static/css/late.css") is None
+
+        (static_root / "css" / "late.css").write_text("a{}")
+        (static_root / "css" / "site.css").write_text("body{color:blue;margin:0}")
+
+        assert index.lookup("/static/css/late.css") is not None
+        assert index.lookup("/static/css/site.css").size == 25
+
+
+class TestStaticFileOptimizationMiddleware:
+    """Test negotiation and conditional requests."""
+
+    def test_serves_brotli_variant(self, middleware):
+        request = RequestFactory().get(
+            "/static/css/site.css", HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+        response = middleware.process_request(request)
+        assert response["Content-Encoding"] == "br"
+        assert response["Vary"] == "Accept-Encoding"
+        assert _body(response) == b"br-bytes"
+
+    def test_serves_webp_when_accepted(self, middleware):
+        request = RequestFactory().get(
+            "/static/img/logo.png", HTTP_ACCEPT="image/webp,*/*"
+        )
+        response = middleware.process_request(request)
+        assert response["Content-Type"] == "image/webp"
+        assert _body(response) == b"webp-bytes"
+
+    def test_conditional_request_returns_304(self, middleware):
+        factory = RequestFactory()
+        first = middleware.process_request(factory.get("/static/css/site.css"))
+        assert first.status_code == 200
+
+        second = middleware.process_request(
+            factory.get("/static/css/site.css", HTTP_IF_NONE_MATCH=first["ETag"])
+        )
+        assert second.status_code == 304
+
+        third = middleware.process_request(
+            factory.get(
+                "/static/css/site.css",
+                HTTP_IF_MODIFIED_SINCE=first["Last-Modified"],
+            )
+        )
+        assert third.status_code == 304
+
+    def test_unknown_file_passes_through(self, middleware):
+        request = RequestFactory().get("/static/css/missing.css")
+        assert middleware.process_request(request) is None
+
+    def test_response_headers_use_index(self, middleware):
+        request = RequestFactory().get("/static/css/site.css")
+        response = middleware.process_response(request, HttpResponse())
+        entry = middleware.index.lookup("/static/css/site.css")
+        assert response["ETag"] == entry.etag
+        assert response["Last-Modified"] == entry.last_modified
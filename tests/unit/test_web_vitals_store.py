@@ -0,0 +1,116 @@
+"""
+Tests for the shared Web Vitals store
+"""
+
+import statistics
+import time
+
+from django.core.cache.backends.locmem import LocMemCache
+
+import pytest
+
+from apps.portfolio.views.monitoring import PerformanceMetrics
+from apps.portfolio.web_vitals import (
+    CacheVitalsStore,
+    WebVitalsStore,
+    bucket_id,
+    bucket_key,
+)
+
+
+@pytest.fixture
+def shared_cache():
+    cache = LocMemCache("test-web-vitals", {})
+    cache.clear()
+    return cache
+
+
+def worker(cache, **kwargs):
+    """A store as seen by one worker process sharing ``cache``"""
+    return WebVitalsStore(backend=CacheVitalsStore(cache, **kwargs))
+
+
+def test_workers_share_one_summary(shared_cache):
+    first, second = worker(shared_cache), worker(shared_cache)
+    for value in (1000, 2000):
+        first.record("lcp", value)
+    second.record("lcp", 3000)
+    second.record("cls", 0.05)
+    second.flush()  # as after its flush interval
+
+    assert first.summary(hours=1) == second.summary(hours=1)
+    lcp = first.summary(hours=1)["lcp"]
+    assert lcp["count"] == 3
+    assert lcp["avg"] == 2000
+    assert (lcp["min"], lcp["max"]) == (1000, 3000)
+    assert list(first.summary(hours=1)) == ["lcp", "cls"]
+
+
+def test_values_are_batched_until_read(shared_cache):
+    store = worker(shared_cache, flush_size=3)
+    now = time.time()
+    store.record("fid", 20, now)
+    store.record("fid", 40, now)
+
+    assert shared_cache.get(bucket_key(bucket_id(now))) is None
+    store.record("fid", 60, now)
+    assert shared_cache.get(bucket_key(bucket_id(now)))["fid"]["count"] == 3
+
+
+def test_percentiles_from_histogram(shared_cache):
+    store = worker(shared_cache)
+    values = list(range(100, 4100, 10))
+    for value in values:
+        store.record("lcp", value)
+
+    lcp = store.summary(hours=1)["lcp"]
+
+    assert abs(lcp["median"] - statistics.median(values)) < 100
+    assert 3500 <= lcp["p95"] <= 4000
+    assert lcp["recent"] == values[-10:]
+
+
+def test_single_value_percentiles_are_exact(shared_cache):
+    store = worker(shared_cache)
+    store.record("cls", 0.12)
+
+    cls = store.summary(hours=1)["cls"]
+    assert cls["median"] == cls["p95"] == 0.12
+
+
+def test_window_only_reads_recent_buckets(shared_cache):
+    store = worker(shared_cache)
+    now = time.time()
+    store.record("ttfb", 900, now - 2 * 3600)
+    store.record("ttfb", 300, now)
+
+    assert store.summary(hours=1, now=now)["ttfb"]["count"] == 1
+    assert store.summary(hours=3, now=now)["ttfb"]["count"] == 2
+
+
+def test_backend_errors_fall_back_to_local_state():
+    class BrokenBackend:
+        def record(self, *args):
+            raise ConnectionError("down")
+
+        def window(self, *args):
+            raise ConnectionError("down")
+
+    store = WebVitalsStore(backend=BrokenBackend())
+    store.record("fcp", 1200)
+
+    assert store.summary(hours=1)["fcp"]["count"] == 1
+
+
+def test_performance_metrics_reads_store(shared_cache):
+    metrics = PerformanceMetrics(store=worker(shared_cache))
+    for _ in range(150):
+        metrics.add_metric("lcp", 5000)
+    metrics.add_metric("network_online", 1)
+
+    summary = metrics.get_summary(hours=1)
+
+    assert list(summary) == ["lcp"]
+    assert summary["lcp"]["count"] == 150
+    assert len(metrics.alerts) == 100
+    assert metrics.get_health_score()["individual"] == {"lcp": 40}
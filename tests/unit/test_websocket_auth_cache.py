@@ -0,0 +1,148 @@
+"""
+Tests for cached WebSocket session authentication
+"""
+
+import json
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import Client
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from apps.chat.auth_cache import user_snapshots
+from apps.chat.middleware import WebSocketAuthMiddleware
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username="ws-user", email="ws@example.com", password="pass-12345-word"
+    )
+
+
+@pytest.fixture
+def logged_in(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def middleware():
+    return WebSocketAuthMiddleware(inner=None)
+
+
+def scope_for(session_key=None, query_string=b""):
+    headers = []
+    if session_key:
+        headers.append((b"cookie", f"csrftoken=x; sessionid={session_key}".encode()))
+    return {
+        "type": "websocket",
+        "headers": headers,
+        "query_string": query_string,
+    }
+
+
+def test_session_user_is_served_from_cache(
+    middleware, logged_in, user, django_assert_num_queries
+):
+    scope = scope_for(logged_in.session.session_key)
+
+    first = middleware.get_user_from_session(scope)
+    with django_assert_num_queries(0):
+        second = middleware.get_user_from_session(scope)
+
+    assert first == user
+    assert second.pk == user.pk
+    assert second.username == "ws-user"
+    assert second.is_authenticated
+
+
+def test_unknown_session_is_cached_as_anonymous(middleware, django_assert_num_queries):
+    scope = scope_for("no-such-session")
+
+    assert not middleware.get_user_from_session(scope).is_authenticated
+    with django_assert_num_queries(0):
+        assert not middleware.get_user_from_session(scope).is_authenticated
+
+
+def test_logout_drops_cached_session(middleware, logged_in):
+    session_key = logged_in.session.session_key
+    middleware.get_user_from_session(scope_for(session_key))
+
+    logged_in.logout()
+
+    assert user_snapshots.get("session", session_key) is None
+    assert not middleware.get_user_from_session(scope_for(session_key)).is_authenticated
+
+
+def test_user_save_drops_cached_user(user):
+    user_snapshots.set("user", user.pk, user)
+    assert user_snapshots.get("user", user.pk).username == "ws-user"
+
+    user.first_name = "Changed"
+    user.save()
+
+    assert user_snapshots.get("user", user.pk) is None
+
+
+def test_user_save_drops_cached_sessions(middleware, logged_in, user):
+    session_key = logged_in.session.session_key
+    middleware.get_user_from_session(scope_for(session_key))
+    assert user_snapshots.get("session", session_key).pk == user.pk
+
+    user.is_active = False
+    user.save()
+
+    assert user_snapshots.get("session", session_key) is None
+
+
+def test_restore_parses_json_serialized_snapshot(logged_in, user):
+    user.refresh_from_db()
+    # As stored by django_redis's JSONSerializer
+    snapshot = json.loads(
+        json.dumps(user_snapshots.snapshot(user), cls=DjangoJSONEncoder)
+    )
+
+    restored = user_snapshots.restore(snapshot)
+
+    assert isinstance(restored.date_joined, datetime)
+    assert isinstance(restored.last_login, datetime)
+    assert restored.date_joined.replace(microsecond=0) == user.date_joined.replace(
+        microsecond=0
+    )
+
+
+def test_get_user_without_credentials_is_anonymous(middleware):
+    user = async_to_sync(middleware.get_user)(scope_for())
+
+    assert not user.is_authenticated
+
+
+def test_get_user_resolves_session(middleware, logged_in, user):
+    user_in_scope = async_to_sync(middleware.get_user)(
+        scope_for(logged_in.session.session_key)
+    )
+
+    assert user_in_scope.pk == user.pk
+
+
+def test_invalid_token_is_rejected(middleware):
+    user = middleware.get_user_from_token(scope_for(query_string=b"token=not-a-jwt"))
+
+    assert not user.is_authenticated